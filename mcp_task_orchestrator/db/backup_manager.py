@@ -3,17 +3,22 @@ Database backup management utilities.
 
 This module handles database backup creation, validation, and metadata tracking
 for the migration system.
+
+Backups are taken with SQLite's online backup API, a bounded number of pages
+at a time with a pause in between, so writers on the live database keep
+making progress while a large database is copied.
 """
 
+import gzip
 import logging
 import os
-import shutil
 import sqlite3
 import json
 import hashlib
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import BinaryIO, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from sqlalchemy.engine import Engine
 
@@ -24,6 +29,38 @@ from ..infrastructure.error_handling.retry_coordinator import FixedDelayPolicy
 
 logger = logging.getLogger(__name__)
 
+# Read/write size for streaming backup files
+CHUNK_SIZE = 1024 * 1024
+
+
+class _HashingFile:
+    """File wrapper that feeds every byte read or written into a digest."""
+    
+    def __init__(self, fileobj: BinaryIO, digest):
+        self._file = fileobj
+        self.digest = digest
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self.digest.update(data)
+        return data
+    
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self._file.write(data)
+    
+    def flush(self):
+        self._file.flush()
+
+
+class _BackupTimeLimit(Exception):
+    """Raised from the backup progress callback to stop stepping."""
+
+
+def _copy_stream(source, target):
+    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+        target.write(chunk)
+
 
 @dataclass
 class BackupInfo:
@@ -35,6 +72,9 @@ class BackupInfo:
     size_bytes: int
     checksum: str
     migration_batch_id: Optional[str] = None
+    # Backups recorded before these fields existed are plain MD5-checked copies
+    checksum_algorithm: str = "md5"
+    compression: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -58,12 +98,21 @@ class BackupManager:
     and metadata tracking for migration rollback capabilities.
     """
     
-    def __init__(self, backup_directory: Optional[Path] = None):
+    def __init__(self, backup_directory: Optional[Path] = None,
+                 pages_per_step: int = 1024,
+                 step_delay: float = 0.005,
+                 compress: bool = False,
+                 max_step_seconds: float = 60.0):
         """
         Initialize backup manager.
         
         Args:
             backup_directory: Directory for storing backups (defaults to ./backups)
+            pages_per_step: Database pages copied per backup step
+            step_delay: Seconds to pause between steps so writers are not starved
+            compress: Whether backups are gzip-compressed by default
+            max_step_seconds: How long to copy in throttled steps before the rest
+                is copied in one step (writes restart a stepped backup)
         """
         if backup_directory is None:
             backup_directory = Path.cwd() / "backups" / "migrations"
@@ -71,16 +120,28 @@ class BackupManager:
         self.backup_directory = Path(backup_directory)
         self.backup_directory.mkdir(parents=True, exist_ok=True)
         self.metadata_file = self.backup_directory / "backup_metadata.json"
+        self.pages_per_step = pages_per_step
+        self.step_delay = step_delay
+        self.compress = compress
+        self.max_step_seconds = max_step_seconds
         
         logger.info(f"Backup manager initialized: {self.backup_directory}")
     
-    def create_backup(self, database_url: str, migration_batch_id: Optional[str] = None) -> BackupInfo:
+    def create_backup(self, database_url: str, migration_batch_id: Optional[str] = None,
+                      compress: Optional[bool] = None) -> BackupInfo:
         """
         Create a backup of the current database state.
         
+        The database is copied with the online backup API, which is
+        consistent under concurrent (including WAL) writes. Plain backups are
+        copied straight into the backup file and checksummed in one read;
+        compressed backups go through a temporary snapshot that is gzipped
+        and checksummed in a single streaming pass.
+        
         Args:
             database_url: SQLAlchemy database URL
             migration_batch_id: Optional batch ID for associating backup
+            compress: Gzip-compress the backup (defaults to the manager setting)
             
         Returns:
             BackupInfo with backup details
@@ -105,15 +166,38 @@ class BackupManager:
             if not original_path.exists():
                 raise FileNotFoundError(f"Database file not found: {original_path}")
             
+            if compress is None:
+                compress = self.compress
+            
             # Create backup
             backup_filename = f"{backup_id}_{original_path.name}"
+            if compress:
+                backup_filename += ".gz"
             backup_path = self.backup_directory / backup_filename
             
-            shutil.copy2(original_path, backup_path)
+            if compress:
+                snapshot_path = self.backup_directory / f"{backup_id}.snapshot"
+                try:
+                    self._online_copy(original_path, snapshot_path)
+                    
+                    # Checksum the stored bytes while they are written
+                    with open(snapshot_path, 'rb') as source, open(backup_path, 'wb') as raw:
+                        stored = _HashingFile(raw, hashlib.sha256())
+                        with gzip.GzipFile(fileobj=stored, mode='wb', compresslevel=6) as target:
+                            _copy_stream(source, target)
+                finally:
+                    if snapshot_path.exists():
+                        snapshot_path.unlink()
+            else:
+                self._online_copy(original_path, backup_path)
+                with open(backup_path, 'rb') as raw:
+                    stored = _HashingFile(raw, hashlib.sha256())
+                    while stored.read(CHUNK_SIZE):
+                        pass
+            backup_checksum = stored.digest.hexdigest()
             
             # Get backup info
             backup_size = backup_path.stat().st_size
-            backup_checksum = self._calculate_file_checksum(backup_path)
             
             backup_info = BackupInfo(
                 backup_id=backup_id,
@@ -122,7 +206,9 @@ class BackupManager:
                 created_at=datetime.now(),
                 size_bytes=backup_size,
                 checksum=backup_checksum,
-                migration_batch_id=migration_batch_id
+                migration_batch_id=migration_batch_id,
+                checksum_algorithm='sha256',
+                compression='gzip' if compress else None
             )
             
             # Store backup metadata
@@ -139,6 +225,11 @@ class BackupManager:
         """
         Restore database from backup.
         
+        The backup is unpacked and checksummed in one pass, checked with
+        ``PRAGMA quick_check``, and only then copied into the database with
+        the online backup API. That copy runs in a single transaction on
+        the destination, so a failed restore leaves the database unchanged.
+        
         Args:
             backup_info: Backup information
             
@@ -153,42 +244,35 @@ class BackupManager:
                 logger.error(f"Backup file not found: {backup_path}")
                 return False
             
-            # Verify backup integrity
-            current_checksum = self._calculate_file_checksum(backup_path)
-            if current_checksum != backup_info.checksum:
-                logger.error(f"Backup integrity check failed for {backup_info.backup_id}")
-                return False
-            
-            # Create temporary backup of current state
-            temp_backup = original_path.with_suffix('.tmp_backup')
-            if original_path.exists():
-                shutil.copy2(original_path, temp_backup)
-            
+            snapshot_path = self.backup_directory / f"{backup_info.backup_id}.restore"
             try:
-                # Restore from backup
-                shutil.copy2(backup_path, original_path)
-                
-                # Verify restoration
-                if not self._verify_database_integrity(original_path):
-                    # Restore from temp backup
-                    if temp_backup.exists():
-                        shutil.copy2(temp_backup, original_path)
-                    logger.error("Database integrity check failed after restoration")
+                # Verify backup integrity while unpacking it
+                with open(backup_path, 'rb') as raw, open(snapshot_path, 'wb') as target:
+                    stored = _HashingFile(raw, hashlib.new(backup_info.checksum_algorithm))
+                    if backup_info.compression == 'gzip':
+                        with gzip.GzipFile(fileobj=stored, mode='rb') as source:
+                            _copy_stream(source, target)
+                    else:
+                        _copy_stream(source=stored, target=target)
+                    # Include any bytes the decompressor did not consume
+                    while stored.read(CHUNK_SIZE):
+                        pass
+                if stored.digest.hexdigest() != backup_info.checksum:
+                    logger.error(f"Backup integrity check failed for {backup_info.backup_id}")
                     return False
                 
-                # Cleanup temp backup
-                if temp_backup.exists():
-                    temp_backup.unlink()
-                
-                logger.info(f"Database restored from backup: {backup_info.backup_id}")
-                return True
+                if not self._verify_database_integrity(snapshot_path):
+                    logger.error(f"Database integrity check failed for backup {backup_info.backup_id}")
+                    return False
                 
-            except Exception as restore_error:
-                # Restore from temp backup on failure
-                if temp_backup.exists():
-                    shutil.copy2(temp_backup, original_path)
-                    temp_backup.unlink()
-                raise restore_error
+                # Restore from backup
+                self._online_copy(snapshot_path, original_path)
+            finally:
+                if snapshot_path.exists():
+                    snapshot_path.unlink()
+            
+            logger.info(f"Database restored from backup: {backup_info.backup_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Failed to restore backup {backup_info.backup_id}: {e}")
@@ -347,20 +431,47 @@ class BackupManager:
         
         return stats
     
-    def _calculate_file_checksum(self, file_path: Path) -> str:
-        """Calculate MD5 checksum of a file."""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+    def _online_copy(self, source_path: Path, target_path: Path):
+        """
+        Copy one SQLite database into another with the online backup API.
+        
+        Pages are copied ``pages_per_step`` at a time, pausing ``step_delay``
+        seconds between steps so writers on the source are not starved. A
+        commit from another connection restarts a stepped backup, so on a
+        busy database it might never finish: after ``max_step_seconds`` the
+        copy starts over in a single step, which holds the source's read lock
+        until it is done.
+        """
+        started = time.perf_counter()
+        
+        def throttle(status, remaining, total):
+            if remaining:
+                if time.perf_counter() - started > self.max_step_seconds:
+                    raise _BackupTimeLimit()
+                logger.debug(f"Backup progress: {total - remaining}/{total} pages")
+                time.sleep(self.step_delay)
+        
+        source = sqlite3.connect(str(source_path))
+        target = sqlite3.connect(str(target_path))
+        try:
+            try:
+                source.backup(target, pages=self.pages_per_step, progress=throttle)
+            except _BackupTimeLimit:
+                logger.warning(f"Stepped backup of {source_path} did not finish within "
+                               f"{self.max_step_seconds}s; copying the rest in one step")
+                source.backup(target, pages=-1)
+        finally:
+            target.close()
+            source.close()
+        
+        logger.debug(f"Copied {source_path} to {target_path} in {time.perf_counter() - started:.2f}s")
     
     def _verify_database_integrity(self, db_path: Path) -> bool:
-        """Verify database integrity using SQLite PRAGMA."""
+        """Verify database integrity using SQLite PRAGMA quick_check."""
         try:
             with sqlite3.connect(str(db_path)) as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA integrity_check;")
+                cursor.execute("PRAGMA quick_check;")
                 result = cursor.fetchone()
                 
                 if result and result[0] == 'ok':
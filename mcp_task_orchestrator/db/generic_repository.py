@@ -8,7 +8,7 @@ NOTE: This module is being refactored. The base class and imports have been move
 repository/base.py to reduce file size and improve maintainability.
 """
 
-from typing import Dict, List, Optional, Tuple, Any, Set
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Any, Set
 from datetime import datetime
 import logging
 
@@ -68,6 +68,37 @@ class GenericTaskRepository(TaskRepository):
         from .repository.crud_operations import update_task
         return await update_task(self, task)
     
+    async def get_subtask(self, task_id: str) -> Optional[GenericTask]:
+        """Fetch one subtask by primary key, without its siblings."""
+        from .repository.crud_operations import get_task
+        task = await get_task(self, task_id)
+        return task if task is not None and task.parent_task_id else None
+    
+    async def update_subtask(self, task: GenericTask, parent_task_id: Optional[str] = None) -> bool:
+        """Write a subtask's row and artifacts without touching its siblings."""
+        from .repository.crud_operations import update_task_row
+        return await update_task_row(self, task, parent_task_id)
+    
+    async def archive_task(self, task_id: str) -> bool:
+        """Mark a finished task archived."""
+        from .repository.crud_operations import archive_task
+        return await archive_task(self, task_id)
+    
+    async def get_subtask_progress(self, parent_task_id: str) -> Dict[str, int]:
+        """Get the total and completed subtask counts of a parent."""
+        from .repository.progress_tracking import get_progress
+        return await get_progress(self, parent_task_id)
+    
+    async def reconcile_subtask_progress(self) -> int:
+        """Repair drifted per-parent subtask counters."""
+        from .repository.progress_tracking import reconcile_progress
+        return await reconcile_progress(self)
+    
+    async def reconcile_parent_progress(self, parent_task_id: str) -> bool:
+        """Recompute one parent's subtask counters from its children."""
+        from .repository.progress_tracking import reconcile_parent_progress
+        return await reconcile_parent_progress(self, parent_task_id)
+    
     async def delete_task(self, task_id: str, hard_delete: bool = False) -> bool:
         """Delete a task (soft delete by default)."""
         from .repository.crud_operations import delete_task
@@ -102,9 +133,12 @@ class GenericTaskRepository(TaskRepository):
         Raises:
             ValueError: If move would create a cycle
         """
+        # The sync get_task below shadows the async one for this class
+        from .repository.crud_operations import get_task
+        
         async with self.get_session() as session:
             # Get the task and its subtree
-            task = await self.get_task(task_id)
+            task = await get_task(self, task_id)
             if not task:
                 raise ValueError(f"Task {task_id} not found")
             
@@ -116,7 +150,7 @@ class GenericTaskRepository(TaskRepository):
             
             # Calculate new hierarchy path
             if new_parent_id:
-                parent = await self.get_task(new_parent_id)
+                parent = await get_task(self, new_parent_id)
                 if not parent:
                     raise ValueError(f"Parent task {new_parent_id} not found")
                 new_path = f"{parent.hierarchy_path}/{task_id}"
@@ -128,6 +162,11 @@ class GenericTaskRepository(TaskRepository):
             # Get old path for updating descendants
             old_path = task.hierarchy_path
             
+            previous = (await session.execute(text("""
+                SELECT status, parent_task_id, deleted_at FROM generic_tasks
+                WHERE task_id = :task_id
+            """), {"task_id": task_id})).fetchone()
+            
             # Update the task
             update_task_stmt = text("""
                 UPDATE generic_tasks SET
@@ -148,6 +187,14 @@ class GenericTaskRepository(TaskRepository):
                 "updated_at": datetime.now().isoformat()
             })
             
+            # The moved subtask leaves one parent's counters and joins the other's
+            if previous.deleted_at is None and previous.parent_task_id != new_parent_id:
+                from .repository.progress_tracking import adjust_progress, completed_delta
+                await adjust_progress(self, session, previous.parent_task_id, -1,
+                                      completed_delta(previous.status, None))
+                await adjust_progress(self, session, new_parent_id, 1,
+                                      completed_delta(None, previous.status))
+            
             # Update all descendants
             update_descendants_stmt = text("""
                 UPDATE generic_tasks SET
@@ -170,7 +217,7 @@ class GenericTaskRepository(TaskRepository):
             logger.info(f"Moved task {task_id} to parent {new_parent_id}")
             
             # Return updated task
-            return await self.get_task(task_id)
+            return await get_task(self, task_id)
     
     # ============================================
     # Dependency Operations (delegated to dependency_manager)
@@ -203,6 +250,42 @@ class GenericTaskRepository(TaskRepository):
         from .repository.query_builder import query_tasks
         return await query_tasks(self, filters, order_by, limit, offset)
     
+    async def get_subtask_page(self, status=None, specialist_type=None,
+                               after: Optional[Tuple[str, str]] = None,
+                               limit: int = 500) -> Tuple[List[GenericTask], Optional[Tuple[str, str]]]:
+        """Get one keyset-paginated page of subtasks of active parents."""
+        from .repository.query_builder import query_subtask_page
+        return await query_subtask_page(self, status, specialist_type, after=after, limit=limit)
+    
+    def iter_subtasks(self, status=None, specialist_type=None,
+                      page_size: int = 500) -> AsyncIterator[GenericTask]:
+        """Stream subtasks of active parents, newest first."""
+        from .repository.query_builder import iter_subtasks
+        return iter_subtasks(self, status, specialist_type, page_size)
+    
+    async def get_interrupted_tasks(self, after: Optional[str] = None,
+                                    limit: int = 500) -> List[Dict[str, Any]]:
+        """Get a batch of tasks left in progress by a previous server process."""
+        from .repository.query_builder import query_interrupted_tasks
+        return await query_interrupted_tasks(self, after=after, limit=limit)
+    
+    async def count_interrupted_tasks(self) -> int:
+        """Count tasks left in progress by a previous server process."""
+        from .repository.query_builder import count_interrupted_tasks
+        return await count_interrupted_tasks(self)
+    
+    async def get_changed_tasks(self, since: str, after: Optional[Tuple[str, str]] = None,
+                                limit: int = 500) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """Get a batch of tasks written at or after a point in time, deleted ones included."""
+        from .repository.query_builder import query_changed_tasks
+        return await query_changed_tasks(self, since, after=after, limit=limit)
+    
+    async def get_task_families(self, parent_ids: List[str],
+                                include_subtasks: bool = True) -> List[GenericTask]:
+        """Get live top-level tasks and, optionally, their live subtasks."""
+        from .repository.query_builder import query_task_families
+        return await query_task_families(self, parent_ids, include_subtasks)
+    
     async def search_by_attribute(self, attribute_name: str, 
                                  attribute_value: str,
                                  indexed_only: bool = True) -> List[GenericTask]:
@@ -78,6 +78,9 @@ CREATE INDEX idx_generic_tasks_hierarchy ON generic_tasks(hierarchy_path);
 CREATE INDEX idx_generic_tasks_type ON generic_tasks(task_type);
 CREATE INDEX idx_generic_tasks_specialist ON generic_tasks(specialist_type);
 CREATE INDEX idx_generic_tasks_created ON generic_tasks(created_at);
+CREATE INDEX idx_generic_tasks_created_order ON generic_tasks(created_at, task_id);
+CREATE INDEX idx_generic_tasks_status_task ON generic_tasks(status, task_id);
+CREATE INDEX idx_generic_tasks_updated_order ON generic_tasks(replace(updated_at, 'T', ' '), task_id);
 CREATE INDEX idx_generic_tasks_deleted ON generic_tasks(deleted_at);
 
 -- ============================================
@@ -214,6 +217,20 @@ CREATE INDEX idx_events_category ON task_events(event_category);
 CREATE INDEX idx_events_created ON task_events(created_at);
 CREATE INDEX idx_events_session ON task_events(session_id);
 
+-- ============================================
+-- Subtask Progress Counters
+-- ============================================
+-- Per-parent subtask totals, maintained on every subtask insert, delete and
+-- status transition so completion checks never scan the children
+CREATE TABLE IF NOT EXISTS task_progress (
+    parent_task_id TEXT PRIMARY KEY,
+    total_subtasks INTEGER NOT NULL DEFAULT 0,
+    completed_subtasks INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (parent_task_id) REFERENCES generic_tasks(task_id) ON DELETE CASCADE
+);
+
 -- ============================================
 -- Task Artifacts (Enhanced)
 -- ============================================
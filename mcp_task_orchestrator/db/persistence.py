@@ -6,7 +6,7 @@ interface with the new GenericTaskRepository implementation.
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 
 from .generic_repository import GenericTaskRepository
@@ -56,6 +56,28 @@ class DatabasePersistenceManager:
         """Get all tasks."""
         return await self._repository.get_all_tasks()
     
+    async def get_subtask_page(self, status=None, specialist_type=None,
+                               after: Optional[Tuple[str, str]] = None,
+                               limit: int = 500) -> Tuple[List[Task], Optional[Tuple[str, str]]]:
+        """
+        Get one page of subtasks of active parents, newest first.
+        
+        Args:
+            status: Subtask status or statuses to include (all if None)
+            specialist_type: Specialist type or types to include (all if None)
+            after: Cursor returned with the previous page, None for the first page
+            limit: Maximum number of subtasks on the page
+            
+        Returns:
+            Tuple of (subtasks, cursor for the next page or None when exhausted)
+        """
+        return await self._repository.get_subtask_page(status, specialist_type, after, limit)
+    
+    def iter_subtasks(self, status=None, specialist_type=None,
+                      page_size: int = 500) -> AsyncIterator[Task]:
+        """Stream subtasks of active parents, newest first, one page at a time."""
+        return self._repository.iter_subtasks(status, specialist_type, page_size)
+    
     async def initialize_database(self) -> bool:
         """Initialize the database."""
         return await self._repository.initialize_database()
@@ -131,6 +153,122 @@ class DatabasePersistenceManager:
             logger.error(f"Failed to save task breakdown: {str(e)}")
             return False
 
+    async def get_subtask(self, task_id: str) -> Optional[Task]:
+        """
+        Fetch a single subtask by primary key.
+        
+        Args:
+            task_id: The ID of the subtask
+            
+        Returns:
+            Optional[Task]: The subtask, or None if not found or not a subtask
+        """
+        return await self._repository.get_subtask(validate_task_id(task_id))
+
+    async def update_subtask(self, subtask: Task, parent_task_id: str) -> bool:
+        """
+        Persist an edited subtask as a single-row update.
+        
+        Every mutable column (title, description, status, context, results,
+        timestamps, ...) and the subtask's artifacts are written; the parent
+        breakdown and sibling subtasks are not rewritten.
+        
+        Args:
+            subtask: The subtask with its new state
+            parent_task_id: The parent the subtask must belong to
+            
+        Returns:
+            bool: True if the subtask was updated
+        """
+        updated = await self._repository.update_subtask(subtask, parent_task_id)
+        if not updated:
+            logger.warning(f"Subtask {subtask.task_id} not found under parent {parent_task_id}")
+        return updated
+
+    async def archive_task(self, parent_task_id: str) -> bool:
+        """
+        Archive a task whose subtasks are all completed.
+        
+        The task leaves the active set (status and lifecycle stage become
+        archived); its subtasks are kept.
+        
+        Args:
+            parent_task_id: The task to archive
+            
+        Returns:
+            bool: True if the task was archived
+        """
+        archived = await self._repository.archive_task(validate_task_id(parent_task_id))
+        if not archived:
+            logger.warning(f"Cannot archive task {parent_task_id}: not found or already archived")
+        return archived
+
+    async def get_parent_progress(self, parent_task_id: str) -> Dict[str, Any]:
+        """
+        Get a parent task's subtask progress from its maintained counters.
+        
+        Args:
+            parent_task_id: The parent task
+            
+        Returns:
+            Dict with total_subtasks, completed_subtasks and progress_percentage
+        """
+        progress = await self._repository.get_subtask_progress(parent_task_id)
+        total = progress["total_subtasks"]
+        progress["progress_percentage"] = (progress["completed_subtasks"] / total) * 100 if total else 0
+        return progress
+
+    async def reconcile_progress_counters(self) -> int:
+        """Repair per-parent subtask counters that drifted; returns the number repaired."""
+        try:
+            return await self._repository.reconcile_subtask_progress()
+        except Exception as e:
+            logger.error(f"Failed to reconcile progress counters: {str(e)}")
+            return 0
+
+    async def reconcile_parent_progress(self, parent_task_id: str) -> bool:
+        """Recompute one parent's subtask counters; returns True if they were wrong."""
+        return await self._repository.reconcile_parent_progress(parent_task_id)
+
+    async def get_interrupted_tasks(self, after: Optional[str] = None,
+                                    limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get a batch of tasks left in progress by a previous server process.
+        
+        Args:
+            after: task_id of the last row of the previous batch
+            limit: Maximum number of rows returned
+            
+        Returns:
+            Dicts with task_id and parent_task_id, ordered by task_id
+        """
+        return await self._repository.get_interrupted_tasks(after, limit)
+
+    async def count_interrupted_tasks(self) -> int:
+        """Count tasks left in progress by a previous server process."""
+        return await self._repository.count_interrupted_tasks()
+
+    async def get_changed_tasks(self, since: str, after: Optional[Tuple[str, str]] = None,
+                                limit: int = 500) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """
+        Get a batch of tasks written at or after a point in time.
+        
+        Args:
+            since: UTC timestamp as 'YYYY-MM-DD HH:MM:SS'
+            after: Cursor returned with the previous batch, None for the first batch
+            limit: Maximum number of rows returned
+            
+        Returns:
+            Tuple of (dicts with task_id, parent_task_id and deleted_at,
+            cursor for the next batch or None when exhausted)
+        """
+        return await self._repository.get_changed_tasks(since, after, limit)
+
+    async def get_task_families(self, parent_ids: List[str],
+                                include_subtasks: bool = True) -> List[Task]:
+        """Get live top-level tasks and, optionally, their live subtasks."""
+        return await self._repository.get_task_families(parent_ids, include_subtasks)
+
     async def get_parent_task_id(self, task_id: str) -> Optional[str]:
         """
         Retrieve the parent task ID for a given task.
@@ -11,6 +11,7 @@ Modules:
 - dependency_manager: Dependency operations and cycle detection
 - converters: Row-to-model conversion utilities
 - template_operations: Template management operations
+- progress_tracking: Per-parent subtask progress counters
 - helpers: Internal helper methods for database operations
 
 File Sizes (all under 500 lines for Claude Code safety):
@@ -29,6 +30,7 @@ from .base import TaskRepository, CycleDetectedError
 # Optional: Export converter utilities if needed externally
 from .converters import (
     row_to_task,
+    rows_to_tasks,
     row_to_attribute,
     row_to_dependency,
     row_to_artifact,
@@ -45,6 +47,7 @@ __all__ = [
     
     # Converter functions (available if needed)
     'row_to_task',
+    'rows_to_tasks',
     'row_to_attribute',
     'row_to_dependency',
     'row_to_artifact',
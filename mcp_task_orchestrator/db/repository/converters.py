@@ -12,18 +12,91 @@ into domain model objects, handling:
 
 import json
 from datetime import datetime
-from typing import Dict
+from typing import Any, Dict, Iterable, List
 
 from ...domain.entities.task import (
     Task, TaskAttribute, TaskDependency, TaskEvent, TaskArtifact,
     TaskTemplate, TemplateParameter,
     TaskType, TaskStatus, LifecycleStage, DependencyType, DependencyStatus,
-    EventType, EventCategory, AttributeType, ArtifactType
+    EventType, EventCategory, AttributeType, ArtifactType,
+    TASK_STORAGE_SCHEMA_VERSION
 )
 
 
+# generic_tasks columns the trusted converter understands. A row with a
+# different column set comes from another schema and is fully validated.
+TASK_COLUMNS = frozenset([
+    'task_id', 'parent_task_id', 'title', 'description', 'task_type',
+    'hierarchy_path', 'hierarchy_level', 'position_in_parent', 'status',
+    'lifecycle_stage', 'complexity', 'estimated_effort', 'actual_effort',
+    'specialist_type', 'assigned_to', 'context', 'configuration', 'results',
+    'summary', 'quality_gate_level', 'verification_status',
+    'auto_maintenance_enabled', 'is_template', 'template_id', 'created_at',
+    'updated_at', 'started_at', 'completed_at', 'due_date', 'deleted_at'
+])
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+
 def row_to_task(row: Dict) -> Task:
-    """Convert database row to Task."""
+    """Convert database row to Task, skipping validation for rows in the current schema."""
+    if _is_current_schema(row):
+        return Task.from_storage(_row_to_task_fields(row), TASK_STORAGE_SCHEMA_VERSION)
+    return _row_to_validated_task(row)
+
+
+def rows_to_tasks(rows: Iterable[Dict]) -> List[Task]:
+    """Convert many database rows to Tasks."""
+    rows = list(rows)
+    if all(_is_current_schema(row) for row in rows):
+        return Task.bulk_from_storage([_row_to_task_fields(row) for row in rows], TASK_STORAGE_SCHEMA_VERSION)
+    return [row_to_task(row) for row in rows]
+
+
+def _is_current_schema(row: Dict) -> bool:
+    return len(row) == len(TASK_COLUMNS) and TASK_COLUMNS.issuperset(row.keys())
+
+
+def _row_to_task_fields(row: Dict) -> Dict[str, Any]:
+    """Field values for a trusted row, in the form validation would have produced."""
+    return {
+        'task_id': row['task_id'],
+        'parent_task_id': row['parent_task_id'],
+        'title': row['title'],
+        'description': row['description'],
+        'task_type': row['task_type'],
+        'hierarchy_path': row['hierarchy_path'],
+        'hierarchy_level': row['hierarchy_level'],
+        'position_in_parent': row['position_in_parent'],
+        'status': row['status'],
+        'lifecycle_stage': row['lifecycle_stage'],
+        'complexity': row['complexity'],
+        'estimated_effort': row['estimated_effort'],
+        'actual_effort': row['actual_effort'],
+        'specialist_type': row['specialist_type'],
+        'assigned_to': row['assigned_to'],
+        'context': json.loads(row['context']) if row['context'] else {},
+        'configuration': json.loads(row['configuration']) if row['configuration'] else {},
+        'results': row['results'],
+        'summary': row['summary'],
+        'quality_gate_level': row['quality_gate_level'],
+        'verification_status': row['verification_status'],
+        'auto_maintenance_enabled': bool(row['auto_maintenance_enabled']),
+        'is_template': bool(row['is_template']),
+        'template_id': row['template_id'],
+        'created_at': datetime.fromisoformat(row['created_at']),
+        'updated_at': datetime.fromisoformat(row['updated_at']),
+        'started_at': _parse_datetime(row['started_at']),
+        'completed_at': _parse_datetime(row['completed_at']),
+        'due_date': _parse_datetime(row['due_date']),
+        'deleted_at': _parse_datetime(row['deleted_at'])
+    }
+
+
+def _row_to_validated_task(row: Dict) -> Task:
+    """Convert a database row to Task with full validation."""
     # Parse JSON fields
     context = json.loads(row['context']) if row['context'] else {}
     config = json.loads(row['configuration']) if row['configuration'] else {}
@@ -4,7 +4,7 @@ CRUD Operations Module - Create, Read, Update, Delete operations for Generic Tas
 This module handles all basic CRUD operations for tasks, including:
 - Creating new tasks with validation
 - Reading tasks with optional relationship loading
-- Updating existing tasks
+- Updating existing tasks, or a single task row
 - Soft and hard deletion of tasks
 """
 
@@ -15,8 +15,9 @@ from typing import Optional
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import text
 
-from ...orchestrator.generic_models import GenericTask, EventType, EventCategory
+from ...orchestrator.generic_models import GenericTask, EventType, EventCategory, TaskStatus
 from .converters import row_to_task
+from .progress_tracking import adjust_progress, completed_delta
 
 logger = logging.getLogger(__name__)
 
@@ -62,6 +63,10 @@ async def create_task(repo_instance, task: GenericTask) -> GenericTask:
             
             await session.execute(stmt, task_data)
             
+            # Count the new subtask towards its parent's progress
+            await adjust_progress(repo_instance, session, task.parent_task_id, 1,
+                                  completed_delta(None, task_data["status"]))
+            
             # Save related entities
             from .helpers import save_attribute, save_dependency, save_artifact, record_event
             
@@ -159,10 +164,13 @@ async def update_task(repo_instance, task: GenericTask) -> GenericTask:
     """
     async with repo_instance.get_session() as session:
         # Check if task exists
-        check_stmt = text("SELECT 1 FROM generic_tasks WHERE task_id = :task_id")
+        check_stmt = text(
+            "SELECT status, parent_task_id, deleted_at FROM generic_tasks WHERE task_id = :task_id"
+        )
         result = await session.execute(check_stmt, {"task_id": task.task_id})
+        previous = result.fetchone()
         
-        if not result.fetchone():
+        if not previous:
             raise ValueError(f"Task {task.task_id} not found")
         
         # Update main task
@@ -195,6 +203,10 @@ async def update_task(repo_instance, task: GenericTask) -> GenericTask:
         """)
         
         await session.execute(update_stmt, task_data)
+        # Soft-deleted subtasks are not counted
+        if previous.deleted_at is None:
+            await adjust_progress(repo_instance, session, previous.parent_task_id,
+                                  completed_delta=completed_delta(previous.status, task_data["status"]))
         
         # Update attributes (delete and recreate for simplicity)
         from .helpers import save_attribute, record_event
@@ -216,6 +228,130 @@ async def update_task(repo_instance, task: GenericTask) -> GenericTask:
         return task
 
 
+async def update_task_row(repo_instance, task: GenericTask,
+                          parent_task_id: Optional[str] = None) -> bool:
+    """Write a task's own row and artifacts in a single-row update.
+    
+    Every mutable column is written from ``task``. Its hierarchy, its
+    relations other than artifacts, and its siblings are left untouched.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        task: The task with its new state
+        parent_task_id: If given, only update the task under this parent
+        
+    Returns:
+        True if the task was updated, False if not found
+    """
+    now = datetime.now()
+    task_data = task.to_dict_for_storage()
+    status = task_data["status"]
+    if status == TaskStatus.COMPLETED.value and task_data["completed_at"] is None:
+        task_data["completed_at"] = now.isoformat()
+    task_data.update(updated_at=now.isoformat(), now=now.isoformat(), expected_parent=parent_task_id)
+    
+    stmt = text("""
+        UPDATE generic_tasks SET
+            title = :title,
+            description = :description,
+            task_type = :task_type,
+            status = :status,
+            lifecycle_stage = :lifecycle_stage,
+            complexity = :complexity,
+            estimated_effort = :estimated_effort,
+            actual_effort = :actual_effort,
+            specialist_type = :specialist_type,
+            assigned_to = :assigned_to,
+            context = :context,
+            configuration = :configuration,
+            results = :results,
+            summary = :summary,
+            quality_gate_level = :quality_gate_level,
+            verification_status = :verification_status,
+            updated_at = :updated_at,
+            started_at = CASE
+                WHEN :started_at IS NOT NULL THEN :started_at
+                WHEN started_at IS NULL AND :status IN ('active', 'in_progress') THEN :now
+                ELSE started_at
+            END,
+            completed_at = :completed_at,
+            due_date = :due_date
+        WHERE task_id = :task_id
+        AND deleted_at IS NULL
+        AND (:expected_parent IS NULL OR parent_task_id = :expected_parent)
+    """)
+    
+    async with repo_instance.get_session() as session:
+        previous = (await session.execute(text("""
+            SELECT status, parent_task_id FROM generic_tasks
+            WHERE task_id = :task_id AND deleted_at IS NULL
+        """), {"task_id": task.task_id})).fetchone()
+        
+        result = await session.execute(stmt, task_data)
+        if result.rowcount == 0:
+            return False
+        
+        # Same transaction as the status change, so the counters never drift
+        await adjust_progress(repo_instance, session, previous.parent_task_id,
+                              completed_delta=completed_delta(previous.status, status))
+        
+        from .helpers import save_artifact, record_event
+        await session.execute(
+            text("DELETE FROM task_artifacts WHERE task_id = :task_id"),
+            {"task_id": task.task_id}
+        )
+        for artifact in task.artifacts:
+            await save_artifact(session, artifact)
+        
+        event_type = EventType.STATUS_CHANGED if previous.status != status else EventType.UPDATED
+        await record_event(
+            session, task.task_id, event_type,
+            EventCategory.LIFECYCLE if event_type is EventType.STATUS_CHANGED else EventCategory.DATA,
+            "system", {"status": status}
+        )
+        
+        logger.info(f"Updated task {task.task_id} ({status})")
+        return True
+
+
+async def archive_task(repo_instance, task_id: str) -> bool:
+    """Move a finished task out of the active set by marking it archived.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        task_id: The task to archive
+        
+    Returns:
+        True if the task was archived, False if not found or already archived
+    """
+    async with repo_instance.get_session() as session:
+        previous = (await session.execute(text("""
+            SELECT status, parent_task_id FROM generic_tasks
+            WHERE task_id = :task_id AND deleted_at IS NULL
+        """), {"task_id": task_id})).fetchone()
+        if previous is None or previous.status == TaskStatus.ARCHIVED.value:
+            return False
+        
+        await session.execute(text("""
+            UPDATE generic_tasks
+            SET status = :status, lifecycle_stage = :status, updated_at = :now
+            WHERE task_id = :task_id
+        """), {"task_id": task_id, "status": TaskStatus.ARCHIVED.value,
+               "now": datetime.now().isoformat()})
+        await adjust_progress(repo_instance, session, previous.parent_task_id,
+                              completed_delta=completed_delta(previous.status, TaskStatus.ARCHIVED.value))
+        
+        from .helpers import record_event
+        await record_event(
+            session, task_id, EventType.ARCHIVED,
+            EventCategory.LIFECYCLE, "system",
+            {"previous_status": previous.status}
+        )
+        
+        logger.info(f"Archived task {task_id}")
+        return True
+
+
 async def delete_task(repo_instance, task_id: str, hard_delete: bool = False) -> bool:
     """Delete a task (soft delete by default).
     
@@ -228,6 +364,11 @@ async def delete_task(repo_instance, task_id: str, hard_delete: bool = False) ->
         True if deleted, False if not found
     """
     async with repo_instance.get_session() as session:
+        previous = (await session.execute(text("""
+            SELECT status, parent_task_id FROM generic_tasks
+            WHERE task_id = :task_id AND deleted_at IS NULL
+        """), {"task_id": task_id})).fetchone()
+        
         if hard_delete:
             # Cascading delete
             stmt = text("DELETE FROM generic_tasks WHERE task_id = :task_id")
@@ -247,6 +388,10 @@ async def delete_task(repo_instance, task_id: str, hard_delete: bool = False) ->
             })
         
         if result.rowcount > 0:
+            if previous is not None:
+                await adjust_progress(repo_instance, session, previous.parent_task_id, -1,
+                                      completed_delta(previous.status, None))
+            
             from .helpers import record_event
             await record_event(
                 session, task_id, EventType.DELETED,
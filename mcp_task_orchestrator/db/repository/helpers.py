@@ -20,7 +20,7 @@ from ...orchestrator.generic_models import (
     EventType, EventCategory
 )
 from .converters import (
-    row_to_task, row_to_attribute, row_to_dependency, 
+    rows_to_tasks, row_to_attribute, row_to_dependency, 
     row_to_artifact, row_to_event
 )
 
@@ -202,12 +202,10 @@ async def load_children(repo_instance, session: AsyncSession, parent_id: str) ->
     """)
     
     result = await session.execute(stmt, {"parent_id": parent_id})
-    children = []
+    children = rows_to_tasks(row._mapping for row in result)
     
-    for row in result:
-        child = row_to_task(row._mapping)
+    for child in children:
         # Load minimal data for children
         child.attributes = await load_attributes(session, child.task_id)
-        children.append(child)
     
     return children
\ No newline at end of file
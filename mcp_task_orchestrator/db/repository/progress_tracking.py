@@ -0,0 +1,199 @@
+"""
+Progress Tracking Module - Per-parent subtask counters
+
+This module maintains the task_progress table:
+- Adjusting total/completed counts inside the transaction that inserts,
+  deletes or changes the status of a subtask
+- Seeding a parent's counters from its children the first time they are needed
+- Reading a parent's progress with a single primary-key lookup
+- Reconciling all counters against the children at startup, or a single
+  parent's counters when it is touched before startup recovery reached it
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from ...orchestrator.generic_models import TaskStatus
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = TaskStatus.COMPLETED.value
+
+CREATE_PROGRESS_TABLE = text("""
+    CREATE TABLE IF NOT EXISTS task_progress (
+        parent_task_id TEXT PRIMARY KEY,
+        total_subtasks INTEGER NOT NULL DEFAULT 0,
+        completed_subtasks INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+""")
+
+# Counts derived from the children themselves
+ACTUAL_COUNTS = """
+    SELECT parent_task_id,
+           COUNT(*) AS total_subtasks,
+           SUM(CASE WHEN status = :completed THEN 1 ELSE 0 END) AS completed_subtasks
+    FROM generic_tasks
+    WHERE parent_task_id IS NOT NULL AND deleted_at IS NULL
+"""
+
+
+async def ensure_progress_table(repo_instance, session: AsyncSession) -> None:
+    """Create the task_progress table once per repository instance."""
+    if getattr(repo_instance, "_progress_table_ready", False):
+        return
+    await session.execute(CREATE_PROGRESS_TABLE)
+    repo_instance._progress_table_ready = True
+
+
+def completed_delta(old_status: Optional[str], new_status: Optional[str]) -> int:
+    """Change in the completed count for a status transition."""
+    return int(new_status == COMPLETED) - int(old_status == COMPLETED)
+
+
+async def _seed_progress(session: AsyncSession, parent_task_id: str) -> None:
+    await session.execute(text("""
+        INSERT OR IGNORE INTO task_progress (
+            parent_task_id, total_subtasks, completed_subtasks, updated_at
+        )
+        SELECT :parent_task_id, COUNT(*),
+               COALESCE(SUM(CASE WHEN status = :completed THEN 1 ELSE 0 END), 0), :now
+        FROM generic_tasks
+        WHERE parent_task_id = :parent_task_id AND deleted_at IS NULL
+    """), {"parent_task_id": parent_task_id, "completed": COMPLETED,
+           "now": datetime.now().isoformat()})
+
+
+async def adjust_progress(repo_instance, session: AsyncSession, parent_task_id: str,
+                          total_delta: int = 0, completed_delta: int = 0) -> None:
+    """Apply a change to a parent's counters within the caller's transaction.
+    
+    Must be called after the subtask row itself was written. A parent without
+    counters yet is seeded from its children, which already include the change.
+    """
+    if not parent_task_id or (total_delta == 0 and completed_delta == 0):
+        return
+    await ensure_progress_table(repo_instance, session)
+    
+    result = await session.execute(text("""
+        UPDATE task_progress SET
+            total_subtasks = total_subtasks + :total_delta,
+            completed_subtasks = completed_subtasks + :completed_delta,
+            updated_at = :now
+        WHERE parent_task_id = :parent_task_id
+    """), {"parent_task_id": parent_task_id, "total_delta": total_delta,
+           "completed_delta": completed_delta, "now": datetime.now().isoformat()})
+    
+    if result.rowcount == 0:
+        await _seed_progress(session, parent_task_id)
+
+
+async def get_progress(repo_instance, parent_task_id: str) -> Dict[str, int]:
+    """Get the total and completed subtask counts of a parent.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        parent_task_id: The parent task
+        
+    Returns:
+        Dict with total_subtasks and completed_subtasks
+    """
+    async with repo_instance.get_session() as session:
+        await ensure_progress_table(repo_instance, session)
+        query = text("""
+            SELECT total_subtasks, completed_subtasks
+            FROM task_progress WHERE parent_task_id = :parent_task_id
+        """)
+        row = (await session.execute(query, {"parent_task_id": parent_task_id})).fetchone()
+        if row is None:
+            await _seed_progress(session, parent_task_id)
+            row = (await session.execute(query, {"parent_task_id": parent_task_id})).fetchone()
+        
+        return {"total_subtasks": row[0], "completed_subtasks": row[1]}
+
+
+async def reconcile_progress(repo_instance) -> int:
+    """Repair counters that drifted from the children they describe.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        
+    Returns:
+        Number of parents whose counters were missing, wrong or orphaned
+    """
+    params = {"completed": COMPLETED, "now": datetime.now().isoformat()}
+    
+    async with repo_instance.get_session() as session:
+        await ensure_progress_table(repo_instance, session)
+        
+        drifted = (await session.execute(text(f"""
+            WITH actual AS ({ACTUAL_COUNTS} GROUP BY parent_task_id)
+            SELECT COUNT(*) FROM actual
+            LEFT JOIN task_progress p ON p.parent_task_id = actual.parent_task_id
+            WHERE p.parent_task_id IS NULL
+               OR p.total_subtasks != actual.total_subtasks
+               OR p.completed_subtasks != actual.completed_subtasks
+        """), params)).scalar_one()
+        
+        orphaned = await session.execute(text(f"""
+            DELETE FROM task_progress
+            WHERE parent_task_id NOT IN (
+                SELECT parent_task_id FROM ({ACTUAL_COUNTS} GROUP BY parent_task_id)
+            )
+        """), params)
+        
+        if drifted:
+            await session.execute(text(f"""
+                INSERT INTO task_progress (
+                    parent_task_id, total_subtasks, completed_subtasks, updated_at
+                )
+                SELECT parent_task_id, total_subtasks, completed_subtasks, :now
+                FROM ({ACTUAL_COUNTS} GROUP BY parent_task_id)
+                WHERE true
+                ON CONFLICT(parent_task_id) DO UPDATE SET
+                    total_subtasks = excluded.total_subtasks,
+                    completed_subtasks = excluded.completed_subtasks,
+                    updated_at = excluded.updated_at
+                WHERE total_subtasks != excluded.total_subtasks
+                   OR completed_subtasks != excluded.completed_subtasks
+            """), params)
+        
+        repaired = drifted + orphaned.rowcount
+        if repaired:
+            logger.warning(f"Reconciled subtask progress counters for {repaired} parent tasks")
+        return repaired
+
+
+async def reconcile_parent_progress(repo_instance, parent_task_id: str) -> bool:
+    """Recompute one parent's counters from its children.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        parent_task_id: The parent task
+        
+    Returns:
+        True if stored counters existed and were wrong
+    """
+    query = text("""
+        SELECT total_subtasks, completed_subtasks
+        FROM task_progress WHERE parent_task_id = :parent_task_id
+    """)
+    params = {"parent_task_id": parent_task_id}
+    
+    async with repo_instance.get_session() as session:
+        await ensure_progress_table(repo_instance, session)
+        before = (await session.execute(query, params)).fetchone()
+        await session.execute(text(
+            "DELETE FROM task_progress WHERE parent_task_id = :parent_task_id"
+        ), params)
+        await _seed_progress(session, parent_task_id)
+        after = (await session.execute(query, params)).fetchone()
+    
+    repaired = before is not None and tuple(before) != tuple(after)
+    if repaired:
+        logger.warning(f"Reconciled subtask progress counters for parent task {parent_task_id}")
+    return repaired
@@ -6,14 +6,46 @@ This module provides advanced query capabilities including:
 - Subtree and ancestor queries
 - Attribute-based searching
 - Efficient pagination and result limiting
+- Keyset-paginated streaming of subtasks in creation order
+- Finding tasks left in progress by a previous server process
+- Finding tasks written since a point in time, for incremental snapshots
 """
 
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Tuple, Union
 
-from sqlalchemy.sql import text
+from sqlalchemy.sql import bindparam, text
 
 from ...orchestrator.generic_models import GenericTask
-from .converters import row_to_task
+from .converters import rows_to_tasks
+
+# Parent statuses whose subtasks count as "in the system" for listings
+ACTIVE_PARENT_STATUSES = ("pending", "in_progress", "active", "planned", "executing")
+
+DEFAULT_PAGE_SIZE = 500
+
+# (created_at, task_id) of the last row on a page
+PageCursor = Tuple[str, str]
+
+# The update trigger stores updated_at as 'YYYY-MM-DD HH:MM:SS' while the
+# application writes ISO timestamps with a 'T' separator; this expression
+# makes both sort as one timeline
+UPDATED_ORDER_KEY = "replace(updated_at, 'T', ' ')"
+
+# (normalized updated_at, task_id) of the last row of a batch
+ChangeCursor = Tuple[str, str]
+
+# Keeps IN lists well below SQLite's bound parameter limit
+MAX_IDS_PER_QUERY = 400
+
+# Indexes used by the keyset queries below, created lazily on older databases
+QUERY_INDEXES = (
+    text("CREATE INDEX IF NOT EXISTS idx_generic_tasks_created_order "
+         "ON generic_tasks(created_at, task_id)"),
+    text("CREATE INDEX IF NOT EXISTS idx_generic_tasks_status_task "
+         "ON generic_tasks(status, task_id)"),
+    text("CREATE INDEX IF NOT EXISTS idx_generic_tasks_updated_order "
+         f"ON generic_tasks({UPDATED_ORDER_KEY}, task_id)"),
+)
 
 
 async def query_tasks(repo_instance, filters: Dict[str, Any], 
@@ -90,12 +122,10 @@ async def query_tasks(repo_instance, filters: Dict[str, Any],
         
         from .helpers import load_attributes
         
-        tasks = []
-        for row in result:
-            task = row_to_task(row._mapping)
+        tasks = rows_to_tasks(row._mapping for row in result)
+        for task in tasks:
             # Load minimal related data
             task.attributes = await load_attributes(session, task.task_id)
-            tasks.append(task)
         
         return tasks
 
@@ -134,11 +164,9 @@ async def search_by_attribute(repo_instance, attribute_name: str,
         
         from .helpers import load_attributes
         
-        tasks = []
-        for row in result:
-            task = row_to_task(row._mapping)
+        tasks = rows_to_tasks(row._mapping for row in result)
+        for task in tasks:
             task.attributes = await load_attributes(session, task.task_id)
-            tasks.append(task)
         
         return tasks
 
@@ -191,16 +219,14 @@ async def get_subtree(repo_instance, task_id: str, max_depth: Optional[int] = No
         query += " ORDER BY hierarchy_level, position_in_parent"
         
         result = await session.execute(text(query), params)
-        tasks = []
+        tasks = rows_to_tasks(row._mapping for row in result)
         
         from .helpers import load_attributes, load_dependencies
         
-        for row in result:
-            task = row_to_task(row._mapping)
+        for task in tasks:
             # Load related data
             task.attributes = await load_attributes(session, task.task_id)
             task.dependencies = await load_dependencies(session, task.task_id)
-            tasks.append(task)
         
         return tasks
 
@@ -229,7 +255,7 @@ async def get_ancestors(repo_instance, task_id: str) -> List[GenericTask]:
             return []
         
         # Parse hierarchy path to get ancestor IDs
-        path_parts = row['hierarchy_path'].strip('/').split('/')
+        path_parts = row.hierarchy_path.strip('/').split('/')
         if len(path_parts) <= 1:
             return []  # No ancestors
         
@@ -237,10 +263,250 @@ async def get_ancestors(repo_instance, task_id: str) -> List[GenericTask]:
         ancestor_ids = path_parts[:-1]
         
         # Load ancestors
+        from .crud_operations import get_task
         ancestors = []
         for ancestor_id in ancestor_ids:
-            task = await repo_instance.get_task(ancestor_id)
+            task = await get_task(repo_instance, ancestor_id)
             if task:
                 ancestors.append(task)
         
-        return ancestors
\ No newline at end of file
+        return ancestors
+
+
+async def ensure_query_indexes(repo_instance, session) -> None:
+    """Create the keyset query indexes once per repository instance."""
+    if getattr(repo_instance, "_query_indexes_ready", False):
+        return
+    for statement in QUERY_INDEXES:
+        await session.execute(statement)
+    repo_instance._query_indexes_ready = True
+
+
+def _as_values(value: Union[None, str, Iterable]) -> Optional[List[str]]:
+    """Normalize a single value or iterable of str/Enum filters to a list of strings."""
+    if value is None:
+        return None
+    if isinstance(value, str) or hasattr(value, "value"):
+        value = [value]
+    return [getattr(v, "value", v) for v in value]
+
+
+async def query_subtask_page(repo_instance,
+                             status: Union[None, str, Iterable] = None,
+                             specialist_type: Union[None, str, Iterable] = None,
+                             parent_statuses: Iterable[str] = ACTIVE_PARENT_STATUSES,
+                             after: Optional[PageCursor] = None,
+                             limit: int = DEFAULT_PAGE_SIZE
+                             ) -> Tuple[List[GenericTask], Optional[PageCursor]]:
+    """Fetch one page of subtasks of active parents, newest first.
+    
+    Pages are addressed by keyset rather than OFFSET: the cursor is the
+    (created_at, task_id) of the last row returned, so every page is a
+    single indexed range scan no matter how deep the caller has paged.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        status: Subtask status or statuses to include (all if None)
+        specialist_type: Specialist type or types to include (all if None)
+        parent_statuses: Parent statuses whose subtasks are listed
+        after: Cursor returned with the previous page, None for the first page
+        limit: Maximum number of subtasks on the page
+        
+    Returns:
+        Tuple of (subtasks, cursor for the next page or None when exhausted)
+    """
+    where_clauses = [
+        "t.parent_task_id IS NOT NULL",
+        "t.deleted_at IS NULL",
+        "p.deleted_at IS NULL",
+        "p.status IN :parent_statuses",
+    ]
+    params: Dict[str, Any] = {"parent_statuses": list(parent_statuses), "limit": limit}
+    expanding = ["parent_statuses"]
+    
+    statuses = _as_values(status)
+    if statuses is not None:
+        where_clauses.append("t.status IN :statuses")
+        params["statuses"] = statuses
+        expanding.append("statuses")
+    specialists = _as_values(specialist_type)
+    if specialists is not None:
+        where_clauses.append("t.specialist_type IN :specialists")
+        params["specialists"] = specialists
+        expanding.append("specialists")
+    if after is not None:
+        where_clauses.append("(t.created_at, t.task_id) < (:after_created, :after_id)")
+        params["after_created"], params["after_id"] = after
+    
+    # Without ANALYZE statistics SQLite prefers the deleted_at index and
+    # sorts the whole table; pin the scan to the keyset index instead
+    query = text(f"""
+        SELECT t.* FROM generic_tasks t INDEXED BY idx_generic_tasks_created_order
+        CROSS JOIN generic_tasks p ON p.task_id = t.parent_task_id
+        WHERE {' AND '.join(where_clauses)}
+        ORDER BY t.created_at DESC, t.task_id DESC
+        LIMIT :limit
+    """).bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    
+    async with repo_instance.get_session() as session:
+        await ensure_query_indexes(repo_instance, session)
+        result = await session.execute(query, params)
+        rows = [row._mapping for row in result]
+    
+    tasks = rows_to_tasks(rows)
+    cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        cursor = (last["created_at"], last["task_id"])
+    return tasks, cursor
+
+
+async def iter_subtasks(repo_instance,
+                        status: Union[None, str, Iterable] = None,
+                        specialist_type: Union[None, str, Iterable] = None,
+                        page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[GenericTask]:
+    """Stream subtasks of active parents, newest first, one page at a time.
+    
+    Only one page is held in memory and no session is kept open between
+    pages, so a slow consumer does not pin a read transaction.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        status: Subtask status or statuses to include (all if None)
+        specialist_type: Specialist type or types to include (all if None)
+        page_size: Number of rows fetched per query
+        
+    Yields:
+        Subtasks ordered by created_at descending
+    """
+    cursor: Optional[PageCursor] = None
+    while True:
+        tasks, cursor = await query_subtask_page(
+            repo_instance, status, specialist_type, after=cursor, limit=page_size
+        )
+        for task in tasks:
+            yield task
+        if cursor is None:
+            return
+
+
+async def query_interrupted_tasks(repo_instance, status: str = "in_progress",
+                                  after: Optional[str] = None,
+                                  limit: int = DEFAULT_PAGE_SIZE) -> List[Dict[str, Any]]:
+    """Find tasks a previous server process left in progress.
+    
+    Only the identifying columns are read, through the (status, task_id)
+    index, so the cost is proportional to the number of interrupted tasks
+    rather than to the size of the table. Batches are keyed by task_id,
+    which does not change while recovery updates the rows it has read.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        status: Status that marks a task as being worked on
+        after: task_id of the last row of the previous batch
+        limit: Maximum number of rows returned
+        
+    Returns:
+        Dicts with task_id and parent_task_id, ordered by task_id
+    """
+    where_clauses = ["status = :status", "deleted_at IS NULL"]
+    params: Dict[str, Any] = {"status": status, "limit": limit}
+    if after is not None:
+        where_clauses.append("task_id > :after")
+        params["after"] = after
+    
+    async with repo_instance.get_session() as session:
+        await ensure_query_indexes(repo_instance, session)
+        result = await session.execute(text(f"""
+            SELECT task_id, parent_task_id
+            FROM generic_tasks INDEXED BY idx_generic_tasks_status_task
+            WHERE {' AND '.join(where_clauses)}
+            ORDER BY task_id
+            LIMIT :limit
+        """), params)
+        return [dict(row._mapping) for row in result]
+
+
+async def count_interrupted_tasks(repo_instance, status: str = "in_progress") -> int:
+    """Count the tasks query_interrupted_tasks would return, using the same index."""
+    async with repo_instance.get_session() as session:
+        await ensure_query_indexes(repo_instance, session)
+        result = await session.execute(text("""
+            SELECT COUNT(*) FROM generic_tasks INDEXED BY idx_generic_tasks_status_task
+            WHERE status = :status AND deleted_at IS NULL
+        """), {"status": status})
+        return result.scalar_one()
+
+
+async def query_changed_tasks(repo_instance, since: str,
+                              after: Optional[ChangeCursor] = None,
+                              limit: int = DEFAULT_PAGE_SIZE
+                              ) -> Tuple[List[Dict[str, Any]], Optional[ChangeCursor]]:
+    """Find tasks written at or after a point in time.
+    
+    Soft-deleted rows are included so callers can see removals. Rows are
+    read through the normalized updated_at index, so the cost follows the
+    number of changed rows rather than the size of the table.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        since: Timestamp as 'YYYY-MM-DD HH:MM:SS'; rows written at or after it are returned
+        after: Cursor returned with the previous batch, None for the first batch
+        limit: Maximum number of rows returned
+        
+    Returns:
+        Tuple of (dicts with task_id, parent_task_id and deleted_at,
+        cursor for the next batch or None when exhausted)
+    """
+    where_clauses = [f"{UPDATED_ORDER_KEY} >= :since"]
+    params: Dict[str, Any] = {"since": since, "limit": limit}
+    if after is not None:
+        # The first clause keeps the scan a range search on the index
+        params["since"] = max(since, after[0])
+        where_clauses.append(f"({UPDATED_ORDER_KEY}, task_id) > (:after_key, :after_id)")
+        params["after_key"], params["after_id"] = after
+    
+    async with repo_instance.get_session() as session:
+        await ensure_query_indexes(repo_instance, session)
+        result = await session.execute(text(f"""
+            SELECT task_id, parent_task_id, deleted_at, {UPDATED_ORDER_KEY} AS updated_key
+            FROM generic_tasks INDEXED BY idx_generic_tasks_updated_order
+            WHERE {' AND '.join(where_clauses)}
+            ORDER BY {UPDATED_ORDER_KEY}, task_id
+            LIMIT :limit
+        """), params)
+        rows = [dict(row._mapping) for row in result]
+    
+    cursor = None
+    if len(rows) == limit:
+        cursor = (rows[-1]["updated_key"], rows[-1]["task_id"])
+    for row in rows:
+        del row["updated_key"]
+    return rows, cursor
+
+
+async def query_task_families(repo_instance, parent_ids: Iterable[str],
+                              include_subtasks: bool = True) -> List[GenericTask]:
+    """Load live top-level tasks, and optionally their live subtasks, by id.
+    
+    Args:
+        repo_instance: Repository instance for accessing session and helper methods
+        parent_ids: task_ids of the top-level tasks
+        include_subtasks: Whether to load the subtasks of each task as well
+        
+    Returns:
+        Tasks in no particular order; subtasks carry their parent_task_id
+    """
+    parent_ids = list(dict.fromkeys(parent_ids))
+    rows = []
+    async with repo_instance.get_session() as session:
+        for start in range(0, len(parent_ids), MAX_IDS_PER_QUERY):
+            ids = parent_ids[start:start + MAX_IDS_PER_QUERY]
+            match = "(task_id IN :ids OR parent_task_id IN :ids)" if include_subtasks else "task_id IN :ids"
+            query = text(f"""
+                SELECT * FROM generic_tasks
+                WHERE {match} AND deleted_at IS NULL
+            """).bindparams(bindparam("ids", expanding=True))
+            result = await session.execute(query, {"ids": ids})
+            rows.extend(row._mapping for row in result)
+    return rows_to_tasks(rows)
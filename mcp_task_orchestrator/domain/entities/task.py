@@ -26,6 +26,11 @@ from ..validation import (
 )
 
 
+# Layout of task rows and snapshots written by this version. Trusted
+# hydration only skips validation for data written with the same layout.
+TASK_STORAGE_SCHEMA_VERSION = 1
+
+
 # ============================================
 # Enumerations
 # ============================================
@@ -629,6 +634,35 @@ class Task(BaseModel):
             data['configuration'] = json.dumps(data['configuration'])
         return data
     
+    @classmethod
+    def from_storage(cls, data: Dict[str, Any],
+                     schema_version: Optional[int] = TASK_STORAGE_SCHEMA_VERSION) -> 'Task':
+        """
+        Hydrate a task from data this system persisted itself.
+        
+        Stored tasks were validated when they were written, so data in the
+        current storage layout is constructed without re-running validators.
+        Values must already be in validated form: enum values as strings,
+        parsed datetimes and dicts. Data from another schema version, or with
+        fields this model does not know, goes through full validation.
+        External input must always use the regular constructor.
+        
+        Args:
+            data: Field values for the task
+            schema_version: Storage layout the data was written with
+        """
+        if schema_version != TASK_STORAGE_SCHEMA_VERSION:
+            return cls(**data)
+        return _construct_trusted(cls, data)
+    
+    @classmethod
+    def bulk_from_storage(cls, records: List[Dict[str, Any]],
+                          schema_version: Optional[int] = TASK_STORAGE_SCHEMA_VERSION) -> List['Task']:
+        """Hydrate many stored tasks; see from_storage."""
+        if schema_version != TASK_STORAGE_SCHEMA_VERSION:
+            return [cls(**data) for data in records]
+        return [_construct_trusted(cls, data) for data in records]
+    
     # Security validators for XSS prevention and input sanitization
     @field_validator('title', 'description')
     @classmethod
@@ -684,6 +718,17 @@ class Task(BaseModel):
 Task.update_forward_refs()
 
 
+def _construct_trusted(cls, data: Dict[str, Any]) -> BaseModel:
+    """
+    Build a model from stored data with model_construct, skipping validators.
+    Data with unknown fields is fully validated instead, since model_construct
+    would silently drop them.
+    """
+    if not cls.model_fields.keys() >= data.keys():
+        return cls(**data)
+    return cls.model_construct(**data)
+
+
 # ============================================
 # Template Models
 # ============================================
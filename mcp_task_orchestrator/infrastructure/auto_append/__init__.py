@@ -6,13 +6,15 @@ security controls, and comprehensive monitoring.
 """
 
 from .event_system import (
-    EventType, TaskEvent, EventListener, EventBus, TaskEventPublisher,
-    get_event_bus, get_event_publisher
+    EventType, TaskEvent, EventListener, EventBus, OverflowPolicy, TaskEventPublisher,
+    get_event_bus, get_event_publisher, enable_event_log
 )
 
+from .event_log import EventLog
+
 from .condition_evaluator import (
     ConditionType, Operator, LogicalOperator,
-    Condition, LogicalExpression, ConditionEvaluator
+    Condition, LogicalExpression, ConditionEvaluator, CompiledPredicate
 )
 
 from .auto_append_engine import (
@@ -30,12 +32,12 @@ from .mcp_tools import get_auto_append_tools
 
 __all__ = [
     # Event System
-    'EventType', 'TaskEvent', 'EventListener', 'EventBus', 'TaskEventPublisher',
-    'get_event_bus', 'get_event_publisher',
+    'EventType', 'TaskEvent', 'EventListener', 'EventBus', 'OverflowPolicy', 'TaskEventPublisher',
+    'get_event_bus', 'get_event_publisher', 'enable_event_log', 'EventLog',
     
     # Condition Evaluator
     'ConditionType', 'Operator', 'LogicalOperator',
-    'Condition', 'LogicalExpression', 'ConditionEvaluator',
+    'Condition', 'LogicalExpression', 'ConditionEvaluator', 'CompiledPredicate',
     
     # Auto-Append Engine
     'AutoAppendRuleStatus', 'TaskCreationMode', 'TaskDefinition',
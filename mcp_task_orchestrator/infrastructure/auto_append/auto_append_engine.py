@@ -8,14 +8,16 @@ evaluator to provide powerful workflow automation.
 
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Set
-from datetime import datetime, timezone
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import uuid
 
 from .event_system import EventListener, TaskEvent, EventType, get_event_bus
-from .condition_evaluator import ConditionEvaluator, LogicalExpression, Condition
+from .condition_evaluator import ConditionEvaluator, LogicalExpression, Condition, CompiledPredicate
+from .rule_index import RuleIndex
 from ..template_system.template_engine import TemplateEngine
 from ..template_system.storage_manager import TemplateStorageManager
 
@@ -134,6 +136,10 @@ class AutoAppendEngine(EventListener):
         
         # Rule storage
         self.rules: Dict[str, AutoAppendRule] = {}
+        self._rule_index = RuleIndex(self.condition_evaluator)
+        
+        # Rule conditions compiled into closures, keyed by rule ID
+        self._compiled_conditions: Dict[str, Tuple[LogicalExpression, CompiledPredicate]] = {}
         
         # Security and performance limits
         self.max_rules = 1000
@@ -149,11 +155,20 @@ class AutoAppendEngine(EventListener):
             "skipped_executions": 0
         }
         
+        # Rule matching performance tracking
+        self.matching_stats: Dict[str, float] = {
+            "events_matched": 0,
+            "candidate_rules_evaluated": 0,
+            "total_match_time_ms": 0.0
+        }
+        self.rule_metrics: Dict[str, Dict[str, float]] = {}
+        
         # Rate limiting
         self._execution_timestamps: List[datetime] = []
         
-        # Register with event bus
-        get_event_bus().subscribe(self)
+        # Register with event bus; the durable name lets the engine resume from
+        # its last acknowledged event when an event log is attached
+        get_event_bus().subscribe(self, durable_name="auto_append_engine")
     
     def get_supported_events(self) -> Set[EventType]:
         """Return all event types that might trigger rules."""
@@ -208,15 +223,27 @@ class AutoAppendEngine(EventListener):
                 self._record_execution(rule, event, success=False, error=str(e))
     
     def _find_matching_rules(self, event: TaskEvent) -> List[AutoAppendRule]:
-        """Find rules that match the given event."""
+        """
+        Find rules that match the given event.
+        
+        Uses the rule index to narrow the search to rules triggered by this
+        event type whose equality discriminators match; only those candidates
+        get a full condition evaluation.
+        """
+        match_started = time.perf_counter()
         matching_rules = []
+        candidate_ids = self._rule_index.candidates(event, self.rules)
         
-        for rule in self.rules.values():
+        for rule_id in candidate_ids:
+            rule = self.rules.get(rule_id)
+            if rule is None:
+                continue
+            
             # Skip inactive rules
             if rule.status != AutoAppendRuleStatus.ACTIVE:
                 continue
             
-            # Check if event type matches
+            # Trigger events may have been edited in place since indexing
             if event.event_type not in rule.trigger_events:
                 continue
             
@@ -230,25 +257,64 @@ class AutoAppendEngine(EventListener):
                 logger.debug(f"Rule {rule.rule_id} is in cooldown period")
                 continue
             
-            # Evaluate conditions
+            # Evaluate compiled conditions
+            evaluation_started = time.perf_counter()
+            matched = False
             try:
-                if self.condition_evaluator.evaluate_expression(rule.condition, event):
+                matched = self._get_compiled_condition(rule)(event, None)
+                if matched:
                     matching_rules.append(rule)
                     logger.debug(f"Rule {rule.rule_id} conditions matched")
                 else:
                     logger.debug(f"Rule {rule.rule_id} conditions not met")
             except Exception as e:
                 logger.error(f"Error evaluating rule {rule.rule_id} conditions: {e}")
+            finally:
+                self._record_rule_evaluation(rule.rule_id, matched, time.perf_counter() - evaluation_started)
+        
+        self.matching_stats["events_matched"] += 1
+        self.matching_stats["candidate_rules_evaluated"] += len(candidate_ids)
+        self.matching_stats["total_match_time_ms"] += (time.perf_counter() - match_started) * 1000
         
         return matching_rules
     
+    def _get_compiled_condition(self, rule: AutoAppendRule) -> CompiledPredicate:
+        """Get the compiled condition for a rule, recompiling if the condition was replaced."""
+        compiled = self._compiled_conditions.get(rule.rule_id)
+        if compiled is None or compiled[0] is not rule.condition:
+            compiled = (rule.condition, self.condition_evaluator.compile_expression(rule.condition))
+            self._compiled_conditions[rule.rule_id] = compiled
+        return compiled[1]
+    
+    def _record_rule_evaluation(self, rule_id: str, matched: bool, elapsed_seconds: float) -> None:
+        """Record per-rule condition evaluation timing."""
+        elapsed_ms = elapsed_seconds * 1000
+        metrics = self.rule_metrics.get(rule_id)
+        if metrics is None:
+            metrics = self.rule_metrics[rule_id] = {
+                "evaluations": 0,
+                "matches": 0,
+                "total_evaluation_time_ms": 0.0,
+                "max_evaluation_time_ms": 0.0
+            }
+        
+        metrics["evaluations"] += 1
+        if matched:
+            metrics["matches"] += 1
+        metrics["total_evaluation_time_ms"] += elapsed_ms
+        if elapsed_ms > metrics["max_evaluation_time_ms"]:
+            metrics["max_evaluation_time_ms"] = elapsed_ms
+    
     def _is_in_cooldown(self, rule: AutoAppendRule) -> bool:
         """Check if rule is in cooldown period."""
         if rule.cooldown_minutes <= 0 or not rule.last_execution:
             return False
         
-        cooldown_end = rule.last_execution.replace(tzinfo=timezone.utc) + \
-                      timezone.utc.localize(datetime.fromtimestamp(rule.cooldown_minutes * 60))
+        last_execution = rule.last_execution
+        if last_execution.tzinfo is None:
+            last_execution = last_execution.replace(tzinfo=timezone.utc)
+        
+        cooldown_end = last_execution + timedelta(minutes=rule.cooldown_minutes)
         
         return datetime.now(timezone.utc) < cooldown_end
     
@@ -379,7 +445,7 @@ class AutoAppendEngine(EventListener):
         now = datetime.now(timezone.utc)
         
         # Clean old timestamps (older than 1 minute)
-        cutoff = now - timezone.utc.localize(datetime.fromtimestamp(60))
+        cutoff = now - timedelta(minutes=1)
         self._execution_timestamps = [ts for ts in self._execution_timestamps if ts > cutoff]
         
         # Check rate limit
@@ -431,12 +497,19 @@ class AutoAppendEngine(EventListener):
             raise ValueError(f"Rule validation failed: {', '.join(validation_errors)}")
         
         self.rules[rule.rule_id] = rule
+        self._compiled_conditions[rule.rule_id] = (
+            rule.condition, self.condition_evaluator.compile_expression(rule.condition)
+        )
+        self._rule_index.invalidate()
         logger.info(f"Added auto-append rule: {rule.name}")
     
     def remove_rule(self, rule_id: str) -> bool:
         """Remove an auto-append rule."""
         if rule_id in self.rules:
             del self.rules[rule_id]
+            self.rule_metrics.pop(rule_id, None)
+            self._compiled_conditions.pop(rule_id, None)
+            self._rule_index.invalidate()
             logger.info(f"Removed auto-append rule: {rule_id}")
             return True
         return False
@@ -461,7 +534,28 @@ class AutoAppendEngine(EventListener):
             "rate_limit_status": {
                 "current_rate": len(self._execution_timestamps),
                 "max_rate": self.max_executions_per_minute
+            },
+            "rule_matching": self._get_matching_statistics()
+        }
+    
+    def _get_matching_statistics(self) -> Dict[str, Any]:
+        """Summarize rule matching cost overall and per rule."""
+        events = self.matching_stats["events_matched"]
+        per_rule = {}
+        for rule_id, metrics in self.rule_metrics.items():
+            evaluations = metrics["evaluations"]
+            per_rule[rule_id] = {
+                **metrics,
+                "average_evaluation_time_ms": metrics["total_evaluation_time_ms"] / evaluations if evaluations else 0.0
             }
+        
+        return {
+            "events_matched": events,
+            "candidate_rules_evaluated": self.matching_stats["candidate_rules_evaluated"],
+            "average_candidates_per_event": self.matching_stats["candidate_rules_evaluated"] / events if events else 0.0,
+            "average_match_time_ms": self.matching_stats["total_match_time_ms"] / events if events else 0.0,
+            "index": self._rule_index.get_statistics(),
+            "per_rule": per_rule
         }
 
 
@@ -7,7 +7,8 @@ Supports complex conditions, boolean logic, and safe evaluation.
 
 import logging
 import re
-from typing import Dict, List, Any, Optional, Union, Set
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional, Union, Set
 from dataclasses import dataclass
 from enum import Enum
 from abc import ABC, abstractmethod
@@ -16,6 +17,11 @@ from .event_system import TaskEvent, EventType
 
 logger = logging.getLogger(__name__)
 
+# Compiled predicate: (event, task_data) -> bool
+CompiledPredicate = Callable[[TaskEvent, Optional[Dict[str, Any]]], bool]
+# Compiled value extractor: (event, task_data) -> value
+CompiledExtractor = Callable[[TaskEvent, Optional[Dict[str, Any]]], Any]
+
 
 class ConditionType(Enum):
     """Types of conditions that can be evaluated."""
@@ -137,8 +143,8 @@ class ConditionEvaluator:
         self.max_regex_length = 1000
         self.evaluation_timeout_seconds = 5.0
         
-        # Compiled regex cache
-        self._regex_cache: Dict[str, re.Pattern] = {}
+        # Compiled regex cache (LRU)
+        self._regex_cache: "OrderedDict[str, re.Pattern]" = OrderedDict()
         self._cache_size_limit = 100
     
     def evaluate_condition(self, condition: Condition, 
@@ -347,23 +353,27 @@ class ConditionEvaluator:
             return False
         
         try:
-            # Use cache to avoid recompiling patterns
-            if pattern not in self._regex_cache:
-                if len(self._regex_cache) >= self._cache_size_limit:
-                    # Clear oldest entries
-                    self._regex_cache.clear()
-                
-                # Compile with timeout protection
-                compiled_pattern = re.compile(pattern, re.IGNORECASE)
-                self._regex_cache[pattern] = compiled_pattern
-            
-            regex = self._regex_cache[pattern]
+            regex = self._get_regex(pattern)
             return bool(regex.search(actual))
             
         except re.error as e:
             logger.warning(f"Invalid regex pattern '{pattern}': {e}")
             return False
     
+    def _get_regex(self, pattern: str) -> re.Pattern:
+        """Get a compiled pattern from the LRU cache, compiling it on a miss."""
+        regex = self._regex_cache.get(pattern)
+        if regex is not None:
+            self._regex_cache.move_to_end(pattern)
+            return regex
+        
+        regex = re.compile(pattern, re.IGNORECASE)
+        self._regex_cache[pattern] = regex
+        if len(self._regex_cache) > self._cache_size_limit:
+            # Evict least recently used pattern
+            self._regex_cache.popitem(last=False)
+        return regex
+    
     def _safe_numeric_compare(self, actual: Any, expected: Any, compare_func) -> bool:
         """Safely perform numeric comparison."""
         try:
@@ -437,4 +447,240 @@ class ConditionEvaluator:
             else:
                 errors.append(f"Invalid item type: {type(item)}")
         
-        return errors
\ No newline at end of file
+        return errors
+    
+    # Compilation
+    
+    def compile_expression(self, expression: LogicalExpression) -> CompiledPredicate:
+        """
+        Compile a logical expression into a nested closure.
+        
+        The closure gives the same verdict as evaluate_expression but resolves
+        field paths, operators, expected values and regexes once, here, instead
+        of on every event. AND/OR short-circuit as in the interpreter.
+        
+        Args:
+            expression: Logical expression to compile
+            
+        Returns:
+            Callable taking (event, task_data) and returning a bool
+        """
+        return self._compile_expression(expression, 0)
+    
+    def compile_condition(self, condition: Condition) -> CompiledPredicate:
+        """Compile a single condition into a closure equivalent to evaluate_condition."""
+        extract = self.compile_value_extractor(condition)
+        compare = self._compile_comparison(condition.operator, condition.value)
+        field = condition.field
+        
+        def evaluate(event: TaskEvent, task_data: Optional[Dict[str, Any]] = None) -> bool:
+            try:
+                return compare(extract(event, task_data))
+            except Exception as e:
+                logger.warning(f"Error evaluating condition {field}: {e}")
+                return False
+        
+        return evaluate
+    
+    def compile_value_extractor(self, condition: Condition) -> CompiledExtractor:
+        """Compile the field lookup of a condition, equivalent to _extract_value."""
+        parts = condition.field.split('.')
+        root_field = parts[0]
+        nested_path = tuple(parts[1:])
+        condition_type = condition.condition_type
+        
+        def navigate(value: Any) -> Any:
+            for part in nested_path:
+                if isinstance(value, dict) and part in value:
+                    value = value[part]
+                else:
+                    return None
+            return value
+        
+        if condition_type == ConditionType.EVENT_TYPE:
+            def extract(event, task_data):
+                return navigate(event.event_type.value)
+        
+        elif condition_type == ConditionType.EVENT_DATA:
+            def extract(event, task_data):
+                return navigate(event.event_data)
+        
+        elif condition_type == ConditionType.TASK_PROPERTY:
+            def extract(event, task_data):
+                if task_data is None:
+                    return None
+                return navigate(task_data)
+        
+        else:
+            def extract(event, task_data):
+                event_data = event.event_data
+                if root_field in event_data:
+                    return navigate(event_data[root_field])
+                if task_data and root_field in task_data:
+                    return navigate(task_data[root_field])
+                return None
+        
+        return extract
+    
+    def _compile_expression(self, expression: LogicalExpression, depth: int) -> CompiledPredicate:
+        """Compile an expression at the given nesting depth."""
+        # Expressions the interpreter would reject always evaluate to False
+        if depth > self.max_evaluation_depth:
+            logger.error(f"Evaluation depth limit exceeded: {depth}")
+            return _always_false
+        
+        if len(expression.conditions) > self.max_conditions_per_rule:
+            logger.error(f"Too many conditions: {len(expression.conditions)}")
+            return _always_false
+        
+        children = tuple(self._compile_item(item, depth + 1) for item in expression.conditions)
+        operator = expression.operator
+        
+        if operator == LogicalOperator.AND:
+            def evaluate(event, task_data=None):
+                try:
+                    for child in children:
+                        if not child(event, task_data):
+                            return False
+                    return True
+                except Exception as e:
+                    logger.error(f"Error evaluating logical expression: {e}")
+                    return False
+        
+        elif operator == LogicalOperator.OR:
+            def evaluate(event, task_data=None):
+                try:
+                    for child in children:
+                        if child(event, task_data):
+                            return True
+                    return False
+                except Exception as e:
+                    logger.error(f"Error evaluating logical expression: {e}")
+                    return False
+        
+        elif operator == LogicalOperator.NOT:
+            if len(children) != 1:
+                logger.error("NOT operator requires exactly one condition")
+                return _always_false
+            only_child = children[0]
+            
+            def evaluate(event, task_data=None):
+                try:
+                    return not only_child(event, task_data)
+                except Exception as e:
+                    logger.error(f"Error evaluating logical expression: {e}")
+                    return False
+        
+        else:
+            logger.error(f"Unknown logical operator: {operator}")
+            return _always_false
+        
+        return evaluate
+    
+    def _compile_item(self, item: Union[Condition, LogicalExpression], depth: int) -> CompiledPredicate:
+        """Compile a single item (condition or expression)."""
+        if isinstance(item, Condition):
+            return self.compile_condition(item)
+        elif isinstance(item, LogicalExpression):
+            return self._compile_expression(item, depth)
+        else:
+            logger.error(f"Unknown item type: {type(item)}")
+            return _always_false
+    
+    def _compile_comparison(self, operator: Operator, expected: Any) -> Callable[[Any], bool]:
+        """Compile an operator and expected value into a one-argument predicate."""
+        if operator == Operator.EQUALS:
+            return lambda actual: actual == expected
+        
+        if operator == Operator.NOT_EQUALS:
+            return lambda actual: actual != expected
+        
+        if operator in (Operator.CONTAINS, Operator.NOT_CONTAINS):
+            expected_str = str(expected)
+            
+            def contains(actual: Any) -> bool:
+                if isinstance(actual, str):
+                    return expected_str in actual
+                elif isinstance(actual, (list, tuple, set)):
+                    return expected in actual
+                elif isinstance(actual, dict):
+                    return expected in actual.values()
+                return False
+            
+            if operator == Operator.CONTAINS:
+                return contains
+            return lambda actual: not contains(actual)
+        
+        if operator == Operator.STARTS_WITH:
+            prefix = str(expected)
+            return lambda actual: isinstance(actual, str) and actual.startswith(prefix)
+        
+        if operator == Operator.ENDS_WITH:
+            suffix = str(expected)
+            return lambda actual: isinstance(actual, str) and actual.endswith(suffix)
+        
+        if operator == Operator.MATCHES_REGEX:
+            try:
+                if len(expected) > self.max_regex_length:
+                    logger.error(f"Regex pattern too long: {len(expected)}")
+                    return _always_false_value
+                search = self._get_regex(expected).search
+            except (re.error, TypeError) as e:
+                logger.warning(f"Invalid regex pattern '{expected}': {e}")
+                return _always_false_value
+            return lambda actual: isinstance(actual, str) and bool(search(actual))
+        
+        if operator in _NUMERIC_COMPARATORS:
+            try:
+                expected_num = float(expected) if expected is not None else 0
+            except (ValueError, TypeError):
+                return _always_false_value
+            compare_func = _NUMERIC_COMPARATORS[operator]
+            
+            def numeric(actual: Any) -> bool:
+                try:
+                    actual_num = float(actual) if actual is not None else 0
+                except (ValueError, TypeError):
+                    return False
+                return compare_func(actual_num, expected_num)
+            
+            return numeric
+        
+        if operator in (Operator.IN_LIST, Operator.NOT_IN_LIST):
+            if not isinstance(expected, list):
+                return _always_false_value
+            
+            members: Any = expected
+            try:
+                members = frozenset(expected)
+            except TypeError:
+                pass  # Unhashable items: fall back to list membership
+            
+            def member(actual: Any) -> bool:
+                try:
+                    return actual in members
+                except TypeError:
+                    return actual in expected
+            
+            if operator == Operator.IN_LIST:
+                return member
+            return lambda actual: not member(actual)
+        
+        logger.error(f"Unknown operator: {operator}")
+        return _always_false_value
+
+
+_NUMERIC_COMPARATORS = {
+    Operator.GREATER_THAN: lambda a, e: a > e,
+    Operator.LESS_THAN: lambda a, e: a < e,
+    Operator.GREATER_EQUAL: lambda a, e: a >= e,
+    Operator.LESS_EQUAL: lambda a, e: a <= e,
+}
+
+
+def _always_false(event: TaskEvent, task_data: Optional[Dict[str, Any]] = None) -> bool:
+    return False
+
+
+def _always_false_value(actual: Any) -> bool:
+    return False
@@ -0,0 +1,345 @@
+"""
+Durable Event Log for the Auto-Append EventBus
+
+Optional SQLite-backed, append-only log of published task events. Events get
+a monotonically increasing sequence number when they are appended and are
+written in batches (group commit) by a background flush, so publishing never
+waits for a per-event disk write.
+
+Each durable subscriber has an acknowledged offset: the sequence of the last
+event it handled. Offsets are committed in the same transaction as the next
+event batch, and after a restart the subscriber is replayed every logged event
+after its offset. A graceful shutdown flushes events and offsets together, so
+nothing is lost or redelivered across a planned reboot; after a crash, events
+handled inside the last flush window may be delivered again.
+
+Old events are removed by retention-based compaction, which never deletes an
+event that a known subscriber has not yet acknowledged.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .event_system import EventType, TaskEvent
+
+logger = logging.getLogger(__name__)
+
+_COMPACT_SEPARATORS = (",", ":")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    sequence INTEGER PRIMARY KEY,
+    event_type TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_task ON events (task_id, sequence);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events (event_type, sequence);
+CREATE INDEX IF NOT EXISTS idx_events_created ON events (created_at);
+CREATE TABLE IF NOT EXISTS subscriber_offsets (
+    subscriber TEXT PRIMARY KEY,
+    sequence INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS log_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+TimeBound = Union[datetime, float, None]
+
+
+class EventLog:
+    """
+    Append-only, batched SQLite event log with per-subscriber offsets.
+
+    Thread-safe: appends and acknowledgements only touch in-memory buffers;
+    flushes run in a worker thread and hold the log lock for the transaction.
+    """
+
+    def __init__(self,
+                 db_path: Union[str, Path],
+                 batch_size: int = 256,
+                 flush_interval: float = 0.5,
+                 retention_seconds: float = 7 * 24 * 3600,
+                 compaction_interval: float = 3600):
+        """
+        Args:
+            db_path: SQLite database file for the log
+            batch_size: Pending events that trigger an immediate flush
+            flush_interval: Maximum seconds an appended event stays unflushed
+            retention_seconds: Age after which acknowledged events may be compacted
+            compaction_interval: Minimum seconds between automatic compactions
+        """
+        self.db_path = Path(db_path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retention_seconds = retention_seconds
+        self.compaction_interval = compaction_interval
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._pending_events: List[Tuple[int, str, str, float, str]] = []
+        self._pending_offsets: Dict[str, int] = {}
+        self._offsets: Dict[str, int] = dict(
+            self._conn.execute("SELECT subscriber, sequence FROM subscriber_offsets").fetchall()
+        )
+        self._last_sequence = self._load_last_sequence()
+
+        self._flush_task: Optional[asyncio.Task] = None
+        self._last_compaction = time.time()
+        self._closed = False
+
+        self.events_appended = 0
+        self.events_flushed = 0
+        self.flushes = 0
+        self.events_compacted = 0
+
+    # Writing
+
+    def append(self, event: TaskEvent) -> int:
+        """Buffer an event for the next batch and return its sequence number."""
+        payload = json.dumps(event.to_dict(), separators=_COMPACT_SEPARATORS, default=str)
+
+        with self._lock:
+            self._last_sequence += 1
+            sequence = self._last_sequence
+            self._pending_events.append(
+                (sequence, event.event_type.value, event.task_id, event.timestamp.timestamp(), payload)
+            )
+            pending = len(self._pending_events)
+            self.events_appended += 1
+
+        self._schedule_flush(immediate=pending >= self.batch_size)
+        return sequence
+
+    def acknowledge(self, subscriber: str, sequence: int) -> None:
+        """Record that a subscriber has handled every event up to ``sequence``."""
+        with self._lock:
+            if sequence <= self._offsets.get(subscriber, 0):
+                return
+            self._offsets[subscriber] = sequence
+            self._pending_offsets[subscriber] = sequence
+
+        self._schedule_flush()
+
+    def flush(self) -> int:
+        """Write buffered events and offsets in one transaction. Returns events written."""
+        with self._lock:
+            if self._closed or (not self._pending_events and not self._pending_offsets):
+                return 0
+
+            events, self._pending_events = self._pending_events, []
+            offsets, self._pending_offsets = self._pending_offsets, {}
+            now = time.time()
+
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO events (sequence, event_type, task_id, created_at, payload) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        events
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO subscriber_offsets (subscriber, sequence, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(subscriber) DO UPDATE SET sequence = excluded.sequence, "
+                        "updated_at = excluded.updated_at",
+                        [(name, sequence, now) for name, sequence in offsets.items()]
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO log_meta (key, value) VALUES ('last_sequence', ?)",
+                        (self._last_sequence,)
+                    )
+            except sqlite3.Error:
+                # Keep the batch so the next flush retries it
+                self._pending_events = events + self._pending_events
+                for name, sequence in offsets.items():
+                    self._pending_offsets.setdefault(name, sequence)
+                raise
+
+            self.events_flushed += len(events)
+            self.flushes += 1
+
+        if self.compaction_interval >= 0 and now - self._last_compaction >= self.compaction_interval:
+            self.compact()
+
+        return len(events)
+
+    async def flush_async(self) -> int:
+        """Flush in a worker thread so the event loop is not blocked."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.flush)
+
+    def compact(self, retention_seconds: Optional[float] = None) -> int:
+        """
+        Delete events older than the retention window.
+
+        Events not yet acknowledged by every known subscriber are kept.
+        Returns the number of deleted events.
+        """
+        retention = self.retention_seconds if retention_seconds is None else retention_seconds
+        cutoff = time.time() - retention
+
+        with self._lock:
+            if self._closed:
+                return 0
+
+            acknowledged = min(self._offsets.values()) if self._offsets else self._last_sequence
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM events WHERE created_at < ? AND sequence <= ?",
+                    (cutoff, acknowledged)
+                )
+            deleted = cursor.rowcount
+            self._last_compaction = time.time()
+            self.events_compacted += deleted
+
+        if deleted:
+            logger.info(f"Compacted {deleted} events from event log {self.db_path}")
+        return deleted
+
+    def close(self) -> None:
+        """Flush pending writes and close the database."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._conn.close()
+
+    # Reading
+
+    def get_offset(self, subscriber: str) -> int:
+        """Last acknowledged sequence for a subscriber (0 if it never acknowledged)."""
+        with self._lock:
+            return self._offsets.get(subscriber, 0)
+
+    def read_after(self, sequence: int, limit: Optional[int] = None) -> List[TaskEvent]:
+        """Events with a sequence greater than ``sequence``, in log order."""
+        self.flush()
+        query = "SELECT sequence, payload FROM events WHERE sequence > ? ORDER BY sequence"
+        params: List[Any] = [sequence]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._fetch(query, params)
+
+    def query(self,
+              task_id: Optional[str] = None,
+              event_type: Optional[EventType] = None,
+              since: TimeBound = None,
+              until: TimeBound = None,
+              limit: int = 100) -> List[TaskEvent]:
+        """
+        Most recent logged events (up to limit) matching all given filters,
+        oldest first. Task, type and time filters are answered from indexes.
+        """
+        self.flush()
+
+        clauses, params = [], []
+        if task_id is not None:
+            clauses.append("task_id = ?")
+            params.append(task_id)
+        if event_type is not None:
+            clauses.append("event_type = ?")
+            params.append(event_type.value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(self._to_epoch(since))
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(self._to_epoch(until))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        events = self._fetch(
+            f"SELECT sequence, payload FROM events {where} ORDER BY sequence DESC LIMIT ?", params
+        )
+        events.reverse()
+        return events
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Describe log size, throughput and subscriber lag."""
+        with self._lock:
+            stored = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] if not self._closed else 0
+            return {
+                "db_path": str(self.db_path),
+                "last_sequence": self._last_sequence,
+                "stored_events": stored,
+                "pending_events": len(self._pending_events),
+                "events_appended": self.events_appended,
+                "events_flushed": self.events_flushed,
+                "flushes": self.flushes,
+                "events_compacted": self.events_compacted,
+                "subscribers": {
+                    name: {"offset": offset, "lag": self._last_sequence - offset}
+                    for name, offset in self._offsets.items()
+                }
+            }
+
+    # Internals
+
+    def _load_last_sequence(self) -> int:
+        stored_max = self._conn.execute("SELECT MAX(sequence) FROM events").fetchone()[0] or 0
+        meta = self._conn.execute("SELECT value FROM log_meta WHERE key = 'last_sequence'").fetchone()
+        # Compaction may have removed the newest events; the meta row keeps numbering monotonic
+        return max(stored_max, meta[0] if meta else 0, *self._offsets.values(), 0)
+
+    def _fetch(self, query: str, params: List[Any]) -> List[TaskEvent]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        events = []
+        for sequence, payload in rows:
+            try:
+                event = TaskEvent.from_dict(json.loads(payload))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable event {sequence} in event log: {e}")
+                continue
+            event.sequence = sequence
+            events.append(event)
+        return events
+
+    def _schedule_flush(self, immediate: bool = False) -> None:
+        """Arrange a background flush; without a running loop, flush full batches inline."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if immediate:
+                self.flush()
+            return
+
+        if self._flush_task is not None and not self._flush_task.done():
+            if not immediate:
+                return
+            self._flush_task.cancel()
+        self._flush_task = loop.create_task(self._flush_later(0 if immediate else self.flush_interval))
+
+    async def _flush_later(self, delay: float) -> None:
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.flush_async()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Event log flush failed: {e}")
+
+    @staticmethod
+    def _to_epoch(value: Union[datetime, float]) -> float:
+        return value.timestamp() if isinstance(value, datetime) else float(value)
@@ -8,12 +8,18 @@ automatic task generation.
 
 import logging
 import asyncio
-from typing import Dict, List, Any, Optional, Callable, Set
+import itertools
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Any, Optional, Callable, Set, Tuple, Union, TYPE_CHECKING
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    from .event_log import EventLog
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +46,8 @@ class TaskEvent:
     event_data: Dict[str, Any] = field(default_factory=dict)
     source: str = "task_orchestrator"
     correlation_id: Optional[str] = None
+    # Position in the durable event log, assigned when the event is published
+    sequence: Optional[int] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary for serialization."""
@@ -51,6 +59,25 @@ class TaskEvent:
             "source": self.source,
             "correlation_id": self.correlation_id
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TaskEvent':
+        """Create an event from its dictionary representation."""
+        return cls(
+            event_type=EventType(data["event_type"]),
+            task_id=data["task_id"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            event_data=data.get("event_data") or {},
+            source=data.get("source", "task_orchestrator"),
+            correlation_id=data.get("correlation_id")
+        )
+
+
+class OverflowPolicy(Enum):
+    """What a listener queue does when it is full."""
+    BLOCK = "block"  # Publisher waits for space (backpressure)
+    DROP_OLDEST = "drop_oldest"  # Oldest pending event is discarded
+    COALESCE = "coalesce"  # Newer event replaces a pending one for the same task and type
 
 
 class EventListener(ABC):
@@ -65,6 +92,239 @@ class EventListener(ABC):
     def get_supported_events(self) -> Set[EventType]:
         """Return set of event types this listener handles."""
         pass
+    
+    async def handle_events(self, events: List[TaskEvent]) -> None:
+        """
+        Handle a batch of events.
+        
+        Only called for listeners subscribed with batch_size > 1. The default
+        implementation handles the events one by one; override it to process
+        a batch more efficiently.
+        """
+        for event in events:
+            await self.handle_event(event)
+
+
+class _ListenerChannel:
+    """
+    Bounded delivery queue and worker pool for a single listener.
+    
+    A slow listener only fills its own queue; other listeners keep receiving
+    events at their own pace.
+    """
+    
+    def __init__(self,
+                 listener: EventListener,
+                 max_queue_size: int,
+                 worker_count: int,
+                 overflow_policy: OverflowPolicy,
+                 batch_size: int,
+                 acknowledge: Optional[Callable[[int], None]] = None,
+                 on_failure: Optional[Callable[[], None]] = None):
+        self.listener = listener
+        self.max_queue_size = max(1, max_queue_size)
+        self.worker_count = max(1, worker_count)
+        self.overflow_policy = overflow_policy
+        self.batch_size = max(1, batch_size)
+        # Called with the highest delivered log sequence (durable subscribers only)
+        self.acknowledge = acknowledge
+        # Called when a logged event fails, so the bus replays it (durable subscribers only)
+        self.on_failure = on_failure
+        self._acked_sequence = 0
+        self._delivered_sequence = 0
+        self._enqueued_sequences: Set[int] = set()
+        # Logged events whose delivery failed; acknowledgements stay below them
+        self._failed_sequences: Set[int] = set()
+        
+        # Each slot is a one-element list so a coalesced event can replace it in place
+        self._pending: Deque[List[TaskEvent]] = deque()
+        self._slots_by_key: Dict[Tuple[str, EventType], List[TaskEvent]] = {}
+        self._in_flight = 0
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+    
+    @property
+    def name(self) -> str:
+        return self.listener.__class__.__name__
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    @property
+    def busy(self) -> bool:
+        return self._in_flight > 0
+    
+    async def put(self, event: TaskEvent) -> None:
+        """Enqueue an event according to the overflow policy."""
+        condition = self._ensure_running()
+        
+        async with condition:
+            if event.sequence is not None and self.acknowledge is not None:
+                # Durable subscribers never see a logged event twice (e.g. replay racing publish)
+                if event.sequence <= self._acked_sequence or event.sequence in self._enqueued_sequences:
+                    return
+                self._enqueued_sequences.add(event.sequence)
+            
+            key = (event.task_id, event.event_type)
+            if self.overflow_policy == OverflowPolicy.COALESCE:
+                slot = self._slots_by_key.get(key)
+                if slot is not None:
+                    slot[0] = event
+                    self.coalesced += 1
+                    return
+            
+            while len(self._pending) >= self.max_queue_size:
+                if self.overflow_policy == OverflowPolicy.BLOCK:
+                    await condition.wait()
+                else:
+                    self._forget(self._pending.popleft())
+                    self.dropped += 1
+            
+            slot = [event]
+            self._pending.append(slot)
+            if self.overflow_policy == OverflowPolicy.COALESCE:
+                self._slots_by_key[key] = slot
+            condition.notify_all()
+    
+    async def join(self) -> None:
+        """Wait until every queued event has been delivered."""
+        condition = self._ensure_running()
+        async with condition:
+            while self._pending or self._in_flight:
+                await condition.wait()
+    
+    async def stop(self) -> None:
+        """Stop the worker pool; undelivered events stay queued."""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        if workers and self._loop is asyncio.get_running_loop():
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "queue_size": len(self._pending),
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "workers": self.worker_count,
+            "overflow_policy": self.overflow_policy.value,
+            "batch_size": self.batch_size,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced
+        }
+    
+    def _ensure_running(self) -> asyncio.Condition:
+        """Bind to the running loop and make sure the worker pool is alive."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the previous loop is gone: rebind, keep pending events
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._workers = []
+            self._in_flight = 0
+        
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(loop.create_task(self._work()))
+        
+        return self._condition
+    
+    def _acknowledge(self, batch: List[TaskEvent]) -> None:
+        if self.acknowledge is None:
+            return
+        sequences = [event.sequence for event in batch if event.sequence is not None]
+        if not sequences:
+            return
+        
+        # The offset covers everything below it, so stop short of older events
+        # still queued or waiting to be replayed after a failure
+        self._delivered_sequence = max(self._delivered_sequence, max(sequences))
+        sequence = self._delivered_sequence
+        queued = [slot[0].sequence for slot in self._pending if slot[0].sequence is not None]
+        if queued and min(queued) < sequence:
+            sequence = min(queued) - 1
+        if self._failed_sequences and min(self._failed_sequences) <= sequence:
+            sequence = min(self._failed_sequences) - 1
+        if sequence <= self._acked_sequence:
+            return
+        
+        try:
+            self.acknowledge(sequence)
+        except Exception as e:
+            logger.error(f"Failed to acknowledge events for listener {self.name}: {e}")
+            return
+        self._acked_sequence = sequence
+        self._enqueued_sequences = {s for s in self._enqueued_sequences if s > sequence}
+    
+    def _record_failure(self, batch: List[TaskEvent]) -> None:
+        """Hold acknowledgements below failed logged events and let them be replayed."""
+        if self.acknowledge is None:
+            return
+        sequences = {event.sequence for event in batch if event.sequence is not None}
+        if not sequences:
+            return
+        self._failed_sequences |= sequences
+        self._enqueued_sequences -= sequences
+        if self.on_failure is not None:
+            self.on_failure()
+    
+    def _forget(self, slot: List[TaskEvent]) -> None:
+        if self.overflow_policy == OverflowPolicy.COALESCE:
+            key = (slot[0].task_id, slot[0].event_type)
+            if self._slots_by_key.get(key) is slot:
+                del self._slots_by_key[key]
+    
+    async def _take_batch(self) -> List[TaskEvent]:
+        condition = self._condition
+        async with condition:
+            while not self._pending:
+                await condition.wait()
+            
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                slot = self._pending.popleft()
+                self._forget(slot)
+                batch.append(slot[0])
+            
+            self._in_flight += len(batch)
+            condition.notify_all()
+            return batch
+    
+    async def _work(self) -> None:
+        """Worker loop: deliver batches until cancelled."""
+        while True:
+            batch = await self._take_batch()
+            succeeded = False
+            try:
+                if self.batch_size > 1:
+                    await self.listener.handle_events(batch)
+                else:
+                    await self.listener.handle_event(batch[0])
+                succeeded = True
+                self._failed_sequences.difference_update(event.sequence for event in batch)
+                self._acknowledge(batch)
+            except Exception as e:
+                logger.error(f"Listener {self.name} failed to handle {len(batch)} event(s) "
+                             f"({batch[0].event_type.value}): {e}")
+                self._record_failure(batch)
+            finally:
+                condition = self._condition
+                async with condition:
+                    self._in_flight -= len(batch)
+                    if succeeded:
+                        self.delivered += len(batch)
+                    else:
+                        self.failed += len(batch)
+                    condition.notify_all()
 
 
 class EventBus:
@@ -72,22 +332,59 @@ class EventBus:
     Event bus for publishing and subscribing to task events.
     
     Provides centralized event distribution with support for:
-    - Async event handling
-    - Multiple listeners per event type
-    - Event filtering and routing
-    - Error handling and recovery
+    - Async event handling with a bounded queue and worker pool per listener
+    - Backpressure via per-listener overflow policies (block, drop oldest, coalesce)
+    - Optional batch delivery for listeners that opt in
+    - Ring-buffer event history indexed by task ID and event type
+    - Optional durable event log with replay for named subscribers
     """
     
-    def __init__(self):
+    def __init__(self,
+                 max_history_size: int = 1000,
+                 default_queue_size: int = 1000,
+                 default_workers: int = 1,
+                 default_overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+                 event_log: Optional["EventLog"] = None):
         self._listeners: Dict[EventType, List[EventListener]] = {}
-        self._event_history: List[TaskEvent] = []
-        self._max_history_size = 1000
-        self._processing_events = False
-        self._event_queue: asyncio.Queue = asyncio.Queue()
-        self._background_task: Optional[asyncio.Task] = None
+        self._channels: Dict[int, _ListenerChannel] = {}
+        self._durable_names: Dict[int, str] = {}
+        # Durable subscribers with logged events to replay (not resumed yet, or a delivery failed)
+        self._unresumed: Set[int] = set()
+        self.event_log = event_log
+        
+        self.default_queue_size = default_queue_size
+        self.default_workers = default_workers
+        self.default_overflow_policy = default_overflow_policy
         
-    def subscribe(self, listener: EventListener) -> None:
-        """Subscribe an event listener to relevant events."""
+        # Ring history with secondary indexes; evicted events leave every index
+        self._max_history_size = max_history_size
+        self._event_history: Deque[TaskEvent] = deque()
+        self._history_by_task: Dict[str, Deque[TaskEvent]] = {}
+        self._history_by_type: Dict[EventType, Deque[TaskEvent]] = {}
+        self._total_published = 0
+        
+    def subscribe(self,
+                  listener: EventListener,
+                  max_queue_size: Optional[int] = None,
+                  workers: Optional[int] = None,
+                  overflow_policy: Optional[OverflowPolicy] = None,
+                  batch_size: int = 1,
+                  durable_name: Optional[str] = None) -> None:
+        """
+        Subscribe an event listener to relevant events.
+        
+        Args:
+            listener: Listener to subscribe
+            max_queue_size: Pending events allowed for this listener
+            workers: Concurrent deliveries to this listener (1 keeps event order)
+            overflow_policy: What to do when the listener's queue is full
+            batch_size: Deliver up to this many events per handle_events() call
+            durable_name: Stable name under which the listener's progress is
+                recorded in the event log; such listeners use a single worker
+                and the BLOCK policy so acknowledgements follow log order and
+                never pass an event that was not handled. An event the
+                listener fails on is replayed on the next publish or resume
+        """
         supported_events = listener.get_supported_events()
         
         for event_type in supported_events:
@@ -97,6 +394,21 @@ class EventBus:
             if listener not in self._listeners[event_type]:
                 self._listeners[event_type].append(listener)
                 logger.debug(f"Subscribed listener {listener.__class__.__name__} to {event_type.value}")
+        
+        if id(listener) not in self._channels:
+            if durable_name is not None:
+                self._durable_names[id(listener)] = durable_name
+                self._unresumed.add(id(listener))
+            self._channels[id(listener)] = _ListenerChannel(
+                listener,
+                max_queue_size=max_queue_size or self.default_queue_size,
+                worker_count=1 if durable_name else (workers or self.default_workers),
+                overflow_policy=(OverflowPolicy.BLOCK if durable_name
+                                 else overflow_policy or self.default_overflow_policy),
+                batch_size=batch_size,
+                acknowledge=self._make_acknowledger(durable_name) if durable_name else None,
+                on_failure=self._make_retrier(listener) if durable_name else None
+            )
     
     def unsubscribe(self, listener: EventListener) -> None:
         """Unsubscribe an event listener from all events."""
@@ -104,94 +416,179 @@ class EventBus:
             if listener in self._listeners[event_type]:
                 self._listeners[event_type].remove(listener)
                 logger.debug(f"Unsubscribed listener {listener.__class__.__name__} from {event_type.value}")
+        
+        self._durable_names.pop(id(listener), None)
+        self._unresumed.discard(id(listener))
+        channel = self._channels.pop(id(listener), None)
+        if channel is not None:
+            for worker in channel._workers:
+                worker.cancel()
     
     async def publish(self, event: TaskEvent) -> None:
-        """Publish an event to all relevant listeners."""
-        # Add to history
-        self._event_history.append(event)
-        if len(self._event_history) > self._max_history_size:
-            self._event_history.pop(0)
+        """
+        Publish an event to all relevant listeners.
         
-        # Queue event for processing
-        await self._event_queue.put(event)
+        Returns once the event is queued for every listener. With the BLOCK
+        policy this waits while a listener's queue is full. With an event log
+        attached the event is appended (and given a sequence number) first;
+        the disk write happens later in a batch. Durable subscribers that have
+        not been resumed get their logged backlog first, so it is never
+        skipped or acknowledged past.
+        """
+        if self._unresumed and self.event_log is not None:
+            await self.resume_durable_subscribers(only_pending=True)
         
-        # Start background processing if not already running
-        if not self._background_task or self._background_task.done():
-            self._background_task = asyncio.create_task(self._process_events())
-    
-    async def _process_events(self) -> None:
-        """Background task to process events from the queue."""
-        self._processing_events = True
+        if self.event_log is not None and event.sequence is None:
+            event.sequence = self.event_log.append(event)
         
-        try:
-            while not self._event_queue.empty():
-                try:
-                    event = await asyncio.wait_for(self._event_queue.get(), timeout=1.0)
-                    await self._handle_event(event)
-                    self._event_queue.task_done()
-                except asyncio.TimeoutError:
-                    break
-                except Exception as e:
-                    logger.error(f"Error processing event: {e}")
-        finally:
-            self._processing_events = False
-    
-    async def _handle_event(self, event: TaskEvent) -> None:
-        """Handle a single event by notifying all relevant listeners."""
-        listeners = self._listeners.get(event.event_type, [])
+        self._record_history(event)
         
+        listeners = self._listeners.get(event.event_type, [])
         if not listeners:
             logger.debug(f"No listeners for event type {event.event_type.value}")
             return
         
-        logger.info(f"Processing event {event.event_type.value} for task {event.task_id}")
-        
-        # Handle events concurrently
-        tasks = []
         for listener in listeners:
-            task = asyncio.create_task(self._safe_handle_listener(listener, event))
-            tasks.append(task)
+            channel = self._channels.get(id(listener))
+            if channel is not None:
+                await channel.put(event)
+    
+    async def join(self) -> None:
+        """Wait until all queued events have been delivered."""
+        for channel in list(self._channels.values()):
+            await channel.join()
+    
+    async def shutdown(self) -> None:
+        """Stop all listener workers and flush the event log."""
+        for channel in list(self._channels.values()):
+            await channel.stop()
+        await self.flush_event_log()
+    
+    def attach_event_log(self, event_log: "EventLog") -> None:
+        """Persist published events and durable subscriber offsets to ``event_log``."""
+        self.event_log = event_log
+    
+    async def flush_event_log(self) -> None:
+        """Write buffered log entries and acknowledgements to disk now."""
+        if self.event_log is not None:
+            await self.event_log.flush_async()
+    
+    async def resume_durable_subscribers(self, only_pending: bool = False) -> Dict[str, int]:
+        """
+        Replay logged events each durable subscriber has not acknowledged yet.
+        
+        Call at startup (e.g. after a reboot); publish() also resumes any
+        subscriber that was not resumed yet before delivering a new event.
+        Returns the number of replayed events per subscriber.
         
-        if tasks:
-            await asyncio.gather(*tasks, return_exceptions=True)
+        Args:
+            only_pending: Skip subscribers whose backlog was already replayed
+        """
+        replayed: Dict[str, int] = {}
+        if self.event_log is None:
+            return replayed
+        
+        loop = asyncio.get_running_loop()
+        for listener_id, name in list(self._durable_names.items()):
+            if only_pending and listener_id not in self._unresumed:
+                continue
+            self._unresumed.discard(listener_id)
+            channel = self._channels.get(listener_id)
+            if channel is None:
+                continue
+            
+            supported = channel.listener.get_supported_events()
+            pending = await loop.run_in_executor(
+                None, self.event_log.read_after, self.event_log.get_offset(name)
+            )
+            count = 0
+            for event in pending:
+                if event.event_type in supported:
+                    await channel.put(event)
+                    count += 1
+            replayed[name] = count
+            if count:
+                logger.info(f"Replaying {count} logged events to durable subscriber {name}")
+        
+        return replayed
     
-    async def _safe_handle_listener(self, listener: EventListener, event: TaskEvent) -> None:
-        """Safely handle event for a single listener with error recovery."""
-        try:
-            await listener.handle_event(event)
-            logger.debug(f"Listener {listener.__class__.__name__} handled event {event.event_type.value}")
-        except Exception as e:
-            logger.error(f"Listener {listener.__class__.__name__} failed to handle event "
-                        f"{event.event_type.value}: {e}")
+    def _make_retrier(self, listener: EventListener) -> Callable[[], None]:
+        def retry() -> None:
+            if id(listener) in self._durable_names:
+                self._unresumed.add(id(listener))
+        return retry
+    
+    def _make_acknowledger(self, name: str) -> Callable[[int], None]:
+        def acknowledge(sequence: int) -> None:
+            if self.event_log is not None:
+                self.event_log.acknowledge(name, sequence)
+        return acknowledge
+    
+    def _record_history(self, event: TaskEvent) -> None:
+        """Append to the ring history, evicting the oldest event from every index."""
+        if self._max_history_size <= 0:
+            return
+        
+        if len(self._event_history) >= self._max_history_size:
+            oldest = self._event_history.popleft()
+            
+            task_events = self._history_by_task.get(oldest.task_id)
+            if task_events:
+                task_events.popleft()
+                if not task_events:
+                    del self._history_by_task[oldest.task_id]
+            
+            type_events = self._history_by_type.get(oldest.event_type)
+            if type_events:
+                type_events.popleft()
+        
+        self._event_history.append(event)
+        self._history_by_task.setdefault(event.task_id, deque()).append(event)
+        self._history_by_type.setdefault(event.event_type, deque()).append(event)
+        self._total_published += 1
     
     def get_event_history(self, 
                          event_type: Optional[EventType] = None,
                          task_id: Optional[str] = None,
                          limit: int = 100) -> List[TaskEvent]:
-        """Get event history with optional filtering."""
-        events = self._event_history[-limit:]
-        
-        if event_type:
-            events = [e for e in events if e.event_type == event_type]
+        """Get the most recent events (up to limit), optionally filtered by type and/or task."""
+        if task_id is not None:
+            candidates = self._history_by_task.get(task_id, ())
+            if event_type is not None:
+                candidates = [e for e in candidates if e.event_type == event_type]
+        elif event_type is not None:
+            candidates = self._history_by_type.get(event_type, ())
+        else:
+            candidates = self._event_history
         
-        if task_id:
-            events = [e for e in events if e.task_id == task_id]
+        if limit <= 0:
+            return []
         
-        return events
+        # Walk backwards so only the requested tail is copied
+        recent = list(itertools.islice(reversed(candidates), limit))
+        recent.reverse()
+        return recent
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get event bus statistics."""
-        event_counts = {}
-        for event in self._event_history:
-            event_type = event.event_type.value
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        event_counts = {
+            event_type.value: len(events)
+            for event_type, events in self._history_by_type.items()
+            if events
+        }
         
         return {
             "total_events": len(self._event_history),
+            "total_published": self._total_published,
             "event_counts": event_counts,
             "active_listeners": sum(len(listeners) for listeners in self._listeners.values()),
-            "processing_events": self._processing_events,
-            "queue_size": self._event_queue.qsize()
+            "processing_events": any(channel.busy for channel in self._channels.values()),
+            "queue_size": sum(len(channel) for channel in self._channels.values()),
+            "event_log": self.event_log.get_statistics() if self.event_log is not None else None,
+            "listeners": {
+                f"{channel.name}#{index}": channel.get_statistics()
+                for index, channel in enumerate(self._channels.values())
+            }
         }
 
 
@@ -291,6 +688,20 @@ def get_event_bus() -> EventBus:
     return _global_event_bus
 
 
+def enable_event_log(db_path: Union[str, Path], **log_options: Any) -> "EventLog":
+    """
+    Attach a durable SQLite event log to the global event bus.
+    
+    Returns the existing log if one is already attached.
+    """
+    from .event_log import EventLog
+    
+    bus = get_event_bus()
+    if bus.event_log is None:
+        bus.attach_event_log(EventLog(db_path, **log_options))
+    return bus.event_log
+
+
 def get_event_publisher() -> TaskEventPublisher:
     """Get a task event publisher using the global event bus."""
     return TaskEventPublisher(get_event_bus())
\ No newline at end of file
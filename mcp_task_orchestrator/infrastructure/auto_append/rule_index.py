@@ -0,0 +1,172 @@
+"""
+Rule Index for the Auto-Append Engine
+
+Indexes auto-append rules by trigger event type and discriminates them on
+cheap equality predicates (e.g. ``task_type == "bug"``) so that each event
+only has to fully evaluate the rules that can possibly match.
+
+The index is a pure prefilter: a rule is placed in a hash bucket only for an
+equality predicate that is *required* for the rule to match (a direct child
+of a top-level AND chain). Candidates returned by the index are still fully
+evaluated by the ConditionEvaluator, so verdicts are unchanged.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from .condition_evaluator import (
+    CompiledExtractor, Condition, ConditionEvaluator, LogicalExpression, LogicalOperator, Operator
+)
+from .event_system import EventType, TaskEvent
+
+if TYPE_CHECKING:
+    from .auto_append_engine import AutoAppendRule
+
+logger = logging.getLogger(__name__)
+
+# (condition type, field) - identifies how a value is extracted from an event
+DiscriminatorKey = Tuple[str, str]
+
+
+@dataclass
+class _Discriminator:
+    """Hash buckets for one extraction key within one event type."""
+    extract: CompiledExtractor
+    buckets: Dict[Hashable, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class _EventTypeIndex:
+    """Rules triggered by one event type."""
+    discriminators: Dict[DiscriminatorKey, _Discriminator] = field(default_factory=dict)
+    unindexed: List[str] = field(default_factory=list)
+
+
+class RuleIndex:
+    """
+    Event-type and equality-predicate index over auto-append rules.
+
+    The index is rebuilt lazily after rules are added or removed.
+    """
+
+    def __init__(self, condition_evaluator: ConditionEvaluator):
+        self.condition_evaluator = condition_evaluator
+        self._by_event_type: Dict[EventType, _EventTypeIndex] = {}
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        """Mark the index stale; it is rebuilt on the next lookup."""
+        self._dirty = True
+
+    def rebuild(self, rules: Iterable["AutoAppendRule"]) -> None:
+        """Rebuild the index from scratch."""
+        by_event_type: Dict[EventType, _EventTypeIndex] = {}
+
+        for rule in rules:
+            discriminator = self._select_discriminator(rule.condition)
+
+            for event_type in rule.trigger_events:
+                event_index = by_event_type.setdefault(event_type, _EventTypeIndex())
+
+                if discriminator is None:
+                    event_index.unindexed.append(rule.rule_id)
+                    continue
+
+                probe, values = discriminator
+                key = (probe.condition_type.value, probe.field)
+                bucket_set = event_index.discriminators.get(key)
+                if bucket_set is None:
+                    bucket_set = event_index.discriminators[key] = _Discriminator(
+                        extract=self.condition_evaluator.compile_value_extractor(probe)
+                    )
+                for value in values:
+                    bucket_set.buckets.setdefault(value, []).append(rule.rule_id)
+
+        self._by_event_type = by_event_type
+        self._dirty = False
+
+    def candidates(self, event: TaskEvent, rules: Dict[str, "AutoAppendRule"]) -> List[str]:
+        """Return IDs of rules that may match the event (order is not significant)."""
+        if self._dirty:
+            self.rebuild(rules.values())
+
+        event_index = self._by_event_type.get(event.event_type)
+        if event_index is None:
+            return []
+
+        candidate_ids = list(event_index.unindexed)
+        for discriminator in event_index.discriminators.values():
+            actual = discriminator.extract(event, None)
+            try:
+                candidate_ids.extend(discriminator.buckets.get(actual, ()))
+            except TypeError:
+                # Unhashable event value can never equal a hashable expected value
+                continue
+
+        # A rule listed under several IN_LIST values may appear twice
+        return list(dict.fromkeys(candidate_ids))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Describe index shape for monitoring."""
+        if self._dirty:
+            return {"built": False}
+
+        return {
+            "built": True,
+            "event_types": {
+                event_type.value: {
+                    "indexed_rules": sum(
+                        len(ids) for d in index.discriminators.values() for ids in d.buckets.values()
+                    ),
+                    "unindexed_rules": len(index.unindexed),
+                    "discriminators": [f"{t}:{f}" for t, f in index.discriminators.keys()]
+                }
+                for event_type, index in self._by_event_type.items()
+            }
+        }
+
+    def _select_discriminator(
+        self, expression: LogicalExpression
+    ) -> Optional[Tuple[Condition, List[Hashable]]]:
+        """Pick a required equality predicate of the rule to bucket it under."""
+        for condition in self._required_conditions(expression):
+            if condition.operator == Operator.EQUALS and self._is_hashable(condition.value):
+                return condition, [condition.value]
+
+            if (condition.operator == Operator.IN_LIST
+                    and isinstance(condition.value, list)
+                    and condition.value
+                    and all(self._is_hashable(v) for v in condition.value)):
+                return condition, list(condition.value)
+
+        return None
+
+    def _required_conditions(self, expression: LogicalExpression, depth: int = 0) -> List[Condition]:
+        """Conditions that must all hold for the expression to be true (AND chains only)."""
+        if expression.operator != LogicalOperator.AND:
+            return []
+        # Mirror the evaluator's limits: expressions it rejects are left unindexed
+        if depth > self.condition_evaluator.max_evaluation_depth:
+            return []
+        if len(expression.conditions) > self.condition_evaluator.max_conditions_per_rule:
+            return []
+
+        required: List[Condition] = []
+        for item in expression.conditions:
+            if isinstance(item, Condition):
+                required.append(item)
+            elif isinstance(item, LogicalExpression):
+                required.extend(self._required_conditions(item, depth + 1))
+        return required
+
+    @staticmethod
+    def _is_hashable(value: Any) -> bool:
+        if isinstance(value, float) and value != value:
+            # NaN never compares equal, so it cannot act as a bucket key
+            return False
+        try:
+            hash(value)
+        except TypeError:
+            return False
+        return True
@@ -14,6 +14,7 @@ import asyncio
 from datetime import datetime
 
 from ..base import OperationalDatabaseAdapter
+from ...monitoring.tool_metrics import measure_db_time
 
 logger = logging.getLogger(__name__)
 
@@ -215,18 +216,19 @@ class AioSQLiteAdapter(OperationalDatabaseAdapter[aiosqlite.Connection]):
             await self.initialize()
         
         try:
-            # Convert named parameters to positional if using ? placeholders
-            if params and '?' in query and ':' not in query:
-                # Extract parameter values in order for positional parameters
-                param_values = list(params.values())
-                async with self._connection.execute(query, param_values) as cursor:
-                    rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
-            else:
-                # Use named parameters
-                async with self._connection.execute(query, params or {}) as cursor:
-                    rows = await cursor.fetchall()
-                    return [dict(row) for row in rows]
+            with measure_db_time():
+                # Convert named parameters to positional if using ? placeholders
+                if params and '?' in query and ':' not in query:
+                    # Extract parameter values in order for positional parameters
+                    param_values = list(params.values())
+                    async with self._connection.execute(query, param_values) as cursor:
+                        rows = await cursor.fetchall()
+                        return [dict(row) for row in rows]
+                else:
+                    # Use named parameters
+                    async with self._connection.execute(query, params or {}) as cursor:
+                        rows = await cursor.fetchall()
+                        return [dict(row) for row in rows]
                 
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
@@ -247,18 +249,19 @@ class AioSQLiteAdapter(OperationalDatabaseAdapter[aiosqlite.Connection]):
             await self.initialize()
         
         try:
-            # Convert named parameters to positional if using ? placeholders
-            if params and '?' in query and ':' not in query:
-                # Extract parameter values in order for positional parameters
-                param_values = list(params.values())
-                async with self._connection.execute(query, param_values) as cursor:
-                    row = await cursor.fetchone()
-                    return dict(row) if row else None
-            else:
-                # Use named parameters
-                async with self._connection.execute(query, params or {}) as cursor:
-                    row = await cursor.fetchone()
-                    return dict(row) if row else None
+            with measure_db_time():
+                # Convert named parameters to positional if using ? placeholders
+                if params and '?' in query and ':' not in query:
+                    # Extract parameter values in order for positional parameters
+                    param_values = list(params.values())
+                    async with self._connection.execute(query, param_values) as cursor:
+                        row = await cursor.fetchone()
+                        return dict(row) if row else None
+                else:
+                    # Use named parameters
+                    async with self._connection.execute(query, params or {}) as cursor:
+                        row = await cursor.fetchone()
+                        return dict(row) if row else None
                 
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
@@ -277,8 +280,9 @@ class AioSQLiteAdapter(OperationalDatabaseAdapter[aiosqlite.Connection]):
         
         try:
             # Use executemany for efficiency
-            await self._connection.executemany(query, params_list)
-            await self._connection.commit()
+            with measure_db_time(queries=len(params_list)):
+                await self._connection.executemany(query, params_list)
+                await self._connection.commit()
             
         except Exception as e:
             logger.error(f"Batch execution failed: {e}")
@@ -5,14 +5,16 @@ This module provides the main DI container for managing service dependencies,
 lifetimes, and resolution throughout the application.
 """
 
-from typing import Type, TypeVar, Dict, Any, Optional, cast, Union
+from typing import Type, TypeVar, Dict, Any, Optional, Tuple, cast, Union
 import threading
 import logging
 from contextlib import contextmanager
+from contextvars import ContextVar
 
 from .lifetime_managers import (
     LifetimeManager, LifetimeScope, create_lifetime_manager, 
-    ServiceScope, DisposableTracker
+    ServiceScope, DisposableTracker, SingletonLifetimeManager,
+    TransientLifetimeManager
 )
 from .registration import (
     ServiceRegistration, ServiceRegistrar, create_factory_with_dependencies,
@@ -22,6 +24,8 @@ from .registration import (
 T = TypeVar('T')
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
 
 class ServiceResolutionError(Exception):
     """Exception raised when service resolution fails."""
@@ -38,21 +42,39 @@ class ServiceContainer:
     Main dependency injection container.
     
     Manages service registration, resolution, and lifetime management.
+    
+    Resolution takes no lock: resolved singletons are served from a plain
+    dict, and each service type's dependency graph is checked for cycles
+    once, when it is first resolved. The lock only guards registration and
+    disposal. The active scope is a context variable, so concurrent asyncio
+    tasks and threads each see their own scope.
     """
     
     def __init__(self):
         """Initialize the service container."""
         self._services: Dict[Type, LifetimeManager] = {}
-        self._resolving_stack: set = set()
+        # Resolved singleton instances, read without locking
+        self._singletons: Dict[Type, Any] = {}
+        # Constructor dependencies per registration; None when hidden in a factory
+        self._dependencies: Dict[Type, Optional[Tuple[Type, ...]]] = {}
+        # Service types whose graph was checked; True if it reaches a factory
+        # and therefore needs the per-call cycle guard
+        self._cycle_checked: Dict[Type, bool] = {}
         self._lock = threading.RLock()
         self._disposable_tracker = DisposableTracker()
-        self._current_scope_context: Optional[Dict[str, Any]] = None
+        self._scope_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+            f"service_scope_{id(self)}", default=None
+        )
+        self._factory_chain: ContextVar[Tuple[Type, ...]] = ContextVar(
+            f"service_factory_chain_{id(self)}", default=()
+        )
         
         # Register self
         self._services[ServiceContainer] = create_lifetime_manager(
             lambda: self,
             LifetimeScope.SINGLETON
         )
+        self._dependencies[ServiceContainer] = ()
     
     def register(self) -> ServiceRegistrar:
         """
@@ -77,37 +99,107 @@ class ServiceContainer:
             ServiceResolutionError: If service cannot be resolved
             CircularDependencyError: If circular dependency detected
         """
-        with self._lock:
-            # Check for circular dependencies
-            if service_type in self._resolving_stack:
-                chain = " -> ".join(str(t.__name__) for t in self._resolving_stack)
+        # Fast path: a singleton that was already resolved
+        instance = self._singletons.get(service_type, _MISSING)
+        if instance is not _MISSING:
+            return cast(T, instance)
+        return cast(T, self._resolve(service_type))
+    
+    def _resolve(self, service_type: Type) -> Any:
+        """Resolve a service through its lifetime manager."""
+        # Check if service is registered
+        manager = self._services.get(service_type)
+        if manager is None:
+            raise ServiceResolutionError(
+                f"Service of type '{_type_name(service_type)}' is not registered"
+            )
+        
+        guarded = self._cycle_checked.get(service_type)
+        if guarded is None:
+            guarded = self._check_dependency_graph(service_type)
+        
+        if guarded:
+            # Factories resolve their dependencies while they run, so cycles
+            # through them can only be seen on the current call chain
+            chain = self._factory_chain.get()
+            if service_type in chain:
                 raise CircularDependencyError(
-                    f"Circular dependency detected: {chain} -> {service_type.__name__}"
+                    "Circular dependency detected: "
+                    + " -> ".join(_type_name(t) for t in chain + (service_type,))
                 )
-            
-            # Check if service is registered
-            if service_type not in self._services:
-                raise ServiceResolutionError(
-                    f"Service of type '{service_type.__name__}' is not registered"
-                )
-            
+            token = self._factory_chain.set(chain + (service_type,))
             try:
-                # Add to resolving stack
-                self._resolving_stack.add(service_type)
-                
-                # Get service from lifetime manager
-                manager = self._services[service_type]
-                instance = manager.get_instance(self._current_scope_context)
-                
-                # Track for disposal if needed
-                self._disposable_tracker.track(instance)
-                
-                logger.debug(f"Resolved service: {service_type.__name__}")
-                return cast(T, instance)
-                
+                instance = manager.get_instance(self._scope_context.get())
             finally:
-                # Remove from resolving stack
-                self._resolving_stack.discard(service_type)
+                self._factory_chain.reset(token)
+        else:
+            instance = manager.get_instance(self._scope_context.get())
+        
+        if isinstance(manager, SingletonLifetimeManager):
+            # Skip caching if the service was re-registered meanwhile
+            if self._services.get(service_type) is manager:
+                self._singletons[service_type] = instance
+        elif isinstance(manager, TransientLifetimeManager):
+            # Singleton and scoped instances are disposed by their managers
+            self._disposable_tracker.track(instance)
+        
+        logger.debug(f"Resolved service: {_type_name(service_type)}")
+        return instance
+    
+    def _check_dependency_graph(self, service_type: Type) -> bool:
+        """
+        Check the registered dependency graph below a service type for cycles.
+        
+        Runs once per service type; the result is cached until the next
+        registration.
+        
+        Args:
+            service_type: Root of the graph to check
+            
+        Returns:
+            True if the graph reaches a factory registration, whose
+            dependencies are only known at run time
+            
+        Raises:
+            CircularDependencyError: If the graph contains a cycle
+        """
+        opaque = False
+        path: list = []
+        on_path: set = set()
+        done: set = set()
+        # Iterative DFS; each frame is (type, iterator over its dependencies)
+        stack = [(service_type, iter(self._dependencies.get(service_type) or ()))]
+        path.append(service_type)
+        on_path.add(service_type)
+        if self._dependencies.get(service_type) is None:
+            opaque = True
+        
+        while stack:
+            node, dependencies = stack[-1]
+            for dependency in dependencies:
+                if dependency not in self._services or dependency in done:
+                    continue
+                if dependency in on_path:
+                    cycle = path[path.index(dependency):] + [dependency]
+                    raise CircularDependencyError(
+                        "Circular dependency detected: "
+                        + " -> ".join(_type_name(t) for t in cycle)
+                    )
+                child_dependencies = self._dependencies.get(dependency)
+                if child_dependencies is None:
+                    opaque = True
+                stack.append((dependency, iter(child_dependencies or ())))
+                path.append(dependency)
+                on_path.add(dependency)
+                break
+            else:
+                stack.pop()
+                path.pop()
+                on_path.discard(node)
+                done.add(node)
+        
+        self._cycle_checked[service_type] = opaque
+        return opaque
     
     def try_get_service(self, service_type: Type[T]) -> Optional[T]:
         """
@@ -163,13 +255,16 @@ class ServiceContainer:
             # Create factory function
             if registration.factory:
                 factory = registration.factory
-            elif registration.instance:
-                factory = lambda: registration.instance
+                dependencies = None
+            elif registration.instance is not None:
+                factory = lambda container: registration.instance
+                dependencies = ()
             elif registration.implementation_type:
                 factory = create_factory_with_dependencies(
                     registration.implementation_type,
                     registration.dependencies
                 )
+                dependencies = factory.dependency_types
             else:
                 raise ValueError("Invalid registration: no implementation specified")
             
@@ -180,8 +275,11 @@ class ServiceContainer:
             # Create lifetime manager
             manager = create_lifetime_manager(container_factory, registration.lifetime)
             
-            # Register
+            # Register; cached singletons and graph checks may be stale now
             self._services[service_type] = manager
+            self._dependencies[service_type] = dependencies
+            self._singletons.pop(service_type, None)
+            self._cycle_checked.clear()
             
             logger.debug(
                 f"Registered service: {service_type.__name__} "
@@ -222,8 +320,9 @@ class ServiceContainer:
                 
             finally:
                 self._services.clear()
-                self._resolving_stack.clear()
-                self._current_scope_context = None
+                self._singletons.clear()
+                self._dependencies.clear()
+                self._cycle_checked.clear()
     
     def __enter__(self):
         """Context manager entry."""
@@ -234,6 +333,10 @@ class ServiceContainer:
         self.dispose()
 
 
+def _type_name(service_type: Any) -> str:
+    return getattr(service_type, '__name__', str(service_type))
+
+
 # Global container instance (can be replaced with proper DI setup)
 _global_container: Optional[ServiceContainer] = None
 _container_lock = threading.Lock()
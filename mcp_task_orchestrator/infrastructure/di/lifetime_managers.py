@@ -137,11 +137,12 @@ class ScopedLifetimeManager(LifetimeManager[T]):
         if scope_context is None:
             return "default"
         
-        # Use session_id if available, otherwise thread_id
+        # Use session_id if available, otherwise the scope itself; scopes
+        # opened by concurrent tasks on one thread must not share instances
         if 'session_id' in scope_context:
             return f"session_{scope_context['session_id']}"
         
-        return f"thread_{threading.current_thread().ident}"
+        return f"scope_{id(scope_context)}"
 
 
 class DisposableTracker:
@@ -222,12 +223,11 @@ class ServiceScope:
         """
         self.container = container
         self.scope_context = scope_context or {}
-        self._original_context = None
+        self._token = None
     
     def __enter__(self):
-        """Enter the scope."""
-        self._original_context = getattr(self.container, '_current_scope_context', None)
-        self.container._current_scope_context = self.scope_context
+        """Enter the scope for the current thread or asyncio task."""
+        self._token = self.container._scope_context.set(self.scope_context)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -239,4 +239,4 @@ class ServiceScope:
                     manager.dispose_scope(self.scope_context)
         finally:
             # Restore original context
-            self.container._current_scope_context = self._original_context
\ No newline at end of file
+            self.container._scope_context.reset(self._token)
\ No newline at end of file
@@ -269,6 +269,11 @@ def create_factory_with_dependencies(implementation_type: Type[T],
     """
     Create a factory function that resolves dependencies automatically.
     
+    The constructor signature is inspected once, here, into a resolution
+    plan; calls to the factory only walk the plan. The plan's dependency
+    types are exposed as ``factory.dependency_types`` so the container can
+    check the dependency graph without running the factory.
+    
     Args:
         implementation_type: Type to instantiate
         dependencies: Optional explicit dependencies
@@ -276,32 +281,40 @@ def create_factory_with_dependencies(implementation_type: Type[T],
     Returns:
         Factory function
     """
+    # (param_name, dependency_type, explicit, has_default)
+    plan = []
+    signature = inspect.signature(implementation_type.__init__)
+    for param_name, param in signature.parameters.items():
+        if param_name == 'self':
+            continue
+        
+        # Use explicit dependency if provided
+        if dependencies and param_name in dependencies:
+            plan.append((param_name, dependencies[param_name], True, False))
+        
+        # Try to resolve by type annotation
+        elif param.annotation != inspect.Parameter.empty:
+            plan.append((param_name, param.annotation, False,
+                         param.default != inspect.Parameter.empty))
+    
     def factory(container: 'ServiceContainer') -> T:
-        # Get constructor signature
-        signature = inspect.signature(implementation_type.__init__)
         kwargs = {}
         
-        for param_name, param in signature.parameters.items():
-            if param_name == 'self':
+        for param_name, dependency_type, explicit, has_default in plan:
+            if explicit:
+                kwargs[param_name] = container.get_service(dependency_type)
                 continue
-            
-            # Use explicit dependency if provided
-            if dependencies and param_name in dependencies:
-                dependency_type = dependencies[param_name]
+            try:
                 kwargs[param_name] = container.get_service(dependency_type)
-            
-            # Try to resolve by type annotation
-            elif param.annotation != inspect.Parameter.empty:
-                try:
-                    kwargs[param_name] = container.get_service(param.annotation)
-                except Exception:
-                    # If we can't resolve and no default, raise error
-                    if param.default == inspect.Parameter.empty:
-                        raise ValueError(
-                            f"Cannot resolve dependency '{param_name}' of type '{param.annotation}' "
-                            f"for {implementation_type.__name__}"
-                        )
+            except Exception:
+                # If we can't resolve and no default, raise error
+                if not has_default:
+                    raise ValueError(
+                        f"Cannot resolve dependency '{param_name}' of type '{dependency_type}' "
+                        f"for {implementation_type.__name__}"
+                    )
         
         return implementation_type(**kwargs)
     
+    factory.dependency_types = tuple(entry[1] for entry in plan)
     return factory
\ No newline at end of file
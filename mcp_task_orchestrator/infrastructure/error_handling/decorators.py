@@ -226,7 +226,9 @@ def with_error_context(component: str, operation: Optional[str] = None, **additi
 def suppress_errors(
     error_types: List[Type[Exception]],
     default_return: Any = None,
-    log_suppressed: bool = True
+    log_suppressed: bool = True,
+    component: Optional[str] = None,
+    operation: Optional[str] = None
 ):
     """
     Decorator to suppress specific error types and return default value.
@@ -235,6 +237,8 @@ def suppress_errors(
         error_types: List of exception types to suppress
         default_return: Value to return when error is suppressed
         log_suppressed: Whether to log suppressed errors
+        component: Component name for logging
+        operation: Operation name for logging
     """
     def decorator(func):
         @functools.wraps(func)
@@ -244,7 +248,8 @@ def suppress_errors(
             except Exception as error:
                 if any(isinstance(error, et) for et in error_types):
                     if log_suppressed:
-                        logger.warning(f"Suppressed {type(error).__name__} in {func.__qualname__}: {error}")
+                        where = f"{component}.{operation or func.__name__}" if component else func.__qualname__
+                        logger.warning(f"Suppressed {type(error).__name__} in {where}: {error}")
                     return default_return
                 else:
                     raise
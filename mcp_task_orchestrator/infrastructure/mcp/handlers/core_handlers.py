@@ -789,6 +789,37 @@ async def handle_maintenance_coordinator(args: Dict[str, Any]) -> List[types.Tex
     )]
 
 
+async def handle_get_metrics(args: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle requests for per-tool performance metrics."""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        from ...monitoring.tool_metrics import get_tool_metrics_report
+        from ...monitoring.metrics import get_metrics_collector
+        
+        window = args.get("window", "last_hour")
+        response = {
+            "status": "metrics_retrieved",
+            **get_tool_metrics_report(window=window, tool=args.get("tool"))
+        }
+        
+        if args.get("include_all_metrics", False):
+            response["all_metrics"] = get_metrics_collector().get_metrics_report()
+        
+    except Exception as e:
+        logger.error(f"Error retrieving metrics: {e}")
+        response = {
+            "status": "error",
+            "error": f"Failed to retrieve metrics: {str(e)}",
+            "error_type": type(e).__name__
+        }
+    
+    return [types.TextContent(
+        type="text",
+        text=json.dumps(response, indent=2, default=str)
+    )]
+
+
 async def _perform_cleanup_scan(results: Dict[str, Any], scope: str, target_task_id: Optional[str]):
     """Perform cleanup scan operations."""
     results["operations_performed"].append("cleanup_scan_initiated")
@@ -145,18 +145,17 @@ class RealTaskUseCase:
                 raise OrchestrationError(f"Task {task_id} not found")
             
             # Update the task fields with new data
-            updated_task = Task(
-                task_id=existing_task.task_id,
-                title=update_data.get("title", existing_task.title),
-                description=update_data.get("description", existing_task.description),
-                task_type=existing_task.task_type,
-                status=TaskStatus(update_data.get("status", existing_task.status.value)) if "status" in update_data else existing_task.status,
-                complexity=ComplexityLevel(update_data.get("complexity", existing_task.complexity.value)) if "complexity" in update_data else existing_task.complexity,
-                specialist_type=update_data.get("specialist_type", existing_task.context.get("specialist", "generic")),
-                created_at=existing_task.created_at,
-                updated_at=datetime.utcnow(),
-                metadata={**existing_task.context, **update_data.get("context", {})}
-            )
+            changes = {"updated_at": datetime.utcnow()}
+            for field in ("title", "description", "specialist_type"):
+                if field in update_data:
+                    changes[field] = update_data[field]
+            if "status" in update_data:
+                changes["status"] = TaskStatus(update_data["status"])
+            if "complexity" in update_data:
+                changes["complexity"] = ComplexityLevel(update_data["complexity"])
+            if "context" in update_data:
+                changes["context"] = {**(existing_task.context or {}), **update_data["context"]}
+            updated_task = existing_task.model_copy(update=changes)
             
             # Use state manager to update the task
             await self.state_manager.update_subtask(updated_task)
@@ -292,8 +291,8 @@ class RealTaskUseCase:
     async def query_tasks(self, filters: Dict[str, Any]) -> Dict[str, Any]:
         """Query tasks with filtering support using the state manager."""
         try:
-            # Get all tasks from state manager
-            all_tasks = await self.state_manager.get_all_tasks()
+            # Get tasks from state manager; the status filter is applied in SQL
+            all_tasks = await self.state_manager.get_all_tasks(status=filters.get("status"))
             
             # Apply filters
             filtered_tasks = []
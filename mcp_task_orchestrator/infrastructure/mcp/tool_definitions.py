@@ -466,6 +466,36 @@ def get_maintenance_tools() -> List[types.Tool]:
     ]
 
 
+def get_monitoring_tools() -> List[types.Tool]:
+    """Get the performance monitoring tools."""
+    return [
+        types.Tool(
+            name="orchestrator_metrics",
+            description="Get per-tool latency percentiles, throughput, database time, response size and error rates",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "window": {
+                        "type": "string",
+                        "enum": ["last_minute", "last_hour", "all_time"],
+                        "description": "Time window to summarize",
+                        "default": "last_hour"
+                    },
+                    "tool": {
+                        "type": "string",
+                        "description": "Only report metrics for this tool"
+                    },
+                    "include_all_metrics": {
+                        "type": "boolean",
+                        "description": "Also include the full metrics report for all recorded metrics",
+                        "default": False
+                    }
+                }
+            }
+        )
+    ]
+
+
 def get_all_tools() -> List[types.Tool]:
     """Get all available MCP tools for the Task Orchestrator."""
     tools = []
@@ -482,6 +512,9 @@ def get_all_tools() -> List[types.Tool]:
     # Add maintenance tools
     tools.extend(get_maintenance_tools())
     
+    # Add monitoring tools
+    tools.extend(get_monitoring_tools())
+    
     # Add template system tools
     from ..template_system.mcp_tools import get_template_tools
     tools.extend(get_template_tools())
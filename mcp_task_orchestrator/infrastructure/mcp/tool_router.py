@@ -7,7 +7,7 @@ Supports gradual migration from dictionary-based to Pydantic DTO-based handlers.
 
 import logging
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from mcp import types
 
 # Import reboot tool handlers
@@ -16,10 +16,37 @@ from ...reboot.reboot_tools import REBOOT_TOOL_HANDLERS
 # Import migration manager
 from .handlers.migration_config import get_handler_for_tool, get_migration_status
 
+# Per-tool instrumentation
+from ..monitoring.tool_metrics import (
+    track_tool_call, handler_started, measure_response, mark_error
+)
+
 logger = logging.getLogger(__name__)
 
 
-async def route_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+async def route_tool_call(name: str, arguments: Dict[str, Any],
+                          received_at: Optional[float] = None) -> List[types.TextContent]:
+    """
+    Route a tool call and record its latency, DB time, response size and outcome.
+    
+    Args:
+        name: Tool name to route
+        arguments: Tool arguments from MCP client
+        received_at: perf_counter() timestamp when the request arrived
+        
+    Returns:
+        List of TextContent responses
+        
+    Raises:
+        ValueError: If tool name is not recognized
+    """
+    with track_tool_call(name, received_at) as call:
+        response = await _dispatch_tool_call(name, arguments)
+        measure_response(call, response)
+        return response
+
+
+async def _dispatch_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """
     Route tool calls to appropriate handler functions with migration support.
     
@@ -46,7 +73,8 @@ async def route_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.Te
         handle_list_sessions,
         handle_resume_session,
         handle_cleanup_sessions,
-        handle_session_status
+        handle_session_status,
+        handle_get_metrics
     )
     
     # Log handler selection for debugging
@@ -55,6 +83,8 @@ async def route_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.Te
         handler_info = migration_status[name]
         logger.debug(f"Tool {name}: using {'new' if handler_info['using_new_handler'] else 'old'} handler")
     
+    handler_started()
+    
     # Core orchestration tools (not migrated yet)
     if name == "orchestrator_initialize_session":
         return await handle_initialize_session(arguments)
@@ -64,6 +94,8 @@ async def route_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.Te
         return await handle_get_status(arguments)
     elif name == "orchestrator_maintenance_coordinator":
         return await handle_maintenance_coordinator(arguments)
+    elif name == "orchestrator_metrics":
+        return await handle_get_metrics(arguments)
     
     # Session management tools
     elif name == "orchestrator_list_sessions":
@@ -98,6 +130,7 @@ async def route_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.Te
             return await handler(arguments)
         except Exception as e:
             logger.error(f"Error routing tool {name}: {e}")
+            mark_error()
             # Return error response
             error_response = {
                 "status": "error",
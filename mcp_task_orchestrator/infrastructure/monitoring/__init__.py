@@ -13,6 +13,7 @@ from .health_checks import (
 from .metrics import (
     MetricPoint,
     MetricSummary,
+    QuantileSketch,
     MetricsCollector,
     PerformanceTracker,
     timed_operation,
@@ -23,6 +24,16 @@ from .metrics import (
     track_performance
 )
 
+from .tool_metrics import (
+    ToolCallMetrics,
+    track_tool_call,
+    record_db_time,
+    measure_db_time,
+    get_tool_metrics_report
+)
+
+from .prometheus_exporter import PrometheusFileExporter
+
 from .system_monitor import (
     SystemSnapshot,
     AlertRule,
@@ -44,6 +55,7 @@ __all__ = [
     # Metrics
     'MetricPoint',
     'MetricSummary',
+    'QuantileSketch',
     'MetricsCollector',
     'PerformanceTracker',
     'timed_operation',
@@ -53,6 +65,14 @@ __all__ = [
     'record_timing',
     'track_performance',
     
+    # Tool instrumentation
+    'ToolCallMetrics',
+    'track_tool_call',
+    'record_db_time',
+    'measure_db_time',
+    'get_tool_metrics_report',
+    'PrometheusFileExporter',
+    
     # System monitoring
     'SystemSnapshot',
     'AlertRule',
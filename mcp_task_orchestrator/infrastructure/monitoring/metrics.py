@@ -1,12 +1,17 @@
 """
 Performance metrics collection and monitoring.
+
+Metrics are aggregated into per-second, per-minute and per-hour ring buckets
+holding count/sum/min/max and a mergeable quantile sketch, so recording is
+cheap and summaries (including p50/p95/p99) do not scan raw samples.
 """
 
+import math
 import time
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Deque, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from collections import deque
 from datetime import datetime, timedelta
 import threading
 
@@ -34,36 +39,256 @@ class MetricSummary:
     avg: float
     recent_values: List[float]
     unit: Optional[str] = None
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    window_seconds: Optional[float] = None
     
     @property
     def rate_per_second(self) -> float:
-        """Calculate rate per second based on recent values."""
+        """Calculate rate per second over the summary window."""
+        if self.window_seconds:
+            return self.count / self.window_seconds
         if len(self.recent_values) < 2:
             return 0.0
         return len(self.recent_values) / 60.0  # Assuming 1-minute window
 
 
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+    
+    Values are counted in logarithmic buckets (bucket i covers
+    (gamma^(i-1), gamma^i]), so any quantile estimate is within
+    ``relative_accuracy`` of the true value and two sketches merge by adding
+    bucket counts. Memory grows with the log of the value range, not with
+    the number of samples.
+    """
+    
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "_positive", "_negative",
+                 "zero_count", "count", "min", "max")
+    
+    # Magnitudes below this are counted as zero
+    MIN_INDEXABLE = 1e-12
+    
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def key(self, value: float) -> int:
+        """Bucket key for a value (sign encoded by which store it goes to)."""
+        magnitude = abs(value)
+        if magnitude < self.MIN_INDEXABLE:
+            return 0
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+    
+    def add(self, value: float, key: Optional[int] = None) -> None:
+        """Add a value; ``key`` may be passed when already computed."""
+        if key is None:
+            key = self.key(value)
+        
+        if value >= self.MIN_INDEXABLE:
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value <= -self.MIN_INDEXABLE:
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's counts into this one (same accuracy required)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1); 0.0 for an empty sketch."""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        
+        rank = q * (self.count - 1)
+        seen = 0
+        
+        # Most negative values first: largest magnitude key first
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return self._clamp(-self._bucket_value(key))
+        
+        seen += self.zero_count
+        if seen > rank:
+            return self._clamp(0.0)
+        
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._clamp(self._bucket_value(key))
+        
+        return self.max
+    
+    def _bucket_value(self, key: int) -> float:
+        # Point of the bucket with equal relative distance to both bounds
+        return 2 * self._gamma ** key / (self._gamma + 1)
+    
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min), self.max)
+
+
+class _Bucket:
+    """Aggregate of all samples in one time slot."""
+    
+    __slots__ = ("epoch", "count", "sum", "min", "max", "sketch")
+    
+    def __init__(self, relative_accuracy: float, epoch: int = -1):
+        self.epoch = epoch
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch(relative_accuracy)
+    
+    def add(self, value: float, key: int) -> None:
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sketch.add(value, key)
+    
+    def merge(self, other: "_Bucket") -> None:
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+
+class _MetricSeries:
+    """
+    Time-bucketed samples for one metric name and tag set.
+    
+    Three rings cover the last minute (per second), hour (per minute) and
+    day (per hour); an all-time bucket covers everything. A sample updates
+    one slot in each ring, and a stale slot is reset when its ring wraps.
+    """
+    
+    # (slot length in seconds, number of slots)
+    RESOLUTIONS = ((1, 60), (60, 60), (3600, 24))
+    
+    def __init__(self, unit: Optional[str], relative_accuracy: float):
+        self.unit = unit
+        self.relative_accuracy = relative_accuracy
+        self.lock = threading.Lock()
+        self.rings = [
+            [_Bucket(relative_accuracy) for _ in range(slots)]
+            for _, slots in self.RESOLUTIONS
+        ]
+        self.total = _Bucket(relative_accuracy)
+        self.recent_values: Deque[float] = deque(maxlen=60)
+    
+    def record(self, value: float, now: float) -> None:
+        key = self.total.sketch.key(value)
+        second = int(now)
+        
+        with self.lock:
+            for (slot_seconds, _), ring in zip(self.RESOLUTIONS, self.rings):
+                epoch = second // slot_seconds
+                bucket = ring[epoch % len(ring)]
+                if bucket.epoch != epoch:
+                    ring[epoch % len(ring)] = bucket = _Bucket(self.relative_accuracy, epoch)
+                bucket.add(value, key)
+            self.total.add(value, key)
+            self.recent_values.append(value)
+    
+    def aggregate(self, window_seconds: Optional[float], now: float) -> _Bucket:
+        """
+        Merge the buckets covering the window, using the finest ring that spans it.
+        
+        Windows are aligned to slot boundaries, so a window may include up to
+        one slot of older samples. Windows longer than a day use all-time data.
+        """
+        merged = _Bucket(self.relative_accuracy)
+        
+        with self.lock:
+            if window_seconds is None:
+                merged.merge(self.total)
+                return merged
+            
+            for (slot_seconds, slots), ring in zip(self.RESOLUTIONS, self.rings):
+                if window_seconds <= slot_seconds * slots:
+                    current = int(now) // slot_seconds
+                    oldest = current - math.ceil(window_seconds / slot_seconds) + 1
+                    for bucket in ring:
+                        if oldest <= bucket.epoch <= current:
+                            merged.merge(bucket)
+                    return merged
+            
+            merged.merge(self.total)
+            return merged
+
+
+TagKey = Tuple[Tuple[str, str], ...]
+
+
 class MetricsCollector:
-    """Collects and manages performance metrics."""
+    """
+    Collects and manages performance metrics.
     
-    def __init__(self, max_points_per_metric: int = 1000):
+    Samples are aggregated into time buckets (count/sum/min/max plus a
+    quantile sketch) per metric name and tag set instead of being stored
+    individually, so memory is bounded and summaries cost O(buckets).
+    """
+    
+    def __init__(self, max_points_per_metric: int = 1000, relative_accuracy: float = 0.01):
+        # Kept for API compatibility; bucketed series do not store raw points
         self.max_points_per_metric = max_points_per_metric
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_points_per_metric))
+        self.relative_accuracy = relative_accuracy
+        self.metrics: Dict[str, Dict[TagKey, _MetricSeries]] = {}
         self.lock = threading.RLock()
         self.start_time = datetime.utcnow()
+        self._tag_keys: Dict[TagKey, TagKey] = {(): ()}
     
     def record_value(self, name: str, value: Union[int, float], 
                     tags: Optional[Dict[str, str]] = None, unit: Optional[str] = None):
         """Record a metric value."""
-        with self.lock:
-            point = MetricPoint(
-                name=name,
-                value=float(value),
-                timestamp=datetime.utcnow(),
-                tags=tags or {},
-                unit=unit
-            )
-            self.metrics[name].append(point)
+        tag_key = self._intern_tags(tags)
+        series_by_tags = self.metrics.get(name)
+        series = series_by_tags.get(tag_key) if series_by_tags is not None else None
+        
+        if series is None:
+            # Only creating a new series takes the collector-wide lock
+            with self.lock:
+                series_by_tags = self.metrics.setdefault(name, {})
+                series = series_by_tags.get(tag_key)
+                if series is None:
+                    series = series_by_tags[tag_key] = _MetricSeries(unit, self.relative_accuracy)
+        
+        series.record(float(value), time.time())
     
     def increment_counter(self, name: str, value: int = 1, 
                          tags: Optional[Dict[str, str]] = None):
@@ -81,46 +306,46 @@ class MetricsCollector:
         self.record_value(name, value, tags, unit)
     
     def get_metric_summary(self, name: str, 
-                          time_window: Optional[timedelta] = None) -> Optional[MetricSummary]:
-        """Get summary statistics for a metric."""
-        with self.lock:
-            if name not in self.metrics:
-                return None
-            
-            points = list(self.metrics[name])
-            if not points:
-                return None
-            
-            # Filter by time window if specified
-            if time_window:
-                cutoff = datetime.utcnow() - time_window
-                points = [p for p in points if p.timestamp >= cutoff]
-            
-            if not points:
-                return None
-            
-            values = [p.value for p in points]
-            
-            return MetricSummary(
-                name=name,
-                count=len(values),
-                sum=sum(values),
-                min=min(values),
-                max=max(values),
-                avg=sum(values) / len(values),
-                recent_values=values[-60:],  # Last 60 values for rate calculation
-                unit=points[0].unit
-            )
+                          time_window: Optional[timedelta] = None,
+                          tags: Optional[Dict[str, str]] = None) -> Optional[MetricSummary]:
+        """
+        Get summary statistics for a metric.
+        
+        Args:
+            name: Metric name
+            time_window: Only include recent samples (None for all time)
+            tags: Only include samples with exactly this tag set (None for all)
+        """
+        series_by_tags = self.metrics.get(name)
+        if not series_by_tags:
+            return None
+        
+        if tags is not None:
+            series = series_by_tags.get(self._intern_tags(tags))
+            selected = [series] if series is not None else []
+        else:
+            selected = list(series_by_tags.values())
+        
+        return self._summarize(name, selected, time_window)
+    
+    def get_tagged_summaries(self, name: str,
+                             time_window: Optional[timedelta] = None) -> Dict[TagKey, MetricSummary]:
+        """Get one summary per tag set recorded for a metric."""
+        summaries = {}
+        for tag_key, series in list(self.metrics.get(name, {}).items()):
+            summary = self._summarize(name, [series], time_window)
+            if summary:
+                summaries[tag_key] = summary
+        return summaries
     
     def get_all_metrics(self, time_window: Optional[timedelta] = None) -> Dict[str, MetricSummary]:
         """Get summaries for all metrics."""
-        with self.lock:
-            summaries = {}
-            for metric_name in self.metrics.keys():
-                summary = self.get_metric_summary(metric_name, time_window)
-                if summary:
-                    summaries[metric_name] = summary
-            return summaries
+        summaries = {}
+        for metric_name in list(self.metrics.keys()):
+            summary = self.get_metric_summary(metric_name, time_window)
+            if summary:
+                summaries[metric_name] = summary
+        return summaries
     
     def get_metrics_report(self) -> Dict[str, Any]:
         """Get comprehensive metrics report."""
@@ -138,22 +363,70 @@ class MetricsCollector:
             "last_minute": {name: {
                 "count": summary.count,
                 "avg": summary.avg,
-                "rate_per_second": summary.rate_per_second
+                "rate_per_second": summary.rate_per_second,
+                "p50": summary.p50,
+                "p95": summary.p95,
+                "p99": summary.p99
             } for name, summary in last_minute.items()},
             "last_hour": {name: {
                 "count": summary.count,
                 "avg": summary.avg,
                 "min": summary.min,
-                "max": summary.max
+                "max": summary.max,
+                "p50": summary.p50,
+                "p95": summary.p95,
+                "p99": summary.p99
             } for name, summary in last_hour.items()},
             "all_time": {name: {
                 "count": summary.count,
                 "avg": summary.avg,
                 "min": summary.min,
                 "max": summary.max,
-                "total": summary.sum
+                "total": summary.sum,
+                "p50": summary.p50,
+                "p95": summary.p95,
+                "p99": summary.p99
             } for name, summary in all_time.items()}
         }
+    
+    def _intern_tags(self, tags: Optional[Dict[str, str]]) -> TagKey:
+        """Return the shared tuple for a tag set so equal tag sets are stored once."""
+        if not tags:
+            return ()
+        key = tuple(sorted(tags.items()))
+        return self._tag_keys.setdefault(key, key)
+    
+    def _summarize(self, name: str, series_list: List[_MetricSeries],
+                   time_window: Optional[timedelta]) -> Optional[MetricSummary]:
+        if not series_list:
+            return None
+        
+        now = time.time()
+        window_seconds = time_window.total_seconds() if time_window else None
+        merged = _Bucket(self.relative_accuracy)
+        recent_values: List[float] = []
+        for series in series_list:
+            merged.merge(series.aggregate(window_seconds, now))
+            recent_values.extend(series.recent_values)
+        
+        if merged.count == 0:
+            return None
+        
+        sketch = merged.sketch
+        return MetricSummary(
+            name=name,
+            count=merged.count,
+            sum=merged.sum,
+            min=merged.min,
+            max=merged.max,
+            avg=merged.sum / merged.count,
+            recent_values=recent_values[-60:],
+            unit=series_list[0].unit,
+            p50=sketch.quantile(0.50),
+            p95=sketch.quantile(0.95),
+            p99=sketch.quantile(0.99),
+            window_seconds=window_seconds
+        )
 
 
 class PerformanceTracker:
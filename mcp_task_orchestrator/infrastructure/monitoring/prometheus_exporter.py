@@ -0,0 +1,123 @@
+"""
+Prometheus text-format exporter for collected metrics.
+
+Periodically writes every metric in the MetricsCollector to a file in the
+Prometheus text exposition format (suitable for the node_exporter textfile
+collector or any scraper that reads files). Each metric becomes a summary:
+``_count`` and ``_sum`` are cumulative since start, quantiles cover a recent
+window.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from datetime import timedelta
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .metrics import MetricsCollector, get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+QUANTILES = (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99"))
+
+
+class PrometheusFileExporter:
+    """Writes metrics to a Prometheus text file at a fixed interval."""
+
+    def __init__(self,
+                 path: Union[str, Path],
+                 interval_seconds: float = 15.0,
+                 collector: Optional[MetricsCollector] = None,
+                 prefix: str = "mcp_task_orchestrator",
+                 quantile_window: timedelta = timedelta(minutes=5)):
+        self.path = Path(path)
+        self.interval_seconds = interval_seconds
+        self.collector = collector or get_metrics_collector()
+        self.prefix = prefix
+        self.quantile_window = quantile_window
+        self._task: Optional[asyncio.Task] = None
+        self.exports = 0
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        for name in sorted(list(self.collector.metrics.keys())):
+            totals = self.collector.get_tagged_summaries(name)
+            if not totals:
+                continue
+            recent = self.collector.get_tagged_summaries(name, self.quantile_window)
+            metric = self._metric_name(name)
+            unit = next(iter(totals.values())).unit
+
+            lines.append(f"# HELP {metric} {name}" + (f" ({unit})" if unit else ""))
+            lines.append(f"# TYPE {metric} summary")
+            for tag_key in sorted(totals):
+                labels = list(tag_key)
+                window_summary = recent.get(tag_key)
+                if window_summary is not None:
+                    for quantile, attribute in QUANTILES:
+                        value = getattr(window_summary, attribute)
+                        lines.append(f"{metric}{self._labels(labels + [('quantile', quantile)])} {value!r}")
+                total = totals[tag_key]
+                lines.append(f"{metric}_sum{self._labels(labels)} {total.sum!r}")
+                lines.append(f"{metric}_count{self._labels(labels)} {total.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self) -> Path:
+        """Write the current metrics atomically (tmp file + rename)."""
+        content = self.render()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, self.path)
+        self.exports += 1
+        return self.path
+
+    def start(self) -> None:
+        """Start periodic export on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+            logger.info(f"Exporting metrics to {self.path} every {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        """Stop periodic export after writing a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_running_loop().run_in_executor(None, self.export)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.export)
+            except Exception as e:
+                logger.error(f"Metrics export to {self.path} failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def _metric_name(self, name: str) -> str:
+        return _INVALID_NAME_CHARS.sub("_", f"{self.prefix}_{name}")
+
+    @staticmethod
+    def _labels(pairs) -> str:
+        if not pairs:
+            return ""
+        rendered = ",".join(
+            f'{_INVALID_NAME_CHARS.sub("_", key)}="{PrometheusFileExporter._escape(value)}"'
+            for key, value in pairs
+        )
+        return "{" + rendered + "}"
+
+    @staticmethod
+    def _escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,276 @@
+"""
+Per-tool instrumentation for MCP tool calls.
+
+Every tool invocation records, tagged with the tool name:
+- ``tool.duration``: total time from request receipt to response
+- ``tool.queue_duration``: time before the handler started (dispatch, imports)
+- ``tool.handler_duration``: time spent inside the handler
+- ``tool.db_duration`` / ``tool.db_queries``: database time attributed to the call
+- ``tool.response_bytes``: size of the text returned to the client
+- ``tool.calls``: one sample per call, additionally tagged with the outcome
+
+Database adapters report query time through ``record_db_time``; the time is
+attributed to the tool call running in the current context.
+"""
+
+import json
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from .metrics import MetricsCollector, get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = {
+    "last_minute": timedelta(minutes=1),
+    "last_hour": timedelta(hours=1),
+    "all_time": None
+}
+
+
+@dataclass
+class ToolCallMetrics:
+    """Measurements for one in-flight tool call."""
+    tool: str
+    received_at: float
+    handler_started_at: Optional[float] = None
+    db_seconds: float = 0.0
+    db_queries: int = 0
+    response_bytes: int = 0
+    status: str = "success"
+
+
+_current_call: ContextVar[Optional[ToolCallMetrics]] = ContextVar("current_tool_call", default=None)
+
+
+def current_tool_call() -> Optional[ToolCallMetrics]:
+    """The tool call being handled in the current context, if any."""
+    return _current_call.get()
+
+
+def record_db_time(duration_seconds: float, queries: int = 1) -> None:
+    """Attribute database time to the current tool call (no-op outside a call)."""
+    call = _current_call.get()
+    if call is not None:
+        call.db_seconds += duration_seconds
+        call.db_queries += queries
+
+
+@contextmanager
+def measure_db_time(queries: int = 1) -> Iterator[None]:
+    """Time a block of database work and attribute it to the current tool call."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_db_time(time.perf_counter() - started, queries)
+
+
+@contextmanager
+def track_tool_call(tool: str,
+                    received_at: Optional[float] = None,
+                    collector: Optional[MetricsCollector] = None) -> Iterator[ToolCallMetrics]:
+    """
+    Measure a tool call and record its metrics when the block exits.
+
+    Nested calls (e.g. server.call_tool wrapping route_tool_call) reuse the
+    outer measurement so a call is only recorded once.
+
+    Args:
+        tool: Tool name
+        received_at: perf_counter() timestamp when the request arrived
+        collector: Metrics collector (defaults to the global one)
+    """
+    outer = _current_call.get()
+    if outer is not None and outer.tool == tool:
+        yield outer
+        return
+
+    call = ToolCallMetrics(tool=tool, received_at=received_at or time.perf_counter())
+    token = _current_call.set(call)
+    try:
+        yield call
+    except BaseException:
+        call.status = "error"
+        raise
+    finally:
+        _current_call.reset(token)
+        _record_call(call, collector or get_metrics_collector())
+
+
+def handler_started() -> None:
+    """Mark the start of handler execution for the current tool call."""
+    call = _current_call.get()
+    if call is not None and call.handler_started_at is None:
+        call.handler_started_at = time.perf_counter()
+
+
+def mark_error() -> None:
+    """Count the current tool call as failed even though it returned a response."""
+    call = _current_call.get()
+    if call is not None:
+        call.status = "error"
+
+
+def measure_response(call: ToolCallMetrics, response: Any) -> None:
+    """Record response size and detect error payloads returned without raising."""
+    total = 0
+    for item in response or ():
+        text = getattr(item, "text", None)
+        if isinstance(text, str):
+            total += len(text.encode("utf-8"))
+            # Several handlers report failures as a JSON body instead of raising
+            if _is_error_payload(text):
+                call.status = "error"
+    call.response_bytes = total
+
+
+def _is_error_payload(text: str) -> bool:
+    """Whether a response body is a JSON object whose top-level status is "error"."""
+    if not text.lstrip().startswith("{"):
+        return False
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and payload.get("status") == "error"
+
+
+def _record_call(call: ToolCallMetrics, collector: MetricsCollector) -> None:
+    finished = time.perf_counter()
+    handler_started_at = call.handler_started_at or call.received_at
+    tags = {"tool": call.tool}
+
+    try:
+        collector.record_timing("tool.duration", finished - call.received_at, tags)
+        collector.record_timing("tool.queue_duration", handler_started_at - call.received_at, tags)
+        collector.record_timing("tool.handler_duration", finished - handler_started_at, tags)
+        collector.record_timing("tool.db_duration", call.db_seconds, tags)
+        collector.record_value("tool.db_queries", call.db_queries, tags, "count")
+        collector.record_value("tool.response_bytes", call.response_bytes, tags, "bytes")
+        collector.increment_counter("tool.calls", tags={"tool": call.tool, "status": call.status})
+    except Exception as e:
+        # Instrumentation must never break a tool call
+        logger.warning(f"Failed to record metrics for tool {call.tool}: {e}")
+
+
+def get_tool_metrics_report(window: str = "last_hour",
+                            tool: Optional[str] = None,
+                            collector: Optional[MetricsCollector] = None) -> Dict[str, Any]:
+    """
+    Summarize per-tool latency, throughput, DB time, payload size and error rate.
+
+    Args:
+        window: One of ``last_minute``, ``last_hour`` or ``all_time``
+        tool: Only report this tool
+        collector: Metrics collector (defaults to the global one)
+    """
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown window '{window}', expected one of {sorted(WINDOWS)}")
+
+    collector = collector or get_metrics_collector()
+    time_window = WINDOWS[window]
+
+    def by_tool(metric: str) -> Dict[str, Any]:
+        return {
+            dict(tag_key).get("tool"): summary
+            for tag_key, summary in collector.get_tagged_summaries(metric, time_window).items()
+        }
+
+    durations = by_tool("tool.duration")
+    handler = by_tool("tool.handler_duration")
+    queue = by_tool("tool.queue_duration")
+    db = by_tool("tool.db_duration")
+    response = by_tool("tool.response_bytes")
+
+    outcomes: Dict[str, Dict[str, int]] = {}
+    for tag_key, summary in collector.get_tagged_summaries("tool.calls", time_window).items():
+        tags = dict(tag_key)
+        outcomes.setdefault(tags.get("tool"), {})[tags.get("status")] = summary.count
+
+    tools: Dict[str, Any] = {}
+    for name, summary in sorted(durations.items()):
+        if tool is not None and name != tool:
+            continue
+
+        calls = outcomes.get(name, {})
+        errors = calls.get("error", 0)
+        entry = {
+            "calls": summary.count,
+            "errors": errors,
+            "error_rate": errors / summary.count if summary.count else 0.0,
+            "latency_ms": _latency_ms(summary),
+            "handler_ms": _latency_ms(handler.get(name)),
+            "queue_ms": _latency_ms(queue.get(name)),
+            "db_ms": _latency_ms(db.get(name)),
+            "avg_response_bytes": response[name].avg if name in response else 0.0,
+            "max_response_bytes": response[name].max if name in response else 0.0
+        }
+        if time_window is not None:
+            entry["calls_per_second"] = summary.rate_per_second
+        tools[name] = entry
+
+    return {
+        "window": window,
+        "tools": tools,
+        "slowest_tools": sorted(tools, key=lambda n: tools[n]["latency_ms"]["p95"], reverse=True)[:5]
+    }
+
+
+def _latency_ms(summary) -> Dict[str, float]:
+    if summary is None:
+        return {"avg": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "avg": summary.avg * 1000,
+        "p50": summary.p50 * 1000,
+        "p95": summary.p95 * 1000,
+        "p99": summary.p99 * 1000,
+        "max": summary.max * 1000
+    }
+
+
+def install_sqlalchemy_timing() -> bool:
+    """
+    Attribute SQLAlchemy query time to tool calls for every engine.
+
+    Called once at server startup; the listeners are global to all engines.
+    Returns False if SQLAlchemy is not available.
+    """
+    global _sqlalchemy_timing_installed
+    if _sqlalchemy_timing_installed:
+        return True
+
+    try:
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+    except ImportError:
+        return False
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("tool_metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts: List[float] = conn.info.get("tool_metrics_query_start")
+        if starts:
+            record_db_time(time.perf_counter() - starts.pop())
+
+    @event.listens_for(Engine, "handle_error")
+    def _handle_error(context):
+        # after_cursor_execute does not run for a failing statement
+        conn = context.connection
+        starts: List[float] = conn.info.get("tool_metrics_query_start") if conn is not None else None
+        if starts:
+            record_db_time(time.perf_counter() - starts.pop())
+
+    _sqlalchemy_timing_installed = True
+    return True
+
+
+_sqlalchemy_timing_installed = False
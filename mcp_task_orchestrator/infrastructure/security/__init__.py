@@ -178,6 +178,7 @@ def initialize_security(api_key_storage_path: str = None,
     
     # Reinitialize API key manager with custom path
     if api_key_storage_path:
+        api_key_manager.close()
         api_key_manager = APIKeyManager(api_key_storage_path)
     
     # Reinitialize audit logger with custom configuration
@@ -0,0 +1,374 @@
+"""
+Storage backend for the security audit log.
+
+Audit records are handed to a QueueHandler on the request path and written by
+a QueueListener thread in batches. The writer rotates the active log file by
+size or age into timestamped segments and keeps a compact side index with,
+per segment and per hour, the byte offset of the hour's first entry and
+counters by event type and severity. Time-window queries use the index to
+seek straight to the relevant offsets, and summaries are answered from the
+counters without re-reading the log.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+LINE_SEPARATOR = " - "
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass
+class HourBucket:
+    """Index entry for the entries of one hour within one segment."""
+    offset: int
+    event_types: Dict[str, int] = field(default_factory=dict)
+    severities: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class SegmentIndex:
+    """Index entry for one log file (the active file or a rotated segment)."""
+    file_name: str
+    created_at: float
+    size: int = 0
+    first_time: Optional[float] = None
+    last_time: Optional[float] = None
+    # Hour number (epoch seconds // 3600) -> bucket, in file order
+    hours: Dict[int, HourBucket] = field(default_factory=dict)
+
+    def add(self, offset: int, length: int, timestamp: float, event_type: str, severity: str) -> None:
+        hour = int(timestamp // 3600)
+        if self.hours:
+            # Keep offsets monotonic if the clock steps backwards
+            hour = max(hour, next(reversed(self.hours)))
+        bucket = self.hours.get(hour)
+        if bucket is None:
+            bucket = self.hours[hour] = HourBucket(offset=offset)
+        bucket.event_types[event_type] = bucket.event_types.get(event_type, 0) + 1
+        bucket.severities[severity] = bucket.severities.get(severity, 0) + 1
+
+        if self.first_time is None:
+            self.first_time = timestamp
+        self.last_time = timestamp if self.last_time is None else max(self.last_time, timestamp)
+        self.size = offset + length
+
+    def ranges(self) -> Iterator[Tuple[int, HourBucket, int]]:
+        """Yield (hour, bucket, end offset) for every hour bucket."""
+        hours = list(self.hours.items())
+        for position, (hour, bucket) in enumerate(hours):
+            end = hours[position + 1][1].offset if position + 1 < len(hours) else self.size
+            yield hour, bucket, end
+
+    def copy(self) -> "SegmentIndex":
+        """Copy whose buckets and counters are not touched by later writes."""
+        return SegmentIndex(
+            file_name=self.file_name,
+            created_at=self.created_at,
+            size=self.size,
+            first_time=self.first_time,
+            last_time=self.last_time,
+            hours={
+                hour: HourBucket(bucket.offset, dict(bucket.event_types), dict(bucket.severities))
+                for hour, bucket in self.hours.items()
+            }
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "file_name": self.file_name,
+            "created_at": self.created_at,
+            "size": self.size,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+            "hours": {
+                str(hour): [bucket.offset, bucket.event_types, bucket.severities]
+                for hour, bucket in self.hours.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentIndex":
+        segment = cls(
+            file_name=data["file_name"],
+            created_at=data["created_at"],
+            size=data["size"],
+            first_time=data.get("first_time"),
+            last_time=data.get("last_time")
+        )
+        for hour, (offset, event_types, severities) in data.get("hours", {}).items():
+            segment.hours[int(hour)] = HourBucket(offset, event_types, severities)
+        return segment
+
+
+def parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one audit log line (``asctime - name - level - json``)."""
+    parts = line.strip().split(LINE_SEPARATOR, 3)
+    if len(parts) < 4:
+        return None
+    try:
+        return json.loads(parts[3])
+    except json.JSONDecodeError:
+        return None
+
+
+def entry_timestamp(entry: Dict[str, Any]) -> float:
+    return datetime.fromisoformat(entry["timestamp"].replace("Z", "+00:00")).timestamp()
+
+
+class AuditLogIndex:
+    """
+    Side index over the active audit log file and its rotated segments.
+
+    Persisted as JSON next to the log. Mutated only by the writer thread;
+    readers take ``lock`` to get a consistent view.
+    """
+
+    def __init__(self, log_file_path: Path):
+        self.log_file_path = log_file_path
+        self.index_path = log_file_path.with_name(log_file_path.name + ".index.json")
+        self.lock = threading.RLock()
+        self.segments: List[SegmentIndex] = []
+        self._load()
+
+    @property
+    def active(self) -> SegmentIndex:
+        return self.segments[-1]
+
+    def path_for(self, segment: SegmentIndex) -> Path:
+        return self.log_file_path.with_name(segment.file_name)
+
+    def save(self) -> None:
+        document = {
+            "format_version": INDEX_FORMAT_VERSION,
+            "segments": [segment.to_dict() for segment in self.segments]
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, separators=(",", ":"))
+        _restrict_permissions(tmp_path)
+        os.replace(tmp_path, self.index_path)
+
+    def start_new_active(self) -> None:
+        self.segments.append(SegmentIndex(file_name=self.log_file_path.name, created_at=time.time()))
+
+    def select(self, cutoff: float) -> List[Tuple[Path, SegmentIndex]]:
+        """
+        Segments (oldest first) that may hold entries at or after ``cutoff``.
+
+        The segments are copied under the lock, so callers can iterate them
+        while the writer thread keeps appending to the live index.
+        """
+        with self.lock:
+            return [
+                (self.path_for(segment), segment.copy())
+                for segment in self.segments
+                if segment.last_time is not None and segment.last_time >= cutoff
+            ]
+
+    def _load(self) -> None:
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    document = json.load(f)
+                if document.get("format_version") == INDEX_FORMAT_VERSION:
+                    self.segments = [SegmentIndex.from_dict(s) for s in document["segments"]]
+            except (OSError, ValueError, KeyError, TypeError):
+                self.segments = []
+
+        # Drop rotated segments whose files are gone; the active file always comes last
+        active_name = self.log_file_path.name
+        rotated = [s for s in self.segments if s.file_name != active_name and self.path_for(s).exists()]
+        active = [s for s in self.segments if s.file_name == active_name]
+        self.segments = rotated + active[-1:]
+
+        if not active:
+            self.start_new_active()
+
+        # The active file may have grown after the last save (crash) or predate the index
+        actual_size = self.log_file_path.stat().st_size if self.log_file_path.exists() else 0
+        if actual_size != self.active.size:
+            self._rebuild_active(actual_size)
+
+    def _rebuild_active(self, actual_size: int) -> None:
+        """Re-index the active file with one sequential scan."""
+        rebuilt = SegmentIndex(file_name=self.log_file_path.name, created_at=self.active.created_at)
+        if actual_size:
+            with open(self.log_file_path, "rb") as f:
+                offset = 0
+                for raw in f:
+                    entry = parse_line(raw.decode("utf-8", errors="replace"))
+                    if entry is not None:
+                        try:
+                            rebuilt.add(offset, len(raw), entry_timestamp(entry),
+                                        entry.get("event_type", "unknown"), entry.get("severity", "unknown"))
+                        except (KeyError, ValueError):
+                            pass
+                    offset += len(raw)
+                rebuilt.size = offset
+        self.segments[-1] = rebuilt
+
+
+class BatchingAuditFileHandler(logging.Handler):
+    """
+    File handler that buffers formatted records and writes them in batches.
+
+    Runs on the QueueListener thread. Rotates the active file into a
+    timestamped segment when it exceeds ``max_bytes`` or is older than
+    ``rotate_interval_seconds`` and keeps at most ``backup_count`` segments.
+    """
+
+    def __init__(self,
+                 index: AuditLogIndex,
+                 batch_size: int = 100,
+                 max_bytes: int = 10 * 1024 * 1024,
+                 rotate_interval_seconds: Optional[float] = 24 * 3600,
+                 backup_count: int = 30):
+        super().__init__()
+        self.index = index
+        self.batch_size = max(1, batch_size)
+        self.max_bytes = max_bytes
+        self.rotate_interval_seconds = rotate_interval_seconds
+        self.backup_count = backup_count
+        self._buffer: List[Tuple[bytes, float, str, str]] = []
+        
+        # Files written before permissions were restricted may still be world-readable
+        for path in [index.index_path] + [index.path_for(s) for s in index.segments]:
+            if path.exists():
+                _restrict_permissions(path)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = (self.format(record) + "\n").encode("utf-8")
+            timestamp = getattr(record, "audit_time", record.created)
+            event_type = getattr(record, "audit_event_type", "unknown")
+            severity = getattr(record, "audit_severity", "unknown")
+            self._buffer.append((line, timestamp, event_type, severity))
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+
+        with self.index.lock:
+            if self._should_rotate():
+                self._rotate()
+
+            path = self.index.log_file_path
+            is_new = not path.exists()
+            with open(path, "ab") as f:
+                offset = f.tell()
+                for line, timestamp, event_type, severity in batch:
+                    f.write(line)
+                    self.index.active.add(offset, len(line), timestamp, event_type, severity)
+                    offset += len(line)
+            if is_new:
+                _restrict_permissions(path)
+
+            self.index.save()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+    def _should_rotate(self) -> bool:
+        active = self.index.active
+        if active.size == 0:
+            return False
+        if self.max_bytes and active.size >= self.max_bytes:
+            return True
+        return bool(self.rotate_interval_seconds) and time.time() - active.created_at >= self.rotate_interval_seconds
+
+    def _rotate(self) -> None:
+        active = self.index.active
+        stamp = datetime.fromtimestamp(active.created_at, timezone.utc).strftime("%Y%m%dT%H%M%S")
+        rotated_name = f"{self.index.log_file_path.name}.{stamp}"
+        suffix = 1
+        while self.index.log_file_path.with_name(rotated_name).exists():
+            rotated_name = f"{self.index.log_file_path.name}.{stamp}-{suffix}"
+            suffix += 1
+
+        os.replace(self.index.log_file_path, self.index.log_file_path.with_name(rotated_name))
+        active.file_name = rotated_name
+        self.index.start_new_active()
+
+        rotated = self.index.segments[:-1]
+        while self.backup_count >= 0 and len(rotated) > self.backup_count:
+            expired = rotated.pop(0)
+            self.index.segments.remove(expired)
+            try:
+                self.index.path_for(expired).unlink()
+            except OSError:
+                pass
+
+
+class _FlushRequest:
+    """Queue marker asking the listener to write everything before it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers when idle and on request."""
+
+    def __init__(self, log_queue, *handlers, flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                self._flush_handlers()
+
+    def handle(self, record) -> None:
+        if isinstance(record, _FlushRequest):
+            self._flush_handlers()
+            record.done.set()
+            return
+        super().handle(record)
+
+    def request_flush(self, timeout: float = 5.0) -> bool:
+        """Block until every record queued so far has been written."""
+        if self._thread is None:
+            self._flush_handlers()
+            return True
+        request = _FlushRequest()
+        self.queue.put_nowait(request)
+        return request.done.wait(timeout)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            super().stop()
+        self._flush_handlers()
+
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+
+def _restrict_permissions(path: Path) -> None:
+    # Owner read/write only; best effort on platforms without POSIX modes
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        pass
@@ -3,10 +3,16 @@ Security Audit Logging Framework for MCP Task Orchestrator
 
 Implements comprehensive security event logging for audit trails, compliance,
 and security monitoring. Follows security-first design principles.
+
+Events are queued on the request path and written in batches by a background
+listener thread; see audit_log_storage for rotation and the query index.
 """
 
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime, timezone
 from enum import Enum
@@ -14,6 +20,11 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 import os
 
+from .audit_log_storage import (
+    AuditLogIndex, BatchingAuditFileHandler, BatchingQueueListener,
+    entry_timestamp, parse_line
+)
+
 class SecurityEventType(Enum):
     """
     Types of security events that should be logged for audit trails.
@@ -75,7 +86,12 @@ class SecurityAuditLogger:
     
     def __init__(self, log_file_path: Optional[str] = None, 
                  enable_console: bool = False,
-                 enable_syslog: bool = False):
+                 enable_syslog: bool = False,
+                 max_bytes: int = 10 * 1024 * 1024,
+                 rotate_interval_hours: Optional[float] = 24,
+                 backup_count: int = 30,
+                 batch_size: int = 100,
+                 flush_interval: float = 1.0):
         """
         Initialize security audit logger.
         
@@ -83,6 +99,11 @@ class SecurityAuditLogger:
             log_file_path: Path to security audit log file
             enable_console: Whether to also log to console (stderr)
             enable_syslog: Whether to send events to syslog
+            max_bytes: Rotate the active log file once it reaches this size
+            rotate_interval_hours: Rotate the active log file after this age (None to disable)
+            backup_count: Number of rotated segments to keep
+            batch_size: Buffered events that trigger a write
+            flush_interval: Seconds after which buffered events are written when idle
         """
         # Set up log file path
         if log_file_path:
@@ -103,8 +124,15 @@ class SecurityAuditLogger:
         # Remove existing handlers to avoid duplicates
         self.logger.handlers.clear()
         
-        # Set up file handler with secure permissions
-        file_handler = logging.FileHandler(self.log_file_path, mode='a', encoding='utf-8')
+        # Batched file writer with rotation and a side index for queries
+        self._index = AuditLogIndex(self.log_file_path)
+        file_handler = BatchingAuditFileHandler(
+            self._index,
+            batch_size=batch_size,
+            max_bytes=max_bytes,
+            rotate_interval_seconds=rotate_interval_hours * 3600 if rotate_interval_hours else None,
+            backup_count=backup_count
+        )
         file_handler.setLevel(logging.INFO)
         
         # JSON formatter for structured logging
@@ -112,20 +140,14 @@ class SecurityAuditLogger:
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
-        
-        # Set secure file permissions (owner read/write only)
-        try:
-            os.chmod(self.log_file_path, 0o600)
-        except OSError:
-            pass  # Best effort - may fail on some systems
+        handlers: List[logging.Handler] = [file_handler]
         
         # Optional console logging (stderr for MCP compliance)
         if enable_console:
             console_handler = logging.StreamHandler(sys.stderr)
             console_handler.setLevel(logging.WARNING)  # Only warnings+ to console
             console_handler.setFormatter(formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
         
         # Optional syslog integration
         if enable_syslog:
@@ -137,11 +159,18 @@ class SecurityAuditLogger:
                     'mcp_task_orchestrator[%(process)d]: %(message)s'
                 )
                 syslog_handler.setFormatter(syslog_formatter)
-                self.logger.addHandler(syslog_handler)
+                handlers.append(syslog_handler)
             except (ImportError, FileNotFoundError, AttributeError, OSError):
                 # Syslog not available on this system (Unix sockets not supported on Windows)
                 pass
         
+        # Request path only enqueues; the listener thread formats and writes
+        self._queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener = BatchingQueueListener(self._queue, *handlers, flush_interval=flush_interval)
+        self._listener.start()
+        atexit.register(self.close)
+        
         # Log initialization
         self.log_event(
             SecurityEventType.SERVER_START,
@@ -188,15 +217,34 @@ class SecurityAuditLogger:
         # Convert to JSON string for structured logging
         json_message = json.dumps(log_entry, separators=(',', ':'))
         
+        # Index keys travel with the record so the writer need not re-parse the JSON
+        index_fields = {
+            "audit_time": entry_timestamp(log_entry),
+            "audit_event_type": event_type.value,
+            "audit_severity": severity.value
+        }
+        
         # Log at appropriate level based on severity
         if severity == SecurityLevel.CRITICAL:
-            self.logger.critical(json_message)
+            self.logger.critical(json_message, extra=index_fields)
         elif severity == SecurityLevel.HIGH:
-            self.logger.error(json_message)
+            self.logger.error(json_message, extra=index_fields)
         elif severity == SecurityLevel.MEDIUM:
-            self.logger.warning(json_message)
+            self.logger.warning(json_message, extra=index_fields)
         else:
-            self.logger.info(json_message)
+            self.logger.info(json_message, extra=index_fields)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until all events logged so far are written to disk."""
+        return self._listener.request_flush(timeout)
+    
+    def close(self) -> None:
+        """Write pending events and stop the background writer."""
+        atexit.unregister(self.close)
+        try:
+            self._listener.stop()
+        except Exception:
+            pass
     
     def log_authentication_success(self, user_id: str, 
                                   details: Optional[Dict[str, Any]] = None) -> None:
@@ -354,102 +402,86 @@ class SecurityAuditLogger:
     
     def get_recent_events(self, hours: int = 24,
                          event_types: Optional[List[SecurityEventType]] = None,
-                         severity_levels: Optional[List[SecurityLevel]] = None) -> List[Dict[str, Any]]:
+                         severity_levels: Optional[List[SecurityLevel]] = None,
+                         limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Retrieve recent security events from the log file.
         
+        Only the log segments and hours that overlap the window are read,
+        starting at the indexed offset of the first relevant hour.
+        
         Args:
             hours: Number of hours back to search
             event_types: Filter by specific event types
             severity_levels: Filter by severity levels
+            limit: Return at most this many (newest) events
             
         Returns:
             List of matching log entries
         """
-        if not self.log_file_path.exists():
-            return []
-        
-        events = []
+        self.flush()
         cutoff_time = datetime.now(timezone.utc).timestamp() - (hours * 3600)
+        event_type_values = {et.value for et in event_types} if event_types else None
+        severity_values = {sl.value for sl in severity_levels} if severity_levels else None
         
-        try:
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    
-                    try:
-                        # Parse JSON log entry
-                        parts = line.strip().split(' - ', 3)
-                        if len(parts) >= 4:
-                            json_part = parts[3]
-                            event = json.loads(json_part)
-                            
-                            # Parse timestamp
-                            event_time = datetime.fromisoformat(
-                                event['timestamp'].replace('Z', '+00:00')
-                            ).timestamp()
-                            
-                            # Filter by time
-                            if event_time < cutoff_time:
-                                continue
-                            
-                            # Filter by event type
-                            if event_types:
-                                event_type_values = [et.value for et in event_types]
-                                if event.get('event_type') not in event_type_values:
-                                    continue
-                            
-                            # Filter by severity
-                            if severity_levels:
-                                severity_values = [sl.value for sl in severity_levels]
-                                if event.get('severity') not in severity_values:
-                                    continue
-                            
-                            events.append(event)
-                    
-                    except (json.JSONDecodeError, KeyError, ValueError):
-                        # Skip malformed log entries
-                        continue
-        
-        except IOError:
-            # Log file not accessible
-            pass
+        events = []
+        for event in self._read_events_since(cutoff_time):
+            # Filter by event type
+            if event_type_values and event.get('event_type') not in event_type_values:
+                continue
+            
+            # Filter by severity
+            if severity_values and event.get('severity') not in severity_values:
+                continue
+            
+            events.append(event)
         
         # Sort by timestamp (newest first)
         events.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        return events
+        return events[:limit] if limit is not None else events
     
     def get_security_summary(self, hours: int = 24) -> Dict[str, Any]:
         """
         Get a summary of recent security events.
         
+        Whole hours inside the window are answered from the index counters;
+        only the partial hour at the start of the window is read from disk.
+        
         Args:
             hours: Number of hours back to analyze
             
         Returns:
             Dictionary with security event statistics
         """
-        events = self.get_recent_events(hours)
+        self.flush()
+        cutoff_time = datetime.now(timezone.utc).timestamp() - (hours * 3600)
         
         # Count events by type and severity
-        event_type_counts = {}
-        severity_counts = {}
+        event_type_counts: Dict[str, int] = {}
+        severity_counts: Dict[str, int] = {}
         
-        for event in events:
-            event_type = event.get('event_type', 'unknown')
-            severity = event.get('severity', 'unknown')
-            
-            event_type_counts[event_type] = event_type_counts.get(event_type, 0) + 1
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        def count(counts: Dict[str, int], key: str, amount: int = 1) -> None:
+            counts[key] = counts.get(key, 0) + amount
+        
+        for path, segment in self._index.select(cutoff_time):
+            for hour, bucket, end in list(segment.ranges()):
+                if hour * 3600 >= cutoff_time:
+                    for event_type, amount in bucket.event_types.items():
+                        count(event_type_counts, event_type, amount)
+                    for severity, amount in bucket.severities.items():
+                        count(severity_counts, severity, amount)
+                elif (hour + 1) * 3600 > cutoff_time:
+                    for event in self._read_range(path, bucket.offset, end, cutoff_time):
+                        count(event_type_counts, event.get('event_type', 'unknown'))
+                        count(severity_counts, event.get('severity', 'unknown'))
         
         return {
             "period_hours": hours,
-            "total_events": len(events),
+            "total_events": sum(event_type_counts.values()),
             "event_types": event_type_counts,
             "severity_levels": severity_counts,
-            "recent_critical": len([e for e in events if e.get('severity') == 'critical']),
-            "recent_high": len([e for e in events if e.get('severity') == 'high']),
+            "recent_critical": severity_counts.get('critical', 0),
+            "recent_high": severity_counts.get('high', 0),
             "auth_failures": event_type_counts.get('authentication_failure', 0),
             "authz_failures": event_type_counts.get('authorization_failure', 0),
             "attack_attempts": (
@@ -458,6 +490,40 @@ class SecurityAuditLogger:
                 event_type_counts.get('injection_attempt_detected', 0)
             )
         }
+    
+    def _read_events_since(self, cutoff_time: float) -> List[Dict[str, Any]]:
+        """Read entries at or after cutoff_time, seeking to the first relevant hour."""
+        events = []
+        for path, segment in self._index.select(cutoff_time):
+            start = segment.size
+            for hour, bucket, _ in segment.ranges():
+                if (hour + 1) * 3600 > cutoff_time:
+                    start = bucket.offset
+                    break
+            events.extend(self._read_range(path, start, segment.size, cutoff_time))
+        return events
+    
+    @staticmethod
+    def _read_range(path: Path, start: int, end: int, cutoff_time: float) -> List[Dict[str, Any]]:
+        events = []
+        try:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                for raw in f.read(max(0, end - start)).splitlines():
+                    # Skip malformed log entries
+                    event = parse_line(raw.decode('utf-8', errors='replace'))
+                    if event is None:
+                        continue
+                    try:
+                        if entry_timestamp(event) < cutoff_time:
+                            continue
+                    except (KeyError, ValueError):
+                        continue
+                    events.append(event)
+        except IOError:
+            # Log file not accessible
+            pass
+        return events
 
 
 # Global security audit logger instance
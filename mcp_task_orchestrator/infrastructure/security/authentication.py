@@ -5,9 +5,12 @@ Implements API key management with secure hashing, key generation, and validatio
 Follows security-first design principles with comprehensive audit logging.
 """
 
+import atexit
 import hashlib
 import logging
+import os
 import secrets
+import threading
 import time
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
@@ -28,14 +31,36 @@ class APIKeyManager:
     - Key expiration support
     - Rate limiting integration points
     - Comprehensive audit logging
+    
+    Validation never touches the disk: usage statistics are kept in memory
+    and written every ``usage_flush_interval`` seconds and at shutdown, and
+    recent successful validations are cached per key hash for
+    ``validation_cache_ttl`` seconds. Key file writes are atomic.
     """
     
-    def __init__(self, storage_path: Optional[str] = None):
-        """Initialize API key manager with secure storage."""
+    def __init__(self, storage_path: Optional[str] = None,
+                 usage_flush_interval: float = 30.0,
+                 validation_cache_ttl: float = 60.0):
+        """
+        Initialize API key manager with secure storage.
+        
+        Args:
+            storage_path: Path of the JSON key file
+            usage_flush_interval: Seconds between writes of accumulated usage statistics
+            validation_cache_ttl: Seconds a successful validation is cached (0 disables)
+        """
         self.storage_path = Path(storage_path or ".task_orchestrator/api_keys.json")
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.usage_flush_interval = usage_flush_interval
+        self.validation_cache_ttl = validation_cache_ttl
         self._keys: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+        # key hash -> monotonic deadline until which the key is known valid
+        self._validation_cache: Dict[str, float] = {}
+        self._usage_dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
         self._load_keys()
+        atexit.register(self.flush_usage)
     
     def generate_api_key(self, description: str = "Generated API Key", 
                         expires_days: Optional[int] = None) -> str:
@@ -70,8 +95,9 @@ class APIKeyManager:
             "is_active": True
         }
         
-        self._keys[key_hash] = key_data
-        self._save_keys()
+        with self._lock:
+            self._keys[key_hash] = key_data
+            self._save_keys()
         
         # Log key generation for security audit
         security_logger.info(
@@ -96,30 +122,38 @@ class APIKeyManager:
             return False, None
         
         key_hash = self._hash_key(api_key)
-        key_data = self._keys.get(key_hash)
-        
-        if not key_data:
-            security_logger.warning("API key validation failed: key not found")
-            return False, None
+        now = datetime.now(timezone.utc).timestamp()
         
-        # Check if key is active
-        if not key_data.get("is_active", False):
-            security_logger.warning("API key validation failed: key inactive")
-            return False, None
-        
-        # Check expiration
-        expires_at = key_data.get("expires_at")
-        if expires_at and datetime.now(timezone.utc).timestamp() > expires_at:
-            security_logger.warning("API key validation failed: key expired")
-            return False, None
-        
-        # Update usage statistics
-        key_data["last_used"] = datetime.now(timezone.utc).timestamp()
-        key_data["usage_count"] = key_data.get("usage_count", 0) + 1
-        self._save_keys()
+        with self._lock:
+            key_data = self._keys.get(key_hash)
+            
+            if not key_data:
+                security_logger.warning("API key validation failed: key not found")
+                return False, None
+            
+            cached_until = self._validation_cache.get(key_hash)
+            if cached_until is None or time.monotonic() >= cached_until:
+                # Check if key is active
+                if not key_data.get("is_active", False):
+                    security_logger.warning("API key validation failed: key inactive")
+                    return False, None
+                
+                # Check expiration
+                expires_at = key_data.get("expires_at")
+                if expires_at and now > expires_at:
+                    security_logger.warning("API key validation failed: key expired")
+                    return False, None
+                
+                self._cache_validation(key_hash, expires_at, now)
+            
+            # Update usage statistics in memory; written by the periodic flush
+            key_data["last_used"] = now
+            key_data["usage_count"] = key_data.get("usage_count", 0) + 1
+            self._mark_usage_dirty()
+            result = key_data.copy()
         
         security_logger.info(f"API key validated successfully: {key_hash[:16]}...")
-        return True, key_data.copy()
+        return True, result
     
     def revoke_api_key(self, api_key: str) -> bool:
         """
@@ -132,15 +166,18 @@ class APIKeyManager:
             bool: True if key was successfully revoked
         """
         key_hash = self._hash_key(api_key)
-        key_data = self._keys.get(key_hash)
         
-        if not key_data:
-            security_logger.warning("Attempted to revoke non-existent key")
-            return False
-        
-        key_data["is_active"] = False
-        key_data["revoked_at"] = datetime.now(timezone.utc).timestamp()
-        self._save_keys()
+        with self._lock:
+            key_data = self._keys.get(key_hash)
+            
+            if not key_data:
+                security_logger.warning("Attempted to revoke non-existent key")
+                return False
+            
+            key_data["is_active"] = False
+            key_data["revoked_at"] = datetime.now(timezone.utc).timestamp()
+            self._validation_cache.pop(key_hash, None)
+            self._save_keys()
         
         security_logger.info(f"API key revoked: {key_hash[:16]}...")
         return True
@@ -153,12 +190,13 @@ class APIKeyManager:
             List of key metadata dictionaries
         """
         active_keys = []
-        for key_hash, key_data in self._keys.items():
-            if key_data.get("is_active", False):
-                # Return safe metadata without the hash
-                safe_data = key_data.copy()
-                safe_data["key_id"] = key_hash[:16] + "..."  # Partial hash for identification
-                active_keys.append(safe_data)
+        with self._lock:
+            for key_hash, key_data in self._keys.items():
+                if key_data.get("is_active", False):
+                    # Return safe metadata without the hash
+                    safe_data = key_data.copy()
+                    safe_data["key_id"] = key_hash[:16] + "..."  # Partial hash for identification
+                    active_keys.append(safe_data)
         
         return active_keys
     
@@ -172,19 +210,64 @@ class APIKeyManager:
         current_time = datetime.now(timezone.utc).timestamp()
         expired_keys = []
         
-        for key_hash, key_data in self._keys.items():
-            expires_at = key_data.get("expires_at")
-            if expires_at and current_time > expires_at:
-                expired_keys.append(key_hash)
+        with self._lock:
+            for key_hash, key_data in self._keys.items():
+                expires_at = key_data.get("expires_at")
+                if expires_at and current_time > expires_at:
+                    expired_keys.append(key_hash)
+            
+            for key_hash in expired_keys:
+                del self._keys[key_hash]
+                self._validation_cache.pop(key_hash, None)
+            
+            if expired_keys:
+                self._save_keys()
+                security_logger.info(f"Cleaned up {len(expired_keys)} expired API keys")
         
-        for key_hash in expired_keys:
-            del self._keys[key_hash]
+        return len(expired_keys)
+    
+    def flush_usage(self) -> bool:
+        """
+        Write accumulated usage statistics to storage.
         
-        if expired_keys:
+        Returns:
+            bool: True if there was anything to write
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._usage_dirty:
+                return False
             self._save_keys()
-            security_logger.info(f"Cleaned up {len(expired_keys)} expired API keys")
-        
-        return len(expired_keys)
+            return True
+    
+    def close(self) -> None:
+        """Write pending usage statistics and drop the exit hook."""
+        atexit.unregister(self.flush_usage)
+        self.flush_usage()
+    
+    def _mark_usage_dirty(self) -> None:
+        """Schedule a usage flush unless one is already pending. Caller holds the lock."""
+        self._usage_dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.usage_flush_interval, self._flush_usage_from_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _flush_usage_from_timer(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+        self.flush_usage()
+    
+    def _cache_validation(self, key_hash: str, expires_at: Optional[float], now: float) -> None:
+        """Remember a successful validation, never past the key's expiry. Caller holds the lock."""
+        if self.validation_cache_ttl <= 0:
+            return
+        ttl = self.validation_cache_ttl
+        if expires_at:
+            ttl = min(ttl, expires_at - now)
+        self._validation_cache[key_hash] = time.monotonic() + ttl
     
     def _hash_key(self, api_key: str) -> str:
         """
@@ -213,14 +296,20 @@ class APIKeyManager:
             self._keys = {}
     
     def _save_keys(self) -> None:
-        """Save API keys to secure storage."""
-        try:
-            with open(self.storage_path, 'w') as f:
-                json.dump(self._keys, f, indent=2)
-            # Set restrictive permissions (owner read/write only)
-            self.storage_path.chmod(0o600)
-        except Exception as e:
-            security_logger.error(f"Failed to save API keys: {str(e)}")
+        """Save API keys to secure storage atomically (tmp file + rename)."""
+        tmp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+        with self._lock:
+            try:
+                # Create with restrictive permissions (owner read/write only)
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(self._keys, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.storage_path)
+                self._usage_dirty = False
+            except Exception as e:
+                security_logger.error(f"Failed to save API keys: {str(e)}")
 
 
 class AuthenticationValidator:
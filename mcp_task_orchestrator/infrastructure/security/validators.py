@@ -76,12 +76,42 @@ class XSSValidator:
         r'&#[0-9]+;',          # Decimal encoded
     ]
     
+    # Every dangerous pattern requires one of these literal characters, so a
+    # pattern only needs to run when its trigger occurs in the input
+    TRIGGER_CHARACTERS = '<:(=@&'
+    
     def __init__(self):
         """Initialize XSS validator with compiled patterns."""
         self.compiled_patterns = [
             re.compile(pattern, re.IGNORECASE | re.DOTALL) 
             for pattern in self.DANGEROUS_PATTERNS
         ]
+        self._trigger_pattern = re.compile(f'[{re.escape(self.TRIGGER_CHARACTERS)}]')
+        self._patterns_by_trigger: Dict[str, List[re.Pattern]] = {}
+        for source, compiled in zip(self.DANGEROUS_PATTERNS, self.compiled_patterns):
+            self._patterns_by_trigger.setdefault(self._trigger_for(source), []).append(compiled)
+    
+    @classmethod
+    def _trigger_for(cls, pattern: str) -> str:
+        """The trigger character a pattern cannot match without."""
+        # Drop repetitions and character classes; what remains must match literally
+        literal = re.sub(r'\\s\*|\[[^\]]*\][*+]?|\.\*\?', '', pattern)
+        for character in cls.TRIGGER_CHARACTERS:
+            if character in literal:
+                return character
+        raise ValueError(f"XSS pattern has no trigger character: {pattern}")
+    
+    def contains_dangerous_pattern(self, value: str) -> bool:
+        """Return True if any of DANGEROUS_PATTERNS matches the value."""
+        # Clean text (no trigger characters at all) skips every regex
+        if not self._trigger_pattern.search(value):
+            return False
+        for trigger, patterns in self._patterns_by_trigger.items():
+            if trigger in value:
+                for pattern in patterns:
+                    if pattern.search(value):
+                        return True
+        return False
     
     def validate_input(self, value: str, field_name: str = "input") -> str:
         """
@@ -103,15 +133,14 @@ class XSSValidator:
         original_value = value
         
         # Check for dangerous patterns
-        for pattern in self.compiled_patterns:
-            if pattern.search(value):
-                security_logger.warning(
-                    f"XSS attempt detected in field '{field_name}': pattern matched"
-                )
-                raise ValidationError(
-                    f"Potentially malicious content detected in {field_name}",
-                    error_code="XSS_DETECTED"
-                )
+        if self.contains_dangerous_pattern(value):
+            security_logger.warning(
+                f"XSS attempt detected in field '{field_name}': pattern matched"
+            )
+            raise ValidationError(
+                f"Potentially malicious content detected in {field_name}",
+                error_code="XSS_DETECTED"
+            )
         
         # HTML entity encode as additional protection
         sanitized_value = html.escape(value, quote=True)
@@ -25,6 +25,12 @@ from .context import (
     ExecutionContext
 )
 
+from .git_operations import (
+    AsyncGitClient,
+    GitCommandResult,
+    get_git_client
+)
+
 from .builtin_hooks import (
     GitBranchHook,
     WorkspaceSetupHook,
@@ -61,6 +67,11 @@ __all__ = [
     'ContextBuilder',
     'ExecutionContext',
     
+    # Git helper
+    'AsyncGitClient',
+    'GitCommandResult',
+    'get_git_client',
+    
     # Built-in hooks
     'GitBranchHook',
     'WorkspaceSetupHook', 
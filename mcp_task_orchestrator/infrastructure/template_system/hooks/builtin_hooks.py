@@ -9,16 +9,15 @@ Provides executive dysfunction-aware hook implementations for:
 - Progress tracking and checkpointing
 """
 
-import asyncio
 import os
 import json
-import subprocess
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import logging
 
 from .base import Hook, ExecutiveDysfunctionHook, HookContext, HookResult, HookExecutionError
+from .git_operations import get_git_client
 
 logger = logging.getLogger(__name__)
 
@@ -51,8 +50,10 @@ class GitBranchHook(ExecutiveDysfunctionHook):
             # Generate branch name automatically (no user decision needed)
             branch_name = self._generate_branch_name(context)
             
+            git = get_git_client(context)
+            
             # Check if we're in a git repository
-            if not self._is_git_repository(context.workspace_path):
+            if not await git.is_repository():
                 return HookResult(
                     success=True,
                     hook_id=self.hook_id,
@@ -61,13 +62,11 @@ class GitBranchHook(ExecutiveDysfunctionHook):
                     cognitive_load_impact="reduced"
                 )
             
-            # Check if branch already exists
-            if self._branch_exists(branch_name, context.workspace_path):
-                # Use existing branch or create variant
-                branch_name = self._create_unique_branch_name(branch_name, context.workspace_path)
+            # Pick a free name from a single branch listing
+            branch_name = await git.unique_branch_name(branch_name)
             
             # Create and switch to branch
-            success = await self._create_and_checkout_branch(branch_name, context.workspace_path)
+            success = await self._create_and_checkout_branch(branch_name, context)
             
             if success:
                 self._created_branches.append(branch_name)
@@ -125,11 +124,13 @@ class GitBranchHook(ExecutiveDysfunctionHook):
             )
         
         try:
+            git = get_git_client(context)
+            
             # Switch to main/master before deleting
-            await self._checkout_main_branch(context.workspace_path)
+            await git.checkout_main_branch()
             
             # Delete the created branch
-            success = await self._delete_branch(branch_name, context.workspace_path)
+            success = (await git.delete_branch(branch_name)).success
             
             if success and branch_name in self._created_branches:
                 self._created_branches.remove(branch_name)
@@ -169,93 +170,16 @@ class GitBranchHook(ExecutiveDysfunctionHook):
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         return f"template/{template_part}-{timestamp}"
     
-    def _is_git_repository(self, workspace_path: str) -> bool:
-        """Check if directory is a git repository."""
-        git_dir = Path(workspace_path) / ".git"
-        return git_dir.exists()
-    
-    def _branch_exists(self, branch_name: str, workspace_path: str) -> bool:
-        """Check if branch exists."""
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--verify", f"refs/heads/{branch_name}"],
-                cwd=workspace_path,
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
-    
-    def _create_unique_branch_name(self, base_name: str, workspace_path: str) -> str:
-        """Create unique branch name if base name exists."""
-        counter = 1
-        while True:
-            candidate = f"{base_name}-{counter}"
-            if not self._branch_exists(candidate, workspace_path):
-                return candidate
-            counter += 1
-    
-    async def _create_and_checkout_branch(self, branch_name: str, workspace_path: str) -> bool:
+    async def _create_and_checkout_branch(self, branch_name: str, context: HookContext) -> bool:
         """Create and checkout git branch."""
-        try:
-            # Create branch
-            create_result = await asyncio.create_subprocess_exec(
-                "git", "checkout", "-b", branch_name,
-                cwd=workspace_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await create_result.communicate()
-            
-            if create_result.returncode == 0:
-                logger.info(f"Created and checked out branch: {branch_name}")
-                return True
-            else:
-                logger.error(f"Failed to create branch {branch_name}: {stderr.decode()}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Git branch creation error: {e}")
-            return False
-    
-    async def _checkout_main_branch(self, workspace_path: str) -> bool:
-        """Checkout main or master branch."""
-        for branch in ["main", "master"]:
-            try:
-                checkout_result = await asyncio.create_subprocess_exec(
-                    "git", "checkout", branch,
-                    cwd=workspace_path,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await checkout_result.communicate()
-                
-                if checkout_result.returncode == 0:
-                    return True
-                    
-            except Exception:
-                continue
+        result = await get_git_client(context).create_and_checkout_branch(branch_name)
+        
+        if result.success:
+            logger.info(f"Created and checked out branch: {branch_name}")
+            return True
         
+        logger.error(f"Failed to create branch {branch_name}: {result.stderr}")
         return False
-    
-    async def _delete_branch(self, branch_name: str, workspace_path: str) -> bool:
-        """Delete git branch."""
-        try:
-            delete_result = await asyncio.create_subprocess_exec(
-                "git", "branch", "-D", branch_name,
-                cwd=workspace_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await delete_result.communicate()
-            return delete_result.returncode == 0
-            
-        except Exception:
-            return False
 
 
 class WorkspaceSetupHook(ExecutiveDysfunctionHook):
@@ -787,8 +711,10 @@ class CommitHook(ExecutiveDysfunctionHook):
             # Generate commit message automatically
             commit_message = self._generate_commit_message(context)
             
+            git = get_git_client(context)
+            
             # Check if there are changes to commit
-            has_changes = await self._has_git_changes(context.workspace_path)
+            has_changes = await git.has_changes()
             
             if not has_changes:
                 return HookResult(
@@ -800,7 +726,7 @@ class CommitHook(ExecutiveDysfunctionHook):
                 )
             
             # Stage and commit changes
-            success = await self._stage_and_commit(commit_message, context.workspace_path)
+            success = (await git.commit_all(commit_message)).success
             
             if success:
                 context.metadata["last_commit_message"] = commit_message
@@ -861,51 +787,6 @@ class CommitHook(ExecutiveDysfunctionHook):
                f"Phase: {phase} ({context.phase_index + 1}/{context.total_phases})\n" \
                f"Execution ID: {context.execution_id}\n" \
                f"\nAutomatically generated commit - no manual decisions required."
-    
-    async def _has_git_changes(self, workspace_path: str) -> bool:
-        """Check if there are uncommitted changes."""
-        try:
-            status_result = await asyncio.create_subprocess_exec(
-                "git", "status", "--porcelain",
-                cwd=workspace_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await status_result.communicate()
-            return len(stdout.strip()) > 0
-            
-        except Exception:
-            return False
-    
-    async def _stage_and_commit(self, commit_message: str, workspace_path: str) -> bool:
-        """Stage all changes and commit."""
-        try:
-            # Stage all changes
-            add_result = await asyncio.create_subprocess_exec(
-                "git", "add", "-A",
-                cwd=workspace_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            await add_result.communicate()
-            if add_result.returncode != 0:
-                return False
-            
-            # Commit changes
-            commit_result = await asyncio.create_subprocess_exec(
-                "git", "commit", "-m", commit_message,
-                cwd=workspace_path,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            await commit_result.communicate()
-            return commit_result.returncode == 0
-            
-        except Exception:
-            return False
 
 
 class NotificationHook(Hook):
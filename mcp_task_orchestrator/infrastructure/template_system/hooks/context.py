@@ -6,14 +6,16 @@ with executive dysfunction-aware features for seamless workflow continuation.
 """
 
 import asyncio
+import atexit
 import json
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Set, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
 
 from .base import HookContext
+from .context_persistence import ContextPersister
 
 logger = logging.getLogger(__name__)
 
@@ -133,11 +135,16 @@ class ContextManager:
     with automatic checkpointing for executive dysfunction support.
     """
     
-    def __init__(self, base_workspace_dir: Optional[Path] = None):
+    def __init__(self, base_workspace_dir: Optional[Path] = None, persist_debounce_seconds: float = 2.0):
         self.base_workspace_dir = base_workspace_dir or Path.cwd() / ".task_orchestrator"
         self.context_storage_dir = self.base_workspace_dir / "execution_contexts"
         self.context_storage_dir.mkdir(parents=True, exist_ok=True)
         
+        # Write-behind persistence: updates are coalesced, checkpoints are logged as deltas
+        self._persister = ContextPersister(self.context_storage_dir, debounce_seconds=persist_debounce_seconds)
+        # Debounced updates must not be lost if the process exits without close()
+        atexit.register(self._persister.flush_blocking)
+        
         # Active contexts (in-memory)
         self._active_contexts: Dict[str, ExecutionContext] = {}
         
@@ -210,12 +217,12 @@ class ContextManager:
         # Store in active contexts
         self._active_contexts[execution_id] = context
         
-        # Persist context
-        await self._persist_context(context)
-        
         # Create initial checkpoint
         await self.create_checkpoint(context, "initialization", "Initial execution context created")
         
+        # Persist immediately so the execution is recoverable from the start
+        await self._persister.write_now(context)
+        
         logger.info(f"Created execution context: {execution_id} with ED support")
         
         return context
@@ -365,10 +372,8 @@ class ContextManager:
         context.checkpoint_history.append(checkpoint_data)
         context.recovery_hints[checkpoint_name] = checkpoint_data["recovery_hints"]
         
-        # Save checkpoint to separate file
-        checkpoint_file = self.context_storage_dir / f"{checkpoint_id}.json"
-        with open(checkpoint_file, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2, default=str)
+        # Append checkpoint delta to the execution's checkpoint log
+        self._persister.append_checkpoint(context.execution_id, checkpoint_data)
         
         logger.debug(f"Created checkpoint: {checkpoint_name} for {context.execution_id}")
         
@@ -451,6 +456,10 @@ class ContextManager:
             return False
         
         try:
+            # Write out pending updates before archiving
+            await self._persister.write_now(context)
+            self._persister.discard(execution_id)
+            
             # Archive context before cleanup
             await self._archive_context(context, preserve_artifacts)
             
@@ -492,35 +501,25 @@ class ContextManager:
         
         return contexts_info
     
+    async def flush(self) -> None:
+        """Write all pending context updates to disk."""
+        await self._persister.flush()
+    
+    async def close(self) -> None:
+        """Write pending context updates and stop deferred persistence (call on shutdown)."""
+        atexit.unregister(self._persister.flush_blocking)
+        await self._persister.close()
+    
     async def _persist_context(self, context: ExecutionContext) -> None:
-        """Persist execution context to disk."""
-        context_file = self.context_storage_dir / f"{context.execution_id}_context.json"
-        
-        # Convert context to serializable format
-        context_dict = asdict(context)
-        context_dict["active_agents"] = list(context_dict["active_agents"])  # Convert set to list
-        
-        with open(context_file, 'w') as f:
-            json.dump(context_dict, f, indent=2, default=str)
+        """Schedule a debounced, atomic write of the execution context."""
+        await self._persister.schedule(context)
     
     async def _load_context(self, execution_id: str) -> Optional[ExecutionContext]:
-        """Load execution context from disk."""
-        context_file = self.context_storage_dir / f"{execution_id}_context.json"
-        
-        if not context_file.exists():
-            return None
-        
+        """Load execution context from its snapshot and checkpoint log."""
         try:
-            with open(context_file, 'r') as f:
-                context_dict = json.load(f)
-            
-            # Convert timestamps back to datetime objects
-            for timestamp_field in ["started_at", "last_activity_at", "current_phase_started_at"]:
-                if timestamp_field in context_dict and context_dict[timestamp_field]:
-                    context_dict[timestamp_field] = datetime.fromisoformat(context_dict[timestamp_field])
-            
-            # Convert active_agents back to set
-            context_dict["active_agents"] = set(context_dict["active_agents"])
+            context_dict = self._persister.load(execution_id)
+            if context_dict is None:
+                return None
             
             return ExecutionContext(**context_dict)
             
@@ -0,0 +1,239 @@
+"""
+Write-behind persistence for hook execution contexts.
+
+Context updates are coalesced within a debounce window and written as one
+compact JSON snapshot, atomically (tmp file + rename). Checkpoints are not
+part of the snapshot: each one is appended as a single line to a
+per-execution checkpoint log, and loading rebuilds the checkpoint history by
+replaying that log on top of the latest snapshot.
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import logging
+
+if TYPE_CHECKING:
+    from .context import ExecutionContext
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 2
+_DATETIME_FIELDS = ("started_at", "last_activity_at", "current_phase_started_at", "estimated_completion_at")
+_COMPACT_SEPARATORS = (",", ":")
+
+
+class ContextPersister:
+    """
+    Debounced, atomic persister for ExecutionContext snapshots.
+
+    Files per execution (in ``storage_dir``):
+    - ``{execution_id}_context.json``: latest compact snapshot
+    - ``{execution_id}_checkpoints.jsonl``: append-only checkpoint log
+    """
+
+    def __init__(self, storage_dir: Path, debounce_seconds: float = 2.0):
+        self.storage_dir = storage_dir
+        self.debounce_seconds = debounce_seconds
+
+        self._pending: Dict[str, "ExecutionContext"] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+
+        # Number of checkpoint log entries written per execution
+        self._checkpoint_counts: Dict[str, int] = {}
+
+        self.snapshots_requested = 0
+        self.snapshots_written = 0
+
+    def snapshot_path(self, execution_id: str) -> Path:
+        return self.storage_dir / f"{execution_id}_context.json"
+
+    def checkpoint_log_path(self, execution_id: str) -> Path:
+        return self.storage_dir / f"{execution_id}_checkpoints.jsonl"
+
+    async def schedule(self, context: "ExecutionContext") -> None:
+        """
+        Mark a context dirty and write it once the debounce window closes.
+
+        All updates made within the window are coalesced into one write.
+        With a debounce of 0 the snapshot is written immediately.
+        """
+        self.snapshots_requested += 1
+        self._pending[context.execution_id] = context
+
+        if self.debounce_seconds <= 0:
+            await self.flush(context.execution_id)
+            return
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_after_debounce())
+
+    async def flush(self, execution_id: Optional[str] = None) -> None:
+        """Write pending snapshots now (all, or only the given execution)."""
+        if execution_id is None:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        else:
+            context = self._pending.pop(execution_id, None)
+            pending = [context] if context is not None else []
+
+        for context in pending:
+            await self._write_snapshot(context)
+
+    async def close(self) -> None:
+        """Stop the deferred write and write everything still pending."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self.flush()
+
+    def flush_blocking(self) -> None:
+        """Write pending snapshots on the calling thread (no event loop needed)."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for context in pending:
+            try:
+                self._atomic_write(self.snapshot_path(context.execution_id), self._serialize(context))
+                self.snapshots_written += 1
+            except OSError as e:
+                logger.error(f"Failed to persist context {context.execution_id}: {e}")
+
+    async def write_now(self, context: "ExecutionContext") -> None:
+        """Write a snapshot immediately, superseding any pending write."""
+        self._pending.pop(context.execution_id, None)
+        await self._write_snapshot(context)
+
+    def discard(self, execution_id: str) -> None:
+        """Drop pending state for an execution that is being cleaned up."""
+        self._pending.pop(execution_id, None)
+        self._checkpoint_counts.pop(execution_id, None)
+
+    def append_checkpoint(self, execution_id: str, checkpoint_data: Dict[str, Any]) -> None:
+        """Append one checkpoint delta to the execution's checkpoint log."""
+        line = json.dumps(checkpoint_data, separators=_COMPACT_SEPARATORS, default=str)
+        with open(self.checkpoint_log_path(execution_id), "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+        self._checkpoint_counts[execution_id] = self._checkpoint_counts.get(execution_id, 0) + 1
+
+    def load(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the constructor arguments for an ExecutionContext.
+
+        Replays the checkpoint log on top of the snapshot. Checkpoints written
+        after the snapshot also restore the execution state they recorded, so
+        progress made inside an unflushed debounce window is not lost.
+        Legacy full snapshots (without a checkpoint log) load unchanged.
+        """
+        snapshot_file = self.snapshot_path(execution_id)
+        if not snapshot_file.exists():
+            return None
+
+        with open(snapshot_file, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+
+        if stored.get("format_version") == SNAPSHOT_FORMAT_VERSION:
+            context_dict = stored["context"]
+            snapshot_checkpoints = stored.get("checkpoint_count", 0)
+            checkpoints = self._read_checkpoint_log(execution_id)
+
+            context_dict["checkpoint_history"] = checkpoints
+            for checkpoint in checkpoints:
+                context_dict["recovery_hints"][checkpoint["checkpoint_name"]] = checkpoint.get("recovery_hints", {})
+            for checkpoint in checkpoints[snapshot_checkpoints:]:
+                self._apply_checkpoint_state(context_dict, checkpoint)
+
+            self._checkpoint_counts[execution_id] = len(checkpoints)
+        else:
+            context_dict = stored
+
+        for timestamp_field in _DATETIME_FIELDS:
+            value = context_dict.get(timestamp_field)
+            if isinstance(value, str) and value:
+                context_dict[timestamp_field] = datetime.fromisoformat(value)
+
+        context_dict["active_agents"] = set(context_dict.get("active_agents", []))
+        return context_dict
+
+    async def _flush_after_debounce(self) -> None:
+        try:
+            await asyncio.sleep(self.debounce_seconds)
+            await self.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Deferred context persistence failed: {e}")
+
+    async def _write_snapshot(self, context: "ExecutionContext") -> None:
+        """Serialize on the event loop, write atomically off the loop."""
+        payload = self._serialize(context)
+        target = self.snapshot_path(context.execution_id)
+
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+
+        async with self._write_lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._atomic_write, target, payload)
+
+        self.snapshots_written += 1
+
+    def _serialize(self, context: "ExecutionContext") -> bytes:
+        context_dict = {
+            f.name: getattr(context, f.name)
+            for f in fields(context)
+            if f.name != "checkpoint_history"
+        }
+        context_dict["active_agents"] = list(context.active_agents)
+
+        document = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "checkpoint_count": self._checkpoint_counts.get(context.execution_id, len(context.checkpoint_history)),
+            "context": context_dict
+        }
+        return json.dumps(document, separators=_COMPACT_SEPARATORS, default=str).encode("utf-8")
+
+    @staticmethod
+    def _atomic_write(target: Path, payload: bytes) -> None:
+        tmp_file = target.with_name(target.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, target)
+
+    def _read_checkpoint_log(self, execution_id: str) -> List[Dict[str, Any]]:
+        log_file = self.checkpoint_log_path(execution_id)
+        if not log_file.exists():
+            return []
+
+        checkpoints = []
+        with open(log_file, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    checkpoints.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-append is expected; skip it
+                    logger.warning(f"Skipping corrupt checkpoint log line {line_number} for {execution_id}")
+        return checkpoints
+
+    @staticmethod
+    def _apply_checkpoint_state(context_dict: Dict[str, Any], checkpoint: Dict[str, Any]) -> None:
+        state = checkpoint.get("execution_state", {})
+        for key in ("current_phase", "phase_index", "execution_status", "completed_phases"):
+            if key in state:
+                context_dict[key] = state[key]
+        if checkpoint.get("created_at"):
+            context_dict["last_activity_at"] = checkpoint["created_at"]
@@ -6,6 +6,8 @@ rollback capabilities, and executive function-friendly error handling.
 """
 
 import asyncio
+import heapq
+import itertools
 from typing import Dict, List, Set, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -13,6 +15,7 @@ import logging
 from collections import defaultdict, deque
 
 from .base import Hook, HookType, HookContext, HookResult, HookExecutionError
+from .registry import HookRegistry, get_hook_priority
 
 logger = logging.getLogger(__name__)
 
@@ -126,6 +129,37 @@ class DependencyGraph:
         
         return plan
     
+    def calculate_critical_path_lengths(self) -> Dict[str, float]:
+        """
+        Calculate the critical-path length from each hook to the end of the graph.
+        
+        The length of a hook is its own estimated execution time plus the longest
+        chain of dependents that can only start after it. Hooks without timing
+        history count as 1ms so that deep chains still rank above shallow ones.
+        
+        Returns:
+            Mapping of hook ID to estimated remaining critical-path time in ms
+        """
+        lengths: Dict[str, float] = {}
+        
+        def visit(hook_id: str) -> float:
+            if hook_id in lengths:
+                return lengths[hook_id]
+            
+            hook = self.nodes[hook_id]
+            own_time = hook.average_execution_time or 1.0
+            downstream = max(
+                (visit(dependent_id) for dependent_id in self.edges[hook_id] if dependent_id in self.nodes),
+                default=0.0
+            )
+            lengths[hook_id] = own_time + downstream
+            return lengths[hook_id]
+        
+        for hook_id in self.nodes.keys():
+            visit(hook_id)
+        
+        return lengths
+    
     def _calculate_in_degrees(self) -> Dict[str, int]:
         """Calculate in-degree (number of dependencies) for each hook."""
         in_degree = {hook_id: 0 for hook_id in self.nodes.keys()}
@@ -219,6 +253,7 @@ class HookExecutor:
     
     Features:
     - Automatic dependency resolution
+    - Ready-queue scheduling: a hook starts as soon as its own dependencies finish
     - Parallel execution where safe
     - Executive dysfunction-aware error handling
     - Automatic rollback on failures
@@ -226,9 +261,30 @@ class HookExecutor:
     - Interruption handling
     """
     
-    def __init__(self, max_parallel_hooks: int = 3, enable_rollback: bool = True):
+    SCHEDULERS = ("ready_queue", "level")
+    SCHEDULE_PRIORITIES = ("critical_path", "priority", "fifo")
+    
+    def __init__(
+        self,
+        max_parallel_hooks: int = 3,
+        enable_rollback: bool = True,
+        scheduler: str = "ready_queue",
+        schedule_priority: str = "critical_path",
+        registry: Optional[HookRegistry] = None
+    ):
+        if scheduler not in self.SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {self.SCHEDULERS}")
+        if schedule_priority not in self.SCHEDULE_PRIORITIES:
+            raise ValueError(
+                f"Unknown schedule priority '{schedule_priority}', expected one of {self.SCHEDULE_PRIORITIES}"
+            )
+        
         self.max_parallel_hooks = max_parallel_hooks
         self.enable_rollback = enable_rollback
+        self.scheduler = scheduler
+        self.schedule_priority = schedule_priority
+        # Source of registered hook priorities; the global registry by default
+        self.registry = registry
         self.execution_history: List[Dict[str, Any]] = []
         self.current_execution: Optional[str] = None
         
@@ -268,11 +324,14 @@ class HookExecutor:
             for hook in hooks:
                 graph.add_hook(hook)
             
-            # Resolve execution plan
+            # Resolve execution plan (also validates cycles and missing dependencies)
             plan = self._resolve_execution_plan(graph, context)
             
             # Execute hooks according to plan
-            results = await self._execute_plan(plan, context, hook_type)
+            if self.scheduler == "ready_queue":
+                results = await self._execute_ready_queue(graph, context, hook_type)
+            else:
+                results = await self._execute_plan(plan, context, hook_type)
             
             # Record successful execution
             self._record_execution_success(execution_id, hook_type, len(hooks), results)
@@ -334,13 +393,140 @@ class HookExecutor:
         
         return optimized
     
+    def _get_concurrency_limit(self) -> int:
+        """Number of hooks allowed in flight at once, honouring the overwhelm threshold."""
+        return max(1, min(self.max_parallel_hooks, self.overwhelm_threshold))
+    
+    def _compute_hook_priorities(self, graph: DependencyGraph) -> Dict[str, float]:
+        """Compute ready-queue priorities (higher runs first) for every hook in the graph."""
+        if self.schedule_priority == "critical_path":
+            return graph.calculate_critical_path_lengths()
+        if self.schedule_priority == "priority":
+            # Registered priorities run lowest number first, so negate them
+            priority_of = self.registry.get_priority if self.registry is not None else get_hook_priority
+            return {hook_id: -float(priority_of(hook_id)) for hook_id in graph.nodes.keys()}
+        return {hook_id: 0.0 for hook_id in graph.nodes.keys()}
+    
+    async def _execute_ready_queue(
+        self,
+        graph: DependencyGraph,
+        context: HookContext,
+        hook_type: HookType
+    ) -> List[HookResult]:
+        """
+        Execute hooks with a dynamic ready queue instead of level barriers.
+        
+        A hook is started as soon as all of its own dependencies have completed,
+        bounded by the concurrency limit. Ready hooks are ordered by priority
+        (critical-path length by default) and then by discovery order. On the
+        first failure no new hooks are started; in-flight hooks are allowed to
+        finish so that they can be rolled back consistently.
+        """
+        priorities = self._compute_hook_priorities(graph)
+        pending_dependencies = {
+            hook_id: len(graph.reverse_edges[hook_id]) for hook_id in graph.nodes.keys()
+        }
+        
+        ready_queue: List[Tuple[float, int, str]] = []
+        sequence = itertools.count()
+        
+        def mark_ready(hook_id: str) -> None:
+            heapq.heappush(ready_queue, (-priorities[hook_id], next(sequence), hook_id))
+        
+        for hook_id, dependency_count in pending_dependencies.items():
+            if dependency_count == 0:
+                mark_ready(hook_id)
+        
+        limit = self._get_concurrency_limit()
+        running: Dict[asyncio.Future, Hook] = {}
+        all_results: List[HookResult] = []
+        executed_hooks: List[Hook] = []
+        failed_results: List[HookResult] = []
+        
+        logger.info(f"Executing {len(graph.nodes)} hooks with ready-queue scheduler (max {limit} in flight)")
+        
+        try:
+            while ready_queue or running:
+                # Start as many ready hooks as the concurrency limit allows
+                while ready_queue and len(running) < limit and not failed_results:
+                    _, _, hook_id = heapq.heappop(ready_queue)
+                    hook = graph.nodes[hook_id]
+                    
+                    # Check if checkpoint is needed
+                    await self._check_checkpoint_needed(context)
+                    
+                    task = asyncio.ensure_future(self._execute_single_hook(hook, context))
+                    running[task] = hook
+                
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    hook = running.pop(task)
+                    result = self._collect_task_result(hook, task)
+                    
+                    # Update context as soon as each hook finishes
+                    self._update_context_with_results(context, [result])
+                    
+                    all_results.append(result)
+                    executed_hooks.append(hook)
+                    
+                    if not result.success:
+                        failed_results.append(result)
+                        continue
+                    
+                    for dependent_id in graph.edges[hook.hook_id]:
+                        if dependent_id not in pending_dependencies:
+                            continue
+                        pending_dependencies[dependent_id] -= 1
+                        if pending_dependencies[dependent_id] == 0:
+                            mark_ready(dependent_id)
+            
+            if failed_results:
+                raise HookExecutionError(
+                    f"Hook execution failed: {len(failed_results)} hooks failed",
+                    failed_results[0].hook_id,
+                    context,
+                    error_type="group_execution_failure"
+                )
+        
+        except BaseException:
+            # Never leave hooks running behind the caller's back
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+            
+            # Store executed hooks for potential rollback
+            context.metadata["executed_hooks"] = [h.hook_id for h in executed_hooks]
+            raise
+        
+        return all_results
+    
+    def _collect_task_result(self, hook: Hook, task: asyncio.Future) -> HookResult:
+        """Convert a finished hook task into a HookResult, including unexpected exceptions."""
+        if not task.cancelled() and task.exception() is None:
+            return task.result()
+        
+        error = "cancelled" if task.cancelled() else task.exception()
+        return HookResult(
+            success=False,
+            hook_id=hook.hook_id,
+            execution_time_ms=0.0,
+            message=f"Parallel execution failed: {error}",
+            error_type="parallel_execution_error",
+            rollback_required=True
+        )
+    
     async def _execute_plan(
         self,
         plan: ExecutionPlan,
         context: HookContext,
         hook_type: HookType
     ) -> List[HookResult]:
-        """Execute the resolved execution plan."""
+        """Execute the resolved execution plan group by group (level-synchronous scheduler)."""
         all_results = []
         executed_hooks = []
         
@@ -0,0 +1,205 @@
+"""
+Non-blocking git helper shared by the built-in hooks.
+
+All git access from hooks goes through AsyncGitClient so that the event loop
+never blocks on a git process. Commands run via asyncio subprocesses with a
+timeout, branch lookups are answered from a single cached
+``git for-each-ref`` listing, and clients are cached per hook execution so
+that several hooks touching the same workspace share their query results.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Set, Tuple
+import logging
+
+from .base import HookContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GIT_TIMEOUT_SECONDS = 30.0
+MAX_CACHED_CLIENTS = 32
+
+
+@dataclass
+class GitCommandResult:
+    """Outcome of a single git invocation."""
+    args: Tuple[str, ...]
+    returncode: int
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+
+    @property
+    def success(self) -> bool:
+        """True if git exited with status 0 within the timeout."""
+        return self.returncode == 0 and not self.timed_out
+
+
+class AsyncGitClient:
+    """
+    Async git wrapper for a single workspace.
+
+    Repository detection and the local branch list are cached until a
+    mutating command invalidates them. Working tree status is always read
+    fresh, since other hooks or the agent may write files between calls.
+    """
+
+    def __init__(self, workspace_path: str, timeout: float = DEFAULT_GIT_TIMEOUT_SECONDS):
+        self.workspace_path = workspace_path
+        self.timeout = timeout
+        self._is_repository: Optional[bool] = None
+        self._local_branches: Optional[Set[str]] = None
+
+    async def run(self, *args: str, timeout: Optional[float] = None) -> GitCommandResult:
+        """
+        Run a git command without blocking the event loop.
+
+        The process is killed if it does not finish within the timeout.
+        Errors starting git (e.g. git not installed) are reported as a
+        failed result rather than raised.
+        """
+        timeout = self.timeout if timeout is None else timeout
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "git", *args,
+                cwd=self.workspace_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to start git {' '.join(args)}: {e}")
+            return GitCommandResult(args=args, returncode=-1, stderr=str(e))
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.error(f"git {' '.join(args)} timed out after {timeout}s in {self.workspace_path}")
+            return GitCommandResult(args=args, returncode=-1, timed_out=True)
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+            raise
+
+        return GitCommandResult(
+            args=args,
+            returncode=process.returncode,
+            stdout=stdout.decode(errors="replace"),
+            stderr=stderr.decode(errors="replace")
+        )
+
+    def invalidate(self) -> None:
+        """Drop cached query results after the repository changed."""
+        self._local_branches = None
+
+    # Queries
+
+    async def is_repository(self) -> bool:
+        """Check whether the workspace is a git repository (``.git`` dir or file)."""
+        if self._is_repository is None:
+            self._is_repository = (Path(self.workspace_path) / ".git").exists()
+        return self._is_repository
+
+    async def list_local_branches(self) -> Set[str]:
+        """Return all local branch names using one ``git for-each-ref`` call."""
+        if self._local_branches is None:
+            result = await self.run("for-each-ref", "--format=%(refname:short)", "refs/heads/")
+            if not result.success:
+                logger.warning(f"Could not list branches in {self.workspace_path}: {result.stderr.strip()}")
+                return set()
+            self._local_branches = {line.strip() for line in result.stdout.splitlines() if line.strip()}
+        return self._local_branches
+
+    async def branch_exists(self, branch_name: str) -> bool:
+        """Check if a local branch exists."""
+        return branch_name in await self.list_local_branches()
+
+    async def unique_branch_name(self, base_name: str) -> str:
+        """Return base_name, or base_name-N for the first N that is not taken."""
+        branches = await self.list_local_branches()
+        if base_name not in branches:
+            return base_name
+
+        counter = 1
+        while f"{base_name}-{counter}" in branches:
+            counter += 1
+        return f"{base_name}-{counter}"
+
+    async def has_changes(self) -> bool:
+        """Check if the working tree has uncommitted changes."""
+        result = await self.run("status", "--porcelain")
+        if not result.success:
+            return False
+        return len(result.stdout.strip()) > 0
+
+    # Mutations
+
+    async def create_and_checkout_branch(self, branch_name: str) -> GitCommandResult:
+        """Create a branch and switch to it."""
+        result = await self.run("checkout", "-b", branch_name)
+        if result.success and self._local_branches is not None:
+            self._local_branches.add(branch_name)
+        return result
+
+    async def checkout(self, branch_name: str) -> GitCommandResult:
+        """Switch to an existing branch."""
+        return await self.run("checkout", branch_name)
+
+    async def checkout_main_branch(self) -> bool:
+        """Switch to main or master, whichever exists."""
+        branches = await self.list_local_branches()
+        candidates = [b for b in ("main", "master") if b in branches] or ["main", "master"]
+
+        for branch in candidates:
+            if (await self.checkout(branch)).success:
+                return True
+        return False
+
+    async def delete_branch(self, branch_name: str) -> GitCommandResult:
+        """Force-delete a local branch."""
+        result = await self.run("branch", "-D", branch_name)
+        if result.success and self._local_branches is not None:
+            self._local_branches.discard(branch_name)
+        return result
+
+    async def commit_all(self, message: str) -> GitCommandResult:
+        """Stage every change and commit it."""
+        add_result = await self.run("add", "-A")
+        if not add_result.success:
+            self.invalidate()
+            return add_result
+
+        commit_result = await self.run("commit", "-m", message)
+        self.invalidate()
+        return commit_result
+
+
+_clients: "OrderedDict[Tuple[str, str], AsyncGitClient]" = OrderedDict()
+
+
+def get_git_client(context: HookContext, timeout: float = DEFAULT_GIT_TIMEOUT_SECONDS) -> AsyncGitClient:
+    """
+    Get the git client for a hook execution.
+
+    Clients are cached per (execution_id, workspace) so that all hooks of one
+    execution share cached query results. Only the most recently used
+    executions are kept.
+    """
+    key = (context.execution_id, str(Path(context.workspace_path or ".").resolve()))
+
+    client = _clients.get(key)
+    if client is None:
+        client = AsyncGitClient(context.workspace_path, timeout=timeout)
+        _clients[key] = client
+        while len(_clients) > MAX_CACHED_CLIENTS:
+            _clients.popitem(last=False)
+    else:
+        _clients.move_to_end(key)
+
+    return client
+
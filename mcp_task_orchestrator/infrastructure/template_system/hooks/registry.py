@@ -111,6 +111,15 @@ class HookRegistry:
         
         return registration.hook_class()
     
+    def get_priority(self, hook_id: str) -> int:
+        """
+        Get the registered priority of a hook (lower = higher priority).
+        
+        Hooks that are not registered get the default priority of 100.
+        """
+        registration = self._hooks.get(hook_id)
+        return registration.priority if registration else 100
+    
     def get_hooks_for_type(
         self,
         hook_type: HookType,
@@ -431,6 +440,11 @@ def get_hook(hook_id: str) -> Optional[Hook]:
     return _global_registry.get_hook(hook_id)
 
 
+def get_hook_priority(hook_id: str) -> int:
+    """Get hook priority from global registry."""
+    return _global_registry.get_priority(hook_id)
+
+
 def get_hooks_for_type(
     hook_type: HookType,
     ed_only: bool = False,
@@ -4,16 +4,25 @@ Auto-reload system for MCP Task Orchestrator.
 
 Detects code changes and automatically reloads the server when modifications are made.
 This helps maintain continuous operation during development.
+
+On Linux the monitor sleeps on inotify events for the package tree and only
+re-checks the files that were reported. Elsewhere it polls, but a file is
+only hashed when its mtime or size changed since the last pass. In both
+modes a burst of changes (an editor save, a git checkout) is collected until
+the tree has been quiet for ``debounce`` seconds and handled as one reload.
 """
 
 import asyncio
 import hashlib
 import logging
+import os
 import subprocess
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from .file_watcher import InotifyWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -21,34 +30,49 @@ logger = logging.getLogger(__name__)
 class OrchestratorAutoReload:
     """Monitors orchestrator code and auto-reloads on changes."""
     
-    def __init__(self, watch_dir: Path = None):
+    def __init__(self, watch_dir: Path = None, debounce: float = 0.5,
+                 use_inotify: Optional[bool] = None):
         """Initialize auto-reload monitor.
         
         Args:
             watch_dir: Directory to watch for changes (defaults to orchestrator package)
+            debounce: Seconds without further changes before a burst is handled
+            use_inotify: Force event-driven (True) or polling (False) mode;
+                defaults to inotify when the platform supports it
         """
         self.watch_dir = watch_dir or Path(__file__).parent.parent
         self.file_hashes: Dict[Path, str] = {}
+        self.file_stats: Dict[Path, Tuple[int, int]] = {}  # path -> (mtime_ns, size)
         self.last_reload = None
         self.reload_count = 0
         self.max_reload_frequency = timedelta(seconds=5)  # Prevent reload loops
+        self.debounce = debounce
+        self.max_debounce = max(debounce * 10, 5.0)  # Handle a never-ending burst eventually
+        self.use_inotify = InotifyWatcher.available() if use_inotify is None else use_inotify
+        self.files_hashed = 0
         self.ignore_patterns = {
             '__pycache__', '.pyc', '.pyo', '.pyd', 
             '.egg-info', '.git', '.pytest_cache'
         }
+        self._initial_scan_done = False
+        
+    def _is_ignored(self, path: Path) -> bool:
+        """Check if path matches an ignore pattern."""
+        path_str = str(path)
+        return any(pattern in path_str for pattern in self.ignore_patterns)
         
     def _should_watch_file(self, path: Path) -> bool:
         """Check if file should be watched for changes."""
         # Skip ignored patterns
-        for pattern in self.ignore_patterns:
-            if pattern in str(path):
-                return False
+        if self._is_ignored(path):
+            return False
                 
         # Only watch Python files
         return path.suffix == '.py'
         
     def _calculate_file_hash(self, path: Path) -> str:
         """Calculate hash of file contents."""
+        self.files_hashed += 1
         try:
             with open(path, 'rb') as f:
                 return hashlib.sha256(f.read()).hexdigest()
@@ -56,50 +80,115 @@ class OrchestratorAutoReload:
             logger.debug(f"Could not hash {path}: {e}")
             return ""
             
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of a regular file, or None if it is gone."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+            
     def _get_watched_files(self) -> Set[Path]:
         """Get all files to watch."""
         watched = set()
         
-        for path in self.watch_dir.rglob('*'):
-            if path.is_file() and self._should_watch_file(path):
-                watched.add(path)
+        # os.walk lets ignored directories be pruned instead of listed
+        for dirpath, dirnames, filenames in os.walk(self.watch_dir):
+            current = Path(dirpath)
+            dirnames[:] = [d for d in dirnames if not self._is_ignored(current / d)]
+            for name in filenames:
+                path = current / name
+                if self._should_watch_file(path):
+                    watched.add(path)
                 
         return watched
         
+    def _check_file(self, path: Path) -> bool:
+        """Check one path against its recorded state.
+        
+        The file is only hashed when its mtime or size differ from the last
+        check, so an unchanged tree costs one stat() per file.
+        
+        Returns:
+            True if the file is new, modified or deleted
+        """
+        signature = self._file_signature(path)
+        known = path in self.file_hashes
+        
+        if signature is None:
+            if not known:
+                return False
+            # Deleted file
+            del self.file_hashes[path]
+            self.file_stats.pop(path, None)
+            logger.info(f"File deleted: {path}")
+            return True
+            
+        if known and self.file_stats.get(path) == signature:
+            return False
+            
+        current_hash = self._calculate_file_hash(path)
+        self.file_stats[path] = signature
+        
+        if not known:
+            # New file
+            self.file_hashes[path] = current_hash
+            if self._initial_scan_done:  # Don't trigger on initial scan
+                logger.info(f"New file detected: {path}")
+                return True
+            return False
+            
+        if self.file_hashes[path] != current_hash:
+            # Modified file
+            self.file_hashes[path] = current_hash
+            logger.info(f"File modified: {path}")
+            return True
+            
+        # Touched, but the contents are the same
+        return False
+        
     def detect_changes(self) -> Set[Path]:
         """Detect which files have changed.
         
         Returns:
             Set of paths that have changed
         """
-        changed_files = set()
         current_files = self._get_watched_files()
         
-        # Check for new or modified files
-        for path in current_files:
-            current_hash = self._calculate_file_hash(path)
-            
-            if path not in self.file_hashes:
-                # New file
-                self.file_hashes[path] = current_hash
-                if self.reload_count > 0:  # Don't trigger on initial scan
-                    changed_files.add(path)
-                    logger.info(f"New file detected: {path}")
-            elif self.file_hashes[path] != current_hash:
-                # Modified file
-                self.file_hashes[path] = current_hash
-                changed_files.add(path)
-                logger.info(f"File modified: {path}")
-                
-        # Check for deleted files
-        deleted_files = set(self.file_hashes.keys()) - current_files
-        for path in deleted_files:
+        # New and modified files, then files that disappeared
+        changed_files = {path for path in current_files if self._check_file(path)}
+        for path in set(self.file_hashes) - current_files:
             del self.file_hashes[path]
+            self.file_stats.pop(path, None)
             changed_files.add(path)
             logger.info(f"File deleted: {path}")
             
+        self._initial_scan_done = True
         return changed_files
         
+    def check_paths(self, paths: Iterable[Path]) -> Set[Path]:
+        """Check only the given paths, as reported by the file watcher.
+        
+        A path that is not a known file is treated as a directory event: the
+        recorded files below it are checked as well, which covers directories
+        that were deleted or moved away.
+        
+        Returns:
+            Set of paths that have changed
+        """
+        candidates: Set[Path] = set()
+        for path in paths:
+            if path in self.file_hashes:
+                candidates.add(path)
+            elif path.is_file():
+                if self._should_watch_file(path):
+                    candidates.add(path)
+            else:
+                candidates.update(known for known in self.file_hashes if path in known.parents)
+                
+        return {path for path in candidates if self._check_file(path)}
+        
     async def reload_server(self) -> bool:
         """Reload the MCP server.
         
@@ -151,35 +240,92 @@ class OrchestratorAutoReload:
             logger.error(f"Error during reload: {e}")
             return False
             
-    async def monitor(self, check_interval: int = 5):
-        """Monitor for changes and auto-reload.
+    async def _handle_changes(self, changed_files: Set[Path]) -> None:
+        """Reload the server for a handled burst of changes."""
+        if not changed_files:
+            return
+            
+        logger.info(f"Detected {len(changed_files)} file changes")
         
-        Args:
-            check_interval: Seconds between change checks
-        """
-        logger.info(f"Starting auto-reload monitor for {self.watch_dir}")
-        logger.info(f"Watching {len(self._get_watched_files())} files")
+        # Only reload for substantive changes
+        if any(not path.name.startswith('test_') for path in changed_files):
+            success = await self.reload_server()
+            
+            if not success:
+                logger.error(
+                    "Auto-reload failed - manual intervention may be required"
+                )
+                
+    async def _wait_until_quiet(self, wakeup: asyncio.Event) -> None:
+        """Return once no event arrived for ``debounce`` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_debounce
+        while True:
+            wakeup.clear()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(wakeup.wait(), min(self.debounce, remaining))
+            except asyncio.TimeoutError:
+                return
+                
+    async def _monitor_events(self) -> None:
+        """Event-driven monitoring: sleep until inotify reports a change."""
+        loop = asyncio.get_running_loop()
+        watcher = InotifyWatcher(self.watch_dir, skip_dir=self._is_ignored)
+        watcher.start()
+        logger.info(f"Watching {watcher.watch_count} directories with inotify")
         
-        # Initial scan to populate hashes
-        self.detect_changes()
+        pending: Set[Path] = set()
+        wakeup = asyncio.Event()
         
+        def on_readable():
+            for event in watcher.read_events():
+                pending.add(event.path)
+            wakeup.set()
+            
+        loop.add_reader(watcher.fileno(), on_readable)
+        try:
+            while True:
+                await wakeup.wait()
+                await self._wait_until_quiet(wakeup)
+                
+                paths = set(pending)
+                pending.clear()
+                if watcher.overflowed:
+                    # The kernel dropped events; fall back to a full scan once
+                    watcher.overflowed = False
+                    changed_files = self.detect_changes()
+                else:
+                    changed_files = self.check_paths(paths)
+                    
+                try:
+                    await self._handle_changes(changed_files)
+                except Exception as e:
+                    logger.error(f"Error in monitor loop: {e}")
+        finally:
+            loop.remove_reader(watcher.fileno())
+            watcher.close()
+            
+    async def _monitor_polling(self, check_interval: float) -> None:
+        """Polling fallback with stat prefiltering."""
         while True:
             try:
                 await asyncio.sleep(check_interval)
                 
                 changed_files = self.detect_changes()
-                
-                if changed_files:
-                    logger.info(f"Detected {len(changed_files)} file changes")
+                # Keep collecting until a pass finds nothing new
+                waited = 0.0
+                while changed_files and self.debounce and waited < self.max_debounce:
+                    await asyncio.sleep(self.debounce)
+                    waited += self.debounce
+                    more = self.detect_changes()
+                    if not more:
+                        break
+                    changed_files |= more
                     
-                    # Only reload for substantive changes
-                    if any(not path.name.startswith('test_') for path in changed_files):
-                        success = await self.reload_server()
-                        
-                        if not success:
-                            logger.error(
-                                "Auto-reload failed - manual intervention may be required"
-                            )
+                await self._handle_changes(changed_files)
                             
             except KeyboardInterrupt:
                 logger.info("Auto-reload monitor stopped by user")
@@ -188,6 +334,27 @@ class OrchestratorAutoReload:
                 logger.error(f"Error in monitor loop: {e}")
                 await asyncio.sleep(check_interval)
                 
+    async def monitor(self, check_interval: int = 5):
+        """Monitor for changes and auto-reload.
+        
+        Args:
+            check_interval: Seconds between change checks when polling
+        """
+        logger.info(f"Starting auto-reload monitor for {self.watch_dir}")
+        
+        # Initial scan to populate hashes
+        self.detect_changes()
+        logger.info(f"Watching {len(self.file_hashes)} files")
+        
+        if self.use_inotify:
+            try:
+                await self._monitor_events()
+                return
+            except OSError as e:
+                logger.warning(f"inotify watcher unavailable ({e}), falling back to polling")
+                
+        await self._monitor_polling(check_interval)
+                
 
 class IntegratedAutoReload:
     """Integrated auto-reload that works with the MCP server."""
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Linux inotify directory watcher for the auto-reload monitor.
+
+inotify is reached through ctypes against libc, so no third-party package is
+needed. The watcher is non-blocking: callers read events when the inotify
+file descriptor becomes readable (``loop.add_reader``) instead of polling the
+file tree. On platforms without inotify ``InotifyWatcher.available()`` is
+False and the auto-reload monitor falls back to stat-based polling.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# Completed writes, renames and directory membership changes. IN_MODIFY is
+# left out on purpose: it fires for every write() call, while IN_CLOSE_WRITE
+# fires once the editor is done with the file.
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        if not sys.platform.startswith("linux"):
+            _libc = False
+        else:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+                _libc = libc
+            except (OSError, AttributeError) as e:
+                logger.debug(f"inotify unavailable: {e}")
+                _libc = False
+    return _libc or None
+
+
+class FileEvent(NamedTuple):
+    """A single change reported by inotify."""
+    path: Path
+    mask: int
+
+    @property
+    def is_dir(self) -> bool:
+        return bool(self.mask & IN_ISDIR)
+
+
+class InotifyWatcher:
+    """Recursive, non-blocking inotify watcher for a directory tree."""
+
+    def __init__(self, root: Path, skip_dir: Optional[Callable[[Path], bool]] = None):
+        """Initialize the watcher.
+
+        Args:
+            root: Directory tree to watch
+            skip_dir: Predicate for directories that should not be watched
+        """
+        self.root = Path(root)
+        self.skip_dir = skip_dir or (lambda path: False)
+        self.overflowed = False
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, Path] = {}
+
+    @staticmethod
+    def available() -> bool:
+        """Whether inotify can be used on this platform."""
+        return _load_libc() is not None
+
+    def fileno(self) -> int:
+        if self._fd is None:
+            raise ValueError("watcher is not started")
+        return self._fd
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._watches)
+
+    def start(self) -> None:
+        """Create the inotify instance and watch every directory under root."""
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._watch_tree(self.root)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._watches.clear()
+
+    def read_events(self) -> List[FileEvent]:
+        """Read all pending events without blocking.
+
+        New directories are watched as soon as their creation is seen. After
+        a queue overflow ``overflowed`` is set; events were lost and the
+        caller must rescan the tree.
+        """
+        events: List[FileEvent] = []
+        while self._fd is not None:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            events.extend(self._parse(data))
+        return events
+
+    def _parse(self, data: bytes) -> List[FileEvent]:
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+
+            path = directory / os.fsdecode(name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                # Files may be written before the new watch exists, so
+                # report the directory's existing contents as created too
+                for created in self._watch_tree(path):
+                    events.append(FileEvent(created, IN_CREATE))
+            events.append(FileEvent(path, mask))
+        return events
+
+    def _watch_tree(self, top: Path) -> List[Path]:
+        """Watch ``top`` and its subdirectories; return the files found."""
+        libc = _load_libc()
+        collect = top != self.root
+        files: List[Path] = []
+        for dirpath, dirnames, filenames in os.walk(top):
+            current = Path(dirpath)
+            if self.skip_dir(current):
+                dirnames[:] = []
+                continue
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                logger.debug(f"Could not watch {dirpath}: {os.strerror(err)}")
+                dirnames[:] = []
+                continue
+            self._watches[wd] = current
+            dirnames[:] = [d for d in dirnames if not self.skip_dir(current / d)]
+            if collect:
+                files.extend(current / name for name in filenames)
+        return files
@@ -2,146 +2,410 @@
 """
 MCP Tool Hanging Points Analysis and Monitoring System
 
-This module provides comprehensive analysis, monitoring, and prevention of hanging 
+This module provides comprehensive analysis, monitoring, and prevention of hanging
 issues in the MCP Task Orchestrator tool.
+
+Every registered operation gets two event loop timers (``loop.call_at``) for
+its warning and timeout deadlines, so there is no polling and finishing an
+operation only cancels its timers. When a deadline fires, a hang report is
+built from the operation's task: the awaited coroutine chain down to the
+innermost pending await. A separate event loop lag sampler measures how late
+a periodic heartbeat runs; a watchdog thread captures the loop thread's stack
+while it is blocked, so a slow report names the offending callback.
 """
 
 import asyncio
 import logging
+import sys
 import time
-import signal
 import threading
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+import traceback
+from collections import deque
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from functools import wraps
-import inspect
-import traceback
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 logger = logging.getLogger("mcp_tool_hanging_analysis")
 
 
+def describe_task_stack(task: Optional[asyncio.Future], limit: int = 30) -> List[str]:
+    """
+    Describe where a task is suspended.
+
+    ``task.get_stack()`` only returns the outermost coroutine frame of a
+    suspended task, so the chain of awaited coroutines is followed through
+    ``cr_await`` down to the innermost awaited object.
+    """
+    if task is None:
+        return []
+
+    lines: List[str] = []
+    if isinstance(task, asyncio.Task):
+        for frame in task.get_stack(limit=limit):
+            lines.append(_describe_frame(frame))
+        awaited = getattr(task.get_coro(), "cr_await", None)
+    else:
+        awaited = None
+
+    while awaited is not None and len(lines) < limit:
+        frame = getattr(awaited, "cr_frame", None) or getattr(awaited, "gi_frame", None)
+        if frame is not None:
+            lines.append(_describe_frame(frame))
+            awaited = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None)
+        else:
+            # A future, task or other awaitable: the thing actually being waited on
+            lines.append(f"awaiting {awaited!r}")
+            break
+    return lines
+
+
+def _describe_frame(frame) -> str:
+    code = frame.f_code
+    return f'File "{code.co_filename}", line {frame.f_lineno}, in {code.co_name}'
+
+
+@dataclass
+class HangReport:
+    """Snapshot of an operation that passed its warning or timeout deadline."""
+    operation_id: str
+    operation: str
+    kind: str  # "warning" or "timeout"
+    duration: float
+    stack: List[str]
+    detected_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operation_id': self.operation_id,
+            'operation': self.operation,
+            'kind': self.kind,
+            'duration': self.duration,
+            'stack': self.stack,
+            'detected_at': self.detected_at
+        }
+
+    def format(self) -> str:
+        where = "\n    ".join(self.stack) if self.stack else "(no task stack available)"
+        return (f"Operation {self.operation_id} ({self.operation}) {self.kind} after "
+                f"{self.duration:.1f}s, suspended at:\n    {where}")
+
+
+class EventLoopLagSampler:
+    """
+    Measures event loop responsiveness.
+
+    A heartbeat callback is scheduled every ``interval`` seconds; the delay
+    between its scheduled and actual run time is the loop lag. A watchdog
+    thread checks the heartbeat and, once the loop has been unresponsive for
+    ``threshold`` seconds, captures the loop thread's current stack, which is
+    the callback holding the loop.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, history_size: int = 20):
+        self.interval = interval
+        self.threshold = threshold
+        self.blocked_events: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.samples = 0
+        self.blocked_count = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._loop_thread_id: Optional[int] = None
+        self._expected_at = 0.0
+        self._last_beat = 0.0  # time.monotonic() of the last heartbeat
+        self._captured_stack: Optional[List[str]] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and not self._loop.is_closed() and not self._stop.is_set()
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Start sampling; must be called from the loop's thread."""
+        loop = loop or asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self.stop()
+
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._last_beat = time.monotonic()
+        self._schedule_beat()
+
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(self._stop,), name="event-loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._loop = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'samples': self.samples,
+            'blocked_count': self.blocked_count,
+            'max_lag': self.max_lag,
+            'avg_lag': self.total_lag / self.samples if self.samples else 0.0,
+            'threshold': self.threshold,
+            'recent_blocks': list(self.blocked_events)
+        }
+
+    def _schedule_beat(self) -> None:
+        self._expected_at = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(self._expected_at, self._beat)
+
+    def _beat(self) -> None:
+        lag = max(0.0, self._loop.time() - self._expected_at)
+        self._last_beat = time.monotonic()
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+
+        stack, self._captured_stack = self._captured_stack, None
+        if lag >= self.threshold:
+            self.blocked_count += 1
+            event = {
+                'lag': lag,
+                'detected_at': datetime.now(timezone.utc).isoformat(),
+                'callback': stack[-1].strip() if stack else None,
+                'stack': stack or []
+            }
+            self.blocked_events.append(event)
+            where = "\n".join(stack) if stack else "(blocking callback not captured)"
+            logger.warning(f"Event loop blocked for {lag:.3f}s, blocking code:\n{where}")
+
+        if not self._stop.is_set():
+            self._schedule_beat()
+
+    def _watch(self, stop: threading.Event) -> None:
+        check_interval = max(self.threshold / 2, 0.01)
+        while not stop.wait(check_interval):
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                return
+            stalled_for = time.monotonic() - self._last_beat
+            if stalled_for < self.interval + self.threshold or self._captured_stack is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._captured_stack = [line.rstrip("\n") for line in traceback.format_stack(frame)]
+
+
+@dataclass
+class _Operation:
+    operation_id: str
+    operation: str
+    start_time: float
+    cancel_token: Optional[asyncio.Future] = None
+    task: Optional[asyncio.Future] = None
+    timeout: Optional[float] = None
+    warning_logged: bool = False
+    timed_out: bool = False
+    handles: List[asyncio.TimerHandle] = field(default_factory=list)
+
+    def cancel_timers(self) -> None:
+        for handle in self.handles:
+            handle.cancel()
+        self.handles.clear()
+
+
 class HangDetector:
     """Detects and monitors potential hanging operations."""
-    
-    def __init__(self, operation_timeout: float = 30.0, warning_timeout: float = 10.0):
+
+    def __init__(self, operation_timeout: float = 30.0, warning_timeout: float = 10.0,
+                 lag_threshold: Optional[float] = 0.25, lag_sample_interval: float = 0.1,
+                 report_history_size: int = 20):
+        """
+        Args:
+            operation_timeout: Default seconds after which an operation is cancelled
+            warning_timeout: Seconds after which a potential hang is reported
+            lag_threshold: Event loop lag reported as blocked (None disables the sampler)
+            lag_sample_interval: Seconds between event loop heartbeats
+            report_history_size: Number of recent hang reports kept
+        """
         self.operation_timeout = operation_timeout
         self.warning_timeout = warning_timeout
-        self.active_operations: Dict[str, dict] = {}
+        self.active_operations: Dict[str, _Operation] = {}
         self.hang_statistics: Dict[str, int] = {}
-        self._monitor_task: Optional[asyncio.Task] = None
-        self._shutdown = False
-    
+        self.hang_reports: Deque[HangReport] = deque(maxlen=report_history_size)
+        self.lag_sampler = (
+            EventLoopLagSampler(interval=lag_sample_interval, threshold=lag_threshold)
+            if lag_threshold is not None else None
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
     def start_monitoring(self):
-        """Start the hang detection monitoring."""
-        if self._monitor_task is None or self._monitor_task.done():
-            self._monitor_task = asyncio.create_task(self._monitor_operations())
+        """Start the hang detection monitoring on the running event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.debug("Hang detection monitoring needs a running event loop")
+            return
+
+        if self._loop is not loop:
+            self._loop = loop
+            # Arm operations registered before a loop was running
+            for op in self.active_operations.values():
+                if not op.handles:
+                    self._arm(op)
             logger.info("Hang detection monitoring started")
-    
+
+        if self.lag_sampler is not None:
+            self.lag_sampler.start(loop)
+
     def stop_monitoring(self):
         """Stop the hang detection monitoring."""
-        self._shutdown = True
-        if self._monitor_task and not self._monitor_task.done():
-            self._monitor_task.cancel()
+        for op in self.active_operations.values():
+            op.cancel_timers()
+        if self.lag_sampler is not None:
+            self.lag_sampler.stop()
+        if self._loop is not None:
+            self._loop = None
             logger.info("Hang detection monitoring stopped")
-    
-    async def _monitor_operations(self):
-        """Monitor active operations for potential hangs."""
-        while not self._shutdown:
-            try:
-                current_time = time.time()
-                
-                for op_id, op_info in list(self.active_operations.items()):
-                    duration = current_time - op_info['start_time']
-                    
-                    # Warning for long-running operations
-                    if duration > self.warning_timeout and not op_info.get('warning_logged'):
-                        logger.warning(
-                            f"Operation {op_id} ({op_info['operation']}) has been running for "
-                            f"{duration:.1f}s - potential hang detected"
-                        )
-                        op_info['warning_logged'] = True
-                    
-                    # Timeout for hanging operations
-                    if duration > self.operation_timeout:
-                        logger.error(
-                            f"Operation {op_id} ({op_info['operation']}) exceeded timeout "
-                            f"({self.operation_timeout}s) - forcing cleanup"
-                        )
-                        
-                        # Record hang statistics
-                        operation_name = op_info['operation']
-                        self.hang_statistics[operation_name] = self.hang_statistics.get(operation_name, 0) + 1
-                        
-                        # Clean up the operation
-                        self._cleanup_hanging_operation(op_id, op_info)
-                
-                await asyncio.sleep(1.0)  # Check every second
-                
-            except Exception as e:
-                logger.error(f"Error in hang monitor: {str(e)}")
-                await asyncio.sleep(5.0)  # Wait longer on error
-    
-    def _cleanup_hanging_operation(self, op_id: str, op_info: dict):
-        """Clean up a hanging operation."""
-        try:
-            # Remove from active operations
-            self.active_operations.pop(op_id, None)
-            
-            # If there's a cancellation token, use it
-            if 'cancel_token' in op_info and op_info['cancel_token']:
-                try:
-                    op_info['cancel_token'].cancel()
-                except Exception as e:
-                    logger.warning(f"Failed to cancel operation {op_id}: {str(e)}")
-            
-            logger.info(f"Cleaned up hanging operation {op_id}")
-            
-        except Exception as e:
-            logger.error(f"Error cleaning up hanging operation {op_id}: {str(e)}")
-    
-    def register_operation(self, operation_name: str, operation_id: str = None, 
-                          cancel_token: Optional[asyncio.Task] = None) -> str:
-        """Register an operation for monitoring."""
+
+    def register_operation(self, operation_name: str, operation_id: str = None,
+                          cancel_token: Optional[asyncio.Task] = None,
+                          timeout: Optional[float] = None) -> str:
+        """
+        Register an operation for monitoring.
+
+        Args:
+            operation_name: Name used in reports and statistics
+            operation_id: Unique id (generated if omitted)
+            cancel_token: Task cancelled when the operation times out
+            timeout: Timeout for this operation (defaults to operation_timeout)
+        """
         if operation_id is None:
             operation_id = f"{operation_name}_{int(time.time() * 1000000)}"
-        
-        self.active_operations[operation_id] = {
-            'operation': operation_name,
-            'start_time': time.time(),
-            'cancel_token': cancel_token,
-            'warning_logged': False
-        }
-        
+
+        task = cancel_token
+        if task is None:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                task = None
+
+        op = _Operation(
+            operation_id=operation_id,
+            operation=operation_name,
+            start_time=time.monotonic(),
+            cancel_token=cancel_token,
+            task=task,
+            timeout=timeout
+        )
+        self.active_operations[operation_id] = op
+        self._arm(op)
+
         logger.debug(f"Registered operation {operation_id} ({operation_name})")
         return operation_id
-    
+
     def unregister_operation(self, operation_id: str):
         """Unregister a completed operation."""
-        if operation_id in self.active_operations:
-            duration = time.time() - self.active_operations[operation_id]['start_time']
-            operation_name = self.active_operations[operation_id]['operation']
-            
-            self.active_operations.pop(operation_id, None)
-            logger.debug(f"Unregistered operation {operation_id} ({operation_name}) after {duration:.2f}s")
-    
+        op = self.active_operations.pop(operation_id, None)
+        if op is not None:
+            op.cancel_timers()
+            duration = time.monotonic() - op.start_time
+            logger.debug(f"Unregistered operation {operation_id} ({op.operation}) after {duration:.2f}s")
+
+    def is_timed_out(self, operation_id: str) -> bool:
+        op = self.active_operations.get(operation_id)
+        return op is not None and op.timed_out
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get hang detection statistics."""
+        now = time.monotonic()
         return {
             'active_operations': len(self.active_operations),
             'active_operation_details': [
                 {
                     'id': op_id,
-                    'operation': op_info['operation'],
-                    'duration': time.time() - op_info['start_time'],
-                    'warning_logged': op_info.get('warning_logged', False)
+                    'operation': op.operation,
+                    'duration': now - op.start_time,
+                    'warning_logged': op.warning_logged
                 }
-                for op_id, op_info in self.active_operations.items()
+                for op_id, op in self.active_operations.items()
             ],
             'hang_statistics': self.hang_statistics.copy(),
-            'total_hangs_detected': sum(self.hang_statistics.values())
+            'total_hangs_detected': sum(self.hang_statistics.values()),
+            'recent_hang_reports': [report.to_dict() for report in self.hang_reports],
+            'event_loop': self.lag_sampler.get_statistics() if self.lag_sampler is not None else None
         }
 
+    def _arm(self, op: _Operation) -> None:
+        """Schedule the warning and timeout callbacks for an operation."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Armed by start_monitoring once a loop is running
+            return
+
+        started = loop.time() - (time.monotonic() - op.start_time)
+        timeout = op.timeout if op.timeout is not None else self.operation_timeout
+        if self.warning_timeout < timeout:
+            op.handles.append(loop.call_at(started + self.warning_timeout, self._on_warning, op.operation_id))
+        op.handles.append(loop.call_at(started + timeout, self._on_timeout, op.operation_id))
+
+    def _report(self, op: _Operation, kind: str) -> HangReport:
+        report = HangReport(
+            operation_id=op.operation_id,
+            operation=op.operation,
+            kind=kind,
+            duration=time.monotonic() - op.start_time,
+            stack=describe_task_stack(op.task)
+        )
+        self.hang_reports.append(report)
+        return report
+
+    def _on_warning(self, operation_id: str) -> None:
+        op = self.active_operations.get(operation_id)
+        if op is None:
+            return
+        op.warning_logged = True
+        try:
+            logger.warning(f"Potential hang detected: {self._report(op, 'warning').format()}")
+        except Exception as e:
+            logger.error(f"Error building hang report for {operation_id}: {str(e)}")
+
+    def _on_timeout(self, operation_id: str) -> None:
+        op = self.active_operations.get(operation_id)
+        if op is None:
+            return
+        op.timed_out = True
+        try:
+            logger.error(f"Operation exceeded timeout: {self._report(op, 'timeout').format()}")
+        except Exception as e:
+            logger.error(f"Error building hang report for {operation_id}: {str(e)}")
+
+        # Record hang statistics
+        self.hang_statistics[op.operation] = self.hang_statistics.get(op.operation, 0) + 1
+        self._cleanup_hanging_operation(operation_id, op)
+
+    def _cleanup_hanging_operation(self, op_id: str, op: _Operation):
+        """Cancel a hanging operation; it is unregistered when its task finishes."""
+        op.cancel_timers()
+
+        # If there's a cancellation token, use it
+        if op.cancel_token is not None:
+            try:
+                op.cancel_token.cancel()
+            except Exception as e:
+                logger.warning(f"Failed to cancel operation {op_id}: {str(e)}")
+        elif op.task is None:
+            # Nothing can unregister it later
+            self.active_operations.pop(op_id, None)
+
+        logger.info(f"Cleaned up hanging operation {op_id}")
+
 
 # Global hang detector instance
 _hang_detector = HangDetector()
@@ -155,16 +419,18 @@ def with_hang_detection(operation_name: str = None, timeout: float = 30.0):
             nonlocal operation_name
             if operation_name is None:
                 operation_name = f"{func.__module__}.{func.__qualname__}"
-            
+
             # Start monitoring
             _hang_detector.start_monitoring()
-            
+
             # Create a task for the operation
             operation_task = asyncio.create_task(func(*args, **kwargs))
-            
-            # Register with hang detector
-            op_id = _hang_detector.register_operation(operation_name, cancel_token=operation_task)
-            
+
+            # Register with hang detector; the wait_for below enforces the timeout
+            op_id = _hang_detector.register_operation(
+                operation_name, cancel_token=operation_task, timeout=timeout + 1.0
+            )
+
             try:
                 # Wait for completion with timeout
                 result = await asyncio.wait_for(operation_task, timeout=timeout)
@@ -176,6 +442,46 @@ def with_hang_detection(operation_name: str = None, timeout: float = 30.0):
             finally:
                 # Unregister operation
                 _hang_detector.unregister_operation(op_id)
-        
+
         return wrapper
     return decorator
+
+
+@asynccontextmanager
+async def hang_protected_operation(operation_name: str, timeout: float = 30.0):
+    """
+    Monitor the enclosed block as an operation of the current task.
+
+    A hang report is logged at the warning deadline; at ``timeout`` the
+    task is cancelled and asyncio.TimeoutError is raised from the block.
+    """
+    _hang_detector.start_monitoring()
+    op_id = _hang_detector.register_operation(
+        operation_name, cancel_token=asyncio.current_task(), timeout=timeout
+    )
+    try:
+        yield op_id
+    except asyncio.CancelledError:
+        if not _hang_detector.is_timed_out(op_id):
+            raise
+        task = asyncio.current_task()
+        if task is not None and hasattr(task, "uncancel"):
+            task.uncancel()
+        raise asyncio.TimeoutError(f"Operation {operation_name} timed out after {timeout}s")
+    finally:
+        _hang_detector.unregister_operation(op_id)
+
+
+def get_hang_detection_statistics() -> Dict[str, Any]:
+    """Statistics of the global hang detector."""
+    return _hang_detector.get_statistics()
+
+
+def start_hang_monitoring() -> None:
+    """Start the global hang detector on the running event loop."""
+    _hang_detector.start_monitoring()
+
+
+def stop_hang_monitoring() -> None:
+    """Stop the global hang detector."""
+    _hang_detector.stop_monitoring()
@@ -8,12 +8,17 @@ by implementing async-safe operations and unified database access patterns.
 import asyncio
 import logging
 import os
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Union, Any, Tuple
 
 from ..domain.entities.task import Task, TaskType, TaskStatus
 from ..domain.value_objects.specialist_type import SpecialistType
+from ..infrastructure.monitoring.metrics import get_metrics_collector
 from ..persistence_factory import create_persistence_manager
 # from ..config import get_config  # Temporarily disabled due to pydantic compatibility issues
 
@@ -21,6 +26,120 @@ from ..persistence_factory import create_persistence_manager
 # Configure logging
 logger = logging.getLogger("mcp_task_orchestrator.state")
 
+
+@dataclass
+class LockHolder:
+    """The operation currently holding a lock stripe."""
+    operation: str
+    key: str
+    acquired_at: float
+
+
+class StripedLock:
+    """A fixed set of asyncio locks, selected by hashing a key.
+    
+    Operations on the same key always share a lock; operations on different
+    keys only contend when their keys hash to the same stripe. Wait times are
+    recorded together with the operation that held the stripe.
+    """
+    
+    def __init__(self, stripes: int = 64):
+        self._locks = [asyncio.Lock() for _ in range(stripes)]
+        self._holders: List[Optional[LockHolder]] = [None] * stripes
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits_by_holder: Counter = Counter()
+        self.last_contention: Optional[Dict[str, Any]] = None
+    
+    def stripe_for(self, key: str) -> int:
+        return hash(key) % len(self._locks)
+    
+    @asynccontextmanager
+    async def hold(self, key: str, operation: str):
+        """Hold the stripe for ``key`` while running ``operation``."""
+        index = self.stripe_for(key)
+        lock = self._locks[index]
+        holder = self._holders[index] if lock.locked() else None
+        
+        started = time.perf_counter()
+        await lock.acquire()
+        acquired = time.perf_counter()
+        waited = acquired - started
+        
+        self.acquisitions += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if holder is not None:
+            self.contended += 1
+            self.waits_by_holder[holder.operation] += 1
+            self.last_contention = {
+                'operation': operation,
+                'key': key,
+                'wait_seconds': waited,
+                'holder_operation': holder.operation,
+                'holder_key': holder.key
+            }
+            get_metrics_collector().record_timing(
+                "state_manager.lock_wait", waited,
+                {"operation": operation, "holder": holder.operation}
+            )
+        
+        self._holders[index] = LockHolder(operation, key, acquired)
+        try:
+            yield
+        finally:
+            self._holders[index] = None
+            lock.release()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        now = time.perf_counter()
+        return {
+            'stripes': len(self._locks),
+            'acquisitions': self.acquisitions,
+            'contended': self.contended,
+            'total_wait_seconds': self.total_wait,
+            'max_wait_seconds': self.max_wait,
+            'avg_wait_seconds': self.total_wait / self.acquisitions if self.acquisitions else 0.0,
+            'waits_by_holder': dict(self.waits_by_holder),
+            'last_contention': self.last_contention,
+            'current_holders': [
+                {'operation': h.operation, 'key': h.key, 'held_seconds': now - h.acquired_at}
+                for h in self._holders if h is not None
+            ]
+        }
+
+
+# Interrupted tasks read per query during startup recovery
+RECOVERY_BATCH_SIZE = 100
+
+
+@dataclass
+class RecoveryProgress:
+    """Progress of the background startup recovery."""
+    state: str = "pending"  # pending, running, completed, failed, cancelled
+    interrupted_total: int = 0
+    recovered: int = 0
+    parents_reconciled: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return {
+            'state': self.state,
+            'interrupted_total': self.interrupted_total,
+            'recovered': self.recovered,
+            'parents_reconciled': self.parents_reconciled,
+            'elapsed_seconds': elapsed,
+            'error': self.error
+        }
+
+
 class StateManager:
     """Manages persistent state for tasks and orchestration data with optimized async handling.
     
@@ -28,7 +147,10 @@ class StateManager:
     with support for persistent storage to prevent task loss during restarts or context resets.
     
     Optimizations:
-    - Async-safe operations with proper lock management
+    - Writes are serialized per parent task through striped locks; reads take
+      no lock and rely on the database's own consistency
+    - Startup recovery runs in the background; a parent touched before it
+      is reached is recovered first, under its lock
     - Retry mechanism with exponential backoff
     - Unified persistence through database manager only
     - Enhanced error recovery and timeout handling
@@ -51,9 +173,16 @@ class StateManager:
                     db_path = os.getcwd() + "/.task_orchestrator/task_orchestrator.db"
         
         self.db_path = str(db_path)
-        self.lock = asyncio.Lock()  # For coordinating async operations only
+        # Writes for one parent task share a stripe; unrelated plans do not wait
+        self.locks = StripedLock()
+        self._init_lock = asyncio.Lock()
         self._initialized = False
         
+        # Startup recovery runs in the background after the first request
+        self.recovery = RecoveryProgress()
+        self._recovery_task: Optional[asyncio.Task] = None
+        self._recovered_parents: set = set()
+        
         # Initialize persistence manager
         if base_dir is None:
             try:
@@ -86,37 +215,117 @@ class StateManager:
         if self._async_initialized:
             return
         
+        async with self._init_lock:
+            if not self._async_initialized:
+                await self._run_initialization()
+    
+    async def _run_initialization(self):
+        # Recovery scans the database, so it must not hold up the first
+        # request; parents touched before it reaches them are recovered inline
+        self.recovery.state = "running"
+        self.recovery.started_at = time.perf_counter()
+        self._recovery_task = asyncio.create_task(self._recover_in_background())
+        
+        self._async_initialized = True
+        logger.info("Async initialization completed; startup recovery continues in the background")
+    
+    async def _recover_in_background(self):
+        """Run startup recovery: stale locks, interrupted tasks, then counters."""
         try:
-            # Attempt to recover any interrupted tasks
-            await self._recover_interrupted_tasks()
-            
             # Clean up any stale locks
             await self._cleanup_stale_locks()
             
-            self._async_initialized = True
-            logger.info("Async initialization completed")
+            # Recover tasks a previous process left in progress
+            await self._recover_interrupted_tasks()
+            
+            # Repair subtask progress counters that drifted while offline
+            await self._reconcile_progress_counters()
+            
+            self.recovery.state = "completed"
+        except asyncio.CancelledError:
+            self.recovery.state = "cancelled"
+            raise
         except Exception as e:
-            logger.error(f"Async initialization failed: {e}")
+            self.recovery.state = "failed"
+            self.recovery.error = str(e)
+            logger.error(f"Startup recovery failed: {e}")
+        finally:
+            self.recovery.finished_at = time.perf_counter()
+            self._recovered_parents.clear()
+            elapsed = self.recovery.finished_at - self.recovery.started_at
+            get_metrics_collector().record_timing(
+                "state_manager.startup_recovery", elapsed, {"state": self.recovery.state}
+            )
+            logger.info(f"Startup recovery {self.recovery.state} in {elapsed:.3f}s: "
+                        f"{self.recovery.recovered} interrupted tasks, "
+                        f"{self.recovery.parents_reconciled} parents reconciled")
     
     async def _recover_interrupted_tasks(self):
-        """Attempt to recover any interrupted tasks from persistent storage."""
+        """Recover tasks left in progress by a previous process, in bounded batches.
+        
+        No process is working on a task when the server starts, so every
+        in_progress row was interrupted. Only those rows are read, through an
+        index, and each affected parent is recovered once.
+        """
         try:
-            # Get all active tasks from persistent storage
-            active_task_ids = await self.persistence.get_all_active_tasks()
-            logger.info(f"Found {len(active_task_ids)} active tasks in persistent storage")
+            self.recovery.interrupted_total = await self.persistence.count_interrupted_tasks()
+            logger.info(f"Found {self.recovery.interrupted_total} interrupted tasks in persistent storage")
             
-            # Load each task into memory
-            for task_id in active_task_ids:
-                try:
-                    # Load the task breakdown from persistent storage
-                    breakdown = await self.persistence.load_task_breakdown(task_id)
-                    if breakdown:
-                        logger.info(f"Recovered task {task_id} from persistent storage")
-                except Exception as e:
-                    logger.error(f"Failed to recover task {task_id}: {str(e)}")
+            cursor = None
+            while True:
+                batch = await self.persistence.get_interrupted_tasks(
+                    after=cursor, limit=RECOVERY_BATCH_SIZE
+                )
+                parents = dict.fromkeys(row["parent_task_id"] for row in batch if row["parent_task_id"])
+                for parent_task_id in parents:
+                    await self._ensure_parent_recovered(parent_task_id)
+                self.recovery.recovered += len(batch)
+                
+                if len(batch) < RECOVERY_BATCH_SIZE:
+                    break
+                cursor = batch[-1]["task_id"]
+                logger.info(f"Recovered {self.recovery.recovered}/{self.recovery.interrupted_total} interrupted tasks")
+                # Let requests run between batches
+                await asyncio.sleep(0)
         except Exception as e:
+            self.recovery.error = str(e)
             logger.error(f"Failed to recover interrupted tasks: {str(e)}")
     
+    async def _ensure_parent_recovered(self, parent_task_id: str) -> None:
+        """Recover a parent task if startup recovery has not reached it yet."""
+        if self.recovery.state != "running" or parent_task_id in self._recovered_parents:
+            return
+        async with self.locks.hold(parent_task_id, "recover_parent"):
+            await self._recover_parent(parent_task_id)
+    
+    async def _recover_parent(self, parent_task_id: str) -> None:
+        """Reconcile a parent's derived state so early requests see it consistent.
+        
+        INTERNAL METHOD - assumes the parent task's lock is already held by caller.
+        """
+        if self.recovery.state != "running" or parent_task_id in self._recovered_parents:
+            return
+        try:
+            if await self.persistence.reconcile_parent_progress(parent_task_id):
+                self.recovery.parents_reconciled += 1
+            self._recovered_parents.add(parent_task_id)
+        except Exception as e:
+            logger.error(f"Failed to recover parent task {parent_task_id}: {str(e)}")
+    
+    def get_recovery_status(self) -> Dict[str, Any]:
+        """Progress of the background startup recovery."""
+        return self.recovery.to_dict()
+    
+    async def wait_for_recovery(self, timeout: Optional[float] = None) -> bool:
+        """Wait for background startup recovery; returns False on timeout."""
+        if self._recovery_task is None:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._recovery_task), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     async def _cleanup_stale_locks(self):
         """Clean up any stale locks at startup."""
         try:
@@ -128,12 +337,25 @@ class StateManager:
         except Exception as e:
             logger.error(f"Failed to clean up stale locks: {str(e)}")
     
+    async def _reconcile_progress_counters(self):
+        """Reconcile per-parent subtask counters with the stored subtasks."""
+        try:
+            repaired = await self.persistence.reconcile_progress_counters()
+            if repaired > 0:
+                logger.info(f"Repaired progress counters for {repaired} parent tasks at startup")
+        except Exception as e:
+            logger.error(f"Failed to reconcile progress counters: {str(e)}")
+    
+    def get_lock_statistics(self) -> Dict[str, Any]:
+        """Lock contention metrics: wait times and the operations holding locks."""
+        return self.locks.get_statistics()
+    
     async def store_task_breakdown(self, breakdown: Task):
         """Store a task breakdown and its subtasks using persistence manager only."""
-        async with self.lock:
-            # Ensure async initialization is complete
-            await self._initialize()
-            
+        # Ensure async initialization is complete
+        await self._initialize()
+        
+        async with self.locks.hold(breakdown.task_id, "store_task_breakdown"):
             try:
                 # Store in persistent storage - this handles all database operations
                 await self.persistence.save_task_breakdown(breakdown)
@@ -143,42 +365,44 @@ class StateManager:
                 raise
     
     async def get_subtask(self, task_id: str, timeout: int = 10) -> Optional[Task]:
-        """Retrieve a specific subtask by ID - simplified version."""
-        async with self.lock:
-            # Ensure async initialization is complete
-            await self._initialize()
+        """Retrieve a specific subtask by ID.
+        
+        The subtask is fetched by primary key; the rest of its breakdown is
+        not loaded. Reads take no lock; each query sees a consistent
+        database state.
+        """
+        # Ensure async initialization is complete
+        await self._initialize()
+        
+        try:
+            subtask = await self.persistence.get_subtask(task_id)
+            if subtask:
+                logger.info(f"Retrieved subtask {task_id} from persistent storage")
+            return subtask
             
-            try:
-                # Get parent task ID first
-                parent_task_id = await self.persistence.get_parent_task_id(task_id)
-                if not parent_task_id:
-                    return None
-                
-                # Load the task breakdown from persistent storage
-                breakdown = await self.persistence.load_task_breakdown(parent_task_id)
-                if breakdown:
-                    for subtask in breakdown.subtasks:
-                        if subtask.task_id == task_id:
-                            logger.info(f"Retrieved subtask {task_id} from persistent storage")
-                            return subtask
-                
-                return None
-                
-            except Exception as e:
-                logger.error(f"Error getting subtask {task_id}: {str(e)}")
-                raise
+        except Exception as e:
+            logger.error(f"Error getting subtask {task_id}: {str(e)}")
+            raise
     
     async def update_subtask(self, subtask: Task):
-        """Update an existing subtask using persistence manager only - simplified version."""
-        async with self.lock:
-            # Ensure async initialization is complete
-            await self._initialize()
+        """Update an existing subtask using persistence manager only.
+        
+        The status transition is written to the subtask's own row. The
+        update and the parent's completion check run under the parent task's
+        lock, so concurrent completions of its last subtasks archive the
+        parent exactly once.
+        """
+        # Ensure async initialization is complete
+        await self._initialize()
+        
+        try:
+            # Get parent task ID for persistence
+            parent_task_id = await self.persistence.get_parent_task_id(subtask.task_id)
             
-            try:
-                # Get parent task ID for persistence
-                parent_task_id = await self.persistence.get_parent_task_id(subtask.task_id)
-                
-                if parent_task_id:
+            if parent_task_id:
+                async with self.locks.hold(parent_task_id, "update_subtask"):
+                    await self._recover_parent(parent_task_id)
+                    
                     # Update in persistent storage
                     await self.persistence.update_subtask(subtask, parent_task_id)
                     logger.info(f"Updated subtask {subtask.task_id} in persistent storage")
@@ -186,23 +410,30 @@ class StateManager:
                     # If the task is completed, check if we should archive the parent task
                     if subtask.status == TaskStatus.COMPLETED:
                         await self._check_and_archive_parent_task(parent_task_id)
-                else:
-                    logger.warning(f"Could not find parent task ID for subtask {subtask.task_id}")
-                    
-            except Exception as e:
-                logger.error(f"Error updating subtask {subtask.task_id}: {str(e)}")
-                raise
+            else:
+                logger.warning(f"Could not find parent task ID for subtask {subtask.task_id}")
+                
+        except Exception as e:
+            logger.error(f"Error updating subtask {subtask.task_id}: {str(e)}")
+            raise
     
     async def _check_and_archive_parent_task(self, parent_task_id: str) -> None:
         """Check if all subtasks for a parent task are completed, and if so, archive the task.
         
-        INTERNAL METHOD - assumes lock is already held by caller.
+        INTERNAL METHOD - assumes the parent task's lock is already held by caller.
+        
+        Reads the parent's maintained subtask counters instead of loading its
+        subtasks, so the check costs the same for any plan size.
         """
-        # Use internal method that doesn't acquire lock (since we already have it)
-        subtasks = await self._get_subtasks_for_parent_unlocked(parent_task_id)
+        try:
+            progress = await self.persistence.get_parent_progress(parent_task_id)
+        except Exception as e:
+            logger.error(f"Failed to read progress of parent task {parent_task_id}: {str(e)}")
+            return
         
         # If all subtasks are completed, archive the task
-        if subtasks and all(st.status == TaskStatus.COMPLETED for st in subtasks):
+        total = progress["total_subtasks"]
+        if total and progress["completed_subtasks"] == total:
             try:
                 await self.persistence.archive_task(parent_task_id)
                 logger.info(f"Archived completed task {parent_task_id}")
@@ -213,10 +444,11 @@ class StateManager:
     async def _get_subtasks_for_parent_unlocked(self, parent_task_id: str) -> List[Task]:
         """Get all subtasks for a given parent task - INTERNAL METHOD without lock."""
         try:
-            breakdown = await self.persistence.load_task_breakdown(parent_task_id)
-            if breakdown:
+            family = await self.persistence.get_task_families([parent_task_id])
+            if any(task.task_id == parent_task_id for task in family):
                 logger.info(f"Retrieved subtasks for parent task {parent_task_id} from persistent storage")
-                return breakdown.subtasks
+                subtasks = [task for task in family if task.parent_task_id == parent_task_id]
+                return sorted(subtasks, key=lambda task: task.position_in_parent)
             else:
                 logger.warning(f"Task breakdown {parent_task_id} not found")
                 return []
@@ -224,40 +456,96 @@ class StateManager:
             logger.error(f"Failed to retrieve subtasks for parent task {parent_task_id}: {str(e)}")
             return []
     
+    async def get_parent_progress(self, parent_task_id: str) -> Optional[Dict[str, Any]]:
+        """Get total/completed subtask counts and percentage for a parent task."""
+        # Ensure async initialization is complete
+        await self._initialize()
+        
+        try:
+            await self._ensure_parent_recovered(parent_task_id)
+            return await self.persistence.get_parent_progress(parent_task_id)
+        except Exception as e:
+            logger.error(f"Failed to get progress for parent task {parent_task_id}: {str(e)}")
+            return None
+    
     async def get_subtasks_for_parent(self, parent_task_id: str) -> List[Task]:
         """Get all subtasks for a given parent task using persistence manager only."""
-        async with self.lock:
-            # Ensure async initialization is complete
-            await self._initialize()
-            return await self._get_subtasks_for_parent_unlocked(parent_task_id)
+        # Ensure async initialization is complete
+        await self._initialize()
+        return await self._get_subtasks_for_parent_unlocked(parent_task_id)
     
-    async def get_all_tasks(self) -> List[Task]:
-        """Get all tasks in the system using persistence manager only."""
-        async with self.lock:
-            # Ensure async initialization is complete
-            await self._initialize()
-            
-            all_subtasks = []
-            
-            try:
-                # Get all active tasks from persistent storage
-                active_task_ids = await self.persistence.get_all_active_tasks()
-                
-                # Load each task breakdown and extract subtasks
-                for parent_task_id in active_task_ids:
-                    try:
-                        breakdown = await self.persistence.load_task_breakdown(parent_task_id)
-                        if breakdown:
-                            all_subtasks.extend(breakdown.subtasks)
-                    except Exception as e:
-                        logger.error(f"Failed to load task {parent_task_id} from persistent storage: {str(e)}")
-            except Exception as e:
-                logger.error(f"Failed to get tasks from persistent storage: {str(e)}")
+    async def iter_all_tasks(self, status=None, specialist_type=None,
+                             page_size: int = 500) -> AsyncIterator[Task]:
+        """
+        Stream the subtasks of all active tasks, newest first.
+        
+        Rows are read in keyset-paginated pages, so memory stays bounded by
+        page_size however many tasks are stored.
+        
+        Args:
+            status: TaskStatus or statuses to include (all if None)
+            specialist_type: Specialist type or types to include (all if None)
+            page_size: Number of subtasks fetched per query
+        """
+        # Ensure async initialization is complete
+        await self._initialize()
+        async for task in self.persistence.iter_subtasks(status, specialist_type, page_size):
+            yield task
+    
+    async def get_tasks_page(self, limit: int = 100, cursor: Optional[Tuple[str, str]] = None,
+                             status=None, specialist_type=None
+                             ) -> Tuple[List[Task], Optional[Tuple[str, str]]]:
+        """
+        Get one page of the subtasks of all active tasks, newest first.
+        
+        Args:
+            limit: Maximum number of subtasks on the page
+            cursor: Cursor returned with the previous page, None for the first page
+            status: TaskStatus or statuses to include (all if None)
+            specialist_type: Specialist type or types to include (all if None)
             
-            # Sort by created_at in descending order
-            all_subtasks.sort(key=lambda st: st.created_at, reverse=True)
+        Returns:
+            Tuple of (subtasks, cursor for the next page or None when exhausted)
+        """
+        # Ensure async initialization is complete
+        await self._initialize()
+        return await self.persistence.get_subtask_page(status, specialist_type, cursor, limit)
+    
+    async def get_all_tasks(self, status=None, specialist_type=None) -> List[Task]:
+        """Get the subtasks of all active tasks, newest first, filtered in SQL."""
+        try:
+            return [task async for task in self.iter_all_tasks(status, specialist_type)]
+        except Exception as e:
+            logger.error(f"Failed to get tasks from persistent storage: {str(e)}")
+            return []
+
+    async def iter_changed_tasks(self, since: str, page_size: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the tasks written at or after a point in time, deleted ones included.
+        
+        Args:
+            since: UTC timestamp as 'YYYY-MM-DD HH:MM:SS'
+            page_size: Number of rows fetched per query
             
-            return all_subtasks
+        Yields:
+            Dicts with task_id, parent_task_id and deleted_at
+        """
+        # Ensure async initialization is complete
+        await self._initialize()
+        cursor = None
+        while True:
+            rows, cursor = await self.persistence.get_changed_tasks(since, cursor, page_size)
+            for row in rows:
+                yield row
+            if cursor is None:
+                return
+
+    async def get_task_families(self, parent_ids: List[str],
+                                include_subtasks: bool = True) -> List[Task]:
+        """Get live top-level tasks and, optionally, their live subtasks."""
+        # Ensure async initialization is complete
+        await self._initialize()
+        return await self.persistence.get_task_families(parent_ids, include_subtasks)
 
     async def _get_parent_task_id(self, task_id: str) -> Optional[str]:
         """
@@ -269,12 +557,11 @@ class StateManager:
         Returns:
             The parent task ID, or None if subtask not found
         """
-        async with self.lock:
-            # Ensure async initialization is complete
-            await self._initialize()
-            
-            try:
-                return await self.persistence.get_parent_task_id(task_id)
-            except Exception as e:
-                logger.error(f"Error getting parent task ID for {task_id}: {str(e)}")
-                return None
+        # Ensure async initialization is complete
+        await self._initialize()
+        
+        try:
+            return await self.persistence.get_parent_task_id(task_id)
+        except Exception as e:
+            logger.error(f"Error getting parent task ID for {task_id}: {str(e)}")
+            return None
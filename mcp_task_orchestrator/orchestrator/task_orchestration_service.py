@@ -14,7 +14,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 from ..domain.entities.task import (
-    Task, TaskType, TaskStatus, LifecycleStage
+    Task, TaskType, TaskStatus, LifecycleStage, TaskArtifact, ArtifactType
 )
 from ..domain.value_objects.specialist_type import SpecialistType
 from ..domain.value_objects.complexity_level import ComplexityLevel
@@ -30,6 +30,20 @@ from ..application.dto.error_responses import ErrorResponseBuilder
 logger = logging.getLogger("mcp_task_orchestrator.core")
 
 
+def _to_task_artifacts(task_id: str, artifacts: List[Any]) -> List[TaskArtifact]:
+    """Wrap artifact references (paths or dicts) as TaskArtifact records of the task."""
+    return [
+        artifact if isinstance(artifact, TaskArtifact) else TaskArtifact(
+            artifact_id=f"{task_id}_artifact_{i}",
+            task_id=task_id,
+            artifact_type=ArtifactType.GENERAL,
+            artifact_name=f"Artifact {i}",
+            content=artifact if isinstance(artifact, str) else json.dumps(artifact)
+        )
+        for i, artifact in enumerate(artifacts)
+    ]
+
+
 class TaskOrchestrator:
     """Main orchestrator for managing complex tasks and specialist coordination.
     
@@ -234,7 +248,7 @@ class TaskOrchestrator:
         # Update task status and data with artifact information
         subtask.status = TaskStatus.COMPLETED
         subtask.results = summary
-        subtask.artifacts = artifacts
+        subtask.artifacts = _to_task_artifacts(task_id, artifacts)
         subtask.completed_at = datetime.utcnow()
         
         # Update the subtask
@@ -325,7 +339,7 @@ class TaskOrchestrator:
         # Update task status and data
         subtask.status = TaskStatus.COMPLETED
         subtask.results = results
-        subtask.artifacts = artifacts
+        subtask.artifacts = _to_task_artifacts(task_id, artifacts)
         subtask.completed_at = datetime.utcnow()
         
         # Update the subtask
@@ -405,15 +419,14 @@ class TaskOrchestrator:
     )
     async def _get_status_core(self, include_completed: bool = False) -> Dict:
         """Core logic for getting task status."""
+        statuses = None
+        if not include_completed:
+            statuses = [status for status in TaskStatus if status != TaskStatus.COMPLETED]
         all_tasks = await asyncio.wait_for(
-            self.state.get_all_tasks(),
+            self.state.get_all_tasks(status=statuses),
             timeout=5
         )
         
-        if not include_completed:
-            all_tasks = [task for task in all_tasks 
-                        if task.status != TaskStatus.COMPLETED]
-        
         return {
             "active_tasks": len([t for t in all_tasks if t.status == TaskStatus.ACTIVE]),
             "pending_tasks": len([t for t in all_tasks if t.status == TaskStatus.PENDING]),
@@ -449,16 +462,16 @@ class TaskOrchestrator:
             if not parent_task_id:
                 return {"progress": "unknown", "error": "Parent task not found"}
             
-            # Get all subtasks for parent with timeout protection
-            subtasks = await asyncio.wait_for(
-                self.state.get_subtasks_for_parent(parent_task_id),
+            # Read the parent's maintained counters with timeout protection
+            progress = await asyncio.wait_for(
+                self.state.get_parent_progress(parent_task_id),
                 timeout=3  # Quick timeout since DB operations are fast
             )
-            total = len(subtasks)
-            completed = len([st for st in subtasks if st.status == TaskStatus.COMPLETED])
-            
-            # Calculate progress percentage
-            progress_pct = (completed / total) * 100 if total > 0 else 0
+            if progress is None:
+                return {"progress": "unknown", "error": "Parent task progress unavailable"}
+            total = progress["total_subtasks"]
+            completed = progress["completed_subtasks"]
+            progress_pct = progress["progress_percentage"]
             
             return {
                 "progress": "in_progress" if completed < total else "completed",
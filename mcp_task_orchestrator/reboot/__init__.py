@@ -10,7 +10,8 @@ from .state_serializer import (
     ServerStateSnapshot,
     RestartReason,
     ClientSession,
-    DatabaseState
+    DatabaseState,
+    SnapshotStream
 )
 
 from .shutdown_coordinator import (
@@ -25,7 +26,8 @@ from .restart_manager import (
     ProcessManager,
     StateRestorer,
     RestartPhase,
-    RestartStatus
+    RestartStatus,
+    RestoreProgress
 )
 
 from .connection_manager import (
@@ -33,6 +35,7 @@ from .connection_manager import (
     ConnectionInfo,
     ConnectionState,
     RequestBuffer,
+    RequestPriority,
     ReconnectionManager
 )
 
@@ -52,6 +55,7 @@ __all__ = [
     'RestartReason',
     'ClientSession',
     'DatabaseState',
+    'SnapshotStream',
     
     # Shutdown coordination
     'ShutdownCoordinator',
@@ -65,12 +69,14 @@ __all__ = [
     'StateRestorer',
     'RestartPhase',
     'RestartStatus',
+    'RestoreProgress',
     
     # Connection management
     'ConnectionManager',
     'ConnectionInfo',
     'ConnectionState',
     'RequestBuffer',
+    'RequestPriority',
     'ReconnectionManager',
     
     # Integration
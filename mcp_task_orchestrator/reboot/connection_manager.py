@@ -6,11 +6,15 @@ during server restarts.
 """
 
 import asyncio
+import heapq
+import json
 import logging
+import os
 import time
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Any, Set
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field
 
 from .state_serializer import ClientSession
@@ -18,6 +22,23 @@ from .state_serializer import ClientSession
 logger = logging.getLogger("mcp_task_orchestrator.server.connection_manager")
 
 
+# Read-only MCP methods and tools; identical buffered calls are replayed once
+IDEMPOTENT_METHODS = frozenset({
+    "ping", "tools/list", "resources/list", "resources/read", "prompts/list", "prompts/get"
+})
+IDEMPOTENT_TOOLS = frozenset({
+    "orchestrator_get_status", "orchestrator_health_check", "orchestrator_list_sessions",
+    "orchestrator_list_partial_artifacts", "orchestrator_metrics", "orchestrator_query_tasks",
+    "orchestrator_restart_status", "orchestrator_session_status"
+})
+
+# Requests held in memory across all sessions before spilling to disk
+DEFAULT_MAX_MEMORY_REQUESTS = 1000
+
+# Upper bound for the spill file; requests beyond it are rejected
+DEFAULT_MAX_SPILL_BYTES = 64 * 1024 * 1024
+
+
 class ConnectionState(str, Enum):
     """Connection states during restart process."""
     ACTIVE = "active"
@@ -41,20 +62,87 @@ class ConnectionInfo:
     buffered_responses: List[Dict[str, Any]] = field(default_factory=list)
 
 
+class RequestPriority(int, Enum):
+    """Replay priority of a buffered request; lower values go first."""
+    STATUS = 0
+    MUTATION = 1
+
+
+def classify_request(request: Dict[str, Any]) -> RequestPriority:
+    """Status reads are idempotent; everything else is treated as a mutation."""
+    method = request.get("method")
+    if method in IDEMPOTENT_METHODS:
+        return RequestPriority.STATUS
+    if method == "tools/call" and (request.get("params") or {}).get("name") in IDEMPOTENT_TOOLS:
+        return RequestPriority.STATUS
+    return RequestPriority.MUTATION
+
+
+def fan_out_response(response: Dict[str, Any], duplicate_ids: List[Any]) -> List[Dict[str, Any]]:
+    """Copy a replayed read's response for each deduplicated request it answers."""
+    return [response] + [{**response, "id": request_id} for request_id in duplicate_ids]
+
+
+@dataclass
+class BufferedRequest:
+    """A buffered request, held in memory or at an offset in the spill file."""
+    sequence: int
+    session_id: str
+    priority: RequestPriority
+    buffered_at: datetime
+    request: Optional[Dict[str, Any]] = None
+    spill_offset: Optional[int] = None
+    dedupe_key: Optional[str] = None
+    duplicate_ids: List[Any] = field(default_factory=list)
+
+
 class RequestBuffer:
-    """Buffers client requests during server restart."""
+    """Buffers client requests during server restart.
+
+    Each session may hold up to ``max_buffer_size`` requests. At most
+    ``max_memory_requests`` are kept in memory across all sessions; the rest
+    are appended to a spill file and read back in arrival order. Identical
+    status reads from a session are buffered once, and status reads are
+    replayed ahead of other sessions' mutations.
+    """
     
-    def __init__(self, max_buffer_size: int = 100):
+    def __init__(self,
+                 max_buffer_size: int = 100,
+                 max_memory_requests: int = DEFAULT_MAX_MEMORY_REQUESTS,
+                 spill_path: Optional[str] = None,
+                 max_spill_bytes: int = DEFAULT_MAX_SPILL_BYTES):
         """Initialize request buffer.
         
         Args:
             max_buffer_size: Maximum number of requests to buffer per client
+            max_memory_requests: Maximum number of requests held in memory
+            spill_path: Append-only file for requests beyond the memory bound.
+                Defaults to .task_orchestrator/server_state/request_spill.jsonl
+            max_spill_bytes: Maximum size of the spill file
         """
+        if spill_path is None:
+            spill_path = os.path.join(
+                os.getcwd(), ".task_orchestrator", "server_state", "request_spill.jsonl"
+            )
+        
         self.max_buffer_size = max_buffer_size
-        self.buffers: Dict[str, List[Dict[str, Any]]] = {}
-        self.buffer_timestamps: Dict[str, List[datetime]] = {}
+        self.max_memory_requests = max_memory_requests
+        self.max_spill_bytes = max_spill_bytes
+        self.spill_path = Path(spill_path)
+        self.buffers: Dict[str, List[BufferedRequest]] = {}
         self.lock = asyncio.Lock()
         
+        self._sequence = 0
+        self._in_memory = 0
+        self._spilled = 0
+        self._spill_size = 0
+        self._spill_file = None
+        self._reads: Dict[Tuple[str, str], BufferedRequest] = {}
+        self._deduplicated = 0
+        self._rejected = 0
+        
+        self._load_spill_file()
+        
         logger.info(f"RequestBuffer initialized with max size {max_buffer_size}")
 
     async def buffer_request(self, session_id: str, request: Dict[str, Any]) -> bool:
@@ -68,21 +156,48 @@ class RequestBuffer:
             True if request was buffered, False if buffer is full
         """
         async with self.lock:
-            if session_id not in self.buffers:
-                self.buffers[session_id] = []
-                self.buffer_timestamps[session_id] = []
+            buffer = self.buffers.setdefault(session_id, [])
+            priority = classify_request(request)
             
-            buffer = self.buffers[session_id]
-            timestamps = self.buffer_timestamps[session_id]
+            dedupe_key = None
+            if priority is RequestPriority.STATUS:
+                dedupe_key = json.dumps(
+                    [request.get("method"), request.get("params")], sort_keys=True, default=str
+                )
+                original = self._reads.get((session_id, dedupe_key))
+                if original is not None and self._record_duplicate(original, request):
+                    self._deduplicated += 1
+                    logger.debug(f"Deduplicated buffered read for session {session_id}")
+                    return True
+            else:
+                # Reads after a mutation must see its effect
+                self._forget_reads(session_id)
             
             # Check buffer size limit
             if len(buffer) >= self.max_buffer_size:
                 logger.warning(f"Request buffer full for session {session_id}")
+                self._rejected += 1
                 return False
             
-            # Add request to buffer
-            buffer.append(request)
-            timestamps.append(datetime.now(timezone.utc))
+            self._sequence += 1
+            entry = BufferedRequest(
+                sequence=self._sequence,
+                session_id=session_id,
+                priority=priority,
+                buffered_at=datetime.now(timezone.utc),
+                dedupe_key=dedupe_key
+            )
+            
+            if self._in_memory < self.max_memory_requests:
+                entry.request = request
+                self._in_memory += 1
+            elif not self._spill(entry, request):
+                self._rejected += 1
+                return False
+            
+            buffer.append(entry)
+            if dedupe_key is not None:
+                self._reads[(session_id, dedupe_key)] = entry
             
             logger.debug(f"Buffered request for session {session_id}: {request.get('method', 'unknown')}")
             return True
@@ -90,20 +205,74 @@ class RequestBuffer:
     async def get_buffered_requests(self, session_id: str) -> List[Dict[str, Any]]:
         """Get all buffered requests for a session.
         
+        Deduplicated reads are returned again as separate requests, each
+        with its own id, right after the request they were merged into.
+        
         Args:
             session_id: Client session ID
             
         Returns:
-            List of buffered requests
+            List of buffered requests in arrival order
         """
         async with self.lock:
-            requests = self.buffers.get(session_id, []).copy()
-            self.buffers[session_id] = []  # Clear buffer after retrieval
-            self.buffer_timestamps[session_id] = []
+            entries = self.buffers.pop(session_id, [])
+            requests = []
+            for entry, request in self._load_requests(entries):
+                requests.append(request)
+                requests.extend({**request, "id": request_id} for request_id in entry.duplicate_ids)
+            self._discard(entries)
             
             logger.debug(f"Retrieved {len(requests)} buffered requests for session {session_id}")
             return requests
 
+    async def drain_requests(self) -> List[Tuple[str, Dict[str, Any], List[Any]]]:
+        """Take the buffered requests of all sessions in replay order.
+        
+        Each session's requests keep their arrival order; across sessions,
+        status reads are replayed before mutations. A deduplicated read is
+        replayed once; the caller answers the ids in ``duplicate_ids`` with
+        copies of its response (see ``fan_out_response``).
+        
+        Returns:
+            List of (session_id, request, duplicate_ids) tuples
+        """
+        async with self.lock:
+            heap = [
+                (entries[0].priority, entries[0].sequence, session_id, 0)
+                for session_id, entries in self.buffers.items() if entries
+            ]
+            heapq.heapify(heap)
+            
+            ordered = []
+            while heap:
+                _, _, session_id, index = heapq.heappop(heap)
+                entries = self.buffers[session_id]
+                ordered.append(entries[index])
+                if index + 1 < len(entries):
+                    following = entries[index + 1]
+                    heapq.heappush(
+                        heap, (following.priority, following.sequence, session_id, index + 1)
+                    )
+            
+            requests = [
+                (entry.session_id, request, list(entry.duplicate_ids))
+                for entry, request in self._load_requests(ordered)
+            ]
+            self.buffers.clear()
+            self._discard(ordered)
+            
+            logger.info(f"Drained {len(requests)} buffered requests")
+            return requests
+
+    async def clear_session_buffer(self, session_id: str):
+        """Drop all buffered requests of a session.
+        
+        Args:
+            session_id: Client session ID
+        """
+        async with self.lock:
+            self._discard(self.buffers.pop(session_id, []))
+
     async def clear_expired_requests(self, max_age_seconds: int = 300):
         """Clear requests older than specified age.
         
@@ -112,29 +281,23 @@ class RequestBuffer:
         """
         async with self.lock:
             current_time = datetime.now(timezone.utc)
-            expired_count = 0
+            expired = []
             
             for session_id in list(self.buffers.keys()):
-                buffer = self.buffers[session_id]
-                timestamps = self.buffer_timestamps[session_id]
-                
-                # Find expired requests
                 valid_requests = []
-                valid_timestamps = []
-                
-                for request, timestamp in zip(buffer, timestamps):
-                    age = (current_time - timestamp).total_seconds()
+                for entry in self.buffers[session_id]:
+                    age = (current_time - entry.buffered_at).total_seconds()
                     if age <= max_age_seconds:
-                        valid_requests.append(request)
-                        valid_timestamps.append(timestamp)
+                        valid_requests.append(entry)
                     else:
-                        expired_count += 1
+                        expired.append(entry)
                 
                 self.buffers[session_id] = valid_requests
-                self.buffer_timestamps[session_id] = valid_timestamps
             
-            if expired_count > 0:
-                logger.info(f"Cleared {expired_count} expired buffered requests")
+            self._discard(expired)
+            
+            if expired:
+                logger.info(f"Cleared {len(expired)} expired buffered requests")
 
     def get_buffer_stats(self) -> Dict[str, Any]:
         """Get buffer statistics.
@@ -146,12 +309,180 @@ class RequestBuffer:
         return {
             'total_sessions': len(self.buffers),
             'total_buffered_requests': total_requests,
+            'in_memory_requests': self._in_memory,
+            'spilled_requests': self._spilled,
+            'spill_file_bytes': self._spill_size,
+            'deduplicated_requests': self._deduplicated,
+            'rejected_requests': self._rejected,
             'sessions': {
                 session_id: len(buffer) 
                 for session_id, buffer in self.buffers.items()
             }
         }
 
+    def _forget_reads(self, session_id: str):
+        """Stop deduplicating against a session's earlier reads."""
+        for key in [key for key in self._reads if key[0] == session_id]:
+            del self._reads[key]
+
+    def _record_duplicate(self, original: BufferedRequest, request: Dict[str, Any]) -> bool:
+        """Attach a duplicate read's id to the original; spilled ones record it on disk too."""
+        if "id" not in request:
+            return True
+        if original.request is None and not self._append_spill_line(
+                {"duplicate_of": original.sequence, "id": request["id"]}):
+            # Buffered as a request of its own instead
+            return False
+        original.duplicate_ids.append(request["id"])
+        return True
+
+    def _spill(self, entry: BufferedRequest, request: Dict[str, Any]) -> bool:
+        """Append a request to the spill file."""
+        record = {
+            "sequence": entry.sequence,
+            "session_id": entry.session_id,
+            "priority": int(entry.priority),
+            "buffered_at": entry.buffered_at.isoformat(),
+            "request": request
+        }
+        offset = self._spill_size
+        if not self._append_spill_line(record):
+            return False
+        
+        entry.spill_offset = offset
+        self._spilled += 1
+        if self._spilled == 1:
+            logger.warning(f"Request buffer memory bound reached; spilling to {self.spill_path}")
+        return True
+
+    def _append_spill_line(self, record: Dict[str, Any], enforce_limit: bool = True) -> bool:
+        """Append one JSON line to the spill file, respecting its size bound."""
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        if enforce_limit and self._spill_size + len(line) > self.max_spill_bytes:
+            logger.warning(f"Request spill file is full ({self._spill_size} bytes)")
+            return False
+        
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self.spill_path, "ab")
+            self._spill_file.write(line)
+            self._spill_file.flush()
+        except OSError as e:
+            logger.error(f"Failed to write request spill file {self.spill_path}: {e}")
+            return False
+        
+        self._spill_size += len(line)
+        return True
+
+    def _load_requests(self, entries: List[BufferedRequest]
+                       ) -> List[Tuple[BufferedRequest, Dict[str, Any]]]:
+        """Resolve entries to request dicts, reading spilled ones back from disk."""
+        requests = []
+        spill_reader = None
+        try:
+            for entry in entries:
+                request = entry.request
+                if request is None:
+                    try:
+                        if spill_reader is None:
+                            spill_reader = open(self.spill_path, "rb")
+                        spill_reader.seek(entry.spill_offset)
+                        request = json.loads(spill_reader.readline())["request"]
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.error(f"Failed to read spilled request {entry.sequence}: {e}")
+                        continue
+                requests.append((entry, request))
+        finally:
+            if spill_reader is not None:
+                spill_reader.close()
+        return requests
+
+    def _discard(self, entries: List[BufferedRequest]):
+        """Release entries that were replayed, cleared or expired."""
+        consumed = []
+        for entry in entries:
+            if entry.request is not None:
+                self._in_memory -= 1
+            else:
+                self._spilled -= 1
+                consumed.append(entry.sequence)
+            if entry.dedupe_key is not None and \
+                    self._reads.get((entry.session_id, entry.dedupe_key)) is entry:
+                del self._reads[(entry.session_id, entry.dedupe_key)]
+        
+        if not consumed:
+            return
+        if self._spilled == 0:
+            self._reset_spill_file()
+        else:
+            # Recorded so a restarted process does not replay them again;
+            # exempt from the size bound, which only limits pending requests
+            self._append_spill_line({"consumed": consumed}, enforce_limit=False)
+
+    def _reset_spill_file(self):
+        """Remove the spill file once nothing in it is pending."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        try:
+            self.spill_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Failed to remove request spill file {self.spill_path}: {e}")
+        self._spill_size = 0
+
+    def _load_spill_file(self):
+        """Pick up requests spilled by a previous process."""
+        if not self.spill_path.exists():
+            return
+        
+        pending: Dict[int, BufferedRequest] = {}
+        offset = 0
+        try:
+            with open(self.spill_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                        if "consumed" in record:
+                            for sequence in record["consumed"]:
+                                pending.pop(sequence, None)
+                        elif "duplicate_of" in record:
+                            original = pending.get(record["duplicate_of"])
+                            if original is not None:
+                                original.duplicate_ids.append(record["id"])
+                        else:
+                            pending[record["sequence"]] = BufferedRequest(
+                                sequence=record["sequence"],
+                                session_id=record["session_id"],
+                                priority=RequestPriority(record["priority"]),
+                                buffered_at=datetime.fromisoformat(record["buffered_at"]),
+                                spill_offset=offset
+                            )
+                    except (ValueError, KeyError) as e:
+                        logger.warning(f"Skipping unreadable request spill record at {offset}: {e}")
+                    offset += len(line)
+            # Drop a line torn by a crash mid-write so appends start cleanly
+            os.truncate(self.spill_path, offset)
+        except OSError as e:
+            logger.error(f"Failed to read request spill file {self.spill_path}: {e}")
+            return
+        
+        for sequence in sorted(pending):
+            entry = pending[sequence]
+            self.buffers.setdefault(entry.session_id, []).append(entry)
+        self._spilled = len(pending)
+        self._spill_size = offset
+        self._sequence = max(pending, default=0)
+        
+        if pending:
+            logger.info(f"Recovered {len(pending)} spilled requests from {self.spill_path}")
+        else:
+            self._reset_spill_file()
+
 
 class ReconnectionManager:
     """Manages client reconnection during and after restart."""
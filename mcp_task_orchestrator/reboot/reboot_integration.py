@@ -8,11 +8,13 @@ MCP Task Orchestrator server infrastructure.
 import asyncio
 import logging
 import os
+from pathlib import Path
 from typing import Optional, Dict, Any
 
 from .state_serializer import StateSerializer, RestartReason, ServerStateSnapshot
 from .shutdown_coordinator import ShutdownCoordinator, ShutdownManager, ShutdownPhase
 from ..orchestrator.orchestration_state_manager import StateManager
+from ..infrastructure.auto_append.event_system import get_event_bus, enable_event_log
 
 logger = logging.getLogger("mcp_task_orchestrator.server.reboot_integration")
 
@@ -40,10 +42,22 @@ class RebootManager:
             state_manager: State manager instance from server
         """
         self.state_manager = state_manager
+        self.shutdown_coordinator.state_manager = state_manager
         self._initialized = True
         
+        # Keep auto-append events next to the task database so rule triggers survive restarts
+        try:
+            enable_event_log(Path(state_manager.db_path).parent / "auto_append_events.db")
+            # Redeliver the unacknowledged backlog before anything new is published
+            replayed = await get_event_bus().resume_durable_subscribers()
+            if replayed:
+                logger.info(f"Resumed durable event subscribers: {replayed}")
+        except Exception as e:
+            logger.error(f"Failed to enable auto-append event log: {e}")
+        
         # Register shutdown callbacks with the state manager
         self.shutdown_coordinator.add_shutdown_callback(self._prepare_state_manager_shutdown)
+        self.shutdown_coordinator.add_shutdown_callback(self._flush_event_log)
         self.shutdown_coordinator.add_cleanup_callback(self._cleanup_state_manager)
         
         logger.info("RebootManager initialized with state manager")
@@ -137,9 +151,10 @@ class RebootManager:
         # Add additional readiness checks
         if self.state_manager:
             try:
-                # Check if state manager is accessible
-                await self.state_manager.get_all_tasks()
+                # Check if state manager is accessible; one row is enough
+                await self.state_manager.get_tasks_page(limit=1)
                 details['state_manager_accessible'] = True
+                details['startup_recovery'] = self.state_manager.get_recovery_status()
             except Exception as e:
                 details['state_manager_accessible'] = False
                 details['state_manager_error'] = str(e)
@@ -240,6 +255,20 @@ class RebootManager:
             logger.error(f"Failed to prepare state manager for shutdown: {e}")
             raise
 
+    async def _flush_event_log(self):
+        """Deliver queued events and persist the event log with subscriber offsets."""
+        event_bus = get_event_bus()
+        try:
+            await asyncio.wait_for(event_bus.join(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out waiting for event delivery; undelivered events will be replayed")
+        
+        try:
+            await event_bus.flush_event_log()
+        except Exception as e:
+            logger.error(f"Failed to flush event log: {e}")
+            raise
+
     async def _cleanup_state_manager(self):
         """Clean up state manager resources."""
         if not self.state_manager:
@@ -277,6 +306,11 @@ class RebootManager:
             # - Restore client sessions
             # - Resume suspended operations
             
+            # Redeliver events that durable subscribers had not acknowledged
+            replayed = await get_event_bus().resume_durable_subscribers()
+            if replayed:
+                logger.info(f"Resumed durable event subscribers: {replayed}")
+            
             logger.info("Server state restoration completed")
             return True
             
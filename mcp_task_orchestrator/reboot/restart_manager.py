@@ -15,14 +15,23 @@ import signal
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Any, Callable, Tuple
+from dataclasses import dataclass, asdict
 
-from .state_serializer import StateSerializer, ServerStateSnapshot, RestartReason
-from ..domain.entities.task import Task, TaskType, TaskStatus
+from .state_serializer import StateSerializer, ServerStateSnapshot, RestartReason, SnapshotStream
+from ..domain.entities.task import Task, TaskType, TaskStatus, TaskDependency, DependencyType
+from ..infrastructure.monitoring.metrics import get_metrics_collector
 
 logger = logging.getLogger("mcp_task_orchestrator.server.restart_manager")
 
+# Snapshot entries converted per batch, and task stores awaited at once
+RESTORE_BATCH_SIZE = 50
+RESTORE_CONCURRENCY = 8
+
+# Tasks that were being worked on when the server stopped; they are restored
+# before the server reports ready, everything else in the background
+CRITICAL_TASK_STATUSES = frozenset(["in_progress", "active", "executing"])
+
 
 class RestartPhase(str, Enum):
     """Phases of the restart process."""
@@ -47,10 +56,40 @@ class RestartStatus:
     completed_at: Optional[datetime] = None
     process_id: Optional[int] = None
     errors: List[str] = None
+    phase_timings: Dict[str, float] = None
     
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
+        if self.phase_timings is None:
+            self.phase_timings = {}
+
+
+@dataclass
+class RestoreProgress:
+    """Progress of a state restoration."""
+    state: str = "idle"  # idle, restoring, ready, completed, failed, cancelled
+    critical_restored: int = 0
+    background_restored: int = 0
+    failed: int = 0
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _record_phase_timing(timings: Dict[str, float], phase: str, started: float):
+    """Store how long a restart phase took and report it as a metric."""
+    seconds = time.perf_counter() - started
+    timings[phase] = seconds
+    get_metrics_collector().record_timing("restart.phase_duration", seconds, {"phase": phase})
+
+
+def _is_critical(task_data: Dict[str, Any]) -> bool:
+    """Whether a snapshot entry was being worked on when the snapshot was taken."""
+    if task_data.get('status') in CRITICAL_TASK_STATUSES:
+        return True
+    return any(st.get('status') in CRITICAL_TASK_STATUSES for st in task_data.get('subtasks', []))
 
 
 class ProcessManager:
@@ -204,16 +243,34 @@ class ProcessManager:
 
 
 class StateRestorer:
-    """Handles state restoration from snapshots."""
+    """Handles state restoration from snapshots.
+    
+    Restoration returns, and sets ready, once the database state and the
+    tasks that were being worked on are restored; the remaining tasks are
+    restored by a background task. Entries are converted to Tasks in a
+    worker thread, one batch ahead of the stores, and at most
+    max_concurrency stores run at a time.
+    """
     
-    def __init__(self, state_serializer: StateSerializer):
+    def __init__(self, state_serializer: StateSerializer,
+                 batch_size: int = RESTORE_BATCH_SIZE,
+                 max_concurrency: int = RESTORE_CONCURRENCY):
         """Initialize state restorer.
         
         Args:
             state_serializer: State serializer instance
+            batch_size: Snapshot entries converted per batch
+            max_concurrency: Maximum number of task stores awaited at once
         """
         self.state_serializer = state_serializer
         self.restoration_callbacks: List[Callable] = []
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        
+        self.ready = asyncio.Event()
+        self.progress = RestoreProgress()
+        self.timings: Dict[str, float] = {}
+        self._background_task: Optional[asyncio.Task] = None
         
         logger.info("StateRestorer initialized")
 
@@ -227,31 +284,80 @@ class StateRestorer:
             state_manager: State manager instance to restore into
             
         Returns:
-            True if restoration was successful, False otherwise
+            True once critical state is restored, False otherwise
         """
         try:
-            logger.info(f"Restoring state from snapshot: {snapshot.timestamp}")
-            
             # Validate snapshot before restoration
             if not await self.state_serializer.validate_snapshot(snapshot):
                 logger.error("Snapshot validation failed")
                 return False
             
+            return await self._restore(
+                snapshot, state_manager,
+                lambda: iter(snapshot.active_tasks),
+                lambda: iter(snapshot.suspended_tasks)
+            )
+            
+        except Exception as e:
+            logger.error(f"State restoration failed: {e}")
+            return False
+
+    async def restore_from_stream(self, stream: SnapshotStream, state_manager) -> bool:
+        """Restore server state from a snapshot streamed from disk.
+        
+        Args:
+            stream: Snapshot opened with StateSerializer.open_latest_snapshot
+            state_manager: State manager instance to restore into
+            
+        Returns:
+            True once critical state is restored, False otherwise
+        """
+        return await self._restore(
+            stream.snapshot, state_manager,
+            stream.iter_active_tasks,
+            stream.iter_suspended_tasks
+        )
+
+    async def wait_for_background_restore(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the background part of the restoration; returns False on timeout."""
+        if self._background_task is None:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(self._background_task), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_restore_status(self) -> Dict[str, Any]:
+        """Get restoration progress and per-phase timings in seconds."""
+        return {**self.progress.to_dict(), 'phase_timings': dict(self.timings)}
+
+    async def _restore(self, snapshot: ServerStateSnapshot, state_manager,
+                       active_entries: Callable[[], Iterator[Dict[str, Any]]],
+                       suspended_entries: Callable[[], Iterator[Dict[str, Any]]]) -> bool:
+        """Restore critical state now and schedule the rest in the background."""
+        try:
+            logger.info(f"Restoring state from snapshot: {snapshot.timestamp}")
+            
+            if self._background_task is not None and not self._background_task.done():
+                self._background_task.cancel()
+            self.ready.clear()
+            self.progress = RestoreProgress(state="restoring")
+            self.timings = {}
+            
             # Restore database state
+            started = time.perf_counter()
             if not await self._restore_database_state(snapshot.database_state, state_manager):
                 logger.error("Database state restoration failed")
+                self.progress.state = "failed"
                 return False
+            _record_phase_timing(self.timings, "restore_database", started)
             
-            # Restore active tasks
-            if not await self._restore_active_tasks(snapshot.active_tasks, state_manager):
-                logger.error("Active tasks restoration failed")
-                return False
-            
-            # Restore suspended tasks
-            if snapshot.suspended_tasks:
-                if not await self._restore_suspended_tasks(snapshot.suspended_tasks, state_manager):
-                    logger.error("Suspended tasks restoration failed")
-                    return False
+            # Restore the tasks that were being worked on
+            started = time.perf_counter()
+            await self._restore_task_entries(active_entries(), state_manager,
+                                             "critical_restored", _is_critical)
+            _record_phase_timing(self.timings, "restore_critical_tasks", started)
             
             # Restore client sessions
             if snapshot.client_sessions:
@@ -265,13 +371,103 @@ class StateRestorer:
                 except Exception as e:
                     logger.error(f"Restoration callback failed: {e}")
             
-            logger.info("State restoration completed successfully")
+            self.progress.state = "ready"
+            self.ready.set()
+            self._background_task = asyncio.create_task(
+                self._restore_in_background(state_manager, active_entries, suspended_entries)
+            )
+            
+            logger.info(f"Critical state restored ({self.progress.critical_restored} tasks), "
+                        f"restoring remaining tasks in the background")
             return True
             
         except Exception as e:
             logger.error(f"State restoration failed: {e}")
+            self.progress.state = "failed"
+            self.progress.error = str(e)
             return False
 
+    async def _restore_in_background(self, state_manager,
+                                     active_entries: Callable[[], Iterator[Dict[str, Any]]],
+                                     suspended_entries: Callable[[], Iterator[Dict[str, Any]]]):
+        """Restore the tasks left out of the critical phase."""
+        started = time.perf_counter()
+        try:
+            await self._restore_task_entries(active_entries(), state_manager, "background_restored",
+                                             lambda task_data: not _is_critical(task_data))
+            await self._restore_task_entries(suspended_entries(), state_manager, "background_restored")
+            self.progress.state = "completed"
+            logger.info(f"State restoration completed: {self.progress.to_dict()}")
+        except asyncio.CancelledError:
+            self.progress.state = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Background state restoration failed: {e}")
+            self.progress.state = "failed"
+            self.progress.error = str(e)
+        finally:
+            _record_phase_timing(self.timings, "restore_background_tasks", started)
+
+    async def _restore_task_entries(self, entries: Iterator[Dict[str, Any]], state_manager,
+                                    counter: str,
+                                    predicate: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        """Restore snapshot entries in pipelined batches.
+        
+        The next batch is read and converted in a worker thread while the
+        current one is stored. A task that fails to convert or store is
+        logged and counted; the others are still restored.
+        
+        Args:
+            entries: Snapshot task entries
+            state_manager: State manager instance to restore into
+            counter: RestoreProgress field counting restored tasks
+            predicate: Selects the entries to restore (all if None)
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def store(breakdown: Task):
+            async with semaphore:
+                try:
+                    await state_manager.store_task_breakdown(breakdown)
+                except Exception as e:
+                    logger.error(f"Failed to restore task {breakdown.task_id}: {e}")
+                    self.progress.failed += 1
+                    return
+            setattr(self.progress, counter, getattr(self.progress, counter) + 1)
+            logger.debug(f"Restored task: {breakdown.task_id}")
+        
+        next_batch = loop.run_in_executor(None, self._convert_batch, entries, predicate)
+        while True:
+            breakdowns, failed, exhausted = await next_batch
+            self.progress.failed += failed
+            if not exhausted:
+                next_batch = loop.run_in_executor(None, self._convert_batch, entries, predicate)
+            await asyncio.gather(*(store(breakdown) for breakdown in breakdowns))
+            if exhausted:
+                return
+
+    def _convert_batch(self, entries: Iterator[Dict[str, Any]],
+                       predicate: Optional[Callable[[Dict[str, Any]], bool]]
+                       ) -> Tuple[List[Task], int, bool]:
+        """Read and convert up to batch_size entries; runs in a worker thread.
+        
+        Returns:
+            Tuple of (converted tasks, entries that failed to convert, whether entries are exhausted)
+        """
+        breakdowns, failed = [], 0
+        for task_data in entries:
+            if predicate is not None and not predicate(task_data):
+                continue
+            try:
+                breakdowns.append(self._dict_to_task_breakdown(task_data))
+            except Exception as e:
+                logger.error(f"Failed to restore task {task_data.get('task_id', 'unknown')}: {e}")
+                failed += 1
+            if len(breakdowns) + failed >= self.batch_size:
+                return breakdowns, failed, False
+        return breakdowns, failed, True
+
     def add_restoration_callback(self, callback: Callable):
         """Add callback to be called during state restoration.
         
@@ -319,19 +515,8 @@ class StateRestorer:
         try:
             logger.info(f"Restoring {len(active_tasks)} active tasks")
             
-            for task_data in active_tasks:
-                try:
-                    # Convert task data back to Task object
-                    task_breakdown = self._dict_to_task_breakdown(task_data)
-                    
-                    # Store the task in state manager
-                    await state_manager.store_task_breakdown(task_breakdown)
-                    
-                    logger.debug(f"Restored task: {task_breakdown.parent_task_id}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to restore task {task_data.get('task_id', 'unknown')}: {e}")
-                    # Continue with other tasks
+            # Failures of single tasks are logged and counted; the rest are restored
+            await self._restore_task_entries(iter(active_tasks), state_manager, "background_restored")
             
             logger.info("Active tasks restored successfully")
             return True
@@ -368,39 +553,75 @@ class StateRestorer:
             return False
 
     def _dict_to_task_breakdown(self, task_data: Dict[str, Any]) -> Task:
-        """Convert dictionary data back to Task object."""
+        """Convert dictionary data back to Task object.
+        
+        Snapshots are written by this server from validated tasks, so data
+        carrying the current schema version is hydrated without re-running
+        model validation; older snapshots are fully validated.
+        """
+        schema_version = task_data.get('schema_version')
+        parent_id = task_data['task_id']
+        
         # Create subtasks
-        subtasks = []
-        for st_data in task_data.get('subtasks', []):
-            subtask = Task(
-                task_id=st_data['task_id'],
-                title=st_data['title'],
-                description=st_data['description'],
-                specialist_type=st_data['specialist_type'],
-                dependencies=st_data.get('dependencies', []),
-                estimated_effort=st_data.get('estimated_effort', ''),
-                status=TaskStatus(st_data.get('status', TaskStatus.PENDING.value)),
-                results=st_data.get('results'),
-                artifacts=st_data.get('artifacts', [])
-            )
-            subtasks.append(subtask)
+        subtask_records = []
+        for position, st_data in enumerate(task_data.get('subtasks', [])):
+            subtask_id = st_data['task_id']
+            record = {
+                'task_id': subtask_id,
+                'parent_task_id': parent_id,
+                'title': st_data['title'],
+                'description': st_data['description'],
+                'specialist_type': st_data['specialist_type'],
+                'hierarchy_path': f"/{parent_id}/{subtask_id}",
+                'hierarchy_level': 1,
+                'position_in_parent': position,
+                'dependencies': [
+                    TaskDependency(
+                        dependent_task_id=subtask_id,
+                        prerequisite_task_id=dependency,
+                        dependency_type=DependencyType.COMPLETION
+                    ) if isinstance(dependency, str) else dependency
+                    for dependency in st_data.get('dependencies', [])
+                ],
+                'estimated_effort': st_data.get('estimated_effort') or None,
+                'status': TaskStatus(st_data.get('status', TaskStatus.PENDING.value)).value,
+                'results': st_data.get('results')
+            }
+            if st_data.get('artifacts'):
+                # Legacy snapshots reference artifacts by path
+                record['context'] = {'artifacts': st_data['artifacts']}
+            subtask_records.append(self._derive_lifecycle_stage(record))
+        subtasks = Task.bulk_from_storage(subtask_records, schema_version)
         
         # Create task breakdown
-        task_breakdown = Task(
-            parent_task_id=task_data['task_id'],
-            description=task_data['description'],
-            complexity=task_data.get('complexity', 'moderate'),
-            subtasks=subtasks
-        )
+        breakdown_record = {
+            'task_id': parent_id,
+            'title': task_data.get('title') or task_data['description'][:255] or parent_id,
+            'description': task_data['description'],
+            'hierarchy_path': f"/{parent_id}",
+            'complexity': task_data.get('complexity', 'moderate'),
+            'status': TaskStatus(task_data.get('status', TaskStatus.PENDING.value)).value,
+            'children': subtasks
+        }
+        self._derive_lifecycle_stage(breakdown_record)
         
         # Restore timestamps if available
         if task_data.get('created_at'):
             try:
-                task_breakdown.created_at = datetime.fromisoformat(task_data['created_at'])
+                breakdown_record['created_at'] = datetime.fromisoformat(task_data['created_at'])
             except ValueError:
                 pass
         
-        return task_breakdown
+        return Task.from_storage(breakdown_record, schema_version)
+
+    @staticmethod
+    def _derive_lifecycle_stage(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Lifecycle stage is not in the snapshot; derive it as validation would."""
+        Task.validate_lifecycle_consistency(record)
+        stage = record.get('lifecycle_stage')
+        if stage is not None:
+            record['lifecycle_stage'] = getattr(stage, 'value', stage)
+        return record
 
 
 class RestartCoordinator:
@@ -427,6 +648,7 @@ class RestartCoordinator:
         
         self.restart_event = asyncio.Event()
         self._restart_in_progress = False
+        self._phase_started: Optional[float] = None
         
         logger.info("RestartCoordinator initialized")
 
@@ -436,8 +658,13 @@ class RestartCoordinator:
                             timeout: int = 60) -> bool:
         """Execute complete restart sequence.
         
+        The sequence completes once critical state is restored; remaining
+        tasks are restored in the background (see
+        StateRestorer.wait_for_background_restore). The duration of each
+        phase is recorded in status.phase_timings.
+        
         Args:
-            snapshot: State snapshot to restore. If None, loads latest.
+            snapshot: State snapshot to restore. If None, streams the latest.
             state_manager: State manager instance for restoration
             timeout: Maximum time for restart sequence
             
@@ -451,6 +678,8 @@ class RestartCoordinator:
         try:
             self._restart_in_progress = True
             self.status.started_at = datetime.now(timezone.utc)
+            self.status.phase_timings = {}
+            self._phase_started = None
             
             logger.info("Executing server restart sequence")
             
@@ -463,8 +692,10 @@ class RestartCoordinator:
                 return False
             
             # Phase 3: Load state snapshot
+            stream = None
             if snapshot is None:
-                snapshot = await self._load_state_snapshot()
+                stream = await self._load_state_snapshot()
+                snapshot = stream.snapshot if stream else None
             if not snapshot:
                 return False
             
@@ -473,7 +704,7 @@ class RestartCoordinator:
                 return False
             
             # Phase 5: Resume tasks and operations
-            if not await self._resume_operations(snapshot, state_manager):
+            if not await self._resume_operations(snapshot, state_manager, stream):
                 return False
             
             # Phase 6: Enable client connections
@@ -527,15 +758,15 @@ class RestartCoordinator:
             RestartReason.MANUAL_REQUEST  # TODO: Get actual restart reason
         )
 
-    async def _load_state_snapshot(self) -> Optional[ServerStateSnapshot]:
-        """Load state snapshot for restoration."""
+    async def _load_state_snapshot(self) -> Optional[SnapshotStream]:
+        """Open state snapshot for restoration; task entries are streamed later."""
         self._update_status(
             RestartPhase.LOADING_STATE,
             40.0,
             "Loading state snapshot"
         )
         
-        return await self.state_serializer.load_latest_snapshot()
+        return await self.state_serializer.open_latest_snapshot()
 
     async def _restore_database_connections(self, snapshot: ServerStateSnapshot, state_manager) -> bool:
         """Restore database connections."""
@@ -550,7 +781,8 @@ class RestartCoordinator:
             state_manager
         )
 
-    async def _resume_operations(self, snapshot: ServerStateSnapshot, state_manager) -> bool:
+    async def _resume_operations(self, snapshot: ServerStateSnapshot, state_manager,
+                                 stream: Optional[SnapshotStream] = None) -> bool:
         """Resume tasks and operations."""
         self._update_status(
             RestartPhase.RESUMING_TASKS,
@@ -558,6 +790,8 @@ class RestartCoordinator:
             "Resuming tasks and operations"
         )
         
+        if stream is not None:
+            return await self.state_restorer.restore_from_stream(stream, state_manager)
         return await self.state_restorer.restore_from_snapshot(snapshot, state_manager)
 
     async def _enable_client_connections(self):
@@ -572,7 +806,14 @@ class RestartCoordinator:
         logger.info("Client connections enabled")
 
     def _update_status(self, phase: RestartPhase, progress: float, message: str):
-        """Update restart status."""
+        """Update restart status, recording how long the previous phase took."""
+        if phase != self.status.phase:
+            if self._phase_started is not None:
+                _record_phase_timing(self.status.phase_timings, self.status.phase.value,
+                                     self._phase_started)
+            finished = phase in (RestartPhase.COMPLETE, RestartPhase.FAILED)
+            self._phase_started = None if finished else time.perf_counter()
+        
         self.status.phase = phase
         self.status.progress_percent = progress
         self.status.message = message
@@ -63,6 +63,8 @@ class ShutdownCoordinator:
         """
         self.state_serializer = state_serializer
         self.shutdown_timeout = shutdown_timeout
+        # Set by the RebootManager once the server's state manager exists
+        self.state_manager = None
         self.task_suspension_timeout = task_suspension_timeout
         
         self.status = ShutdownStatus(
@@ -233,7 +235,7 @@ class ShutdownCoordinator:
             await self._suspend_active_tasks()
             
             # Phase 3: Serialize state
-            snapshot = await self._serialize_server_state(restart_reason)
+            await self._serialize_server_state(restart_reason)
             
             # Phase 4: Close connections
             await self._close_connections()
@@ -307,8 +309,13 @@ class ShutdownCoordinator:
             logger.error(f"Failed to suspend active tasks: {e}")
             raise
 
-    async def _serialize_server_state(self, restart_reason: RestartReason) -> ServerStateSnapshot:
-        """Serialize complete server state."""
+    async def _serialize_server_state(self, restart_reason: RestartReason) -> Optional[str]:
+        """Serialize server state, extending the snapshot chain with what changed.
+
+        Returns:
+            Path of the snapshot or delta file written, or None if the
+            database is unchanged since the last snapshot
+        """
         self._update_status(
             ShutdownPhase.SERIALIZING_STATE,
             50.0,
@@ -316,29 +323,21 @@ class ShutdownCoordinator:
         )
         
         try:
-            # TODO: Get actual state manager instance
-            # For now, simulate state serialization
-            from .orchestrator.orchestration_state_manager import StateManager
-            
-            # Create a mock state manager for testing
-            # In real implementation, this would be passed in or obtained from server
-            state_manager = None  # TODO: Get from server instance
-            
-            if state_manager is None:
-                # Create minimal snapshot for testing
+            if self.state_manager is None:
+                # No task state to capture; record the restart reason only
                 snapshot = ServerStateSnapshot(restart_reason=restart_reason)
                 snapshot.integrity_hash = self.state_serializer._generate_integrity_hash(snapshot)
+                await self.state_serializer.save_snapshot(snapshot, backup=True)
+                path = str(self.state_serializer.current_state_file)
             else:
-                snapshot = await self.state_serializer.create_snapshot(
-                    state_manager, 
+                # Only tasks written since the last snapshot are serialized
+                path = await self.state_serializer.save_incremental_snapshot(
+                    self.state_manager,
                     restart_reason
                 )
             
-            # Save snapshot to disk
-            await self.state_serializer.save_snapshot(snapshot, backup=True)
-            
             logger.info("Server state serialized successfully")
-            return snapshot
+            return path
             
         except Exception as e:
             logger.error(f"Failed to serialize server state: {e}")
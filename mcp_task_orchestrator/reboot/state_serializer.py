@@ -3,6 +3,11 @@ State serialization and restoration for server reboot functionality.
 
 This module provides atomic state snapshots and restoration capabilities
 to enable seamless server restarts without data loss.
+
+Snapshots form a chain: a full base snapshot followed by deltas that hold
+only the tasks written since the previous link. A small manifest records
+the chain, and the deltas are folded back into the base once the chain
+grows long.
 """
 
 import asyncio
@@ -10,17 +15,40 @@ import json
 import logging
 import os
 import hashlib
-from datetime import datetime, timezone
+import shutil
+import struct
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
 
-from ..domain.entities.task import Task, TaskType, TaskStatus
+from ..db.repository.query_builder import ACTIVE_PARENT_STATUSES
+from ..domain.entities.task import Task, TaskType, TaskStatus, TASK_STORAGE_SCHEMA_VERSION
 from ..domain.value_objects.specialist_type import SpecialistType
 
 logger = logging.getLogger("mcp_task_orchestrator.server.state_serializer")
 
+# Subtask statuses captured in snapshots
+SNAPSHOT_SUBTASK_STATUSES = (TaskStatus.ACTIVE, TaskStatus.PENDING)
+
+# Deltas re-read rows written this long before the previous snapshot, so
+# transactions that committed while it was being taken are not missed
+CHANGE_WATERMARK_LOOKBACK = timedelta(seconds=5)
+
+DEFAULT_MAX_CHAIN_LENGTH = 8
+
+# Deltas are folded into the base once they add up to this share of its size
+COMPACTION_SIZE_RATIO = 0.5
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Characters read from a snapshot file at a time when streaming it
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Snapshot fields holding one entry per task, streamed rather than loaded whole
+STREAMED_FIELDS = ("active_tasks", "suspended_tasks")
+
 
 class RestartReason(str, Enum):
     """Reasons for server restart."""
@@ -83,14 +111,165 @@ class ServerStateSnapshot:
             self.client_sessions = []
 
 
+class _JsonObjectReader:
+    """Incremental reader for a JSON object whose array fields are streamed.
+    
+    Values are decoded with JSONDecoder.raw_decode from a buffer refilled
+    from the file as needed, so memory is bounded by the largest single
+    value rather than by the size of the file.
+    """
+    
+    _WHITESPACE = " \t\n\r"
+    
+    def __init__(self, f):
+        self._file = f
+        self._buffer = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+    
+    def iter_fields(self, streamed=STREAMED_FIELDS) -> Iterator[Tuple[str, Any, bool]]:
+        """Yield (name, value, False) per field and (name, element, True) per
+        element of the streamed array fields."""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            name = self._value()
+            self._expect(":")
+            if name in streamed and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield name, self._value(), True
+                        if self._peek() != ",":
+                            break
+                        self._pos += 1
+                    self._expect("]")
+            else:
+                yield name, self._value(), False
+            if self._peek() != ",":
+                break
+            self._pos += 1
+        self._expect("}")
+    
+    def _fill(self) -> bool:
+        chunk = self._file.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+    
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self._WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of snapshot file")
+    
+    def _expect(self, char: str):
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in snapshot file, found {found!r}")
+        self._pos += 1
+    
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _read_snapshot_header(path: Path) -> Tuple[Dict[str, Any], Dict[str, List[Optional[str]]]]:
+    """Read a snapshot file's plain fields and the task_ids of its task entries."""
+    data: Dict[str, Any] = {}
+    task_ids: Dict[str, List[Optional[str]]] = {name: [] for name in STREAMED_FIELDS}
+    with open(path, 'r', encoding='utf-8') as f:
+        for name, value, is_element in _JsonObjectReader(f).iter_fields():
+            if is_element:
+                task_ids[name].append(value.get('task_id') if isinstance(value, dict) else None)
+            else:
+                data[name] = value
+    return data, task_ids
+
+
+def _iter_snapshot_entries(path: Path, field: str) -> Iterator[Dict[str, Any]]:
+    """Stream the task entries of one field of a snapshot file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for name, value, is_element in _JsonObjectReader(f).iter_fields():
+            if is_element and name == field:
+                yield value
+
+
+class SnapshotStream:
+    """A validated snapshot whose task entries are read from disk on demand.
+    
+    snapshot carries every field except the task lists, which are left
+    empty; iterate them with iter_active_tasks and iter_suspended_tasks.
+    Deltas of the snapshot chain are applied while streaming, and each
+    iteration reads the file again.
+    """
+    
+    def __init__(self, snapshot: ServerStateSnapshot, base_path: Path,
+                 base_task_ids: List[str], suspended_task_count: int,
+                 overrides: Dict[str, Optional[Dict[str, Any]]]):
+        self.snapshot = snapshot
+        self.base_path = base_path
+        # task_id -> replacement entry from a delta, or None if removed
+        self.overrides = overrides
+        self.suspended_task_count = suspended_task_count
+        
+        task_ids = dict.fromkeys(base_task_ids)
+        for task_id, entry in overrides.items():
+            if entry is None:
+                task_ids.pop(task_id, None)
+            else:
+                task_ids[task_id] = None
+        self.active_task_count = len(task_ids)
+    
+    def iter_active_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Stream the active task entries: base order first, then entries added by deltas."""
+        replaced = set()
+        for entry in _iter_snapshot_entries(self.base_path, "active_tasks"):
+            task_id = entry['task_id']
+            if task_id in self.overrides:
+                replaced.add(task_id)
+                entry = self.overrides[task_id]
+                if entry is None:
+                    continue
+            yield entry
+        for task_id, entry in self.overrides.items():
+            if entry is not None and task_id not in replaced:
+                yield entry
+    
+    def iter_suspended_tasks(self) -> Iterator[Dict[str, Any]]:
+        """Stream the suspended task entries of the base snapshot."""
+        if self.suspended_task_count:
+            yield from _iter_snapshot_entries(self.base_path, "suspended_tasks")
+
+
 class StateSerializer:
     """Handles server state serialization and restoration."""
     
-    def __init__(self, base_dir: str = None):
+    def __init__(self, base_dir: str = None, max_chain_length: int = DEFAULT_MAX_CHAIN_LENGTH):
         """Initialize state serializer.
         
         Args:
             base_dir: Base directory for state files. Defaults to .task_orchestrator/server_state/
+            max_chain_length: Number of deltas kept before they are compacted into the base
         """
         if base_dir is None:
             base_dir = os.path.join(os.getcwd(), ".task_orchestrator", "server_state")
@@ -102,6 +281,9 @@ class StateSerializer:
         # State file naming
         self.current_state_file = self.state_dir / "current_state.json"
         self.backup_pattern = "backup_state_{timestamp}.json"
+        self.chain_file = self.state_dir / "snapshot_chain.json"
+        self.delta_pattern = "state_delta_{sequence:06d}.json"
+        self.max_chain_length = max_chain_length
         
         logger.info(f"StateSerializer initialized with state directory: {self.state_dir}")
 
@@ -122,29 +304,7 @@ class StateSerializer:
         async with self.lock:
             try:
                 logger.info(f"Creating state snapshot for restart reason: {restart_reason}")
-                
-                # Create snapshot object
-                snapshot = ServerStateSnapshot(
-                    restart_reason=restart_reason,
-                    process_id=os.getpid(),
-                    working_directory=os.getcwd(),
-                    environment_vars=self._get_relevant_env_vars()
-                )
-                
-                # Capture active tasks
-                snapshot.active_tasks = await self._serialize_active_tasks(state_manager)
-                snapshot.suspended_tasks = await self._serialize_suspended_tasks(state_manager)
-                
-                # Capture database state
-                snapshot.database_state = await self._serialize_database_state(state_manager)
-                
-                # Capture client sessions if requested
-                if include_client_sessions:
-                    snapshot.client_sessions = await self._serialize_client_sessions()
-                
-                # Generate integrity hash
-                snapshot.integrity_hash = self._generate_integrity_hash(snapshot)
-                
+                snapshot = await self._build_snapshot(state_manager, restart_reason, include_client_sessions)
                 logger.info(f"State snapshot created successfully with {len(snapshot.active_tasks)} active tasks")
                 return snapshot
                 
@@ -164,28 +324,84 @@ class StateSerializer:
         """
         async with self.lock:
             try:
-                # Create backup if requested and current state exists
-                if backup and self.current_state_file.exists():
-                    await self._create_backup()
+                return await self._write_base(snapshot, backup)
                 
-                # Convert snapshot to JSON-serializable format
-                state_data = self._snapshot_to_dict(snapshot)
+            except Exception as e:
+                logger.error(f"Failed to save state snapshot: {e}")
+                raise
+
+    async def save_incremental_snapshot(self,
+                                        state_manager,
+                                        restart_reason: RestartReason = RestartReason.MANUAL_REQUEST,
+                                        include_client_sessions: bool = True) -> Optional[str]:
+        """Append a delta with the tasks written since the last snapshot.
+        
+        Starts a new chain with a full snapshot when there is none. The
+        database fingerprint is compared first, so nothing is queried or
+        written when the database has not changed.
+        
+        Args:
+            state_manager: Current state manager instance
+            restart_reason: Reason for creating snapshot
+            include_client_sessions: Whether to include client session state
+            
+        Returns:
+            Path of the delta or base file written, or None if the database is unchanged
+        """
+        async with self.lock:
+            try:
+                chain = self._read_chain()
+                if chain is None or not chain.get('watermark'):
+                    logger.info("No snapshot chain to extend, creating full snapshot")
+                    snapshot = await self._build_snapshot(state_manager, restart_reason, include_client_sessions)
+                    return await self._write_base(snapshot, backup=True)
                 
-                # Write to temporary file first for atomicity
-                temp_file = self.current_state_file.with_suffix('.tmp')
-                with open(temp_file, 'w', encoding='utf-8') as f:
-                    json.dump(state_data, f, indent=2, default=str)
+                database_state = await self._serialize_database_state(state_manager)
+                fingerprint = database_state.integrity_checksum
+                if fingerprint and fingerprint == chain['fingerprint']:
+                    logger.debug("Database unchanged since the last snapshot")
+                    return None
                 
-                # Atomic move to final location
-                temp_file.replace(self.current_state_file)
+                snapshot = ServerStateSnapshot(
+                    restart_reason=restart_reason,
+                    process_id=os.getpid(),
+                    working_directory=os.getcwd(),
+                    environment_vars=self._get_relevant_env_vars(),
+                    database_state=database_state
+                )
+                snapshot.active_tasks, removed_task_ids = await self._serialize_changed_tasks(
+                    state_manager, chain['watermark']
+                )
+                if include_client_sessions:
+                    snapshot.client_sessions = await self._serialize_client_sessions()
+                snapshot.integrity_hash = self._generate_integrity_hash(snapshot)
                 
-                logger.info(f"State snapshot saved to: {self.current_state_file}")
-                return str(self.current_state_file)
+                delta_path = self._write_delta(chain, snapshot, removed_task_ids)
+                logger.info(f"State delta saved to {delta_path}: {len(snapshot.active_tasks)} "
+                            f"tasks changed, {len(removed_task_ids)} removed")
+                
+                if self._should_compact(chain):
+                    await self._compact(chain)
+                    return str(self.current_state_file)
+                return delta_path
                 
             except Exception as e:
-                logger.error(f"Failed to save state snapshot: {e}")
+                logger.error(f"Failed to save incremental state snapshot: {e}")
                 raise
 
+    async def compact_snapshots(self) -> bool:
+        """Fold the deltas of the current chain into a new base snapshot.
+        
+        Returns:
+            True if there were deltas to compact
+        """
+        async with self.lock:
+            chain = self._read_chain()
+            if not chain or not chain['deltas']:
+                return False
+            await self._compact(chain)
+            return True
+
     async def load_latest_snapshot(self) -> Optional[ServerStateSnapshot]:
         """Load the most recent state snapshot.
         
@@ -207,6 +423,8 @@ class StateSerializer:
                 logger.error("State snapshot failed integrity validation")
                 return None
             
+            snapshot = await self._apply_deltas(snapshot)
+            
             logger.info(f"Loaded state snapshot from {snapshot.timestamp}")
             return snapshot
             
@@ -214,6 +432,62 @@ class StateSerializer:
             logger.error(f"Failed to load state snapshot: {e}")
             return None
 
+    async def open_latest_snapshot(self) -> Optional[SnapshotStream]:
+        """Validate the most recent snapshot without loading its task entries.
+        
+        The file is read incrementally, off the event loop, keeping only the
+        task_ids needed to check the integrity hash; entries are streamed
+        later from the returned SnapshotStream.
+        
+        Returns:
+            SnapshotStream if found and valid, None otherwise
+        """
+        try:
+            if not self.current_state_file.exists():
+                logger.warning("No current state file found")
+                return None
+            
+            loop = asyncio.get_running_loop()
+            data, task_ids = await loop.run_in_executor(
+                None, _read_snapshot_header, self.current_state_file
+            )
+            snapshot = self._dict_to_snapshot(data)
+            active_ids, suspended_ids = task_ids['active_tasks'], task_ids['suspended_tasks']
+            
+            # Validate integrity
+            if not snapshot.timestamp or not snapshot.version:
+                logger.error("Snapshot missing required fields")
+                return None
+            expected_hash = self._generate_integrity_hash(snapshot, len(active_ids), len(suspended_ids))
+            if snapshot.integrity_hash != expected_hash:
+                logger.error("Snapshot integrity hash mismatch")
+                return None
+            if None in active_ids:
+                logger.error("Invalid task data in snapshot")
+                return None
+            
+            overrides: Dict[str, Optional[Dict[str, Any]]] = {}
+            chain = self._read_chain()
+            if chain and chain['deltas'] and chain['base_hash'] == snapshot.integrity_hash:
+                for removed_task_ids, delta in await self._read_deltas(chain):
+                    overrides.update(dict.fromkeys(removed_task_ids))
+                    overrides.update((entry['task_id'], entry) for entry in delta.active_tasks)
+                    delta.active_tasks = []
+                    snapshot = delta
+            
+            stream = SnapshotStream(snapshot, self.current_state_file, active_ids,
+                                    len(suspended_ids), overrides)
+            snapshot.integrity_hash = self._generate_integrity_hash(
+                snapshot, stream.active_task_count, stream.suspended_task_count
+            )
+            logger.info(f"Opened state snapshot from {snapshot.timestamp} "
+                        f"with {stream.active_task_count} active tasks")
+            return stream
+            
+        except Exception as e:
+            logger.error(f"Failed to open state snapshot: {e}")
+            return None
+
     async def validate_snapshot(self, snapshot: ServerStateSnapshot) -> bool:
         """Validate snapshot integrity and consistency.
         
@@ -276,44 +550,121 @@ class StateSerializer:
 
     # Private helper methods
     
+    async def _build_snapshot(self, state_manager, restart_reason: RestartReason,
+                              include_client_sessions: bool) -> ServerStateSnapshot:
+        """Capture a full snapshot; the caller holds the lock."""
+        snapshot = ServerStateSnapshot(
+            restart_reason=restart_reason,
+            process_id=os.getpid(),
+            working_directory=os.getcwd(),
+            environment_vars=self._get_relevant_env_vars()
+        )
+        
+        # Capture database state first: its fingerprint and change
+        # watermark must not postdate the task rows read below
+        snapshot.database_state = await self._serialize_database_state(state_manager)
+        
+        # Capture active tasks
+        snapshot.active_tasks = await self._serialize_active_tasks(state_manager)
+        snapshot.suspended_tasks = await self._serialize_suspended_tasks(state_manager)
+        
+        # Capture client sessions if requested
+        if include_client_sessions:
+            snapshot.client_sessions = await self._serialize_client_sessions()
+        
+        # Generate integrity hash
+        snapshot.integrity_hash = self._generate_integrity_hash(snapshot)
+        return snapshot
+    
     async def _serialize_active_tasks(self, state_manager) -> List[Dict[str, Any]]:
         """Serialize active tasks from state manager."""
         try:
-            tasks = []
-            # Get all active tasks from state manager
-            all_tasks = await state_manager.get_all_tasks()
+            # Stream active subtasks from state manager, filtered in SQL
+            subtasks_by_parent: Dict[str, List[Task]] = {}
+            async for task in state_manager.iter_all_tasks(status=list(SNAPSHOT_SUBTASK_STATUSES)):
+                subtasks_by_parent.setdefault(task.parent_task_id, []).append(task)
             
-            for task in all_tasks:
-                if task.status in [TaskStatus.ACTIVE, TaskStatus.PENDING]:
-                    task_dict = {
-                        'task_id': task.parent_task_id,
-                        'description': task.description,
-                        'complexity': task.complexity,
-                        'status': task.status.value,
-                        'created_at': task.created_at.isoformat() if task.created_at else None,
-                        'subtasks': [
-                            {
-                                'task_id': st.task_id,
-                                'title': st.title,
-                                'description': st.description,
-                                'specialist_type': st.specialist_type.value,
-                                'status': st.status.value,
-                                'dependencies': st.dependencies,
-                                'estimated_effort': st.estimated_effort,
-                                'results': st.results,
-                                'artifacts': st.artifacts
-                            }
-                            for st in task.subtasks
-                        ]
-                    }
-                    tasks.append(task_dict)
-            
-            return tasks
+            parents = {
+                parent.task_id: parent
+                for parent in await state_manager.get_task_families(
+                    list(subtasks_by_parent), include_subtasks=False
+                )
+            }
+            return [
+                self._serialize_task_entry(parents[parent_id], subtasks)
+                for parent_id, subtasks in subtasks_by_parent.items()
+                if parent_id in parents
+            ]
             
         except Exception as e:
             logger.error(f"Failed to serialize active tasks: {e}")
             return []
 
+    async def _serialize_changed_tasks(self, state_manager,
+                                       since: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Serialize the tasks whose rows were written since a watermark.
+        
+        A changed subtask re-serializes its whole parent entry. Entries that
+        no longer qualify for a snapshot are returned as removed.
+        
+        Returns:
+            Tuple of (task entries, task_ids of removed entries)
+        """
+        parent_ids = list(dict.fromkeys([
+            row['parent_task_id'] or row['task_id']
+            async for row in state_manager.iter_changed_tasks(since)
+        ]))
+        if not parent_ids:
+            return [], []
+        
+        parents: Dict[str, Task] = {}
+        subtasks_by_parent: Dict[str, List[Task]] = {}
+        for task in await state_manager.get_task_families(parent_ids):
+            if task.parent_task_id is None:
+                parents[task.task_id] = task
+            elif task.status in SNAPSHOT_SUBTASK_STATUSES:
+                subtasks_by_parent.setdefault(task.parent_task_id, []).append(task)
+        
+        entries, removed = [], []
+        for parent_id in parent_ids:
+            parent = parents.get(parent_id)
+            subtasks = subtasks_by_parent.get(parent_id)
+            if parent is not None and subtasks and _enum_value(parent.status) in ACTIVE_PARENT_STATUSES:
+                entries.append(self._serialize_task_entry(parent, subtasks))
+            else:
+                removed.append(parent_id)
+        return entries, removed
+
+    def _serialize_task_entry(self, parent: Task, subtasks: List[Task]) -> Dict[str, Any]:
+        """Serialize a task and its captured subtasks as one snapshot entry."""
+        subtasks = sorted(subtasks, key=lambda st: (st.position_in_parent, st.created_at, st.task_id))
+        return {
+            'schema_version': TASK_STORAGE_SCHEMA_VERSION,
+            'task_id': parent.task_id,
+            'title': parent.title,
+            'description': parent.description,
+            'complexity': _enum_value(parent.complexity),
+            'status': _enum_value(parent.status),
+            'created_at': parent.created_at.isoformat() if parent.created_at else None,
+            'subtasks': [
+                {
+                    'task_id': st.task_id,
+                    'title': st.title,
+                    'description': st.description,
+                    'specialist_type': _enum_value(st.specialist_type),
+                    'status': _enum_value(st.status),
+                    'dependencies': [getattr(d, 'prerequisite_task_id', d) for d in st.dependencies],
+                    'estimated_effort': st.estimated_effort,
+                    'results': st.results,
+                    'artifacts': [
+                        getattr(a, 'file_reference', None) or getattr(a, 'artifact_id', a)
+                        for a in st.artifacts
+                    ]
+                }
+                for st in subtasks
+            ]
+        }
+
     async def _serialize_suspended_tasks(self, state_manager) -> List[Dict[str, Any]]:
         """Serialize suspended tasks."""
         # For now, return empty list - will be implemented when task suspension is added
@@ -326,7 +677,8 @@ class StateSerializer:
                 db_path=state_manager.db_path,
                 connection_metadata={
                     'initialized': state_manager._initialized,
-                    'base_dir': getattr(state_manager, 'base_dir', None)
+                    'base_dir': getattr(state_manager, 'base_dir', None),
+                    'change_watermark': self._change_watermark()
                 },
                 pending_transactions=[],  # TODO: Implement transaction tracking
                 integrity_checksum=self._calculate_db_checksum(state_manager.db_path),
@@ -358,14 +710,25 @@ class StateSerializer:
         
         return {var: os.environ.get(var, '') for var in relevant_vars if os.environ.get(var)}
 
-    def _generate_integrity_hash(self, snapshot: ServerStateSnapshot) -> str:
-        """Generate integrity hash for snapshot validation."""
+    def _generate_integrity_hash(self, snapshot: ServerStateSnapshot,
+                                 active_tasks_count: Optional[int] = None,
+                                 suspended_tasks_count: Optional[int] = None) -> str:
+        """Generate integrity hash for snapshot validation.
+        
+        Task counts default to the lengths of the snapshot's task lists;
+        streamed snapshots pass the counts read from the file instead.
+        """
+        if active_tasks_count is None:
+            active_tasks_count = len(snapshot.active_tasks)
+        if suspended_tasks_count is None:
+            suspended_tasks_count = len(snapshot.suspended_tasks)
+        
         # Create deterministic representation for hashing
         hash_data = {
             'timestamp': snapshot.timestamp.isoformat(),
             'server_version': snapshot.server_version,
-            'active_tasks_count': len(snapshot.active_tasks),
-            'suspended_tasks_count': len(snapshot.suspended_tasks),
+            'active_tasks_count': active_tasks_count,
+            'suspended_tasks_count': suspended_tasks_count,
             'client_sessions_count': len(snapshot.client_sessions)
         }
         
@@ -373,33 +736,209 @@ class StateSerializer:
         return hashlib.sha256(hash_string.encode('utf-8')).hexdigest()
 
     def _calculate_db_checksum(self, db_path: str) -> str:
-        """Calculate database file checksum."""
+        """Fingerprint the database from SQLite's own change counters.
+        
+        Reads the file header, the WAL header and the WAL index header, a
+        few hundred bytes in all, instead of hashing the file. The header
+        change counter moves on every commit in rollback journal mode; in
+        WAL mode the WAL salts and frame counter do, and a checkpoint
+        rewrites the database file. The fingerprint tells whether the
+        database changed, not whether its contents are intact.
+        """
         try:
-            if not os.path.exists(db_path):
+            if not db_path or not os.path.exists(db_path):
                 return ""
             
-            hash_sha256 = hashlib.sha256()
+            stat = os.stat(db_path)
             with open(db_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+                header = f.read(100)
+            if len(header) < 100 or not header.startswith(SQLITE_HEADER):
+                return ""
+            # File change counter and database size in pages
+            parts = list(struct.unpack_from(">II", header, 24))
+            parts += [stat.st_size, stat.st_mtime_ns]
+            
+            wal_path = db_path + "-wal"
+            if os.path.exists(wal_path):
+                with open(wal_path, "rb") as f:
+                    wal_header = f.read(32)
+                if len(wal_header) == 32:
+                    # Checkpoint sequence and salts, renewed when the WAL restarts
+                    parts += struct.unpack_from(">III", wal_header, 12)
+                
+                shm_path = db_path + "-shm"
+                index_header = b""
+                if os.path.exists(shm_path):
+                    with open(shm_path, "rb") as f:
+                        index_header = f.read(24)
+                if len(index_header) == 24:
+                    # Change counter and last valid frame, in native byte order
+                    parts += struct.unpack_from("=I4xI", index_header, 8)
+                else:
+                    parts.append(os.path.getsize(wal_path))
+            
+            return "sqlite:" + ":".join(str(part) for part in parts)
             
         except Exception as e:
-            logger.error(f"Failed to calculate database checksum: {e}")
+            logger.error(f"Failed to calculate database fingerprint: {e}")
             return ""
 
+    @staticmethod
+    def _change_watermark() -> str:
+        """Lower bound for the updated_at of rows the next delta must include.
+        
+        The update trigger writes UTC while inserts carry local time, so
+        the lookback is widened by the local offset west of UTC.
+        """
+        now = datetime.now(timezone.utc)
+        utc_offset = datetime.now().astimezone().utcoffset() or timedelta(0)
+        lookback = CHANGE_WATERMARK_LOOKBACK + max(-utc_offset, timedelta(0))
+        return (now - lookback).strftime("%Y-%m-%d %H:%M:%S")
+
     async def _create_backup(self):
-        """Create backup of current state file."""
+        """Create backup of current state file.
+        
+        The backup is a hard link, so it costs no copying; the current
+        state file is only ever replaced, never rewritten in place.
+        """
         if not self.current_state_file.exists():
             return
         
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         backup_file = self.state_dir / self.backup_pattern.format(timestamp=timestamp)
         
-        import shutil
-        shutil.copy2(self.current_state_file, backup_file)
+        try:
+            os.link(self.current_state_file, backup_file)
+        except OSError:
+            shutil.copy2(self.current_state_file, backup_file)
         logger.debug(f"Created backup: {backup_file}")
 
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        """Write JSON to a temporary file and move it into place atomically."""
+        temp_file = path.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str)
+        temp_file.replace(path)
+
+    async def _write_base(self, snapshot: ServerStateSnapshot, backup: bool) -> str:
+        """Save a full snapshot and start a new chain on it; the caller holds the lock."""
+        # Create backup if requested and current state exists
+        if backup and self.current_state_file.exists():
+            await self._create_backup()
+        
+        self._write_json(self.current_state_file, self._snapshot_to_dict(snapshot))
+        
+        db_state = snapshot.database_state
+        base_stat = self.current_state_file.stat()
+        self._write_json(self.chain_file, {
+            'base_hash': snapshot.integrity_hash,
+            'base_stat': [base_stat.st_size, base_stat.st_mtime_ns],
+            'watermark': db_state.connection_metadata.get('change_watermark') if db_state else None,
+            'fingerprint': db_state.integrity_checksum if db_state else "",
+            'next_sequence': 1,
+            'deltas': []
+        })
+        for delta_file in self.state_dir.glob("state_delta_*.json"):
+            delta_file.unlink()
+        
+        logger.info(f"State snapshot saved to: {self.current_state_file}")
+        return str(self.current_state_file)
+
+    def _read_chain(self) -> Optional[Dict[str, Any]]:
+        """Load the chain manifest if it still describes the current base file."""
+        try:
+            with open(self.chain_file, 'r', encoding='utf-8') as f:
+                chain = json.load(f)
+            base_stat = self.current_state_file.stat()
+        except (OSError, ValueError):
+            return None
+        if chain.get('base_stat') != [base_stat.st_size, base_stat.st_mtime_ns]:
+            logger.warning("Snapshot chain does not match the current state file")
+            return None
+        return chain
+
+    def _write_delta(self, chain: Dict[str, Any], snapshot: ServerStateSnapshot,
+                     removed_task_ids: List[str]) -> str:
+        """Write a delta file, then record it in the chain manifest."""
+        sequence = chain['next_sequence']
+        delta_file = self.state_dir / self.delta_pattern.format(sequence=sequence)
+        self._write_json(delta_file, {
+            'sequence': sequence,
+            'removed_task_ids': removed_task_ids,
+            'snapshot': self._snapshot_to_dict(snapshot)
+        })
+        
+        chain['deltas'].append({'file': delta_file.name, 'size_bytes': delta_file.stat().st_size})
+        chain['next_sequence'] = sequence + 1
+        chain['watermark'] = snapshot.database_state.connection_metadata['change_watermark']
+        chain['fingerprint'] = snapshot.database_state.integrity_checksum
+        self._write_json(self.chain_file, chain)
+        return str(delta_file)
+
+    def _should_compact(self, chain: Dict[str, Any]) -> bool:
+        """Whether the chain is long or large enough to fold into the base."""
+        delta_bytes = sum(delta['size_bytes'] for delta in chain['deltas'])
+        return (len(chain['deltas']) >= self.max_chain_length
+                or delta_bytes > chain['base_stat'][0] * COMPACTION_SIZE_RATIO)
+
+    async def _compact(self, chain: Dict[str, Any]):
+        """Replace the base with the merged chain; the caller holds the lock."""
+        with open(self.current_state_file, 'r', encoding='utf-8') as f:
+            base = self._dict_to_snapshot(json.load(f))
+        merged = await self._apply_deltas(base, chain)
+        await self._write_base(merged, backup=False)
+        logger.info(f"Compacted {len(chain['deltas'])} state deltas into the base snapshot")
+
+    async def _apply_deltas(self, base: ServerStateSnapshot,
+                            chain: Optional[Dict[str, Any]] = None) -> ServerStateSnapshot:
+        """Replay the chain's deltas over its base snapshot.
+        
+        Task entries are replaced or removed by task_id; everything else is
+        taken from the newest delta. Replay stops at the first unreadable
+        delta, which leaves the state as of the delta before it.
+        """
+        if chain is None:
+            chain = self._read_chain()
+        if not chain or not chain['deltas'] or chain['base_hash'] != base.integrity_hash:
+            return base
+        
+        tasks = {task['task_id']: task for task in base.active_tasks}
+        latest = None
+        for removed_task_ids, snapshot in await self._read_deltas(chain):
+            for task_id in removed_task_ids:
+                tasks.pop(task_id, None)
+            for task in snapshot.active_tasks:
+                tasks[task['task_id']] = task
+            latest = snapshot
+        
+        if latest is None:
+            return base
+        latest.active_tasks = list(tasks.values())
+        latest.suspended_tasks = base.suspended_tasks
+        latest.integrity_hash = self._generate_integrity_hash(latest)
+        return latest
+
+    async def _read_deltas(self, chain: Dict[str, Any]) -> List[Tuple[List[str], ServerStateSnapshot]]:
+        """Load the chain's deltas in order, stopping at the first unreadable one.
+        
+        Returns:
+            List of (removed task_ids, delta snapshot)
+        """
+        deltas = []
+        for delta in chain['deltas']:
+            try:
+                with open(self.state_dir / delta['file'], 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                snapshot = self._dict_to_snapshot(data['snapshot'])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Failed to read state delta {delta['file']}: {e}")
+                break
+            if not await self.validate_snapshot(snapshot):
+                logger.error(f"State delta {delta['file']} failed integrity validation")
+                break
+            deltas.append((data['removed_task_ids'], snapshot))
+        return deltas
+
     def _snapshot_to_dict(self, snapshot: ServerStateSnapshot) -> Dict[str, Any]:
         """Convert snapshot to JSON-serializable dictionary."""
         # Convert dataclass to dict
@@ -450,4 +989,9 @@ class StateSerializer:
         if 'restart_reason' in data and isinstance(data['restart_reason'], str):
             data['restart_reason'] = RestartReason(data['restart_reason'])
         
-        return ServerStateSnapshot(**data)
\ No newline at end of file
+        return ServerStateSnapshot(**data)
+
+
+def _enum_value(value):
+    """Plain value of an Enum member, or the value itself."""
+    return getattr(value, 'value', value)
@@ -12,6 +12,8 @@ File size optimized: <150 lines (previously 1407 lines)
 import asyncio
 import os
 import logging
+import time
+from pathlib import Path
 from typing import Dict, List, Any
 
 from mcp import types
@@ -21,6 +23,7 @@ from mcp.server.stdio import stdio_server
 # Import refactored modules
 from .infrastructure.mcp.tool_definitions import get_all_tools
 from .infrastructure.mcp.tool_router import route_tool_call
+from .infrastructure.monitoring.tool_metrics import install_sqlalchemy_timing
 from .infrastructure.mcp.handlers.core_handlers import (
     setup_logging,
     enable_dependency_injection,
@@ -43,15 +46,33 @@ async def list_tools() -> List[types.Tool]:
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle tool calls from the LLM by routing to appropriate handlers."""
-    return await route_tool_call(name, arguments)
+    return await route_tool_call(name, arguments, received_at=time.perf_counter())
+
+
+def start_metrics_export():
+    """Periodically write metrics to .task_orchestrator/metrics.prom if enabled."""
+    if os.environ.get("MCP_TASK_ORCHESTRATOR_METRICS_EXPORT", "false").lower() not in ("true", "1", "yes"):
+        return None
+    
+    from .infrastructure.monitoring.prometheus_exporter import PrometheusFileExporter
+    
+    base_dir = os.environ.get("MCP_TASK_ORCHESTRATOR_BASE_DIR") or os.getcwd()
+    interval = float(os.environ.get("MCP_TASK_ORCHESTRATOR_METRICS_INTERVAL", "15"))
+    exporter = PrometheusFileExporter(Path(base_dir) / ".task_orchestrator" / "metrics.prom", interval)
+    exporter.start()
+    return exporter
 
 
 async def main():
     """Async main entry point for the MCP server."""
+    metrics_exporter = None
     try:
         # Log server initialization
         logger.info("Starting MCP Task Orchestrator server...")
         
+        # Attribute database time to the tool call that issued the query
+        install_sqlalchemy_timing()
+        
         # Check if auto-reload should be enabled (only in development)
         enable_auto_reload = os.environ.get("MCP_AUTO_RELOAD", "false").lower() in ("true", "1", "yes")
         if enable_auto_reload:
@@ -76,6 +97,12 @@ async def main():
         else:
             logger.info("Server running in legacy singleton mode")
         
+        # Optional Prometheus text-file export of tool metrics
+        try:
+            metrics_exporter = start_metrics_export()
+        except Exception as e:
+            logger.warning(f"Could not start metrics export: {e}")
+        
         # Start the server
         logger.info("MCP Task Orchestrator server ready")
         async with stdio_server() as (read_stream, write_stream):
@@ -96,6 +123,12 @@ async def main():
             pass  # Ignore cleanup errors during shutdown
         raise
     finally:
+        # Stop periodic export and write a final metrics snapshot
+        if metrics_exporter is not None:
+            try:
+                await metrics_exporter.stop()
+            except Exception as e:
+                logger.warning(f"Could not stop metrics export: {e}")
         logger.info("MCP Task Orchestrator server stopped")
 
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for dependency injection resolution.
+
+Measures ServiceContainer.get_service for the lifetimes the MCP handlers
+resolve on every tool call. Run from the repository root:
+
+    python tests/performance/di_resolution_benchmark.py
+"""
+
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from mcp_task_orchestrator.infrastructure.di import ServiceContainer
+
+
+class Settings:
+    pass
+
+
+class TaskRepository:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+
+class TaskService:
+    def __init__(self, repository: TaskRepository, settings: Settings):
+        self.repository = repository
+        self.settings = settings
+
+
+class RequestContext:
+    pass
+
+
+def build_container() -> ServiceContainer:
+    container = ServiceContainer()
+    (container.register()
+        .register_type(Settings, Settings).as_singleton()
+        .register_type(TaskRepository, TaskRepository).as_singleton()
+        .register_type(TaskService, TaskService).as_transient()
+        .register_type(RequestContext, RequestContext).as_scoped()
+        .build())
+    return container
+
+
+def measure(stmt, number: int = 20000, repeat: int = 5) -> float:
+    """Median nanoseconds per call."""
+    timings = timeit.repeat(stmt, number=number, repeat=repeat)
+    return statistics.median(timings) / number * 1e9
+
+
+def run_benchmark():
+    container = build_container()
+    container.get_service(TaskRepository)
+
+    def scoped():
+        with container.create_scope():
+            container.get_service(RequestContext)
+
+    results = {
+        "singleton (cached)": measure(lambda: container.get_service(TaskRepository)),
+        "transient with 2 dependencies": measure(lambda: container.get_service(TaskService)),
+        "scope + scoped service": measure(scoped, number=5000),
+    }
+
+    print("DI Resolution Micro-benchmark")
+    print("=" * 50)
+    for name, nanoseconds in results.items():
+        print(f"{name:<32} {nanoseconds:>10.0f} ns/call")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark()
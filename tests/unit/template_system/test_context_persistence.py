@@ -0,0 +1,118 @@
+"""
+Unit tests for debounced execution context persistence.
+"""
+
+import asyncio
+import atexit
+import json
+from unittest.mock import patch
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.template_system.hooks.context import ContextManager
+
+
+async def create_context(manager):
+    return await manager.create_execution_context(
+        template_id="demo",
+        session_id="session",
+        template_parameters={"name": "value"},
+        template_metadata={"total_phases": 3}
+    )
+
+
+class TestContextPersistence:
+    """Test suite for ContextManager write-behind persistence."""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced(self, tmp_path):
+        manager = ContextManager(tmp_path, persist_debounce_seconds=0.05)
+        persister = manager._persister
+        context = await create_context(manager)
+        written_after_create = persister.snapshots_written
+
+        for i in range(20):
+            context.execution_metadata["counter"] = i
+            await manager._persist_context(context)
+
+        await asyncio.sleep(0.15)
+
+        assert persister.snapshots_written == written_after_create + 1
+        snapshot = json.loads(persister.snapshot_path(context.execution_id).read_text())
+        assert snapshot["context"]["execution_metadata"]["counter"] == 19
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_compact_and_excludes_checkpoints(self, tmp_path):
+        manager = ContextManager(tmp_path, persist_debounce_seconds=0)
+        context = await create_context(manager)
+
+        raw = manager._persister.snapshot_path(context.execution_id).read_text()
+
+        assert "\n" not in raw
+        assert "checkpoint_history" not in json.loads(raw)["context"]
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_recovery_replays_checkpoint_log(self, tmp_path):
+        manager = ContextManager(tmp_path, persist_debounce_seconds=60)
+        context = await create_context(manager)
+
+        await manager.transition_phase(context.execution_id, "design", 1)
+        await manager.transition_phase(context.execution_id, "build", 2)
+        # Simulate a crash before the debounced snapshot was written
+        manager._persister._pending.clear()
+
+        recovered = await ContextManager(tmp_path)._load_context(context.execution_id)
+
+        assert recovered is not None
+        assert [c["checkpoint_name"] for c in recovered.checkpoint_history] == [
+            c["checkpoint_name"] for c in context.checkpoint_history
+        ]
+        assert recovered.current_phase == "build"
+        assert recovered.phase_index == 2
+        assert recovered.completed_phases == ["design"]
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_latest_state(self, tmp_path):
+        manager = ContextManager(tmp_path, persist_debounce_seconds=60)
+        context = await create_context(manager)
+        context.agent_assignments["agent-1"] = {"role": "coder"}
+        await manager._persist_context(context)
+
+        await manager.flush()
+
+        recovered = await ContextManager(tmp_path)._load_context(context.execution_id)
+        assert recovered.agent_assignments == {"agent-1": {"role": "coder"}}
+        assert isinstance(recovered.active_agents, set)
+
+    @pytest.mark.asyncio
+    async def test_close_writes_pending_updates(self, tmp_path):
+        manager = ContextManager(tmp_path, persist_debounce_seconds=60)
+        context = await create_context(manager)
+        context.execution_metadata["step"] = "final"
+        await manager._persist_context(context)
+        flush_task = manager._persister._flush_task
+
+        await manager.close()
+
+        assert flush_task.cancelled()
+        recovered = await ContextManager(tmp_path)._load_context(context.execution_id)
+        assert recovered.execution_metadata["step"] == "final"
+
+    @pytest.mark.asyncio
+    async def test_pending_updates_are_written_at_exit(self, tmp_path):
+        with patch.object(atexit, "register") as register, \
+                patch.object(atexit, "unregister") as unregister:
+            manager = ContextManager(tmp_path, persist_debounce_seconds=60)
+            context = await create_context(manager)
+            context.execution_metadata["step"] = "final"
+            await manager._persist_context(context)
+
+            # Interpreter exit: no close() and no running debounce
+            exit_hook = register.call_args.args[0]
+            exit_hook()
+            await manager.close()
+
+        recovered = await ContextManager(tmp_path)._load_context(context.execution_id)
+        assert recovered.execution_metadata["step"] == "final"
+        assert unregister.call_args.args[0] == exit_hook
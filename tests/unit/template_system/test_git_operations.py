@@ -0,0 +1,131 @@
+"""
+Unit tests for the async git helper used by the built-in hooks.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.template_system.hooks.base import HookContext
+from mcp_task_orchestrator.infrastructure.template_system.hooks.builtin_hooks import (
+    GitBranchHook, CommitHook
+)
+from mcp_task_orchestrator.infrastructure.template_system.hooks.git_operations import (
+    AsyncGitClient, get_git_client
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repository with one commit on main."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (tmp_path / "README.md").write_text("hello\n")
+    git("add", "-A")
+    git("commit", "-q", "-m", "initial")
+    git("branch", "feature")
+    return tmp_path
+
+
+def make_context(workspace, execution_id="exec-1"):
+    return HookContext(
+        template_id="demo_template",
+        execution_id=execution_id,
+        session_id="session",
+        current_phase="build",
+        phase_index=0,
+        total_phases=1,
+        workspace_path=str(workspace)
+    )
+
+
+class TestAsyncGitClient:
+    """Test suite for AsyncGitClient."""
+
+    @pytest.mark.asyncio
+    async def test_lists_branches_with_single_query(self, repo):
+        client = AsyncGitClient(str(repo))
+
+        assert await client.list_local_branches() == {"main", "feature"}
+        assert await client.branch_exists("feature")
+        assert not await client.branch_exists("missing")
+
+    @pytest.mark.asyncio
+    async def test_unique_branch_name(self, repo):
+        client = AsyncGitClient(str(repo))
+
+        assert await client.unique_branch_name("feature") == "feature-1"
+        assert await client.unique_branch_name("fresh") == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_branch_cache_tracks_mutations(self, repo):
+        client = AsyncGitClient(str(repo))
+        await client.list_local_branches()
+
+        assert (await client.create_and_checkout_branch("work")).success
+        assert await client.branch_exists("work")
+
+        assert await client.checkout_main_branch()
+        assert (await client.delete_branch("work")).success
+        assert not await client.branch_exists("work")
+
+    @pytest.mark.asyncio
+    async def test_working_tree_status_is_not_cached(self, repo):
+        client = get_git_client(make_context(repo, "exec-status"))
+        assert not await client.has_changes()
+
+        (repo / "written_later.txt").write_text("content\n")
+
+        assert await client.has_changes()
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process(self, repo):
+        client = AsyncGitClient(str(repo), timeout=0.0)
+
+        result = await client.run("status")
+
+        assert result.timed_out
+        assert not result.success
+
+    @pytest.mark.asyncio
+    async def test_client_cached_per_execution(self, repo):
+        first = get_git_client(make_context(repo, "exec-a"))
+
+        assert get_git_client(make_context(repo, "exec-a")) is first
+        assert get_git_client(make_context(repo, "exec-b")) is not first
+
+
+class TestGitHooks:
+    """Built-in git hooks run through the shared helper."""
+
+    @pytest.mark.asyncio
+    async def test_branch_hook_creates_and_rolls_back_branch(self, repo):
+        hook = GitBranchHook()
+        context = make_context(repo, "exec-branch")
+
+        result = await hook.execute(context)
+        branch = context.metadata["git_branch"]
+
+        assert result.success
+        assert branch.startswith("template/demo-template-")
+
+        rollback = await hook.rollback(context)
+        assert rollback.success
+        assert not await AsyncGitClient(str(repo)).branch_exists(branch)
+
+    @pytest.mark.asyncio
+    async def test_commit_hook_commits_changes(self, repo):
+        (repo / "new.txt").write_text("content\n")
+        context = make_context(repo, "exec-commit")
+
+        result = await CommitHook().execute(context)
+
+        assert result.success
+        assert not await AsyncGitClient(str(repo)).has_changes()
@@ -0,0 +1,179 @@
+"""
+Unit tests for the hook executor ready-queue scheduler.
+
+Verifies that hooks start as soon as their own dependencies finish, that
+concurrency and priority ordering are respected, and that rollback still
+covers every hook that ran before a failure.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.template_system.hooks.base import (
+    Hook, HookContext, HookResult, HookType, HookExecutionError
+)
+from mcp_task_orchestrator.infrastructure.template_system.hooks.executor import (
+    HookExecutor, DependencyGraph
+)
+from mcp_task_orchestrator.infrastructure.template_system.hooks.registry import HookRegistry
+
+
+class SleepHook(Hook):
+    """Test hook that sleeps and records start/finish times."""
+
+    def __init__(self, hook_id, delay=0.0, dependencies=None, fail=False, log=None):
+        super().__init__(hook_id)
+        self.delay = delay
+        self.dependencies = dependencies or []
+        self.fail = fail
+        self.log = log if log is not None else []
+        self.rolled_back = False
+
+    async def execute(self, context):
+        self.log.append(("start", self.hook_id, time.monotonic()))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", self.hook_id, time.monotonic()))
+        return HookResult(success=not self.fail, hook_id=self.hook_id, execution_time_ms=0.0)
+
+    def get_dependencies(self):
+        return self.dependencies
+
+    def supports_rollback(self):
+        return True
+
+    async def rollback(self, context):
+        self.rolled_back = True
+        return HookResult(success=True, hook_id=self.hook_id, execution_time_ms=0.0)
+
+
+def make_context():
+    return HookContext(
+        template_id="template",
+        execution_id="execution",
+        session_id="session",
+        current_phase="phase_1",
+        phase_index=0,
+        total_phases=1,
+        workspace_path="/tmp"
+    )
+
+
+def event_time(log, kind, hook_id):
+    return next(t for k, h, t in log if k == kind and h == hook_id)
+
+
+class TestReadyQueueScheduler:
+    """Test suite for HookExecutor ready-queue scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_dependent_starts_without_waiting_for_unrelated_slow_hook(self):
+        """A hook starts once its own dependency is done, not the whole level."""
+        log = []
+        hooks = [
+            SleepHook("slow_git", delay=0.3, log=log),
+            SleepHook("fast", delay=0.01, log=log),
+            SleepHook("after_fast", delay=0.01, dependencies=["fast"], log=log),
+        ]
+
+        results = await HookExecutor().execute_hooks(HookType.PHASE_TRANSITION, hooks, make_context())
+
+        assert all(r.success for r in results)
+        assert event_time(log, "start", "after_fast") < event_time(log, "end", "slow_git")
+
+    @pytest.mark.asyncio
+    async def test_dependencies_are_respected(self):
+        """Dependents never start before all of their dependencies finish."""
+        log = []
+        hooks = [
+            SleepHook("a", delay=0.02, log=log),
+            SleepHook("b", delay=0.05, log=log),
+            SleepHook("c", dependencies=["a", "b"], log=log),
+        ]
+
+        await HookExecutor().execute_hooks(HookType.PHASE_INIT, hooks, make_context())
+
+        assert event_time(log, "start", "c") >= event_time(log, "end", "a")
+        assert event_time(log, "start", "c") >= event_time(log, "end", "b")
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than max_parallel_hooks run at once."""
+        log = []
+        hooks = [SleepHook(f"h{i}", delay=0.02, log=log) for i in range(6)]
+
+        await HookExecutor(max_parallel_hooks=2).execute_hooks(HookType.PHASE_INIT, hooks, make_context())
+
+        in_flight = 0
+        peak = 0
+        for kind, _, _ in sorted(log, key=lambda entry: (entry[2], entry[0] == "start")):
+            in_flight += 1 if kind == "start" else -1
+            peak = max(peak, in_flight)
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_priority_ordering(self):
+        """With one slot, hooks start in registry order (lower number first)."""
+        class LowHook(SleepHook):
+            def __init__(self, **kwargs):
+                super().__init__("low", **kwargs)
+
+        class HighHook(SleepHook):
+            def __init__(self, **kwargs):
+                super().__init__("high", **kwargs)
+
+        registry = HookRegistry()
+        registry.register_hook(LowHook, [HookType.PHASE_INIT], priority=50)
+        registry.register_hook(HighHook, [HookType.PHASE_INIT], priority=10)
+        log = []
+        hooks = [LowHook(log=log), HighHook(log=log), SleepHook("unregistered", log=log)]
+
+        executor = HookExecutor(max_parallel_hooks=1, schedule_priority="priority", registry=registry)
+        await executor.execute_hooks(HookType.PHASE_INIT, hooks, make_context())
+
+        starts = [h for k, h, _ in log if k == "start"]
+        assert starts == ["high", "low", "unregistered"]
+
+    def test_critical_path_lengths(self):
+        """Critical-path length accumulates along the longest dependent chain."""
+        graph = DependencyGraph()
+        a = SleepHook("a")
+        b = SleepHook("b", dependencies=["a"])
+        c = SleepHook("c", dependencies=["b"])
+        d = SleepHook("d")
+        for hook in (a, b, c, d):
+            hook.average_execution_time = 10.0
+            graph.add_hook(hook)
+
+        lengths = graph.calculate_critical_path_lengths()
+
+        assert lengths == {"a": 30.0, "b": 20.0, "c": 10.0, "d": 10.0}
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_scheduling_and_rolls_back(self):
+        """A failure prevents dependents from starting and rolls back executed hooks."""
+        ok = SleepHook("ok")
+        bad = SleepHook("bad", fail=True)
+        blocked = SleepHook("blocked", dependencies=["bad"])
+        context = make_context()
+
+        with pytest.raises(HookExecutionError):
+            await HookExecutor().execute_hooks(HookType.PHASE_INIT, [ok, bad, blocked], context)
+
+        assert set(context.metadata["executed_hooks"]) == {"ok", "bad"}
+        assert ok.rolled_back and bad.rolled_back
+        assert not blocked.rolled_back
+
+    @pytest.mark.asyncio
+    async def test_level_scheduler_still_available(self):
+        """The legacy level-synchronous scheduler can still be selected."""
+        hooks = [SleepHook("a"), SleepHook("b", dependencies=["a"])]
+
+        results = await HookExecutor(scheduler="level").execute_hooks(HookType.PHASE_INIT, hooks, make_context())
+
+        assert [r.hook_id for r in results] == ["a", "b"]
+
+    def test_unknown_scheduler_rejected(self):
+        with pytest.raises(ValueError):
+            HookExecutor(scheduler="bogus")
@@ -0,0 +1,125 @@
+"""
+Tests for API key validation without per-request disk writes.
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.security.authentication import (
+    APIKeyManager, AuthenticationValidator
+)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return APIKeyManager(str(tmp_path / "api_keys.json"), usage_flush_interval=3600)
+
+
+class TestAPIKeyManager:
+    """Usage stats, validation cache and atomic storage."""
+
+    def test_validation_does_not_write_key_file(self, manager):
+        api_key = manager.generate_api_key("test")
+
+        with patch.object(manager, "_save_keys", wraps=manager._save_keys) as save:
+            for _ in range(50):
+                assert manager.validate_api_key(api_key)[0]
+            assert save.call_count == 0
+
+            assert manager.flush_usage()
+            assert save.call_count == 1
+            assert not manager.flush_usage()
+
+        stored = json.loads(manager.storage_path.read_text())
+        assert next(iter(stored.values()))["usage_count"] == 50
+
+    def test_usage_flushed_on_interval(self, tmp_path):
+        manager = APIKeyManager(str(tmp_path / "api_keys.json"), usage_flush_interval=0.05)
+        api_key = manager.generate_api_key("test")
+        manager.validate_api_key(api_key)
+
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            stored = json.loads(manager.storage_path.read_text())
+            if next(iter(stored.values()))["usage_count"] == 1:
+                break
+            time.sleep(0.01)
+        else:
+            pytest.fail("usage statistics were not flushed")
+
+    def test_revocation_and_expiry_bypass_cache(self, manager):
+        api_key = manager.generate_api_key("test")
+        assert manager.validate_api_key(api_key)[0]
+
+        manager.revoke_api_key(api_key)
+        assert not manager.validate_api_key(api_key)[0]
+
+        expiring = manager.generate_api_key("expiring")
+        key_hash = manager._hash_key(expiring)
+        manager._keys[key_hash]["expires_at"] = time.time() + 0.05
+        assert manager.validate_api_key(expiring)[0]
+        time.sleep(0.1)
+        assert not manager.validate_api_key(expiring)[0]
+
+    def test_save_is_atomic_and_private(self, manager):
+        manager.generate_api_key("test")
+
+        assert not manager.storage_path.with_name("api_keys.json.tmp").exists()
+        assert oct(os.stat(manager.storage_path).st_mode & 0o777) == oct(0o600)
+        assert len(APIKeyManager(str(manager.storage_path))._keys) == 1
+
+    def test_close_flushes_usage_and_unregisters_exit_hook(self, manager):
+        api_key = manager.generate_api_key("test")
+        assert manager.validate_api_key(api_key)[0]
+
+        with patch("mcp_task_orchestrator.infrastructure.security.authentication.atexit") as atexit:
+            manager.close()
+
+        atexit.unregister.assert_called_once_with(manager.flush_usage)
+        stored = json.loads(manager.storage_path.read_text())
+        assert next(iter(stored.values()))["usage_count"] == 1
+        assert not manager.flush_usage()
+
+
+class TestAuthenticationConcurrency:
+    """Benchmark of concurrent authenticated tool calls."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_authenticated_calls(self, manager):
+        validator = AuthenticationValidator(manager)
+        keys = [manager.generate_api_key(f"client {i}") for i in range(4)]
+
+        @validator.require_authentication
+        async def handler(arguments=None, **kwargs):
+            return kwargs["_auth_metadata"]["description"]
+
+        calls = 2000
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=8) as pool, \
+                patch.object(manager, "_save_keys", wraps=manager._save_keys) as save:
+            started = time.perf_counter()
+            # Half the calls on the loop, half validated from worker threads
+            results = await asyncio.gather(*(
+                handler(arguments={"api_key": keys[i % len(keys)]}) for i in range(calls // 2)
+            ))
+            validations = await asyncio.gather(*(
+                loop.run_in_executor(pool, manager.validate_api_key, keys[i % len(keys)])
+                for i in range(calls // 2)
+            ))
+            elapsed = time.perf_counter() - started
+
+        assert len(results) == calls // 2
+        assert all(valid for valid, _ in validations)
+        assert save.call_count == 0
+        # Without a per-call fsync thousands of validations take well under a second
+        assert elapsed / calls < 0.005, f"{elapsed / calls * 1e6:.0f}us per authenticated call"
+
+        manager.flush_usage()
+        stored = json.loads(manager.storage_path.read_text())
+        assert sum(entry["usage_count"] for entry in stored.values()) == calls
@@ -0,0 +1,149 @@
+"""
+Unit tests for indexed rule matching in the auto-append engine.
+
+The rule index must be a pure prefilter: for any event it has to select
+exactly the rules a full scan with the ConditionEvaluator would select.
+"""
+
+import itertools
+import random
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.auto_append.auto_append_engine import (
+    AutoAppendEngine, AutoAppendRule, AutoAppendRuleStatus, TaskCreationMode, TaskDefinition
+)
+from mcp_task_orchestrator.infrastructure.auto_append.condition_evaluator import (
+    Condition, ConditionType, LogicalExpression, LogicalOperator, Operator
+)
+from mcp_task_orchestrator.infrastructure.auto_append.event_system import EventType, TaskEvent
+from mcp_task_orchestrator.infrastructure.template_system.storage_manager import TemplateStorageManager
+
+
+TASK_TYPES = ["bug", "feature", "docs", "chore"]
+STATUSES = ["completed", "failed", "blocked"]
+FIELD_TYPES = {"task_type": ConditionType.TASK_TYPE, "status": ConditionType.TASK_STATUS}
+_ids = itertools.count()
+
+
+def equals(field, value):
+    return Condition(condition_type=FIELD_TYPES[field], field=field, operator=Operator.EQUALS, value=value)
+
+
+def make_rule(condition, events=(EventType.TASK_COMPLETED,), **kwargs):
+    return AutoAppendRule(
+        rule_id=f"rule-{next(_ids)}",
+        name="test rule",
+        description="",
+        trigger_events=set(events),
+        condition=condition,
+        creation_mode=TaskCreationMode.DIRECT,
+        task_definition=TaskDefinition(title="Follow up", description="Follow up"),
+        **kwargs
+    )
+
+
+def scan_matching_rule_ids(engine, event):
+    """Reference implementation: evaluate every rule."""
+    return {
+        rule.rule_id for rule in engine.rules.values()
+        if rule.status == AutoAppendRuleStatus.ACTIVE
+        and event.event_type in rule.trigger_events
+        and engine.condition_evaluator.evaluate_expression(rule.condition, event)
+    }
+
+
+@pytest.fixture
+def engine(tmp_path):
+    return AutoAppendEngine(storage_manager=TemplateStorageManager(tmp_path))
+
+
+class TestRuleIndex:
+    """Test suite for AutoAppendEngine rule indexing."""
+
+    def test_only_bucketed_candidates_are_evaluated(self, engine):
+        for task_type in TASK_TYPES * 25:
+            engine.add_rule(make_rule(LogicalExpression(
+                operator=LogicalOperator.AND,
+                conditions=[equals("task_type", task_type), equals("status", "completed")]
+            )))
+
+        event = TaskEvent(EventType.TASK_COMPLETED, "task-1", event_data={"task_type": "bug", "status": "completed"})
+        matches = engine._find_matching_rules(event)
+
+        assert len(matches) == 25
+        assert engine.matching_stats["candidate_rules_evaluated"] == 25
+
+    def test_event_type_filtering(self, engine):
+        engine.add_rule(make_rule(
+            LogicalExpression(operator=LogicalOperator.AND, conditions=[equals("task_type", "bug")]),
+            events=(EventType.TASK_FAILED,)
+        ))
+
+        event = TaskEvent(EventType.TASK_COMPLETED, "task-1", event_data={"task_type": "bug"})
+
+        assert engine._find_matching_rules(event) == []
+        assert engine.matching_stats["candidate_rules_evaluated"] == 0
+
+    def test_in_list_and_or_rules(self, engine):
+        in_list = make_rule(LogicalExpression(operator=LogicalOperator.AND, conditions=[
+            Condition(ConditionType.TASK_TYPE, "task_type", Operator.IN_LIST, ["bug", "docs"])
+        ]))
+        either = make_rule(LogicalExpression(operator=LogicalOperator.OR, conditions=[
+            equals("task_type", "feature"), equals("status", "failed")
+        ]))
+        engine.add_rule(in_list)
+        engine.add_rule(either)
+
+        docs = TaskEvent(EventType.TASK_COMPLETED, "t", event_data={"task_type": "docs"})
+        failed = TaskEvent(EventType.TASK_COMPLETED, "t", event_data={"task_type": "bug", "status": "failed"})
+
+        assert [r.rule_id for r in engine._find_matching_rules(docs)] == [in_list.rule_id]
+        assert {r.rule_id for r in engine._find_matching_rules(failed)} == {in_list.rule_id, either.rule_id}
+
+    def test_removed_rules_are_unindexed(self, engine):
+        rule = make_rule(LogicalExpression(operator=LogicalOperator.AND, conditions=[equals("task_type", "bug")]))
+        engine.add_rule(rule)
+        event = TaskEvent(EventType.TASK_COMPLETED, "t", event_data={"task_type": "bug"})
+        assert engine._find_matching_rules(event)
+
+        engine.remove_rule(rule.rule_id)
+
+        assert engine._find_matching_rules(event) == []
+
+    def test_matches_full_scan_on_random_rules(self, engine):
+        rng = random.Random(1234)
+        for _ in range(200):
+            conditions = [equals("task_type", rng.choice(TASK_TYPES))]
+            if rng.random() < 0.5:
+                conditions.append(equals("status", rng.choice(STATUSES)))
+            if rng.random() < 0.3:
+                conditions.append(Condition(ConditionType.EVENT_DATA, "event_data.priority", Operator.GREATER_THAN, rng.randint(1, 5)))
+            operator = rng.choice([LogicalOperator.AND, LogicalOperator.AND, LogicalOperator.OR])
+            events = rng.sample([EventType.TASK_COMPLETED, EventType.TASK_FAILED, EventType.TASK_CREATED], 2)
+            engine.add_rule(make_rule(LogicalExpression(operator=operator, conditions=conditions), events=events))
+
+        for _ in range(200):
+            event = TaskEvent(
+                rng.choice([EventType.TASK_COMPLETED, EventType.TASK_FAILED, EventType.TASK_CREATED]),
+                "task",
+                event_data={
+                    "task_type": rng.choice(TASK_TYPES + [None]),
+                    "status": rng.choice(STATUSES),
+                    "priority": rng.randint(0, 6)
+                }
+            )
+            indexed = {r.rule_id for r in engine._find_matching_rules(event)}
+            assert indexed == scan_matching_rule_ids(engine, event)
+
+    def test_statistics_expose_rule_timings(self, engine):
+        rule = make_rule(LogicalExpression(operator=LogicalOperator.AND, conditions=[equals("task_type", "bug")]))
+        engine.add_rule(rule)
+        engine._find_matching_rules(TaskEvent(EventType.TASK_COMPLETED, "t", event_data={"task_type": "bug"}))
+
+        stats = engine.get_statistics()["rule_matching"]
+
+        assert stats["events_matched"] == 1
+        assert stats["per_rule"][rule.rule_id]["evaluations"] == 1
+        assert stats["per_rule"][rule.rule_id]["matches"] == 1
+        assert "average_evaluation_time_ms" in stats["per_rule"][rule.rule_id]
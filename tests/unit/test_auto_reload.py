@@ -0,0 +1,136 @@
+"""
+Tests for the event-driven auto-reload monitor and its polling fallback.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from mcp_task_orchestrator.monitoring.auto_reload import OrchestratorAutoReload
+from mcp_task_orchestrator.monitoring.file_watcher import InotifyWatcher
+
+
+def make_tree(root, count=5):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__pycache__").mkdir()
+    for i in range(count):
+        (root / "pkg" / f"module{i}.py").write_text(f"VALUE = {i}\n")
+    (root / "pkg" / "__pycache__" / "module0.cpython-311.pyc").write_bytes(b"\0")
+    return root / "pkg"
+
+
+async def run_monitor(monitor, action, settle=0.4):
+    bursts = []
+
+    async def record(changed_files):
+        if changed_files:
+            bursts.append(changed_files)
+
+    monitor._handle_changes = record
+    task = asyncio.create_task(monitor.monitor(check_interval=0.05))
+    await asyncio.sleep(0.2)
+    await action()
+    await asyncio.sleep(settle)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    return bursts
+
+
+class TestStatPrefilter:
+    """Polling only hashes files whose mtime or size changed."""
+
+    def test_unchanged_tree_is_not_rehashed(self, tmp_path):
+        pkg = make_tree(tmp_path)
+        monitor = OrchestratorAutoReload(tmp_path, use_inotify=False)
+
+        assert monitor.detect_changes() == set()
+        assert len(monitor.file_hashes) == 5
+        hashed = monitor.files_hashed
+
+        for _ in range(3):
+            assert monitor.detect_changes() == set()
+        assert monitor.files_hashed == hashed
+
+        target = pkg / "module1.py"
+        target.write_text("VALUE = 'changed'\n")
+        assert monitor.detect_changes() == {target}
+        assert monitor.files_hashed == hashed + 1
+
+    def test_touch_without_content_change_is_ignored(self, tmp_path):
+        pkg = make_tree(tmp_path)
+        monitor = OrchestratorAutoReload(tmp_path, use_inotify=False)
+        monitor.detect_changes()
+
+        target = pkg / "module2.py"
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert monitor.detect_changes() == set()
+
+    def test_new_and_deleted_files(self, tmp_path):
+        pkg = make_tree(tmp_path)
+        monitor = OrchestratorAutoReload(tmp_path, use_inotify=False)
+        monitor.detect_changes()
+
+        (pkg / "module0.py").unlink()
+        (pkg / "extra.py").write_text("X = 1\n")
+        (pkg / "notes.txt").write_text("ignored\n")
+        assert monitor.detect_changes() == {pkg / "module0.py", pkg / "extra.py"}
+
+    @pytest.mark.asyncio
+    async def test_polling_debounces_a_burst(self, tmp_path):
+        pkg = make_tree(tmp_path)
+        monitor = OrchestratorAutoReload(tmp_path, debounce=0.15, use_inotify=False)
+
+        async def burst():
+            for i in range(5):
+                (pkg / f"module{i}.py").write_text(f"VALUE = {i + 100}\n")
+                await asyncio.sleep(0.04)
+
+        bursts = await run_monitor(monitor, burst, settle=0.6)
+        assert len(bursts) == 1
+        assert len(bursts[0]) == 5
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify not available")
+class TestInotifyMonitor:
+    """Event-driven monitoring with debounce."""
+
+    @pytest.mark.asyncio
+    async def test_burst_handled_once_without_rescans(self, tmp_path):
+        pkg = make_tree(tmp_path, count=50)
+        monitor = OrchestratorAutoReload(tmp_path, debounce=0.1, use_inotify=True)
+        scans = []
+        original = monitor._get_watched_files
+        monitor._get_watched_files = lambda: scans.append(1) or original()
+
+        async def burst():
+            for i in range(3):
+                (pkg / f"module{i}.py").write_text(f"VALUE = {i + 100}\n")
+                await asyncio.sleep(0.02)
+            (pkg / "__pycache__" / "module1.cpython-311.pyc").write_bytes(b"\1")
+
+        bursts = await run_monitor(monitor, burst)
+        assert bursts == [{pkg / f"module{i}.py" for i in range(3)}]
+        # Only the initial scan walked the tree; the burst hashed three files
+        assert len(scans) == 1
+        assert monitor.files_hashed == 53
+
+    @pytest.mark.asyncio
+    async def test_new_directory_and_removed_directory(self, tmp_path):
+        pkg = make_tree(tmp_path)
+        sub = pkg / "sub"
+        monitor = OrchestratorAutoReload(tmp_path, debounce=0.1, use_inotify=True)
+
+        async def create():
+            sub.mkdir()
+            (sub / "new.py").write_text("X = 1\n")
+
+        assert await run_monitor(monitor, create) == [{sub / "new.py"}]
+
+        async def remove():
+            (sub / "new.py").unlink()
+            sub.rmdir()
+
+        assert await run_monitor(monitor, remove) == [{sub / "new.py"}]
@@ -0,0 +1,141 @@
+"""
+Tests for online database backups in the BackupManager.
+
+Backups go through SQLite's backup API in throttled page steps with a time
+limit, are checksummed in a single pass, and are checked with quick_check
+before restore.
+"""
+
+import gzip
+import hashlib
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from mcp_task_orchestrator.db import backup_manager as backup_module
+from mcp_task_orchestrator.db.backup_manager import BackupInfo, BackupManager
+
+
+def rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT id, body FROM notes ORDER BY id").fetchall()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tasks.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+        conn.executemany("INSERT INTO notes (body) VALUES (?)",
+                         [(f"note {i} " + "x" * 200,) for i in range(500)])
+    return path
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return BackupManager(tmp_path / "backups", pages_per_step=8, step_delay=0)
+
+
+class TestBackupManager:
+    """Online backup, streaming checksum, optional compression and restore."""
+
+    def test_backup_includes_uncheckpointed_wal_pages(self, db_path, manager):
+        writer = sqlite3.connect(db_path)
+        writer.execute("PRAGMA wal_autocheckpoint=0")
+        writer.execute("INSERT INTO notes (body) VALUES ('only in the WAL')")
+        writer.commit()
+
+        info = manager.create_backup(f"sqlite:///{db_path}")
+        writer.close()
+
+        assert rows(info.backup_path)[-1] == (501, "only in the WAL")
+        assert not list(manager.backup_directory.glob("*.snapshot"))
+
+    def test_copy_is_throttled_in_page_steps(self, db_path, manager):
+        with patch.object(backup_module.time, "sleep") as sleep:
+            manager.create_backup(f"sqlite:///{db_path}")
+
+        with sqlite3.connect(db_path) as conn:
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        assert sleep.call_count == (pages - 1) // 8
+
+    def test_stepped_copy_has_a_time_limit(self, db_path, tmp_path):
+        manager = BackupManager(tmp_path / "backups", pages_per_step=8, step_delay=0,
+                                max_step_seconds=0)
+
+        with patch.object(backup_module.time, "sleep") as sleep:
+            info = manager.create_backup(f"sqlite:///{db_path}")
+
+        # The first step ran past the limit; the rest was copied in one step
+        assert sleep.call_count == 0
+        assert rows(info.backup_path) == rows(db_path)
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_only_compressed_backups_use_a_snapshot(self, db_path, manager, compress):
+        with patch.object(manager, "_online_copy", wraps=manager._online_copy) as copy:
+            info = manager.create_backup(f"sqlite:///{db_path}", compress=compress)
+
+        target = copy.call_args.args[1]
+        assert (target.suffix == ".snapshot") is compress
+        assert (str(target) == info.backup_path) is not compress
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_checksum_covers_the_stored_file(self, db_path, manager, compress):
+        info = manager.create_backup(f"sqlite:///{db_path}", compress=compress)
+
+        with open(info.backup_path, "rb") as f:
+            stored = f.read()
+        assert info.checksum == hashlib.sha256(stored).hexdigest()
+        assert info.checksum_algorithm == "sha256"
+        assert info.size_bytes == len(stored)
+        if compress:
+            assert info.compression == "gzip"
+            assert len(stored) < db_path.stat().st_size
+            assert gzip.decompress(stored)[:16] == b"SQLite format 3\0"
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_restore_round_trip(self, db_path, manager, compress):
+        expected = rows(db_path)
+        manager.create_backup(f"sqlite:///{db_path}", compress=compress)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM notes WHERE id > 10")
+
+        assert manager.restore_backup(manager.list_backups()[-1])
+        assert rows(db_path) == expected
+        assert not list(manager.backup_directory.glob("*.restore"))
+
+    def test_corrupt_backups_are_not_restored(self, db_path, manager):
+        info = manager.create_backup(f"sqlite:///{db_path}")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM notes WHERE id > 10")
+
+        data = bytearray(open(info.backup_path, "rb").read())
+        data[4096:4096 + 12] = b"\x05" + b"\xff" * 11  # page 2 b-tree header
+        open(info.backup_path, "wb").write(data)
+        assert not manager.restore_backup(info)
+
+        # A matching checksum does not get a damaged database past quick_check
+        info.checksum = hashlib.sha256(data).hexdigest()
+        assert not manager.restore_backup(info)
+        assert len(rows(db_path)) == 10
+
+    def test_legacy_md5_backups_still_restore(self, db_path, manager):
+        expected = rows(db_path)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        legacy_copy = manager.backup_directory / "backup_legacy_tasks.db"
+        legacy_copy.write_bytes(db_path.read_bytes())
+        info = BackupInfo.from_dict({
+            "backup_id": "backup_legacy", "original_path": str(db_path),
+            "backup_path": str(legacy_copy), "created_at": "2024-01-01T00:00:00",
+            "size_bytes": legacy_copy.stat().st_size,
+            "checksum": hashlib.md5(legacy_copy.read_bytes()).hexdigest(),
+            "migration_batch_id": None
+        })
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM notes")
+
+        assert manager.restore_backup(info)
+        assert rows(db_path) == expected
@@ -0,0 +1,140 @@
+"""
+Differential tests for compiled auto-append conditions.
+
+Compiled closures must return exactly the verdict of the interpreting
+ConditionEvaluator.evaluate_expression for every expression and event.
+"""
+
+import random
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.auto_append.condition_evaluator import (
+    Condition, ConditionEvaluator, ConditionType, LogicalExpression, LogicalOperator, Operator
+)
+from mcp_task_orchestrator.infrastructure.auto_append.event_system import EventType, TaskEvent
+
+
+FIELDS = [
+    "status", "task_type", "priority", "title", "tags", "meta",
+    "meta.owner", "meta.depth.level", "event_data.priority", "event_data.meta.owner",
+    "missing", "event_type"
+]
+VALUES = [
+    None, 0, 1, 2.5, -3, True, "bug", "BUG-123", "feature", "", "3", "abc",
+    ["bug", "feature"], ["a", ["nested"]], {"k": "v"}, "^bug", "(unclosed", "a" * 5, "x"
+]
+SAMPLE_DATA = {
+    "status": ["completed", "failed", None, 1],
+    "task_type": ["bug", "feature", "BUG-123", 3, None],
+    "priority": [0, 1, 2.5, "3", "high", None, True],
+    "title": ["Fix bug in parser", "abc", "", 42],
+    "tags": [["bug", "urgent"], ("x",), {"bug"}, "bug,urgent", []],
+    "meta": [{"owner": "abc", "depth": {"level": 2}}, {"owner": None}, "flat", None],
+}
+
+
+def random_condition(rng):
+    return Condition(
+        condition_type=rng.choice(list(ConditionType)),
+        field=rng.choice(FIELDS),
+        operator=rng.choice(list(Operator)),
+        value=rng.choice(VALUES)
+    )
+
+
+def random_expression(rng, depth=0):
+    operator = rng.choice(list(LogicalOperator))
+    if operator == LogicalOperator.NOT and rng.random() < 0.8:
+        count = 1
+    else:
+        count = rng.randint(0, 4)
+
+    conditions = []
+    for _ in range(count):
+        if depth < 4 and rng.random() < 0.3:
+            conditions.append(random_expression(rng, depth + 1))
+        else:
+            conditions.append(random_condition(rng))
+    return LogicalExpression(operator=operator, conditions=conditions)
+
+
+def random_event(rng):
+    event_data = {
+        key: rng.choice(values) for key, values in SAMPLE_DATA.items() if rng.random() < 0.8
+    }
+    return TaskEvent(event_type=rng.choice(list(EventType)), task_id="task", event_data=event_data)
+
+
+def random_task_data(rng):
+    if rng.random() < 0.3:
+        return None
+    return {key: rng.choice(values) for key, values in SAMPLE_DATA.items() if rng.random() < 0.5}
+
+
+class TestConditionCompiler:
+    """Compiled conditions agree with the interpreter."""
+
+    def setup_method(self):
+        self.evaluator = ConditionEvaluator()
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_compiled_matches_interpreter(self, seed):
+        rng = random.Random(seed)
+
+        for _ in range(300):
+            expression = random_expression(rng)
+            compiled = self.evaluator.compile_expression(expression)
+
+            for _ in range(10):
+                event = random_event(rng)
+                task_data = random_task_data(rng)
+                expected = self.evaluator.evaluate_expression(expression, event, task_data)
+                assert compiled(event, task_data) == expected, expression.to_dict()
+
+    def test_depth_and_size_limits_match_interpreter(self):
+        self.evaluator.max_evaluation_depth = 2
+        self.evaluator.max_conditions_per_rule = 3
+        leaf = Condition(ConditionType.TASK_TYPE, "task_type", Operator.EQUALS, "bug")
+        deep = LogicalExpression(LogicalOperator.AND, [leaf])
+        for _ in range(4):
+            deep = LogicalExpression(LogicalOperator.AND, [deep])
+        wide = LogicalExpression(LogicalOperator.OR, [leaf] * 4)
+        event = TaskEvent(EventType.TASK_COMPLETED, "t", event_data={"task_type": "bug"})
+
+        for expression in (deep, wide):
+            assert self.evaluator.compile_expression(expression)(event, None) == \
+                self.evaluator.evaluate_expression(expression, event) == False
+
+    def test_and_short_circuits(self):
+        calls = []
+        evaluator = self.evaluator
+        original = evaluator.compile_condition
+
+        def counting_compile(condition):
+            predicate = original(condition)
+
+            def wrapped(event, task_data=None):
+                calls.append(condition.field)
+                return predicate(event, task_data)
+            return wrapped
+
+        evaluator.compile_condition = counting_compile
+        expression = LogicalExpression(LogicalOperator.AND, [
+            Condition(ConditionType.TASK_TYPE, "task_type", Operator.EQUALS, "feature"),
+            Condition(ConditionType.TASK_STATUS, "status", Operator.EQUALS, "completed"),
+        ])
+
+        compiled = evaluator.compile_expression(expression)
+        compiled(TaskEvent(EventType.TASK_COMPLETED, "t", event_data={"task_type": "bug"}), None)
+
+        assert calls == ["task_type"]
+
+    def test_regex_cache_is_lru(self):
+        self.evaluator._cache_size_limit = 2
+        self.evaluator._get_regex("a")
+        self.evaluator._get_regex("b")
+        self.evaluator._get_regex("a")  # refresh "a"
+        self.evaluator._get_regex("c")  # evicts "b"
+
+        assert list(self.evaluator._regex_cache.keys()) == ["a", "c"]
@@ -0,0 +1,139 @@
+"""
+Tests for service resolution in the DI container.
+
+Resolved singletons are served without locking, dependency cycles are found
+from the registered graph once per type, and scopes follow the current
+asyncio task.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.di import (
+    CircularDependencyError, ServiceContainer, ServiceResolutionError
+)
+from mcp_task_orchestrator.infrastructure.di import registration
+
+
+class Clock:
+    pass
+
+
+class Repository:
+    def __init__(self, clock: Clock):
+        self.clock = clock
+
+
+class Service:
+    def __init__(self, repository: Repository, retries: int = 3):
+        self.repository = repository
+        self.retries = retries
+
+
+class Session:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Left:
+    def __init__(self, right: "Right"):
+        self.right = right
+
+
+class Right:
+    def __init__(self, left: Left):
+        self.left = left
+
+
+# Forward references are not evaluated by the container
+Left.__init__.__annotations__["right"] = Right
+
+
+@pytest.fixture
+def container():
+    container = ServiceContainer()
+    (container.register()
+        .register_type(Clock, Clock).as_singleton()
+        .register_type(Repository, Repository).as_singleton()
+        .register_type(Service, Service)
+        .register_type(Session, Session).as_scoped()
+        .build())
+    return container
+
+
+class TestServiceContainer:
+    """Resolution semantics are unchanged; the per-call overhead is gone."""
+
+    def test_singletons_are_served_from_the_cache(self, container):
+        service = container.get_service(Service)
+        assert service.repository is container.get_service(Repository)
+        assert service.repository.clock is container.get_service(Clock)
+        assert service.retries == 3
+        assert container.get_service(Service) is not service
+
+        manager = container._services[Repository]
+        with patch.object(manager, "get_instance", side_effect=AssertionError):
+            assert container.get_service(Repository) is service.repository
+
+    def test_constructor_signature_is_inspected_once(self, container):
+        container.get_service(Service)
+        with patch.object(registration.inspect, "signature", side_effect=AssertionError):
+            for _ in range(3):
+                container.get_service(Service)
+
+    def test_cycles_are_detected_once_from_the_graph(self, container):
+        (container.register()
+            .register_factory(Clock, lambda c: Clock())
+            .register_type(Left, Left)
+            .register_type(Right, Right)
+            .build())
+
+        with patch.object(container, "_check_dependency_graph",
+                          wraps=container._check_dependency_graph) as check:
+            with pytest.raises(CircularDependencyError, match="Left -> Right -> Left"):
+                container.get_service(Left)
+            container.get_service(Service)
+            container.get_service(Service)
+        checked = [call.args[0] for call in check.call_args_list]
+        assert checked[0] is Left
+        assert sorted(t.__name__ for t in checked[1:]) == ["Clock", "Repository", "Service"]
+        assert container._cycle_checked[Service] is True  # reaches the Clock factory
+
+    def test_cycles_through_factories_are_detected_per_call(self, container):
+        (container.register()
+            .register_factory(Left, lambda c: Left(c.get_service(Right)))
+            .register_factory(Right, lambda c: Right(c.get_service(Left)))
+            .build())
+
+        with pytest.raises(CircularDependencyError, match="Left -> Right -> Left"):
+            container.get_service(Left)
+        assert container._factory_chain.get() == ()
+
+    def test_reregistration_replaces_cached_singleton(self, container):
+        first = container.get_service(Clock)
+        container.register().register_instance(Clock, Clock()).build()
+
+        assert container.get_service(Clock) is not first
+        with pytest.raises(ServiceResolutionError):
+            container.get_service(Left)
+
+    @pytest.mark.asyncio
+    async def test_scopes_follow_the_current_task(self, container):
+        seen = {}
+
+        async def request(name):
+            with container.create_scope():
+                session = container.get_service(Session)
+                await asyncio.sleep(0)
+                assert container.get_service(Session) is session
+                seen[name] = session
+            assert session.closed
+
+        await asyncio.gather(*(request(i) for i in range(5)))
+        assert len({id(session) for session in seen.values()}) == 5
+        assert container._scope_context.get() is None
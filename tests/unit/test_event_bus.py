@@ -0,0 +1,184 @@
+"""
+Unit tests for the backpressured auto-append EventBus.
+"""
+
+import asyncio
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.auto_append.event_system import (
+    EventBus, EventListener, EventType, OverflowPolicy, TaskEvent
+)
+
+
+class RecordingListener(EventListener):
+    """Records delivered events; optionally blocks until released."""
+
+    def __init__(self, events=(EventType.TASK_COMPLETED,), gate=None):
+        self.events = set(events)
+        self.gate = gate
+        self.received = []
+        self.batches = []
+
+    def get_supported_events(self):
+        return self.events
+
+    async def handle_event(self, event):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.received.append(event)
+
+    async def handle_events(self, events):
+        self.batches.append(list(events))
+        for event in events:
+            await self.handle_event(event)
+
+
+def completed(task_id, **data):
+    return TaskEvent(EventType.TASK_COMPLETED, task_id, event_data=data)
+
+
+class TestEventBus:
+    """Test suite for EventBus delivery and history."""
+
+    @pytest.mark.asyncio
+    async def test_slow_listener_does_not_block_fast_listener(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+        slow = RecordingListener(gate=gate)
+        fast = RecordingListener()
+        bus.subscribe(slow)
+        bus.subscribe(fast)
+
+        for i in range(5):
+            await bus.publish(completed(f"task-{i}"))
+        await asyncio.sleep(0.05)
+
+        assert len(fast.received) == 5
+        assert slow.received == []
+
+        gate.set()
+        await bus.join()
+        assert [e.task_id for e in slow.received] == [f"task-{i}" for i in range(5)]
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+        listener = RecordingListener(gate=gate)
+        bus.subscribe(listener, max_queue_size=2, overflow_policy=OverflowPolicy.BLOCK)
+
+        for i in range(3):  # one in flight, two queued
+            await bus.publish(completed(f"task-{i}"))
+        await asyncio.sleep(0)
+
+        blocked = asyncio.ensure_future(bus.publish(completed("task-3")))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        gate.set()
+        await asyncio.wait_for(blocked, 1)
+        await bus.join()
+        assert len(listener.received) == 4
+        assert bus.get_statistics()["listeners"]["RecordingListener#0"]["dropped"] == 0
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+        listener = RecordingListener(gate=gate)
+        bus.subscribe(listener, max_queue_size=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+
+        await bus.publish(completed("task-0"))
+        await asyncio.sleep(0)  # task-0 is now in flight
+        for i in range(1, 5):
+            await bus.publish(completed(f"task-{i}"))
+
+        gate.set()
+        await bus.join()
+
+        assert [e.task_id for e in listener.received] == ["task-0", "task-3", "task-4"]
+        assert bus.get_statistics()["listeners"]["RecordingListener#0"]["dropped"] == 2
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_coalesce_policy_keeps_latest_event_per_task(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+        listener = RecordingListener(gate=gate)
+        bus.subscribe(listener, max_queue_size=10, overflow_policy=OverflowPolicy.COALESCE)
+
+        await bus.publish(completed("busy"))
+        await asyncio.sleep(0)
+        for version in range(3):
+            await bus.publish(completed("task-a", version=version))
+        await bus.publish(completed("task-b", version=0))
+
+        gate.set()
+        await bus.join()
+
+        assert [(e.task_id, e.event_data.get("version")) for e in listener.received] == [
+            ("busy", None), ("task-a", 2), ("task-b", 0)
+        ]
+        assert bus.get_statistics()["listeners"]["RecordingListener#0"]["coalesced"] == 2
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_batch_delivery(self):
+        bus = EventBus()
+        gate = asyncio.Event()
+        listener = RecordingListener(gate=gate)
+        bus.subscribe(listener, batch_size=10)
+
+        for i in range(4):
+            await bus.publish(completed(f"task-{i}"))
+        gate.set()
+        await bus.join()
+
+        assert [len(batch) for batch in listener.batches] == [4]
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failing_listener_is_counted_and_isolated(self):
+        class FailingListener(RecordingListener):
+            async def handle_event(self, event):
+                raise RuntimeError("boom")
+
+        bus = EventBus()
+        failing = FailingListener()
+        healthy = RecordingListener()
+        bus.subscribe(failing)
+        bus.subscribe(healthy)
+
+        await bus.publish(completed("task-1"))
+        await bus.join()
+
+        stats = bus.get_statistics()["listeners"]
+        assert stats["FailingListener#0"]["failed"] == 1
+        assert stats["RecordingListener#1"]["delivered"] == 1
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_history_ring_and_indexes_evict_together(self):
+        bus = EventBus(max_history_size=3)
+
+        await bus.publish(completed("task-a"))
+        await bus.publish(TaskEvent(EventType.TASK_FAILED, "task-b"))
+        await bus.publish(completed("task-b"))
+        await bus.publish(completed("task-c"))
+
+        assert [e.task_id for e in bus.get_event_history()] == ["task-b", "task-b", "task-c"]
+        assert bus.get_event_history(task_id="task-a") == []
+        assert len(bus.get_event_history(task_id="task-b")) == 2
+        assert [e.task_id for e in bus.get_event_history(event_type=EventType.TASK_COMPLETED)] == ["task-b", "task-c"]
+        assert [e.event_type for e in bus.get_event_history(event_type=EventType.TASK_FAILED, task_id="task-b")] == [
+            EventType.TASK_FAILED
+        ]
+        assert [e.task_id for e in bus.get_event_history(limit=1)] == ["task-c"]
+
+        stats = bus.get_statistics()
+        assert stats["total_events"] == 3
+        assert stats["total_published"] == 4
+        assert stats["event_counts"] == {"task_completed": 2, "task_failed": 1}
@@ -0,0 +1,188 @@
+"""
+Unit tests for the durable auto-append event log.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.auto_append.event_log import EventLog
+from mcp_task_orchestrator.infrastructure.auto_append.event_system import (
+    EventBus, EventListener, EventType, OverflowPolicy, TaskEvent
+)
+
+
+class RecordingListener(EventListener):
+    def __init__(self):
+        self.received = []
+
+    def get_supported_events(self):
+        return {EventType.TASK_COMPLETED, EventType.TASK_FAILED}
+
+    async def handle_event(self, event):
+        self.received.append(event)
+
+
+def completed(task_id, **data):
+    return TaskEvent(EventType.TASK_COMPLETED, task_id, event_data=data)
+
+
+class TestEventLog:
+    """Test suite for EventLog persistence and queries."""
+
+    def test_appends_are_batched(self, tmp_path):
+        log = EventLog(tmp_path / "events.db", batch_size=3)
+
+        sequences = [log.append(completed(f"task-{i}")) for i in range(5)]
+
+        assert sequences == [1, 2, 3, 4, 5]
+        assert log.flushes == 1  # the full batch of 3; two events still pending
+        assert log.get_statistics()["pending_events"] == 2
+
+        log.close()
+        reopened = EventLog(tmp_path / "events.db")
+        assert [e.task_id for e in reopened.read_after(0)] == [f"task-{i}" for i in range(5)]
+        assert reopened.append(completed("task-5")) == 6
+
+    def test_indexed_queries(self, tmp_path):
+        log = EventLog(tmp_path / "events.db")
+        now = datetime.now(timezone.utc)
+        log.append(TaskEvent(EventType.TASK_COMPLETED, "a", timestamp=now - timedelta(hours=2)))
+        log.append(TaskEvent(EventType.TASK_FAILED, "a", timestamp=now - timedelta(hours=1)))
+        log.append(TaskEvent(EventType.TASK_COMPLETED, "b", timestamp=now))
+
+        assert [e.event_type for e in log.query(task_id="a")] == [EventType.TASK_COMPLETED, EventType.TASK_FAILED]
+        assert [e.task_id for e in log.query(event_type=EventType.TASK_COMPLETED)] == ["a", "b"]
+        assert [e.task_id for e in log.query(since=now - timedelta(minutes=90))] == ["a", "b"]
+        assert [e.sequence for e in log.query(until=now - timedelta(minutes=90))] == [1]
+        assert [e.sequence for e in log.query(limit=1)] == [3]
+
+    def test_compaction_keeps_unacknowledged_events(self, tmp_path):
+        log = EventLog(tmp_path / "events.db", compaction_interval=-1)
+        old = datetime.now(timezone.utc) - timedelta(days=30)
+        for i in range(4):
+            log.append(TaskEvent(EventType.TASK_COMPLETED, f"task-{i}", timestamp=old))
+        log.acknowledge("engine", 2)
+        log.flush()
+
+        assert log.compact(retention_seconds=3600) == 2
+        assert [e.sequence for e in log.read_after(0)] == [3, 4]
+
+        log.close()
+        # Numbering stays monotonic even when the newest events were compacted
+        reopened = EventLog(tmp_path / "events.db")
+        assert reopened.append(completed("next")) == 5
+
+
+class TestDurableSubscribers:
+    """Test suite for EventBus replay from the event log."""
+
+    @pytest.mark.asyncio
+    async def test_subscriber_resumes_after_restart(self, tmp_path):
+        db_path = tmp_path / "events.db"
+
+        # First run: the listener handles two events, then the process stops
+        bus = EventBus(event_log=EventLog(db_path))
+        listener = RecordingListener()
+        bus.subscribe(listener, durable_name="engine")
+        await bus.publish(completed("task-1"))
+        await bus.publish(completed("task-2"))
+        await bus.join()
+        bus.unsubscribe(listener)
+        # Published but never delivered before shutdown
+        await bus.publish(completed("task-3"))
+        await bus.publish(TaskEvent(EventType.TASK_CREATED, "ignored"))
+        await bus.shutdown()
+        bus.event_log.close()
+
+        # Second run: only the unacknowledged event is replayed
+        bus = EventBus(event_log=EventLog(db_path))
+        listener = RecordingListener()
+        bus.subscribe(listener, durable_name="engine")
+
+        assert await bus.resume_durable_subscribers() == {"engine": 1}
+        await bus.join()
+        assert [e.task_id for e in listener.received] == ["task-3"]
+
+        # Resuming twice does not redeliver
+        await bus.resume_durable_subscribers()
+        await bus.join()
+        assert [e.task_id for e in listener.received] == ["task-3"]
+        await bus.shutdown()
+
+        assert bus.event_log.get_offset("engine") == 3
+
+    @pytest.mark.asyncio
+    async def test_backlog_survives_a_publish_before_resume(self, tmp_path):
+        db_path = tmp_path / "events.db"
+        bus = EventBus(event_log=EventLog(db_path))
+        for i in range(3):
+            await bus.publish(completed(f"task-{i}"))
+        await bus.shutdown()
+        bus.event_log.close()
+
+        bus = EventBus(event_log=EventLog(db_path))
+        listener = RecordingListener()
+        bus.subscribe(listener, durable_name="engine")
+        await bus.publish(completed("live"))
+        await bus.join()
+
+        assert [e.task_id for e in listener.received] == ["task-0", "task-1", "task-2", "live"]
+        assert bus.event_log.get_offset("engine") == 4
+        assert await bus.resume_durable_subscribers() == {"engine": 0}
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_acknowledgements_are_flushed_in_batches(self, tmp_path):
+        log = EventLog(tmp_path / "events.db", flush_interval=0.05)
+        bus = EventBus(event_log=log)
+        bus.subscribe(RecordingListener(), durable_name="engine")
+
+        for i in range(20):
+            await bus.publish(completed(f"task-{i}"))
+        await bus.join()
+        await bus.flush_event_log()
+
+        # 20 events and their acknowledgements took far fewer than 40 writes
+        assert log.flushes <= 3
+        assert EventLog(tmp_path / "events.db").get_offset("engine") == 20
+        await bus.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_event_is_not_acknowledged_past(self, tmp_path):
+        class FailingOnce(RecordingListener):
+            def __init__(self, task_id):
+                super().__init__()
+                self.fail_on = task_id
+
+            async def handle_event(self, event):
+                if event.task_id == self.fail_on:
+                    self.fail_on = None
+                    raise RuntimeError("transient failure")
+                await super().handle_event(event)
+
+        bus = EventBus(event_log=EventLog(tmp_path / "events.db"))
+        listener = FailingOnce("task-2")
+        bus.subscribe(listener, durable_name="engine")
+        for i in (1, 2, 3):
+            await bus.publish(completed(f"task-{i}"))
+        await bus.join()
+
+        assert [e.task_id for e in listener.received] == ["task-1", "task-3"]
+        assert bus.event_log.get_offset("engine") == 1
+
+        # The failed event is replayed ahead of the next publish
+        await bus.publish(completed("task-4"))
+        await bus.join()
+
+        assert [e.task_id for e in listener.received] == ["task-1", "task-3", "task-2", "task-4"]
+        assert bus.event_log.get_offset("engine") == 4
+        await bus.shutdown()
+
+    def test_durable_subscribers_always_block(self, tmp_path):
+        bus = EventBus(event_log=EventLog(tmp_path / "events.db"))
+        listener = RecordingListener()
+
+        bus.subscribe(listener, overflow_policy=OverflowPolicy.DROP_OLDEST, durable_name="engine")
+
+        assert bus._channels[id(listener)].overflow_policy is OverflowPolicy.BLOCK
@@ -0,0 +1,110 @@
+"""
+Tests for timer-based hang detection and the event loop lag sampler.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from mcp_task_orchestrator.monitoring import hang_protected_operation, get_hang_detection_statistics
+from mcp_task_orchestrator.monitoring.hang_detection import (
+    EventLoopLagSampler, HangDetector, describe_task_stack
+)
+
+
+async def wait_forever_inner(event):
+    await event.wait()
+
+
+async def wait_forever_outer(event):
+    await wait_forever_inner(event)
+
+
+def block_loop_for(seconds):
+    time.sleep(seconds)
+
+
+class TestHangDetector:
+    """Deadline timers, hang reports and cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_report_has_awaited_stack_and_cancels(self):
+        detector = HangDetector(operation_timeout=0.2, warning_timeout=0.05, lag_threshold=None)
+        detector.start_monitoring()
+        task = asyncio.create_task(wait_forever_outer(asyncio.Event()))
+        await asyncio.sleep(0)
+        op_id = detector.register_operation("stuck", cancel_token=task)
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        detector.unregister_operation(op_id)
+
+        kinds = [report.kind for report in detector.hang_reports]
+        assert kinds == ["warning", "timeout"]
+        stack = detector.hang_reports[-1].stack
+        assert any("wait_forever_outer" in line for line in stack)
+        assert any("wait_forever_inner" in line for line in stack)
+        assert stack[-1].startswith("awaiting")
+        assert detector.get_statistics()["hang_statistics"] == {"stuck": 1}
+        assert detector.active_operations == {}
+
+    @pytest.mark.asyncio
+    async def test_finished_operations_cancel_their_timers(self):
+        detector = HangDetector(operation_timeout=0.05, warning_timeout=0.01, lag_threshold=None)
+        detector.start_monitoring()
+        op_ids = [detector.register_operation(f"op{i}") for i in range(100)]
+        handles = [h for op_id in op_ids for h in detector.active_operations[op_id].handles]
+        for op_id in op_ids:
+            detector.unregister_operation(op_id)
+
+        await asyncio.sleep(0.1)
+        assert all(handle.cancelled() for handle in handles)
+        assert not detector.hang_reports
+        assert detector.get_statistics()["total_hangs_detected"] == 0
+
+    def test_operations_registered_without_loop_are_armed_on_start(self):
+        detector = HangDetector(operation_timeout=0.05, warning_timeout=1.0, lag_threshold=None)
+        op_id = detector.register_operation("sync")
+        assert detector.active_operations[op_id].handles == []
+
+        async def run():
+            detector.start_monitoring()
+            await asyncio.sleep(0.1)
+
+        asyncio.run(run())
+        assert detector.hang_statistics == {"sync": 1}
+
+    @pytest.mark.asyncio
+    async def test_protected_operation_raises_timeout(self):
+        with pytest.raises(asyncio.TimeoutError):
+            async with hang_protected_operation("slow_block", timeout=0.05):
+                await asyncio.sleep(5)
+
+        stats = get_hang_detection_statistics()
+        assert stats["hang_statistics"].get("slow_block") == 1
+        assert stats["active_operations"] == 0
+
+    def test_describe_task_stack_without_task(self):
+        assert describe_task_stack(None) == []
+
+
+class TestEventLoopLagSampler:
+    """Blocked-loop detection names the blocking callback."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_is_reported(self):
+        sampler = EventLoopLagSampler(interval=0.02, threshold=0.1)
+        sampler.start()
+        try:
+            await asyncio.sleep(0.05)
+            asyncio.get_running_loop().call_soon(block_loop_for, 0.4)
+            await asyncio.sleep(0.1)
+        finally:
+            sampler.stop()
+
+        stats = sampler.get_statistics()
+        assert stats["blocked_count"] >= 1
+        assert stats["max_lag"] >= 0.3
+        blocked = stats["recent_blocks"][-1]
+        assert any("block_loop_for" in line for line in blocked["stack"])
@@ -0,0 +1,116 @@
+"""
+Unit tests for the bucketed metrics collector and quantile sketch.
+"""
+
+import random
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.monitoring.metrics import MetricsCollector, QuantileSketch
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestQuantileSketch:
+    """Test suite for QuantileSketch accuracy and merging."""
+
+    @pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+    def test_relative_error_is_bounded(self, q):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-4, 1.5) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        expected = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected + 1e-12
+
+    def test_merge_equals_single_sketch(self):
+        rng = random.Random(3)
+        values = [rng.uniform(-5, 50) for _ in range(5000)] + [0.0] * 10
+        whole = QuantileSketch()
+        left, right = QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+
+        left.merge(right)
+
+        for q in (0.0, 0.1, 0.5, 0.9, 1.0):
+            assert left.quantile(q) == whole.quantile(q)
+        assert left.quantile(0.0) == min(values)
+        assert left.quantile(1.0) == max(values)
+
+    def test_merge_rejects_different_accuracy(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.05))
+
+
+class TestMetricsCollector:
+    """Test suite for MetricsCollector windowed summaries."""
+
+    def test_summary_statistics(self):
+        collector = MetricsCollector()
+        for value in range(1, 101):
+            collector.record_timing("tool.duration", value / 1000)
+
+        summary = collector.get_metric_summary("tool.duration")
+
+        assert summary.count == 100
+        assert summary.min == pytest.approx(0.001)
+        assert summary.max == pytest.approx(0.1)
+        assert summary.avg == pytest.approx(0.0505)
+        assert summary.p50 == pytest.approx(0.050, rel=0.02)
+        assert summary.p99 == pytest.approx(0.099, rel=0.02)
+        assert summary.unit == "seconds"
+
+    def test_time_windows_use_buckets(self):
+        collector = MetricsCollector()
+        with patch("mcp_task_orchestrator.infrastructure.monitoring.metrics.time.time") as clock:
+            clock.return_value = 1_000_000.0
+            collector.record_value("requests", 1)
+            clock.return_value += 30 * 60  # 30 minutes later
+            collector.record_value("requests", 2)
+            collector.record_value("requests", 3)
+
+            last_minute = collector.get_metric_summary("requests", timedelta(minutes=1))
+            last_hour = collector.get_metric_summary("requests", timedelta(hours=1))
+            all_time = collector.get_metric_summary("requests")
+
+            clock.return_value += 2 * 3600
+            expired = collector.get_metric_summary("requests", timedelta(minutes=1))
+
+        assert last_minute.count == 2
+        assert last_minute.rate_per_second == pytest.approx(2 / 60)
+        assert last_hour.count == 3
+        assert all_time.sum == 6
+        assert expired is None
+
+    def test_tag_sets_are_interned_and_filterable(self):
+        collector = MetricsCollector()
+        collector.record_timing("tool.duration", 0.1, tags={"tool": "a", "status": "ok"})
+        collector.record_timing("tool.duration", 0.3, tags={"status": "ok", "tool": "a"})
+        collector.record_timing("tool.duration", 0.5, tags={"tool": "b", "status": "ok"})
+
+        per_tags = collector.get_tagged_summaries("tool.duration")
+
+        assert len(collector.metrics["tool.duration"]) == 2
+        assert per_tags[(("status", "ok"), ("tool", "a"))].count == 2
+        assert collector.get_metric_summary("tool.duration", tags={"tool": "b", "status": "ok"}).max == 0.5
+        assert collector.get_metric_summary("tool.duration").count == 3
+        assert collector.get_metric_summary("tool.duration", tags={"tool": "c"}) is None
+
+    def test_report_includes_percentiles(self):
+        collector = MetricsCollector()
+        collector.record_timing("db.query", 0.02)
+
+        report = collector.get_metrics_report()
+
+        assert report["total_metrics"] == 1
+        for window in ("last_minute", "last_hour", "all_time"):
+            assert report[window]["db.query"]["p95"] == pytest.approx(0.02)
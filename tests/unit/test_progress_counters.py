@@ -0,0 +1,175 @@
+"""
+Tests for the per-parent subtask counters behind auto-archival.
+"""
+
+import sqlite3
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import event
+
+from mcp_task_orchestrator.db.persistence import DatabasePersistenceManager
+from mcp_task_orchestrator.db.repository.crud_operations import (
+    create_task, delete_task, get_task, update_task
+)
+from mcp_task_orchestrator.domain.entities.task import Task, TaskStatus
+from mcp_task_orchestrator.orchestrator.orchestration_state_manager import StateManager
+
+SCHEMA = Path(__file__).parents[2] / "mcp_task_orchestrator" / "db" / "generic_task_schema.sql"
+
+
+def subtask(i, parent="plan", **fields):
+    return Task(task_id=f"{parent}_step_{i}", title=f"Step {i}", description="Do it",
+                parent_task_id=parent, hierarchy_path=f"/{parent}/{parent}_step_{i}",
+                hierarchy_level=1, specialist_type="implementer", **fields)
+
+
+def insert_tasks(db_path, tasks):
+    rows = [task.to_dict_for_storage() for task in tasks]
+    columns = list(rows[0])
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO generic_tasks ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})",
+            rows
+        )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tasks.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    insert_tasks(path, [Task(task_id="plan", title="Plan", description="d", hierarchy_path="/plan")]
+                 + [subtask(i) for i in range(50)])
+    return path
+
+
+@pytest.fixture
+def persistence(db_path, tmp_path):
+    return DatabasePersistenceManager(str(tmp_path), f"sqlite:///{db_path}")
+
+
+@pytest.fixture
+def manager(persistence, tmp_path):
+    manager = StateManager(db_path=str(tmp_path / "state.db"), base_dir=str(tmp_path))
+    manager.persistence = persistence
+    manager._async_initialized = True
+    persistence.archive_task = AsyncMock(wraps=persistence.archive_task)
+    return manager
+
+
+async def set_status(persistence, task_id, status):
+    task = await persistence.get_subtask(task_id)
+    task.status = status
+    assert await persistence.update_subtask(task, task.parent_task_id)
+
+
+class TestProgressCounters:
+    """Counters follow subtask inserts, deletes and status transitions."""
+
+    @pytest.mark.asyncio
+    async def test_status_transitions_adjust_completed(self, persistence):
+        assert (await persistence.get_parent_progress("plan"))["completed_subtasks"] == 0
+
+        await set_status(persistence, "plan_step_0", TaskStatus.COMPLETED)
+        await set_status(persistence, "plan_step_1", TaskStatus.COMPLETED)
+        await set_status(persistence, "plan_step_1", TaskStatus.COMPLETED)
+        await set_status(persistence, "plan_step_2", TaskStatus.IN_PROGRESS)
+        progress = await persistence.get_parent_progress("plan")
+        assert progress == {"total_subtasks": 50, "completed_subtasks": 2, "progress_percentage": 4.0}
+
+        await set_status(persistence, "plan_step_0", TaskStatus.IN_PROGRESS)
+        assert (await persistence.get_parent_progress("plan"))["completed_subtasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_insert_and_delete_adjust_total(self, persistence):
+        repo = persistence._repository
+        await create_task(repo, subtask(50, status=TaskStatus.COMPLETED))
+        assert await persistence.get_parent_progress("plan") == {
+            "total_subtasks": 51, "completed_subtasks": 1, "progress_percentage": 100 / 51
+        }
+
+        assert await delete_task(repo, "plan_step_50")
+        assert await delete_task(repo, "plan_step_49", hard_delete=True)
+        progress = await persistence.get_parent_progress("plan")
+        assert (progress["total_subtasks"], progress["completed_subtasks"]) == (49, 0)
+
+    @pytest.mark.asyncio
+    async def test_move_adjusts_both_parents(self, db_path, persistence):
+        insert_tasks(db_path, [Task(task_id="other", title="Other", description="d", hierarchy_path="/other"),
+                               subtask(0, parent="other", status=TaskStatus.COMPLETED)])
+        repo = persistence._repository
+        await set_status(persistence, "plan_step_0", TaskStatus.COMPLETED)
+        assert (await persistence.get_parent_progress("other"))["progress_percentage"] == 100
+
+        await repo.move_task("plan_step_1", "other")
+        await repo.move_task("plan_step_0", "other")
+
+        plan = await persistence.get_parent_progress("plan")
+        other = await persistence.get_parent_progress("other")
+        assert (plan["total_subtasks"], plan["completed_subtasks"]) == (48, 0)
+        assert (other["total_subtasks"], other["completed_subtasks"]) == (3, 2)
+
+    @pytest.mark.asyncio
+    async def test_updates_to_deleted_subtasks_are_not_counted(self, persistence):
+        repo = persistence._repository
+        task = await get_task(repo, "plan_step_3")
+        assert await delete_task(repo, "plan_step_3")
+
+        task.status = TaskStatus.COMPLETED
+        await update_task(repo, task)
+
+        progress = await persistence.get_parent_progress("plan")
+        assert (progress["total_subtasks"], progress["completed_subtasks"]) == (49, 0)
+
+    @pytest.mark.asyncio
+    async def test_archive_check_is_constant_time(self, db_path, manager, persistence):
+        statements = []
+        event.listen(persistence._repository.async_engine.sync_engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        per_completion = []
+        for i in range(50):
+            task = await manager.get_subtask(f"plan_step_{i}")
+            task.status = TaskStatus.COMPLETED
+            statements.clear()
+            await manager.update_subtask(task)
+            per_completion.append(len(statements))
+            if i:
+                # Only the first completion seeds the counters from the children
+                assert not any("COUNT(" in s for s in statements)
+
+        # The 49th completion costs as many statements as the second one; the
+        # 50th also archives the parent
+        assert per_completion[1] == per_completion[-2]
+        manager.persistence.archive_task.assert_awaited_once_with("plan")
+        assert (await manager.get_parent_progress("plan"))["progress_percentage"] == 100
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute(
+                "SELECT status, lifecycle_stage FROM generic_tasks WHERE task_id = 'plan'"
+            ).fetchone() == ("archived", "archived")
+        assert not await persistence.archive_task("plan")
+
+    @pytest.mark.asyncio
+    async def test_startup_reconciliation_repairs_drift(self, db_path, persistence, manager):
+        insert_tasks(db_path, [Task(task_id="other", title="Other", description="d", hierarchy_path="/other")]
+                     + [subtask(i, parent="other") for i in range(3)])
+        await persistence.get_parent_progress("plan")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE task_progress SET total_subtasks = 7, completed_subtasks = 5")
+            conn.execute("INSERT INTO task_progress (parent_task_id, total_subtasks) VALUES ('gone', 4)")
+            conn.execute("UPDATE generic_tasks SET status = 'completed' WHERE task_id = 'other_step_0'")
+
+        manager._async_initialized = False
+        manager._recover_interrupted_tasks = AsyncMock()
+        await manager._initialize()
+        assert await manager.wait_for_recovery(timeout=5)
+
+        with sqlite3.connect(db_path) as conn:
+            rows = dict((r[0], r[1:]) for r in conn.execute("SELECT * FROM task_progress"))
+        assert rows["plan"][:2] == (50, 0)
+        assert rows["other"][:2] == (3, 1)
+        assert "gone" not in rows
+        assert await persistence.reconcile_progress_counters() == 0
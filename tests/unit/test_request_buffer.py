@@ -0,0 +1,168 @@
+"""
+Tests for the bounded RequestBuffer used while the server restarts.
+
+Sessions have quotas, identical status reads are buffered once, and
+requests beyond the memory bound go to an append-only spill file that is
+replayed in arrival order.
+"""
+
+import json
+
+import pytest
+
+from mcp_task_orchestrator.reboot.connection_manager import (
+    RequestBuffer, RequestPriority, classify_request, fan_out_response
+)
+
+
+def call(request_id, tool, **arguments):
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": tool, "arguments": arguments}}
+
+
+def status(request_id):
+    return call(request_id, "orchestrator_get_status")
+
+
+def update(request_id, task_id="task_1"):
+    return call(request_id, "orchestrator_update_task", task_id=task_id, title=f"Title {request_id}")
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return tmp_path / "server_state" / "request_spill.jsonl"
+
+
+@pytest.fixture
+def buffer(spill_path):
+    return RequestBuffer(max_buffer_size=10, max_memory_requests=3, spill_path=str(spill_path))
+
+
+class TestRequestBuffer:
+    """Quotas, deduplication, priorities and spilling."""
+
+    def test_requests_are_classified(self):
+        assert classify_request(status(1)) is RequestPriority.STATUS
+        assert classify_request({"method": "tools/list"}) is RequestPriority.STATUS
+        assert classify_request(update(1)) is RequestPriority.MUTATION
+        assert classify_request({"method": "tools/call"}) is RequestPriority.MUTATION
+
+    @pytest.mark.asyncio
+    async def test_per_client_quota(self, spill_path):
+        buffer = RequestBuffer(max_buffer_size=2, spill_path=str(spill_path))
+
+        assert await buffer.buffer_request("a", update(1))
+        assert await buffer.buffer_request("a", update(2))
+        assert not await buffer.buffer_request("a", update(3))
+        assert await buffer.buffer_request("b", update(4))
+        assert buffer.get_buffer_stats()["rejected_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_are_buffered_once(self, buffer):
+        for request_id in (1, 2, 3):
+            assert await buffer.buffer_request("a", status(request_id))
+        await buffer.buffer_request("a", update(4))
+        await buffer.buffer_request("a", status(5))
+
+        assert buffer.get_buffer_stats()["total_buffered_requests"] == 3
+        drained = await buffer.drain_requests()
+
+        assert [(r["id"], duplicate_ids) for _, r, duplicate_ids in drained] == [
+            (1, [2, 3]), (4, []), (5, [])
+        ]
+        assert drained[0][1] == status(1)
+        assert buffer.get_buffer_stats()["deduplicated_requests"] == 2
+
+        responses = fan_out_response({"jsonrpc": "2.0", "id": 1, "result": {}}, drained[0][2])
+        assert [response["id"] for response in responses] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_session_replay_restores_deduplicated_reads(self, buffer):
+        for request_id in (1, 2):
+            await buffer.buffer_request("a", status(request_id))
+        await buffer.buffer_request("a", update(3))
+
+        assert await buffer.get_buffered_requests("a") == [status(1), status(2), update(3)]
+
+    @pytest.mark.asyncio
+    async def test_spilled_requests_replay_in_order(self, buffer, spill_path):
+        for request_id in range(8):
+            assert await buffer.buffer_request("a" if request_id % 2 else "b", update(request_id))
+
+        stats = buffer.get_buffer_stats()
+        assert (stats["in_memory_requests"], stats["spilled_requests"]) == (3, 5)
+        assert len(spill_path.read_bytes().splitlines()) == 5
+
+        assert [r["id"] for r in await buffer.get_buffered_requests("a")] == [1, 3, 5, 7]
+        assert [r["id"] for r in await buffer.get_buffered_requests("b")] == [0, 2, 4, 6]
+        assert not spill_path.exists()
+        assert buffer.get_buffer_stats()["spill_file_bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_status_reads_are_replayed_first_across_sessions(self, buffer):
+        await buffer.buffer_request("a", update(1))
+        await buffer.buffer_request("a", status(2))
+        await buffer.buffer_request("b", update(3))
+        await buffer.buffer_request("c", status(4))
+        await buffer.buffer_request("c", update(5))
+
+        drained = await buffer.drain_requests()
+
+        assert [(session, r["id"]) for session, r, _ in drained] == [
+            ("c", 4), ("a", 1), ("a", 2), ("b", 3), ("c", 5)
+        ]
+        assert buffer.get_buffer_stats()["total_buffered_requests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_spill_file_survives_a_new_process(self, buffer, spill_path):
+        for request_id in range(6):
+            await buffer.buffer_request("a", update(request_id))
+        buffer._discard([buffer.buffers["a"].pop(3)])
+        with open(spill_path, "ab") as f:
+            f.write(b'{"sequence": 99, "session_')  # torn by a crash
+
+        recovered = RequestBuffer(max_memory_requests=3, spill_path=str(spill_path))
+
+        assert recovered.get_buffer_stats()["spilled_requests"] == 2
+        await recovered.buffer_request("a", update(6))
+        assert [r["id"] for r in await recovered.get_buffered_requests("a")] == [4, 5, 6]
+        assert not spill_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_spilled_read_keeps_its_duplicates_across_processes(self, buffer, spill_path):
+        for request_id in range(3):
+            await buffer.buffer_request("b", update(request_id))
+        for request_id in (10, 11, 12):
+            assert await buffer.buffer_request("a", status(request_id))
+        assert buffer.get_buffer_stats()["spilled_requests"] == 1
+
+        recovered = RequestBuffer(max_memory_requests=3, spill_path=str(spill_path))
+
+        drained = await recovered.drain_requests()
+        assert [(session, r["id"], ids) for session, r, ids in drained] == [("a", 10, [11, 12])]
+
+    @pytest.mark.asyncio
+    async def test_spill_size_is_bounded(self, spill_path):
+        buffer = RequestBuffer(max_memory_requests=1, spill_path=str(spill_path),
+                               max_spill_bytes=400)
+
+        results = [await buffer.buffer_request("a", update(i)) for i in range(6)]
+
+        assert results[:2] == [True, True] and results[-1] is False
+        assert spill_path.stat().st_size <= 400
+        lines = [json.loads(line) for line in spill_path.read_bytes().splitlines()]
+        assert [line["request"]["id"] for line in lines] == list(range(1, results.count(True)))
+
+    @pytest.mark.asyncio
+    async def test_consumed_records_are_written_when_spill_is_full(self, spill_path):
+        buffer = RequestBuffer(max_memory_requests=1, spill_path=str(spill_path))
+        for request_id in range(3):
+            await buffer.buffer_request("a", update(request_id))
+        buffer.max_spill_bytes = buffer.get_buffer_stats()["spill_file_bytes"]
+        assert not await buffer.buffer_request("a", update(3))
+
+        buffer._discard([buffer.buffers["a"].pop(1)])
+
+        assert json.loads(spill_path.read_bytes().splitlines()[-1]) == {"consumed": [2]}
+        recovered = RequestBuffer(max_memory_requests=1, spill_path=str(spill_path))
+        assert [r["id"] for r in await recovered.get_buffered_requests("a")] == [2]
@@ -0,0 +1,168 @@
+"""
+Tests for the batched, indexed security audit log.
+"""
+
+import atexit
+import json
+import os
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.security.audit_log_storage import AuditLogIndex
+from mcp_task_orchestrator.infrastructure.security.audit_logger import (
+    SecurityAuditLogger, SecurityEventType, SecurityLevel
+)
+
+
+def write_legacy_entry(path, when, event_type, severity):
+    entry = {"timestamp": when.isoformat(), "event_type": event_type, "severity": severity, "message": "m"}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"2024-01-01 00:00:00,000 - audit - INFO - {json.dumps(entry)}\n")
+
+
+@pytest.fixture
+def audit_logger(tmp_path):
+    logger = SecurityAuditLogger(str(tmp_path / "audit.log"), flush_interval=60)
+    yield logger
+    logger.close()
+
+
+class TestSecurityAuditLog:
+    """Batching, rotation and index-backed queries."""
+
+    def test_events_are_batched_until_flush(self, audit_logger):
+        log_path = audit_logger.log_file_path
+        audit_logger.flush()
+        size_after_init = log_path.stat().st_size
+
+        audit_logger.log_xss_attempt("title")
+        assert log_path.stat().st_size == size_after_init
+
+        assert audit_logger.flush()
+        assert log_path.stat().st_size > size_after_init
+        assert oct(log_path.stat().st_mode & 0o777) == oct(0o600)
+
+    def test_recent_events_filters_and_limit(self, audit_logger):
+        for i in range(5):
+            audit_logger.log_xss_attempt(f"field{i}")
+        audit_logger.log_authentication_failure("mallory", "bad key")
+
+        xss = audit_logger.get_recent_events(event_types=[SecurityEventType.XSS_DETECTED])
+        assert len(xss) == 5
+        assert xss[0]["details"]["field_name"] == "field4"
+
+        assert len(audit_logger.get_recent_events(limit=2)) == 2
+        medium = audit_logger.get_recent_events(severity_levels=[SecurityLevel.MEDIUM])
+        assert [e["event_type"] for e in medium] == ["authentication_failure"]
+
+    def test_window_queries_use_index_offsets(self, tmp_path):
+        log_path = tmp_path / "audit.log"
+        now = datetime.now(timezone.utc)
+        for hours_ago in (50, 30, 3, 0):
+            write_legacy_entry(log_path, now - timedelta(hours=hours_ago), "xss_attack_detected", "high")
+
+        logger = SecurityAuditLogger(str(log_path), flush_interval=60)
+        try:
+            # The pre-existing file is indexed on startup
+            assert len(logger._index.active.hours) >= 4
+
+            # Corrupt the old region: an indexed query must never read it
+            data = log_path.read_bytes()
+            second_hour_offset = list(logger._index.active.hours.values())[1].offset
+            log_path.write_bytes(b"X" * second_hour_offset + data[second_hour_offset:])
+
+            assert len(logger.get_recent_events(hours=40,
+                                                event_types=[SecurityEventType.XSS_DETECTED])) == 3
+            summary = logger.get_security_summary(hours=24)
+            assert summary["attack_attempts"] == 2
+            assert summary["severity_levels"]["high"] == 2
+        finally:
+            logger.close()
+
+    def test_summary_counters_match_full_scan(self, audit_logger):
+        for i in range(7):
+            audit_logger.log_xss_attempt(f"f{i}")
+        for i in range(3):
+            audit_logger.log_authorization_failure("bob", "admin", "delete")
+        audit_logger.log_suspicious_activity("odd", "medium")
+
+        summary = audit_logger.get_security_summary(hours=1)
+        events = audit_logger.get_recent_events(hours=1)
+
+        assert summary["total_events"] == len(events)
+        assert summary["attack_attempts"] == 7
+        assert summary["authz_failures"] == 3
+        assert sum(summary["severity_levels"].values()) == len(events)
+
+    def test_selected_segments_are_isolated_from_the_writer(self, audit_logger):
+        audit_logger.log_xss_attempt("title")
+        audit_logger.flush()
+        index = audit_logger._index
+
+        [(_, segment)] = index.select(0)
+        [counters] = [dict(b.event_types) for b in index.active.hours.values()]
+        # The writer thread keeps adding hours and counter keys to the live index
+        for hour in range(3):
+            index.active.add(index.active.size, 10, (10 ** 7 + hour) * 3600, f"type{hour}", "low")
+
+        assert len(segment.hours) == 1
+        [bucket] = segment.hours.values()
+        assert bucket.event_types == counters
+        assert counters["xss_attack_detected"] == 1
+        assert len(index.active.hours) == 4
+
+    def test_rotation_by_size_prunes_old_segments(self, tmp_path):
+        logger = SecurityAuditLogger(str(tmp_path / "audit.log"), max_bytes=600,
+                                     backup_count=2, batch_size=1, flush_interval=60)
+        try:
+            for i in range(20):
+                logger.log_xss_attempt(f"field{i}")
+            logger.flush()
+
+            rotated = [name for name in os.listdir(tmp_path) if name.startswith("audit.log.2")]
+            assert len(rotated) == 2
+            assert len(logger._index.segments) == 3
+            assert all(logger._index.path_for(s).exists() for s in logger._index.segments)
+
+            # Queries span every retained segment
+            total = sum(sum(b.event_types.values()) for s in logger._index.segments for b in s.hours.values())
+            assert len(logger.get_recent_events(hours=1)) == total
+        finally:
+            logger.close()
+
+    def test_index_rebuilt_after_unsaved_writes(self, tmp_path):
+        log_path = tmp_path / "audit.log"
+        logger = SecurityAuditLogger(str(log_path), flush_interval=60)
+        logger.log_xss_attempt("a")
+        logger.close()
+
+        # Simulate a crash: entries appended after the index was last saved
+        write_legacy_entry(log_path, datetime.now(timezone.utc), "xss_attack_detected", "high")
+
+        index = AuditLogIndex(log_path)
+        assert index.active.size == log_path.stat().st_size
+        xss_count = sum(b.event_types.get("xss_attack_detected", 0) for b in index.active.hours.values())
+        assert xss_count == 2
+
+    def test_existing_files_and_index_are_restricted(self, tmp_path):
+        log_path = tmp_path / "audit.log"
+        write_legacy_entry(log_path, datetime.now(timezone.utc), "xss_detected", "high")
+        os.chmod(log_path, 0o644)
+
+        logger = SecurityAuditLogger(str(log_path), flush_interval=60)
+        logger.close()
+
+        index_path = tmp_path / "audit.log.index.json"
+        assert oct(log_path.stat().st_mode & 0o777) == oct(0o600)
+        assert oct(index_path.stat().st_mode & 0o777) == oct(0o600)
+
+    def test_close_unregisters_exit_hook(self, tmp_path):
+        with patch.object(atexit, "register") as register, \
+                patch.object(atexit, "unregister") as unregister:
+            logger = SecurityAuditLogger(str(tmp_path / "audit.log"), flush_interval=60)
+            logger.close()
+
+        assert register.call_args.args[0] == logger.close
+        assert unregister.call_args.args[0] == logger.close
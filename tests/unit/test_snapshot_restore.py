@@ -0,0 +1,225 @@
+"""
+Tests for streamed, parallel state restoration after a restart.
+
+Snapshots are decoded incrementally, tasks that were being worked on are
+restored before the server reports ready, and the rest follow in the
+background in bounded batches.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from mcp_task_orchestrator.domain.entities.task import TASK_STORAGE_SCHEMA_VERSION
+from mcp_task_orchestrator.reboot import state_serializer as serializer_module
+from mcp_task_orchestrator.reboot.restart_manager import (
+    RestartCoordinator, RestartPhase, StateRestorer
+)
+from mcp_task_orchestrator.reboot.state_serializer import (
+    DatabaseState, ServerStateSnapshot, StateSerializer
+)
+
+
+def entry(task_id, status="pending"):
+    return {
+        "schema_version": TASK_STORAGE_SCHEMA_VERSION,
+        "task_id": task_id,
+        "title": f"Plan {task_id}",
+        "description": "Plan with \"quotes\", [brackets] and {braces}",
+        "complexity": "moderate",
+        "status": status,
+        "created_at": "2024-01-01T00:00:00",
+        "subtasks": [
+            {"task_id": f"{task_id}_step_{i}", "title": f"Step {i}", "description": "Do it",
+             "specialist_type": "implementer", "status": "pending", "dependencies": [],
+             "estimated_effort": None, "results": None, "artifacts": []}
+            for i in range(2)
+        ]
+    }
+
+
+class FakeStateManager:
+    """Records stores; stores of tasks in `blocked` wait for `release`."""
+
+    def __init__(self, db_path, blocked=()):
+        self.db_path = str(db_path)
+        self._initialized = True
+        self.stored = []
+        self.blocked = set(blocked)
+        self.release = asyncio.Event()
+        self.in_flight = self.max_in_flight = 0
+
+    async def store_task_breakdown(self, breakdown):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if breakdown.task_id in self.blocked:
+                await self.release.wait()
+            await asyncio.sleep(0.001)
+            self.stored.append(breakdown.task_id)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tasks.db"
+    path.write_bytes(b"")
+    return path
+
+
+@pytest.fixture
+def serializer(tmp_path):
+    return StateSerializer(str(tmp_path / "server_state"))
+
+
+async def save(serializer, db_path, entries):
+    snapshot = ServerStateSnapshot(
+        active_tasks=entries,
+        database_state=DatabaseState(
+            db_path=str(db_path), connection_metadata={}, pending_transactions=[],
+            integrity_checksum="", last_checkpoint=datetime.now()
+        )
+    )
+    snapshot.integrity_hash = serializer._generate_integrity_hash(snapshot)
+    await serializer.save_snapshot(snapshot)
+    return snapshot
+
+
+class TestStreamedSnapshots:
+    """Snapshot files are validated and read without loading them whole."""
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_full_load_across_chunk_boundaries(self, serializer, db_path):
+        await save(serializer, db_path, [entry(f"plan_{i}") for i in range(25)])
+
+        with patch.object(serializer_module, "STREAM_CHUNK_SIZE", 7):
+            stream = await serializer.open_latest_snapshot()
+            streamed = list(stream.iter_active_tasks())
+
+        loaded = await serializer.load_latest_snapshot()
+        assert streamed == loaded.active_tasks
+        assert stream.active_task_count == 25
+        assert stream.snapshot.active_tasks == []
+        assert stream.snapshot.database_state.db_path == str(db_path)
+
+    @pytest.mark.asyncio
+    async def test_stream_applies_chain_deltas(self, serializer, db_path):
+        await save(serializer, db_path, [entry(f"plan_{i}") for i in range(5)])
+        chain = serializer._read_chain()
+        chain["watermark"] = "2024-01-01 00:00:00"
+        delta = ServerStateSnapshot(active_tasks=[entry("plan_2", "active"), entry("plan_9")])
+        delta.integrity_hash = serializer._generate_integrity_hash(delta)
+        delta.database_state = DatabaseState(
+            db_path=str(db_path), connection_metadata={"change_watermark": "2024-01-01 00:00:00"},
+            pending_transactions=[], integrity_checksum="", last_checkpoint=delta.timestamp
+        )
+        serializer._write_delta(chain, delta, ["plan_0"])
+
+        stream = await serializer.open_latest_snapshot()
+        ids = [(e["task_id"], e["status"]) for e in stream.iter_active_tasks()]
+
+        assert ids == [("plan_1", "pending"), ("plan_2", "active"), ("plan_3", "pending"),
+                       ("plan_4", "pending"), ("plan_9", "pending")]
+        assert stream.active_task_count == 5
+        merged = await serializer.load_latest_snapshot()
+        assert [e["task_id"] for e in merged.active_tasks] == [i for i, _ in ids]
+
+    @pytest.mark.asyncio
+    async def test_tampered_snapshot_is_rejected_before_restoring(self, serializer, db_path):
+        await save(serializer, db_path, [entry(f"plan_{i}") for i in range(3)])
+        data = json.loads(serializer.current_state_file.read_text())
+        data["active_tasks"].pop()
+        serializer.current_state_file.write_text(json.dumps(data))
+
+        assert await serializer.open_latest_snapshot() is None
+
+
+class TestStateRestorer:
+    """Critical tasks first, the rest in bounded background batches."""
+
+    @pytest.mark.asyncio
+    async def test_ready_once_critical_tasks_are_restored(self, serializer, db_path):
+        entries = [entry(f"plan_{i}", "in_progress" if i % 4 == 0 else "pending") for i in range(12)]
+        await save(serializer, db_path, entries)
+        manager = FakeStateManager(db_path, blocked={"plan_1"})
+        restorer = StateRestorer(serializer, batch_size=3, max_concurrency=2)
+
+        stream = await serializer.open_latest_snapshot()
+        assert await restorer.restore_from_stream(stream, manager)
+
+        assert restorer.ready.is_set()
+        assert sorted(manager.stored) == ["plan_0", "plan_4", "plan_8"]
+        assert restorer.progress.state == "ready"
+        assert not await restorer.wait_for_background_restore(timeout=0.05)
+
+        manager.release.set()
+        assert await restorer.wait_for_background_restore(timeout=5)
+        status = restorer.get_restore_status()
+        assert sorted(manager.stored) == sorted(e["task_id"] for e in entries)
+        assert (status["state"], status["critical_restored"], status["background_restored"]) == \
+            ("completed", 3, 9)
+        assert set(status["phase_timings"]) == {
+            "restore_database", "restore_critical_tasks", "restore_background_tasks"
+        }
+        assert manager.max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_entries_are_converted_off_the_event_loop(self, serializer, db_path):
+        snapshot = await save(serializer, db_path, [entry(f"plan_{i}", "active") for i in range(4)])
+        restorer = StateRestorer(serializer, batch_size=2)
+        threads = set()
+        convert = restorer._dict_to_task_breakdown
+
+        def record_thread(task_data):
+            threads.add(threading.get_ident())
+            return convert(task_data)
+
+        restorer._dict_to_task_breakdown = record_thread
+        assert await restorer.restore_from_snapshot(snapshot, FakeStateManager(db_path))
+
+        assert len(threads) >= 1 and threading.get_ident() not in threads
+        assert restorer.progress.critical_restored == 4
+
+    @pytest.mark.asyncio
+    async def test_bad_entries_are_counted_and_skipped(self, serializer, db_path):
+        entries = [entry("plan_0", "active"), {"task_id": "broken", "status": "active"},
+                   entry("plan_1", "active")]
+        snapshot = await save(serializer, db_path, entries)
+        manager = FakeStateManager(db_path)
+        restorer = StateRestorer(serializer)
+
+        assert await restorer.restore_from_snapshot(snapshot, manager)
+        await restorer.wait_for_background_restore(timeout=5)
+
+        assert sorted(manager.stored) == ["plan_0", "plan_1"]
+        assert restorer.progress.failed == 1
+
+
+class TestRestartCoordinator:
+    """The restart sequence records how long each phase took."""
+
+    @pytest.mark.asyncio
+    async def test_phase_timings_are_recorded(self, serializer, db_path):
+        await save(serializer, db_path, [entry("plan_0", "active"), entry("plan_1")])
+        coordinator = RestartCoordinator(serializer)
+        coordinator.process_manager.start_new_process = AsyncMock(return_value=(True, 4242))
+        manager = FakeStateManager(db_path)
+
+        with patch("mcp_task_orchestrator.reboot.restart_manager.get_metrics_collector") as metrics:
+            assert await coordinator.execute_restart(state_manager=manager)
+            await coordinator.state_restorer.wait_for_background_restore(timeout=5)
+
+        assert coordinator.status.phase == RestartPhase.COMPLETE
+        assert list(coordinator.status.phase_timings) == [
+            "preparing", "starting_process", "loading_state", "restoring_database",
+            "resuming_tasks", "enabling_connections"
+        ]
+        assert all(seconds >= 0 for seconds in coordinator.status.phase_timings.values())
+        recorded = {call.args[2]["phase"] for call in metrics.return_value.record_timing.call_args_list}
+        assert {"loading_state", "restore_critical_tasks", "restore_background_tasks"} <= recorded
+        assert sorted(manager.stored) == ["plan_0", "plan_1"]
@@ -0,0 +1,156 @@
+"""
+Tests for background startup recovery in the StateManager.
+
+Initialization returns before recovery has scanned the database; requests
+that touch a parent first recover that parent inline.
+"""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from mcp_task_orchestrator.db.persistence import DatabasePersistenceManager
+from mcp_task_orchestrator.domain.entities.task import Task, TaskStatus
+from mcp_task_orchestrator.orchestrator import orchestration_state_manager
+from mcp_task_orchestrator.orchestrator.orchestration_state_manager import StateManager
+
+SCHEMA = Path(__file__).parents[2] / "mcp_task_orchestrator" / "db" / "generic_task_schema.sql"
+
+
+def subtask(i, parent, **fields):
+    return Task(task_id=f"{parent}_step_{i:02d}", title=f"Step {i}", description="Do it",
+                parent_task_id=parent, hierarchy_path=f"/{parent}/{parent}_step_{i:02d}",
+                hierarchy_level=1, specialist_type="implementer", **fields)
+
+
+def insert_tasks(db_path, tasks):
+    rows = [task.to_dict_for_storage() for task in tasks]
+    columns = list(rows[0])
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO generic_tasks ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})",
+            rows
+        )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tasks.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    tasks = []
+    for parent in ("alpha", "beta", "gamma"):
+        tasks.append(Task(task_id=parent, title=parent, description="d", hierarchy_path=f"/{parent}"))
+        tasks.extend(subtask(i, parent, status=TaskStatus.IN_PROGRESS if i < 4 else TaskStatus.PENDING)
+                     for i in range(10))
+    insert_tasks(path, tasks)
+    # Drifted counters for every parent, as left by an older server version
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS task_progress (parent_task_id TEXT PRIMARY KEY, "
+                     "total_subtasks INTEGER NOT NULL DEFAULT 0, completed_subtasks INTEGER NOT NULL "
+                     "DEFAULT 0, updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)")
+        conn.executemany("INSERT INTO task_progress (parent_task_id, total_subtasks) VALUES (?, 3)",
+                         [("alpha",), ("beta",), ("gamma",)])
+    return path
+
+
+@pytest.fixture
+def manager(db_path, tmp_path):
+    manager = StateManager(db_path=str(tmp_path / "state.db"), base_dir=str(tmp_path))
+    manager.persistence = DatabasePersistenceManager(str(tmp_path), f"sqlite:///{db_path}")
+    return manager
+
+
+def block_stale_lock_cleanup(manager):
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+
+    manager._cleanup_stale_locks = blocked
+    return release
+
+
+class TestStartupRecovery:
+    """Recovery runs in the background and never shows early requests drift."""
+
+    @pytest.mark.asyncio
+    async def test_initialize_does_not_wait_for_recovery(self, manager):
+        release = block_stale_lock_cleanup(manager)
+
+        await asyncio.wait_for(manager._initialize(), timeout=1)
+        assert manager.get_recovery_status()["state"] == "running"
+
+        release.set()
+        assert await manager.wait_for_recovery(timeout=5)
+        status = manager.get_recovery_status()
+        assert status["state"] == "completed"
+        assert status["interrupted_total"] == status["recovered"] == 12
+        assert status["parents_reconciled"] == 3
+
+    @pytest.mark.asyncio
+    async def test_early_request_recovers_its_parent_first(self, manager):
+        release = block_stale_lock_cleanup(manager)
+        await manager._initialize()
+
+        progress = await manager.get_parent_progress("beta")
+        assert progress["total_subtasks"] == 10
+        assert manager.recovery.parents_reconciled == 1
+
+        release.set()
+        await manager.wait_for_recovery(timeout=5)
+        # beta was not reconciled a second time by the background pass
+        assert manager.recovery.parents_reconciled == 3
+
+    @pytest.mark.asyncio
+    async def test_interrupted_tasks_are_read_in_bounded_batches(self, manager, db_path):
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE generic_tasks SET deleted_at = CURRENT_TIMESTAMP "
+                         "WHERE task_id = 'gamma_step_00'")
+        statements = []
+        engine = manager.persistence._repository.async_engine.sync_engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "FROM generic_tasks INDEXED BY idx_generic_tasks_status_task" in statement \
+                    and "COUNT" not in statement:
+                statements.append((statement, parameters))
+
+        with patch.object(orchestration_state_manager, "RECOVERY_BATCH_SIZE", 5):
+            await manager._initialize()
+            await manager.wait_for_recovery(timeout=5)
+
+        # 11 in_progress rows remain; pending and deleted rows are never read
+        assert manager.recovery.recovered == manager.recovery.interrupted_total == 11
+        assert len(statements) == 3
+        with sqlite3.connect(db_path) as conn:
+            for statement, parameters in statements:
+                plan = " ".join(row[-1] for row in
+                                conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                assert "SEARCH" in plan and "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_update_during_recovery_sees_reconciled_counters(self, manager):
+        release = block_stale_lock_cleanup(manager)
+        archived = []
+
+        async def archive_task(parent_task_id):
+            archived.append(parent_task_id)
+
+        manager.persistence.archive_task = archive_task
+        await manager._initialize()
+
+        for i in range(10):
+            task = await manager.get_subtask(f"alpha_step_{i:02d}")
+            task.status = TaskStatus.COMPLETED
+            await manager.update_subtask(task)
+            # The drifted total of 3 would have archived alpha after 3 subtasks
+            assert archived == ([] if i < 9 else ["alpha"])
+
+        release.set()
+        await manager.wait_for_recovery(timeout=5)
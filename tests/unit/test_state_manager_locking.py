@@ -0,0 +1,143 @@
+"""
+Tests for per-parent locking in the orchestrator StateManager.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_task_orchestrator.domain.entities.task import TaskStatus
+from mcp_task_orchestrator.orchestrator.orchestration_state_manager import StateManager
+
+
+class SlowPersistence:
+    """In-memory persistence whose writes and family loads take time."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.parents = {}
+        self.archived = []
+
+    def add_parent(self, parent_id, subtask_ids):
+        self.parents[parent_id] = {
+            task_id: SimpleNamespace(task_id=task_id, status=TaskStatus.PENDING)
+            for task_id in subtask_ids
+        }
+
+    async def get_parent_task_id(self, task_id):
+        for parent_id, subtasks in self.parents.items():
+            if task_id in subtasks:
+                return parent_id
+        return None
+
+    async def update_subtask(self, subtask, parent_task_id):
+        await asyncio.sleep(self.delay)
+        self.parents[parent_task_id][subtask.task_id].status = subtask.status
+
+    async def get_task_families(self, parent_ids, include_subtasks=True):
+        family = []
+        for parent_id in parent_ids:
+            family.append(SimpleNamespace(task_id=parent_id, parent_task_id=None, position_in_parent=0))
+            family.extend(SimpleNamespace(**vars(st), parent_task_id=parent_id, position_in_parent=i)
+                          for i, st in enumerate(self.parents[parent_id].values()))
+        await asyncio.sleep(self.delay)
+        return family
+
+    async def get_parent_progress(self, parent_task_id):
+        statuses = [st.status for st in self.parents[parent_task_id].values()]
+        await asyncio.sleep(self.delay)
+        completed = statuses.count(TaskStatus.COMPLETED)
+        return {"total_subtasks": len(statuses), "completed_subtasks": completed}
+
+    async def archive_task(self, parent_task_id):
+        self.archived.append(parent_task_id)
+
+
+def parents_on_distinct_stripes(manager, count):
+    parents, stripes = [], set()
+    i = 0
+    while len(parents) < count:
+        parent_id = f"parent_{i}"
+        stripe = manager.locks.stripe_for(parent_id)
+        if stripe not in stripes:
+            stripes.add(stripe)
+            parents.append(parent_id)
+        i += 1
+    return parents
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = StateManager(db_path=str(tmp_path / "state.db"), base_dir=str(tmp_path))
+    manager.persistence = SlowPersistence()
+    manager._async_initialized = True
+    return manager
+
+
+def completed(task_id):
+    return SimpleNamespace(task_id=task_id, status=TaskStatus.COMPLETED)
+
+
+class TestStateManagerLocking:
+    """Striped write locks, lock-free reads and contention metrics."""
+
+    @pytest.mark.asyncio
+    async def test_unrelated_parents_do_not_serialize(self, manager):
+        parents = parents_on_distinct_stripes(manager, 10)
+        for parent_id in parents:
+            manager.persistence.add_parent(parent_id, [f"{parent_id}_a", f"{parent_id}_b"])
+
+        started = asyncio.get_running_loop().time()
+        await asyncio.gather(*(manager.update_subtask(completed(f"{p}_a")) for p in parents))
+        elapsed = asyncio.get_running_loop().time() - started
+
+        # One update plus one completion check each, all running in parallel
+        assert elapsed < 0.1 * 3
+        assert manager.get_lock_statistics()["contended"] == 0
+
+    @pytest.mark.asyncio
+    async def test_archive_check_is_atomic_per_parent(self, manager):
+        manager.persistence.add_parent("plan", ["step_1", "step_2"])
+
+        await asyncio.gather(manager.update_subtask(completed("step_1")),
+                             manager.update_subtask(completed("step_2")))
+
+        assert manager.persistence.archived == ["plan"]
+        stats = manager.get_lock_statistics()
+        assert stats["contended"] == 1
+        assert stats["waits_by_holder"] == {"update_subtask": 1}
+        assert stats["last_contention"]["holder_key"] == "plan"
+        assert stats["max_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_reads_do_not_wait_for_writers(self, manager):
+        manager.persistence.add_parent("plan", ["step_1", "step_2"])
+        manager.persistence.delay = 0.2
+
+        update = asyncio.create_task(manager.update_subtask(completed("step_1")))
+        await asyncio.sleep(0.01)
+        assert manager.get_lock_statistics()["current_holders"][0]["operation"] == "update_subtask"
+
+        manager.persistence.delay = 0
+        subtasks = await asyncio.wait_for(manager.get_subtasks_for_parent("plan"), 0.1)
+        assert len(subtasks) == 2
+        assert not update.done()
+        await update
+
+    @pytest.mark.asyncio
+    async def test_initialization_runs_once_under_concurrency(self, manager):
+        calls = []
+
+        async def recover():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+
+        async def cleanup():
+            pass
+
+        manager._async_initialized = False
+        manager._recover_interrupted_tasks = recover
+        manager._cleanup_stale_locks = cleanup
+        await asyncio.gather(*(manager._initialize() for _ in range(5)))
+        assert calls == [1]
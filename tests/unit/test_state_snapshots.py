@@ -0,0 +1,224 @@
+"""
+Tests for incremental state snapshots in the StateSerializer.
+
+A chain starts with a full snapshot; later snapshots hold only the tasks
+written since the previous one and are compacted back into the base.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from mcp_task_orchestrator.db.persistence import DatabasePersistenceManager
+from mcp_task_orchestrator.domain.entities.task import Task, TaskStatus
+from mcp_task_orchestrator.orchestrator.orchestration_state_manager import StateManager
+from mcp_task_orchestrator.reboot.restart_manager import StateRestorer
+from mcp_task_orchestrator.reboot.shutdown_coordinator import ShutdownCoordinator
+from mcp_task_orchestrator.reboot.state_serializer import RestartReason, StateSerializer
+
+SCHEMA = Path(__file__).parents[2] / "mcp_task_orchestrator" / "db" / "generic_task_schema.sql"
+LONG_AGO = datetime(2024, 1, 1)
+
+
+def family(parent, count=4, **fields):
+    fields.setdefault("updated_at", LONG_AGO)
+    tasks = [Task(task_id=parent, title=parent, description=f"Plan {parent}",
+                  hierarchy_path=f"/{parent}", status=TaskStatus.ACTIVE, **fields)]
+    tasks.extend(
+        Task(task_id=f"{parent}_step_{i}", title=f"Step {i}", description="Do it",
+             parent_task_id=parent, hierarchy_path=f"/{parent}/{parent}_step_{i}",
+             hierarchy_level=1, position_in_parent=i, specialist_type="implementer",
+             status=TaskStatus.COMPLETED if i == 0 else TaskStatus.PENDING, **fields)
+        for i in range(count)
+    )
+    return tasks
+
+
+def insert_tasks(db_path, tasks):
+    rows = [task.to_dict_for_storage() for task in tasks]
+    columns = list(rows[0])
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO generic_tasks ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})",
+            rows
+        )
+
+
+def execute(db_path, statement):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(statement)
+
+
+def task_ids(snapshot):
+    return {entry["task_id"]: [st["task_id"] for st in entry["subtasks"]]
+            for entry in snapshot.active_tasks}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tasks.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA.read_text())
+        conn.execute("PRAGMA journal_mode=WAL")
+    tasks = family("alpha") + family("beta") + family("gamma")
+    # Untouched plans keep deltas small next to the base
+    for i in range(10):
+        tasks += family(f"plan_{i}")
+    insert_tasks(path, tasks)
+    return path
+
+
+@pytest.fixture
+def manager(db_path, tmp_path):
+    manager = StateManager(db_path=str(db_path), base_dir=str(tmp_path))
+    manager.persistence = DatabasePersistenceManager(str(tmp_path), f"sqlite:///{db_path}")
+    manager._async_initialized = True
+    return manager
+
+
+@pytest.fixture
+def serializer(tmp_path):
+    return StateSerializer(str(tmp_path / "server_state"), max_chain_length=3)
+
+
+def delta_files(serializer):
+    return sorted(serializer.state_dir.glob("state_delta_*.json"))
+
+
+class TestStateSnapshots:
+    """Deltas carry only changed tasks and replay to the same state."""
+
+    @pytest.mark.asyncio
+    async def test_first_snapshot_is_a_full_base(self, manager, serializer):
+        path = await serializer.save_incremental_snapshot(manager)
+
+        assert path == str(serializer.current_state_file)
+        snapshot = await serializer.load_latest_snapshot()
+        steps = [f"_step_{i}" for i in (1, 2, 3)]
+        assert len(snapshot.active_tasks) == 13
+        assert task_ids(snapshot)["alpha"] == ["alpha" + s for s in steps]
+
+        restored = StateRestorer(serializer)._dict_to_task_breakdown(snapshot.active_tasks[0])
+        assert [child.parent_task_id for child in restored.children] == [restored.task_id] * 3
+
+    @pytest.mark.asyncio
+    async def test_delta_holds_only_changed_tasks(self, manager, serializer, db_path):
+        await serializer.save_incremental_snapshot(manager)
+
+        execute(db_path, "UPDATE generic_tasks SET title = 'Renamed' WHERE task_id = 'alpha_step_2'")
+        execute(db_path, "UPDATE generic_tasks SET status = 'completed' WHERE task_id = 'beta'")
+        insert_tasks(db_path, family("delta", count=2, updated_at=datetime.now()))
+        path = await serializer.save_incremental_snapshot(manager)
+
+        with open(path) as f:
+            delta = json.load(f)
+        assert [entry["task_id"] for entry in delta["snapshot"]["active_tasks"]] == ["alpha", "delta"]
+        assert delta["removed_task_ids"] == ["beta"]
+
+        snapshot = await serializer.load_latest_snapshot()
+        assert await serializer.validate_snapshot(snapshot)
+        assert {"alpha", "delta", "gamma"} <= set(task_ids(snapshot))
+        assert "beta" not in task_ids(snapshot)
+        alpha = next(entry for entry in snapshot.active_tasks if entry["task_id"] == "alpha")
+        assert alpha["subtasks"][1]["title"] == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_database_is_not_queried(self, manager, serializer):
+        await serializer.save_incremental_snapshot(manager)
+
+        with patch.object(manager, "iter_changed_tasks", side_effect=AssertionError), \
+                patch.object(manager, "iter_all_tasks", side_effect=AssertionError):
+            assert await serializer.save_incremental_snapshot(manager) is None
+        assert delta_files(serializer) == []
+
+    @pytest.mark.asyncio
+    async def test_changed_rows_are_an_index_range_scan(self, manager, serializer, db_path):
+        await serializer.save_incremental_snapshot(manager)
+        statements = []
+        engine = manager.persistence._repository.async_engine.sync_engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if "INDEXED BY idx_generic_tasks_updated_order" in statement:
+                statements.append((statement, parameters))
+
+        execute(db_path, "UPDATE generic_tasks SET title = 'Renamed' WHERE task_id = 'gamma_step_1'")
+        await serializer.save_incremental_snapshot(manager)
+
+        assert len(statements) == 1
+        with sqlite3.connect(db_path) as conn:
+            statement, parameters = statements[0]
+            plan = " ".join(row[-1] for row in
+                            conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        assert "SEARCH" in plan and "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_chain_is_compacted_into_the_base(self, manager, serializer, db_path):
+        await serializer.save_incremental_snapshot(manager)
+        for i, parent in enumerate(("alpha", "beta")):
+            execute(db_path, f"UPDATE generic_tasks SET status = 'completed' "
+                             f"WHERE task_id = '{parent}_step_{i + 1}'")
+            await serializer.save_incremental_snapshot(manager)
+        assert len(delta_files(serializer)) == 2
+        before = task_ids(await serializer.load_latest_snapshot())
+
+        execute(db_path, "DELETE FROM generic_tasks WHERE parent_task_id = 'gamma'")
+        execute(db_path, "UPDATE generic_tasks SET deleted_at = CURRENT_TIMESTAMP WHERE task_id = 'gamma'")
+        await serializer.save_incremental_snapshot(manager)
+
+        assert delta_files(serializer) == []
+        assert json.loads(serializer.chain_file.read_text())["deltas"] == []
+        del before["gamma"]
+        assert task_ids(await serializer.load_latest_snapshot()) == before
+
+    @pytest.mark.asyncio
+    async def test_full_save_starts_a_new_chain(self, manager, serializer, db_path):
+        await serializer.save_incremental_snapshot(manager)
+        execute(db_path, "UPDATE generic_tasks SET status = 'completed' WHERE task_id = 'alpha'")
+        await serializer.save_incremental_snapshot(manager)
+
+        snapshot = await serializer.create_snapshot(manager)
+        await serializer.save_snapshot(snapshot)
+
+        assert delta_files(serializer) == []
+        assert len(list(serializer.state_dir.glob("backup_state_*.json"))) == 1
+        ids = task_ids(await serializer.load_latest_snapshot())
+        assert "alpha" not in ids and {"beta", "gamma"} <= set(ids)
+
+    @pytest.mark.asyncio
+    async def test_shutdown_extends_the_chain(self, manager, serializer, db_path):
+        coordinator = ShutdownCoordinator(serializer)
+        coordinator.state_manager = manager
+        assert await coordinator._serialize_server_state(RestartReason.MANUAL_REQUEST) == \
+            str(serializer.current_state_file)
+
+        execute(db_path, "UPDATE generic_tasks SET title = 'Renamed' WHERE task_id = 'beta_step_3'")
+        with patch.object(serializer, "create_snapshot", side_effect=AssertionError):
+            path = await coordinator._serialize_server_state(RestartReason.MANUAL_REQUEST)
+
+        assert [Path(path)] == delta_files(serializer)
+        snapshot = await serializer.load_latest_snapshot()
+        beta = next(entry for entry in snapshot.active_tasks if entry["task_id"] == "beta")
+        assert beta["subtasks"][-1]["title"] == "Renamed"
+
+    def test_fingerprint_follows_wal_commits(self, serializer, db_path):
+        writer = sqlite3.connect(db_path)
+        fingerprint = serializer._calculate_db_checksum(str(db_path))
+
+        writer.execute("SELECT COUNT(*) FROM generic_tasks").fetchone()
+        assert serializer._calculate_db_checksum(str(db_path)) == fingerprint
+
+        writer.execute("UPDATE generic_tasks SET title = 'Renamed' WHERE task_id = 'alpha'")
+        writer.commit()
+        assert serializer._calculate_db_checksum(str(db_path)) != fingerprint
+        writer.close()
+
+        with patch("builtins.open", wraps=open) as opened:
+            serializer._calculate_db_checksum(str(db_path))
+        assert all(call.args[1] == "rb" for call in opened.call_args_list)
@@ -0,0 +1,149 @@
+"""
+Tests for primary-key subtask lookup and single-row subtask updates.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from mcp_task_orchestrator.db.persistence import DatabasePersistenceManager
+from mcp_task_orchestrator.domain.entities.task import Task, TaskStatus
+from mcp_task_orchestrator.orchestrator.orchestration_state_manager import StateManager
+from mcp_task_orchestrator.orchestrator.task_orchestration_service import _to_task_artifacts
+
+SCHEMA = Path(__file__).parents[2] / "mcp_task_orchestrator" / "db" / "generic_task_schema.sql"
+SUBTASKS = 200
+
+
+def insert_tasks(db_path, tasks):
+    rows = [task.to_dict_for_storage() for task in tasks]
+    columns = list(rows[0])
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO generic_tasks ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})",
+            rows
+        )
+
+
+@pytest.fixture
+def persistence(tmp_path):
+    db_path = tmp_path / "tasks.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA.read_text())
+
+    insert_tasks(db_path, [Task(task_id="plan", title="Plan", description="Big plan",
+                                hierarchy_path="/plan")] + [
+        Task(task_id=f"step_{i}", title=f"Step {i}", description="Do it",
+             parent_task_id="plan", hierarchy_path=f"/plan/step_{i}",
+             hierarchy_level=1, specialist_type="implementer")
+        for i in range(SUBTASKS)
+    ])
+    return DatabasePersistenceManager(str(tmp_path), f"sqlite:///{db_path}")
+
+
+def capture_statements(persistence):
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(persistence._repository.async_engine.sync_engine, "before_cursor_execute", before_execute)
+    return statements
+
+
+def sibling_rows(persistence):
+    db_path = persistence.db_url[len("sqlite:///"):]
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            "SELECT task_id, status, updated_at FROM generic_tasks WHERE task_id != 'step_7' ORDER BY task_id"
+        ).fetchall()
+
+
+class TestSubtaskLookup:
+    """Single subtasks are read and written without their breakdown."""
+
+    @pytest.mark.asyncio
+    async def test_get_subtask_reads_one_row(self, persistence):
+        statements = capture_statements(persistence)
+
+        subtask = await persistence.get_subtask("step_7")
+
+        assert subtask.task_id == "step_7"
+        assert subtask.parent_task_id == "plan"
+        task_queries = [s for s in statements if "FROM generic_tasks" in s]
+        assert len(task_queries) == 1
+        assert "WHERE task_id = ?" in task_queries[0]
+        assert await persistence.get_subtask("plan") is None
+        assert await persistence.get_subtask("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_update_subtask_is_single_row(self, persistence):
+        before = sibling_rows(persistence)
+        subtask = await persistence.get_subtask("step_7")
+        subtask.status = TaskStatus.COMPLETED
+        subtask.results = "Implemented"
+
+        statements = capture_statements(persistence)
+        assert await persistence.update_subtask(subtask, "plan")
+
+        updates = [s for s in statements if s.startswith("UPDATE generic_tasks")]
+        assert len(updates) == 1
+        assert sibling_rows(persistence) == before
+
+        stored = await persistence.get_subtask("step_7")
+        assert stored.status == TaskStatus.COMPLETED
+        assert stored.results == "Implemented"
+        assert stored.completed_at is not None
+
+    @pytest.mark.asyncio
+    async def test_update_subtask_persists_edits_and_artifacts(self, persistence):
+        subtask = await persistence.get_subtask("step_5")
+        subtask.title = "Renamed step"
+        subtask.context = {"note": "edited"}
+        subtask.status = TaskStatus.COMPLETED
+        subtask.artifacts = _to_task_artifacts("step_5", ["notes.md", {"path": "src/app.py"}])
+
+        assert await persistence.update_subtask(subtask, "plan")
+
+        stored = await persistence.get_subtask("step_5")
+        assert stored.title == "Renamed step"
+        assert stored.context == {"note": "edited"}
+        assert {a.content for a in stored.artifacts} == {"notes.md", '{"path": "src/app.py"}'}
+        assert (await persistence.get_parent_progress("plan"))["completed_subtasks"] == 1
+
+        # Saving the loaded task again keeps its artifacts and the counter
+        assert await persistence.update_subtask(stored, "plan")
+        assert len((await persistence.get_subtask("step_5")).artifacts) == 2
+        assert (await persistence.get_parent_progress("plan"))["completed_subtasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_update_requires_matching_parent(self, persistence):
+        subtask = await persistence.get_subtask("step_3")
+        subtask.status = TaskStatus.IN_PROGRESS
+
+        assert not await persistence.update_subtask(subtask, "other_plan")
+        assert (await persistence.get_subtask("step_3")).status == TaskStatus.PENDING
+
+        assert await persistence.update_subtask(subtask, "plan")
+        stored = await persistence.get_subtask("step_3")
+        assert stored.status == TaskStatus.IN_PROGRESS
+        assert stored.started_at is not None
+
+    @pytest.mark.asyncio
+    async def test_state_manager_uses_direct_lookup(self, persistence, tmp_path):
+        manager = StateManager(db_path=str(tmp_path / "state.db"), base_dir=str(tmp_path))
+        manager.persistence = persistence
+        manager._async_initialized = True
+
+        subtask = await manager.get_subtask("step_42")
+        subtask.status = TaskStatus.IN_PROGRESS
+        await manager.update_subtask(subtask)
+
+        assert (await manager.get_subtask("step_42")).status == TaskStatus.IN_PROGRESS
+
+        subtasks = await manager.get_subtasks_for_parent("plan")
+        assert [t.task_id for t in subtasks][:3] == ["step_0", "step_1", "step_2"]
+        assert len(subtasks) == SUBTASKS
@@ -0,0 +1,120 @@
+"""
+Tests for trusted hydration of stored tasks.
+
+Rows and snapshots written by this server are hydrated without re-running
+pydantic validation; the result must equal the fully validated model.
+"""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from mcp_task_orchestrator.db.repository import converters
+from mcp_task_orchestrator.db.repository.converters import (
+    TASK_COLUMNS, row_to_task, rows_to_tasks, _row_to_validated_task
+)
+from mcp_task_orchestrator.domain.entities.task import Task, TaskStatus, TASK_STORAGE_SCHEMA_VERSION
+from mcp_task_orchestrator.reboot.restart_manager import StateRestorer
+
+
+def stored_row(**overrides):
+    task = Task(
+        task_id=overrides.pop("task_id", "task_1"),
+        title=overrides.pop("title", "Fix parser"),
+        description="Handle nested quotes",
+        hierarchy_path="/task_1",
+        specialist_type="implementer",
+        context={"priority": 2},
+        started_at=datetime(2024, 1, 2, 3, 4, 5),
+        **overrides
+    )
+    row = task.to_dict_for_storage()
+    # SQLite returns booleans as integers
+    row["auto_maintenance_enabled"] = int(row["auto_maintenance_enabled"])
+    row["is_template"] = int(row["is_template"])
+    return row
+
+
+class TestTrustedHydration:
+    """Trusted and validated hydration agree."""
+
+    @pytest.mark.parametrize("status", ["pending", "in_progress", "completed", "failed"])
+    def test_row_to_task_matches_validated(self, status):
+        row = stored_row(status=status)
+        assert set(row) == TASK_COLUMNS
+
+        with patch.object(converters, "_row_to_validated_task") as validated:
+            trusted = row_to_task(row)
+        assert not validated.called
+        assert trusted.model_dump() == _row_to_validated_task(row).model_dump()
+
+    def test_rows_to_tasks_preserves_order(self):
+        rows = [stored_row(task_id=f"task_{i}", title=f"Task {i}") for i in range(20)]
+        assert [t.task_id for t in rows_to_tasks(rows)] == [f"task_{i}" for i in range(20)]
+
+    def test_unknown_columns_are_validated(self):
+        row = stored_row()
+        row["new_column"] = "value"
+
+        with patch.object(converters, "_row_to_validated_task", wraps=_row_to_validated_task) as validated:
+            task = row_to_task(row)
+        assert validated.called
+        assert task.task_id == "task_1"
+
+    def test_schema_version_mismatch_is_validated(self):
+        data = {"task_id": "bad id!", "title": "t", "description": "d", "hierarchy_path": "/x"}
+
+        assert Task.from_storage(data).task_id == "bad id!"
+        with pytest.raises(ValueError):
+            Task.from_storage(dict(data, unknown_field=1))
+        with pytest.raises(ValueError):
+            Task.from_storage(data, schema_version=TASK_STORAGE_SCHEMA_VERSION + 1)
+        with pytest.raises(ValueError):
+            Task.bulk_from_storage([data], schema_version=None)
+
+    def test_hydrated_tasks_do_not_share_defaults(self):
+        data = {"task_id": "task_1", "title": "t", "description": "d", "hierarchy_path": "/task_1"}
+
+        first, second = Task.bulk_from_storage([dict(data), dict(data)])
+        first.context["key"] = "value"
+        first.children.append(second)
+
+        assert second.context == {}
+        assert second.children == []
+        assert first.model_fields_set == set(data)
+        assert first.model_copy(update={"title": "u"}).title == "u"
+
+    def test_snapshot_hydration_matches_validated(self):
+        snapshot = {
+            "schema_version": TASK_STORAGE_SCHEMA_VERSION,
+            "task_id": "parent_1",
+            "description": "Build the feature",
+            "complexity": "complex",
+            "status": TaskStatus.ACTIVE.value,
+            "created_at": "2024-01-01T00:00:00",
+            "subtasks": [{
+                "task_id": f"sub_{i}", "title": f"Step {i}", "description": "Do it",
+                "specialist_type": "implementer", "status": "pending",
+                "dependencies": [f"sub_{i - 1}"] if i else [], "estimated_effort": "1h",
+                "results": None, "artifacts": []
+            } for i in range(3)]
+        }
+        legacy = dict(snapshot)
+        del legacy["schema_version"]
+
+        restorer = StateRestorer.__new__(StateRestorer)
+        trusted = restorer._dict_to_task_breakdown(snapshot)
+        validated = restorer._dict_to_task_breakdown(legacy)
+
+        def comparable(task):
+            data = task.model_dump(exclude={"updated_at", "children"})
+            data["children"] = [
+                child.model_dump(exclude={"created_at", "updated_at", "dependencies"})
+                for child in task.children
+            ]
+            return data
+
+        assert comparable(trusted) == comparable(validated)
+        assert [c.task_id for c in trusted.children] == ["sub_0", "sub_1", "sub_2"]
+        assert trusted.children[1].dependencies[0].prerequisite_task_id == "sub_0"
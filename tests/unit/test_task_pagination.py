@@ -0,0 +1,141 @@
+"""
+Tests for keyset-paginated task listing.
+
+get_all_tasks streams the subtasks of active parents in creation order with
+one indexed query per page; status and specialist filters run in SQL.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from mcp_task_orchestrator.db.persistence import DatabasePersistenceManager
+from mcp_task_orchestrator.domain.entities.task import Task, TaskStatus
+from mcp_task_orchestrator.orchestrator.orchestration_state_manager import StateManager
+
+SCHEMA = Path(__file__).parents[2] / "mcp_task_orchestrator" / "db" / "generic_task_schema.sql"
+START = datetime(2024, 1, 1)
+
+
+def subtask(i, parent, **fields):
+    fields.setdefault("created_at", START + timedelta(minutes=i // 2))
+    return Task(task_id=f"{parent}_step_{i:03d}", title=f"Step {i}", description="Do it",
+                parent_task_id=parent, hierarchy_path=f"/{parent}/{parent}_step_{i:03d}",
+                hierarchy_level=1, **fields)
+
+
+def insert_tasks(db_path, tasks):
+    rows = [task.to_dict_for_storage() for task in tasks]
+    columns = list(rows[0])
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            f"INSERT INTO generic_tasks ({', '.join(columns)}) "
+            f"VALUES ({', '.join(':' + c for c in columns)})",
+            rows
+        )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "tasks.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA.read_text())
+    parents = [
+        Task(task_id="plan", title="Plan", description="d", hierarchy_path="/plan",
+             status=TaskStatus.ACTIVE),
+        Task(task_id="done", title="Done", description="d", hierarchy_path="/done",
+             status=TaskStatus.COMPLETED),
+    ]
+    # Pairs of subtasks share a created_at so ties must be broken by task_id
+    active = [subtask(i, "plan", specialist_type="implementer" if i % 3 else "tester",
+                      status=TaskStatus.COMPLETED if i % 4 == 0 else TaskStatus.PENDING)
+              for i in range(60)]
+    archived = [subtask(i, "done") for i in range(10)]
+    insert_tasks(path, parents + active + archived)
+    return path
+
+
+@pytest.fixture
+def persistence(db_path, tmp_path):
+    return DatabasePersistenceManager(str(tmp_path), f"sqlite:///{db_path}")
+
+
+@pytest.fixture
+def manager(persistence, tmp_path):
+    manager = StateManager(db_path=str(tmp_path / "state.db"), base_dir=str(tmp_path))
+    manager.persistence = persistence
+    manager._async_initialized = True
+    return manager
+
+
+def record_selects(persistence):
+    statements = []
+    engine = persistence._repository.async_engine.sync_engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    return statements
+
+
+def expected_ids(predicate=lambda i: True):
+    return sorted((f"plan_step_{i:03d}" for i in range(60) if predicate(i)), reverse=True)
+
+
+class TestTaskPagination:
+    """Subtasks are streamed page by page in created_at order."""
+
+    @pytest.mark.asyncio
+    async def test_get_all_tasks_orders_subtasks_of_active_parents(self, manager):
+        tasks = await manager.get_all_tasks()
+
+        assert [t.task_id for t in tasks] == expected_ids()
+        assert all(a.created_at >= b.created_at for a, b in zip(tasks, tasks[1:]))
+
+    @pytest.mark.asyncio
+    async def test_pages_are_bounded_and_cover_every_row_once(self, manager, persistence):
+        selects = record_selects(persistence)
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = await manager.get_tasks_page(limit=7, cursor=cursor)
+            assert len(page) <= 7
+            seen.extend(t.task_id for t in page)
+            pages += 1
+            if cursor is None:
+                break
+
+        assert seen == expected_ids()
+        assert len(selects) == pages == 9
+        assert all("OFFSET" not in s for s, _ in selects)
+
+    @pytest.mark.asyncio
+    async def test_filters_are_pushed_into_sql(self, manager, persistence):
+        selects = record_selects(persistence)
+        pending_testers = [t.task_id async for t in manager.iter_all_tasks(
+            status=TaskStatus.PENDING, specialist_type="tester", page_size=4)]
+
+        assert pending_testers == expected_ids(lambda i: i % 4 and i % 3 == 0)
+        assert all("t.status IN" in s and "t.specialist_type IN" in s for s, _ in selects)
+
+        not_completed = await manager.get_all_tasks(
+            status=[s for s in TaskStatus if s != TaskStatus.COMPLETED])
+        assert [t.task_id for t in not_completed] == expected_ids(lambda i: i % 4)
+
+    @pytest.mark.asyncio
+    async def test_pages_are_range_scans_of_the_keyset_index(self, manager, persistence, db_path):
+        selects = record_selects(persistence)
+        _, cursor = await manager.get_tasks_page(limit=5)
+        await manager.get_tasks_page(limit=5, cursor=cursor, status=TaskStatus.PENDING)
+
+        with sqlite3.connect(db_path) as conn:
+            for statement, parameters in selects:
+                plan = " ".join(row[-1] for row in
+                                conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+                assert "idx_generic_tasks_created_order" in plan
+                assert "TEMP B-TREE" not in plan
+        assert "(created_at,task_id)<(?,?)" in plan
@@ -0,0 +1,170 @@
+"""
+Unit tests for per-tool call instrumentation and metrics export.
+"""
+
+import json
+
+import pytest
+from mcp import types
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from mcp_task_orchestrator.infrastructure.mcp.tool_router import route_tool_call
+from mcp_task_orchestrator.infrastructure.monitoring.metrics import MetricsCollector, set_metrics_collector
+from mcp_task_orchestrator.infrastructure.monitoring.prometheus_exporter import PrometheusFileExporter
+from mcp_task_orchestrator.infrastructure.monitoring.tool_metrics import (
+    get_tool_metrics_report, install_sqlalchemy_timing, measure_db_time, measure_response,
+    track_tool_call
+)
+
+
+@pytest.fixture
+def collector():
+    collector = MetricsCollector()
+    set_metrics_collector(collector)
+    yield collector
+    set_metrics_collector(None)
+
+
+class TestToolMetrics:
+    """Test suite for tool call instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_route_tool_call_records_latency_and_size(self, collector):
+        response = await route_tool_call("orchestrator_metrics", {"window": "all_time"})
+
+        tags = {"tool": "orchestrator_metrics"}
+        assert collector.get_metric_summary("tool.duration", tags=tags).count == 1
+        assert collector.get_metric_summary("tool.response_bytes", tags=tags).max == \
+            len(response[0].text.encode("utf-8"))
+        assert collector.get_metric_summary("tool.calls", tags={**tags, "status": "success"}).count == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self, collector):
+        with pytest.raises(ValueError):
+            await route_tool_call("no_such_tool", {})
+
+        report = get_tool_metrics_report("all_time", collector=collector)
+
+        assert report["tools"]["no_such_tool"]["errors"] == 1
+        assert report["tools"]["no_such_tool"]["error_rate"] == 1.0
+
+    def test_db_time_is_attributed_to_current_call(self, collector):
+        install_sqlalchemy_timing()
+        engine = create_engine("sqlite://")
+
+        with track_tool_call("query_tool", collector=collector):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+            with measure_db_time():
+                pass
+
+        # Queries outside a tool call are not attributed
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 3"))
+
+        queries = collector.get_metric_summary("tool.db_queries", tags={"tool": "query_tool"})
+        assert queries.count == 1
+        assert queries.sum == 3
+
+    def test_error_payloads_are_detected_from_top_level_status(self, collector):
+        def outcome(payload):
+            with track_tool_call("payload_tool", collector=collector) as call:
+                measure_response(call, [types.TextContent(type="text", text=payload)])
+            return call.status
+
+        assert outcome(json.dumps({"status": "error", "error": "boom"}, indent=2)) == "error"
+        assert outcome(json.dumps({"tool": "x", "details": "...." * 100, "status": "error"})) == "error"
+        # A nested status belongs to a subtask, not to the call
+        assert outcome(json.dumps({"subtasks": [{"status": "error"}], "status": "success"})) == "success"
+        assert outcome('Task failed: "status": "error"') == "success"
+
+    def test_failed_queries_do_not_leak_start_times(self, collector):
+        install_sqlalchemy_timing()
+        engine = create_engine("sqlite://")
+
+        with track_tool_call("failing_tool", collector=collector):
+            with engine.connect() as conn:
+                for _ in range(3):
+                    with pytest.raises(Exception):
+                        conn.execute(text("SELECT * FROM missing_table"))
+                assert conn.info.get("tool_metrics_query_start") == []
+
+        queries = collector.get_metric_summary("tool.db_queries", tags={"tool": "failing_tool"})
+        assert queries.sum == 3
+
+    @pytest.mark.asyncio
+    async def test_async_engine_db_time_is_attributed(self, collector):
+        install_sqlalchemy_timing()
+        engine = create_async_engine("sqlite+aiosqlite://")
+
+        with track_tool_call("async_tool", collector=collector):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await engine.dispose()
+
+        assert collector.get_metric_summary("tool.db_queries", tags={"tool": "async_tool"}).sum == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_tool_reports_percentiles(self, collector):
+        for _ in range(3):
+            await route_tool_call("orchestrator_get_status", {"include_completed": False})
+
+        response = await route_tool_call("orchestrator_metrics", {"tool": "orchestrator_get_status"})
+        report = json.loads(response[0].text)
+
+        entry = report["tools"]["orchestrator_get_status"]
+        assert entry["calls"] == 3
+        assert set(entry["latency_ms"]) == {"avg", "p50", "p95", "p99", "max"}
+        assert "calls_per_second" in entry
+        assert list(report["tools"]) == ["orchestrator_get_status"]
+
+
+class TestPrometheusFileExporter:
+    """Test suite for the Prometheus text-file exporter."""
+
+    def test_export_writes_summaries(self, tmp_path, collector):
+        collector.record_timing("tool.duration", 0.25, tags={"tool": 'say "hi"'})
+        collector.record_timing("tool.duration", 0.75, tags={"tool": 'say "hi"'})
+
+        path = PrometheusFileExporter(tmp_path / "metrics.prom", collector=collector).export()
+        content = path.read_text()
+
+        assert "# TYPE mcp_task_orchestrator_tool_duration summary" in content
+        assert 'mcp_task_orchestrator_tool_duration_count{tool="say \\"hi\\""} 2' in content
+        assert 'mcp_task_orchestrator_tool_duration_sum{tool="say \\"hi\\""} 1.0' in content
+        assert 'quantile="0.99"' in content
+        assert not list(tmp_path.glob("*.tmp"))
+
+    @pytest.mark.asyncio
+    async def test_server_stops_exporter_on_shutdown(self, tmp_path, collector, monkeypatch):
+        from mcp_task_orchestrator import server
+
+        monkeypatch.setenv("MCP_TASK_ORCHESTRATOR_METRICS_EXPORT", "true")
+        monkeypatch.setenv("MCP_TASK_ORCHESTRATOR_BASE_DIR", str(tmp_path))
+        monkeypatch.setenv("MCP_TASK_ORCHESTRATOR_USE_DI", "false")
+        started = []
+        original_start = PrometheusFileExporter.start
+
+        def record_start(exporter):
+            started.append(exporter)
+            original_start(exporter)
+
+        def failing_stdio_server():
+            raise RuntimeError("stdio unavailable")
+
+        monkeypatch.setattr(PrometheusFileExporter, "start", record_start)
+        monkeypatch.setattr(server, "stdio_server", failing_stdio_server)
+        monkeypatch.setattr(server, "disable_dependency_injection", lambda: None)
+
+        installed = []
+        monkeypatch.setattr(server, "install_sqlalchemy_timing", lambda: installed.append(True))
+
+        with pytest.raises(RuntimeError):
+            await server.main()
+
+        assert installed == [True]
+        assert len(started) == 1
+        assert started[0]._task is None
+        assert (tmp_path / ".task_orchestrator" / "metrics.prom").exists()
@@ -0,0 +1,57 @@
+"""
+Differential tests for the single-pass XSS detection in XSSValidator.
+
+The prefiltered, combined pattern must return exactly the verdict of
+searching every pattern in DANGEROUS_PATTERNS one after another.
+"""
+
+import html
+import random
+
+import pytest
+
+from mcp_task_orchestrator.infrastructure.security.validators import ValidationError, XSSValidator
+
+
+FRAGMENTS = [
+    "<script>", "</script>", "<SCRIPT src=x>", "<scr", "ipt>", "javascript", ":", "vbscript:",
+    "data:text/html", "data:image/png;base64", "onload", "onerror =", "= ", "onclick",
+    "<iframe", "<object data=1>", "<embed", "<form", "<meta", "<link", ">", "expression (",
+    "@import", "behavior :", "alert(", "confirm (", "prompt", "eval(", "Function(", "setTimeout(",
+    "setInterval", "&#x41;", "&#65;", "&#", "&amp;", ";", "(", "=", "@", "&", "<", " ", "\n",
+    "plain words", "task title", "ONLOAD=", "JaVaScRiPt:", "x", "1", "ſ", "K"
+]
+
+
+def reference_verdict(validator, value):
+    return any(pattern.search(value) for pattern in validator.compiled_patterns)
+
+
+class TestXSSValidator:
+    """Single-pass detection matches the per-pattern scan."""
+
+    def setup_method(self):
+        self.validator = XSSValidator()
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_verdicts_match_per_pattern_scan(self, seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            value = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 8)))
+            assert self.validator.contains_dangerous_pattern(value) == \
+                reference_verdict(self.validator, value), repr(value)
+
+    def test_patterns_only_run_when_their_trigger_is_present(self):
+        triggers = {XSSValidator._trigger_for(p): p for p in XSSValidator.DANGEROUS_PATTERNS}
+        assert set(triggers) == set(XSSValidator.TRIGGER_CHARACTERS)
+        assert XSSValidator._trigger_for(r'data:[^;]*;base64') == ':'
+        assert XSSValidator._trigger_for(r'onload\s*=') == '='
+
+        clean = "Refactor the scheduler, add tests; update docs"
+        assert not self.validator.contains_dangerous_pattern(clean)
+
+    def test_clean_text_is_escaped_as_before(self):
+        assert self.validator.validate_input("Fix the \"parser\" > lexer") == \
+            html.escape("Fix the \"parser\" > lexer", quote=True)
+        with pytest.raises(ValidationError):
+            self.validator.validate_input("click <script>alert(1)</script>")